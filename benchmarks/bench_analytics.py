@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark columnar execution analytics
+
+Loads 300,000 executions into columns from list_executions-shaped dicts, and
+30,000 from the SQLite mirror (synced through the mock at the API's 100 per
+page), and times grouped aggregates with each available backend (numpy when
+installed, stdlib always).
+
+Usage:
+    python benchmarks/bench_analytics.py [--executions N] [--mirror-executions N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.analytics.columns import ExecutionColumns, available_backends
+from src.analytics.mirror import ExecutionMirror
+from src.clients.mock_client import MockTaskManagerClient
+
+
+def generate(count: int) -> list:
+    rng = random.Random(0)
+    statuses = ["completed"] * 6 + ["failed"] * 3 + ["running"]
+    executions = []
+    for i in range(count):
+        minute = i % 1440
+        executions.append({
+            "execution_id": f"e{i}",
+            "task_id": f"t{rng.randrange(2000)}",
+            "status": rng.choice(statuses),
+            "trigger_type": rng.choice(["manual", "scheduled", "comment"]),
+            "cost_usd": round(rng.lognormvariate(0, 1), 4),
+            "confidence_level": rng.randint(0, 100),
+            "started_at": f"2026-{1 + i // 40000:02d}-01T{minute // 60:02d}:{minute % 60:02d}:00Z",
+            "completed_at": f"2026-{1 + i // 40000:02d}-01T{minute // 60:02d}:{minute % 60:02d}:{rng.randrange(60):02d}Z",
+        })
+    return executions
+
+
+def timed(label: str, action):
+    start = time.perf_counter()
+    result = action()
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--executions", type=int, default=300_000)
+    parser.add_argument("--mirror-executions", type=int, default=30_000)
+    args = parser.parse_args()
+
+    executions = generate(args.executions)
+    print(f"{args.executions} executions, backends: {', '.join(available_backends())}")
+    for backend in available_backends():
+        columns = ExecutionColumns(backend)
+        timed(f"[{backend}] load from dicts", lambda: columns.append(executions))
+        for group_by in ("status", "trigger_type", "task_id"):
+            timed(f"[{backend}] aggregate by {group_by}", lambda: columns.aggregate(group_by))
+        timed(f"[{backend}] aggregate + histogram", lambda: columns.aggregate("status", histogram="duration_seconds"))
+
+    backend = MockTaskManagerClient(max_executions=args.mirror_executions)
+    for execution in executions[:args.mirror_executions]:
+        backend.put_execution(execution)
+    with tempfile.TemporaryDirectory() as directory:
+        mirror = ExecutionMirror(backend, path=os.path.join(directory, "mirror.db"))
+        timed(f"sync mirror ({args.mirror_executions})", mirror.sync)
+        columns = timed("load from mirror", lambda: ExecutionColumns.from_mirror(mirror))
+        timed(f"[{columns.backend}] aggregate by task_id", lambda: columns.aggregate("task_id"))
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
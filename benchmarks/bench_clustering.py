@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark failure clustering
+
+Clusters 50,000 failed executions drawn from 200 error templates, with a
+random identifier word in each message so that most normalized messages are
+distinct and go through MinHash and LSH; once directly and once paged from
+the mock backend. Then adds 1,000 new failures and times the incremental
+refresh.
+
+Usage:
+    python benchmarks/bench_clustering.py [--failures N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.analytics.clustering import FailureIndex
+from src.clients.mock_client import MockTaskManagerClient
+
+
+WORDS = ("request", "worker", "branch", "ticket", "model", "token", "commit", "review", "build", "deploy",
+         "timeout", "refused", "invalid", "missing", "parse", "remote", "local", "cache", "queue", "limit")
+
+
+def templates(count: int, rng: random.Random) -> list:
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) + " {id} after {n} attempts"
+            for _ in range(count)]
+
+
+def failure(i: int, template: str, rng: random.Random) -> dict:
+    return {
+        "execution_id": f"e{i}",
+        "task_id": f"t{i % 500}",
+        "status": "failed",
+        "error_message": template.format(id=f"{rng.choice(WORDS)}_{rng.choice(WORDS)}", n=rng.randrange(10)),
+        "started_at": f"2026-10-01T00:00:00.{i:06d}Z",
+    }
+
+
+def timed(label: str, action):
+    start = time.perf_counter()
+    result = action()
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--failures", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    shapes = templates(200, rng)
+    failures = [failure(i, rng.choice(shapes), rng) for i in range(args.failures)]
+    print(f"{args.failures} failures")
+
+    def assign_all():
+        for execution in failures:
+            index.add(execution)
+
+    index = FailureIndex(MockTaskManagerClient())
+    timed("assign all, no paging", assign_all)
+
+    backend = MockTaskManagerClient(max_executions=args.failures + 1000)
+    for execution in failures:
+        backend.put_execution(execution)
+    index = FailureIndex(backend)
+    timed("page and cluster all", index.refresh)
+    summary = index.summary()
+    print(f"{summary['cluster_count']} clusters, {len(index._assigned)} distinct normalized messages")
+    for i in range(args.failures, args.failures + 1000):
+        backend.put_execution(failure(i, rng.choice(shapes), rng))
+    timed("assign 1,000 new failures", index.refresh)
+    timed("summary", index.summary)
+
+
+if __name__ == "__main__":
+    main()
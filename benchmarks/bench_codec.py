@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON codecs over realistic Task Manager payloads
+
+Compares the stdlib and orjson codecs for request encoding, response decoding
+and decode + generated model parsing (``from_dict``), then eager decoding
+against lazy decoding of heavy fields for a status-only listing.
+
+Usage:
+    python benchmarks/bench_codec.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.payloads import executions_response, logs_response, step_create_body
+from src.clients.codec import available_codecs, get_codec
+from src.clients.lazy_json import loads_lazy, project
+from src.clients.generated._client.models import HttpExecutionsResponse, HttpLogsResponse
+
+
+def bench(fn, min_time: float = 0.3) -> float:
+    """Return the best per-call time in milliseconds"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=5, number=number)) / number * 1000
+
+
+def main():
+    payloads = {
+        "executions x100 (20KB raw_output)": (executions_response(100, 20_000), HttpExecutionsResponse),
+        "executions x20 (1MB raw_output)": (executions_response(20, 1_000_000), HttpExecutionsResponse),
+        "logs x1000 lines": (logs_response(1000), HttpLogsResponse),
+        "create step body": (step_create_body(), None),
+    }
+    
+    print(f"{'payload':<36} {'codec':<8} {'size':>10} {'encode ms':>10} {'decode ms':>10} {'decode+model ms':>16}")
+    for label, (payload, model) in payloads.items():
+        for name in available_codecs():
+            codec = get_codec(name)
+            body = codec.dumps(payload)
+            encode_ms = bench(lambda: codec.dumps(payload))
+            decode_ms = bench(lambda: codec.loads(body))
+            model_ms = bench(lambda: model.from_dict(codec.loads(body))) if model else float("nan")
+            print(f"{label:<36} {name:<8} {len(body):>10} {encode_ms:>10.4f} {decode_ms:>10.4f} {model_ms:>16.4f}")
+    
+    print(f"\n{'status-only listing':<36} {'codec':<8} {'eager ms':>10} {'lazy ms':>10}")
+    fields = ["execution_id", "status"]
+    listings = {
+        "x100, 20KB text transcript": executions_response(100, 20_000),
+        "x100, 20KB stream-json transcript": executions_response(100, 20_000, style="stream-json"),
+        "x20, 1MB text transcript": executions_response(20, 1_000_000),
+        "x20, 1MB stream-json transcript": executions_response(20, 1_000_000, style="stream-json"),
+    }
+    for label, payload in listings.items():
+        for name in available_codecs():
+            codec = get_codec(name)
+            body = codec.dumps(payload)
+            eager_ms = bench(lambda: [project(e, fields) for e in codec.loads(body)["data"]["executions"]])
+            lazy_ms = bench(lambda: [project(e, fields) for e in loads_lazy(body, codec=codec)["data"]["executions"]])
+            print(f"{label:<36} {name:<8} {eager_ms:>10.4f} {lazy_ms:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark the CPU/bandwidth tradeoff of body compression
+
+For each representative payload and each available encoding and level, shows
+the compression ratio, compress and decompress time, and the break-even
+bandwidth: on links slower than it, compressing saves more transfer time than
+it costs in CPU. zstd and brotli rows appear when zstandard / brotli are
+installed.
+
+Usage:
+    python benchmarks/bench_compression.py
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.bench_codec import bench
+from benchmarks.payloads import executions_response, logs_response, step_create_body, transcript
+from src.clients.compression import available_encodings, compress, decompress
+
+
+LEVELS = {"gzip": (1, 6, 9), "zstd": (1, 3, 10), "br": (1, 4, 11)}
+
+
+def main():
+    payloads = {
+        "logs x1000 lines": logs_response(1000),
+        "executions x20 (20KB raw_output)": executions_response(20, 20_000),
+        "executions x100 (20KB raw_output)": executions_response(100, 20_000),
+        "create step, 4KB message": {**step_create_body(), "message": transcript(random.Random(7), 4000)},
+    }
+    print(f"{'payload':<36} {'encoding':<9} {'KB':>8} {'ratio':>6} {'comp ms':>8} {'decomp ms':>9} {'break-even Mbit/s':>18}")
+    for name, payload in payloads.items():
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        print(f"{name:<36} {'identity':<9} {len(data) / 1024:>8.1f}")
+        for encoding in available_encodings():
+            for level in LEVELS[encoding]:
+                encoded = compress(data, encoding, level)
+                comp = bench(lambda: compress(data, encoding, level), min_time=0.1)
+                decomp = bench(lambda: decompress(encoded, encoding), min_time=0.1)
+                saved_bits = (len(data) - len(encoded)) * 8
+                break_even = saved_bits / ((comp + decomp) / 1000) / 1e6
+                print(
+                    f"{'':<36} {f'{encoding}-{level}':<9} {len(encoded) / 1024:>8.1f} {len(data) / len(encoded):>6.1f}"
+                    f" {comp:>8.2f} {decomp:>9.2f} {break_even:>18.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent small-request throughput over HTTP/1.1 and HTTP/2
+
+Many threads share one HttpTaskManagerClient, as tool calls do in a shared MCP
+server, and send create_step/update_step pairs to the local stand-in server
+(served by hypercorn, which speaks both protocols). HTTP/2 needs the optional
+h2 and hypercorn packages; without them only HTTP/1.1 is measured.
+
+Usage:
+    python benchmarks/bench_http2.py
+"""
+
+import importlib.util
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.standin_server import StandinServer
+from src.clients.http_client import HttpTaskManagerClient
+from src.clients.transport import DualTransport, Http2Transport, http2_available
+
+
+REQUESTS = 2000
+BACKEND_LATENCY = 0.002
+
+
+def run(client: HttpTaskManagerClient, workers: int) -> float:
+    """Send REQUESTS requests from workers threads; returns requests per second"""
+    def agent(n: int):
+        step = client.create_step(f"exec-{n % 50}", "bench")
+        assert step.get("success"), step
+        client.patch_step(f"exec-{n % 50}", step["data"]["step_id"], status="completed")
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(agent, range(REQUESTS // 2)))
+    return REQUESTS / (time.monotonic() - start)
+
+
+def connections(transport) -> int:
+    """Connections held by the transport's sync pool"""
+    inner = transport._prior_knowledge if isinstance(transport, Http2Transport) else transport
+    return len(inner._sync._pool.connections) if inner._sync else 0
+
+
+def main():
+    hypercorn = importlib.util.find_spec("hypercorn") is not None
+    modes = ["HTTP/1.1"]
+    if http2_available() and hypercorn:
+        modes.append("HTTP/2")
+    else:
+        print("HTTP/2 skipped: pip install h2 hypercorn\n")
+
+    with StandinServer(http2=hypercorn, latency=BACKEND_LATENCY) as server:
+        print(f"{REQUESTS} requests, {BACKEND_LATENCY * 1000:.0f}ms backend latency\n")
+        print(f"{'workers':>7} {'protocol':<10} {'req/s':>9} {'connections':>12}")
+        for workers in (1, 8, 32, 64):
+            for mode in modes:
+                client = HttpTaskManagerClient()
+                client.base_url = server.base_url
+                client.transport = Http2Transport(shared=True) if mode == "HTTP/2" else DualTransport(shared=True)
+                rate = run(client, workers)
+                print(f"{workers:>7} {mode:<10} {rate:>9.0f} {connections(client.transport):>12}")
+
+
+if __name__ == "__main__":
+    main()
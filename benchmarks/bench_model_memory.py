@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for 100k HttpExecutionInfo objects
+
+Compares the checked-in (compact profile) generated model with an equivalent
+class built the way the default openapi-python-client profile emits it: an
+eager ``additional_properties`` dict per instance and no string interning.
+
+Usage:
+    python benchmarks/bench_model_memory.py [count]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+import attrs
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.payloads import executions_response
+from src.clients.codec import get_codec
+from src.clients.generated._client.models import HttpExecutionInfo
+from src.clients.generated._client.types import UNSET
+
+
+def default_profile_class():
+    """HttpExecutionInfo as emitted by the default generation profile"""
+    fields = {f.alias: attrs.field(default=UNSET) for f in attrs.fields(HttpExecutionInfo) if f.alias != "additional_properties"}
+    fields["additional_properties"] = attrs.field(init=False, factory=dict)
+    cls = attrs.make_class("DefaultHttpExecutionInfo", fields, slots=True)
+
+    def from_dict(src_dict: dict) -> Any:
+        d = dict(src_dict)
+        obj = cls(**{name: d.pop(name, UNSET) for name in fields if name != "additional_properties"})
+        obj.additional_properties = d
+        return obj
+
+    cls.from_dict = staticmethod(from_dict)
+    return cls
+
+
+def measure(label: str, from_dict, body: bytes, codec) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    decoded = codec.loads(body)["data"]["executions"]
+    objects = [from_dict(item) for item in decoded]
+    del decoded
+    gc.collect()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {len(objects):>8} {current / 2**20:>12.1f} {current / len(objects):>10.0f} {peak / 2**20:>10.1f} {elapsed:>8.2f}")
+    del objects
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    codec = get_codec()
+    # Listing payload: raw_output kept small, memory is dominated by the objects themselves
+    body = codec.dumps(executions_response(count, raw_output_bytes=64))
+
+    print(f"{'model':<28} {'objects':>8} {'retained MB':>12} {'B/object':>10} {'peak MB':>10} {'time s':>8}")
+    measure("default profile", default_profile_class().from_dict, body, codec)
+    measure("compact profile", HttpExecutionInfo.from_dict, body, codec)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded Task Manager session and report request latency
+
+Records come from TASK_MANAGER_RECORD. Requests are re-issued with their
+recorded pacing, against a live backend when --base-url is given, otherwise
+against the recording itself (client-side overhead plus recorded latency).
+
+Usage:
+    python benchmarks/bench_replay.py session.jsonl
+    python benchmarks/bench_replay.py session.jsonl --base-url http://localhost:8080 --speed 4
+    python benchmarks/bench_replay.py session.jsonl --speed max
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.clients.recording import ReplayTransport, load_records, replay_session
+from src.clients.transport import parse_speed
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("recording", help="Recording file (JSON Lines)")
+    parser.add_argument("--base-url", help="Backend to replay against (default: serve from the recording)")
+    parser.add_argument("--speed", default="1", help="Pacing: 1 original, N times faster, or max")
+    parser.add_argument("--workers", type=int, default=32, help="Requests in flight at once")
+    args = parser.parse_args()
+
+    records = load_records(args.recording)
+    if not records:
+        print(f"❌ No requests in {args.recording}")
+        return 1
+    speed = parse_speed(args.speed)
+
+    if args.base_url:
+        client = httpx.Client(base_url=args.base_url)
+    else:
+        client = httpx.Client(base_url="http://replay", transport=ReplayTransport(records, speed=speed))
+
+    start = time.monotonic()
+    with client:
+        results = replay_session(records, client, speed=speed, max_workers=args.workers)
+    elapsed = time.monotonic() - start
+
+    mismatches = sum(1 for r in results if r["status"] != r["recorded_status"])
+    print(f"{'endpoint':<40} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    by_endpoint = {}
+    for result in results:
+        path = result["url"].split("?")[0]
+        by_endpoint.setdefault(f"{result['method']} {path}", []).append(result["latency"] * 1000)
+    by_endpoint["all"] = [r["latency"] * 1000 for r in results]
+    for endpoint, latencies in by_endpoint.items():
+        print(
+            f"{endpoint[:40]:<40} {len(latencies):>6} {percentile(latencies, 0.5):>9.2f} "
+            f"{percentile(latencies, 0.95):>9.2f} {percentile(latencies, 0.99):>9.2f}"
+        )
+    print(f"\n{len(results)} requests in {elapsed:.2f}s ({len(results) / elapsed:.0f} req/s), "
+          f"{mismatches} status mismatches")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
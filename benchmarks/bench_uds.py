@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark step-update latency over TCP loopback and a Unix domain socket
+
+One agent sends create_step/update_step pairs back to back through
+HttpTaskManagerClient to the local stand-in server, listening on TCP and on a
+Unix socket. In "TCP, new connection" the transport is not shared, so each
+per-request client closes it and every request connects anew.
+
+Usage:
+    python benchmarks/bench_uds.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.standin_server import StandinServer
+from src.clients.http_client import HttpTaskManagerClient
+from src.clients.transport import DualTransport
+
+
+REQUESTS = 1000
+
+
+def measure(client: HttpTaskManagerClient) -> list:
+    """Per-request latencies in milliseconds"""
+    latencies = []
+    for n in range(REQUESTS // 2):
+        start = time.perf_counter()
+        step = client.create_step("exec-1", "bench")
+        latencies.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        client.patch_step("exec-1", step["data"]["step_id"], status="completed")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "task-manager.sock")
+        with StandinServer() as tcp_server, StandinServer(uds=path) as uds_server:
+            setups = [
+                ("TCP, new connection", tcp_server.base_url, DualTransport()),
+                ("TCP, pooled", tcp_server.base_url, DualTransport(shared=True)),
+                ("Unix socket, pooled", uds_server.base_url, DualTransport(shared=True, uds=path)),
+            ]
+            print(f"{REQUESTS} sequential step requests\n")
+            print(f"{'transport':<22} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+            for name, base_url, transport in setups:
+                client = HttpTaskManagerClient()
+                client.base_url = base_url
+                client.transport = transport
+                measure(client)  # warm up
+                latencies = measure(client)
+                mean = sum(latencies) / len(latencies)
+                print(f"{name:<22} {percentile(latencies, 0.5):>8.3f} {percentile(latencies, 0.99):>8.3f} {mean:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark first-call latency with and without warm-up
+
+Compares the first create_step of a fresh client (cold: DNS lookup and new
+connection), the first call after warm_up(), and the steady-state median,
+against the local stand-in server addressed by host name.
+
+Usage:
+    python benchmarks/bench_warmup.py
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.standin_server import StandinServer
+from src.clients.dns import DnsCache
+from src.clients.http_client import HttpTaskManagerClient
+from src.clients.transport import DualTransport
+
+
+ROUNDS = 20
+
+
+def timed(client: HttpTaskManagerClient) -> float:
+    start = time.perf_counter()
+    assert client.create_step("exec-1", "bench")["success"]
+    return (time.perf_counter() - start) * 1000
+
+
+def fresh_client(base_url: str) -> HttpTaskManagerClient:
+    client = HttpTaskManagerClient(base_url=base_url)
+    client.transport = DualTransport(shared=True, dns_cache=DnsCache(ttl=60))
+    return client
+
+
+def main():
+    with StandinServer() as server:
+        base_url = f"http://localhost:{server.port}"
+        cold, warm, steady = [], [], []
+        for _ in range(ROUNDS):
+            client = fresh_client(base_url)
+            cold.append(timed(client))
+            steady.extend(timed(client) for _ in range(10))
+            client.transport._sync.close()
+
+            client = fresh_client(base_url)
+            client.warm_up(connections=2)
+            warm.append(timed(client))
+            client.transport._sync.close()
+
+        print(f"{'first call':<22} {'median ms':>10}")
+        print(f"{'cold':<22} {statistics.median(cold):>10.2f}")
+        print(f"{'after warm-up':<22} {statistics.median(warm):>10.2f}")
+        print(f"{'steady state':<22} {statistics.median(steady):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
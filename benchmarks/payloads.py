@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Realistic Task Manager payloads shared by the benchmarks
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+
+STATUSES = ["running", "completed", "failed", "rejected"]
+TRIGGER_TYPES = ["comment", "label", "schedule", "manual"]
+STEP_NAMES = ["analyzing", "coding", "testing", "reviewing"]
+
+_TRANSCRIPT_LINES = [
+    "Reading src/clients/http_client.py to understand the request flow",
+    "Running `python -m pytest -q` — 42 passed, 1 failed",
+    "分析失败的测试用例并修复断言",
+    "Traceback (most recent call last):\n  File \"app.py\", line 12, in <module>\n    main()",
+    "Committing changes: fix: handle timeout error in HTTP client",
+]
+
+
+def transcript(rng: random.Random, size_bytes: int, style: str = "text") -> str:
+    """An agent transcript of roughly size_bytes
+
+    style "text" is plain log lines; "stream-json" is one JSON event per line,
+    so the transcript is JSON nested in JSON and full of escaped quotes.
+    """
+    lines = []
+    size = 0
+    while size < size_bytes:
+        line = rng.choice(_TRANSCRIPT_LINES)
+        if style == "stream-json":
+            line = json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": line}]}}, ensure_ascii=False)
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def execution(i: int, rng: random.Random, raw_output_bytes: int = 20_000, style: str = "text") -> dict:
+    """One ExecutionInfo dict with a transcript of roughly raw_output_bytes"""
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i)
+    status = rng.choice(STATUSES)
+    info = {
+        "execution_id": f"exec-{i:08d}",
+        "task_id": f"task-{i % 500:05d}",
+        "status": status,
+        "trigger_type": rng.choice(TRIGGER_TYPES),
+        "sandbox_type": "docker",
+        "session_id": f"nova-{i:06d}",
+        "started_at": started.isoformat(),
+        "completed_at": (started + timedelta(seconds=rng.randint(30, 3600))).isoformat(),
+        "comment_id": 100000 + i,
+        "commit_sha": f"{rng.getrandbits(160):040x}",
+        "confidence_level": rng.randint(1, 5),
+        "confidence_reason": "Tests pass and the change is limited to the HTTP client",
+        "cost_usd": round(rng.uniform(0.01, 4.0), 4),
+        "worktree_path": f"/workspace/worktrees/exec-{i:08d}",
+        "raw_output": transcript(rng, raw_output_bytes, style),
+    }
+    if status == "failed":
+        info["error_message"] = f"Command failed with exit code {rng.randint(1, 2)}: pytest tests/test_{i % 17}.py"
+    return info
+
+
+def executions_response(count: int = 100, raw_output_bytes: int = 20_000, seed: int = 7, style: str = "text") -> dict:
+    """An /api/executions response body"""
+    rng = random.Random(seed)
+    return {
+        "success": True,
+        "data": {
+            "executions": [execution(i, rng, raw_output_bytes, style) for i in range(count)],
+            "page": 1,
+            "limit": count,
+            "total_count": count * 10,
+        },
+    }
+
+
+def logs_response(lines: int = 1000, seed: int = 7) -> dict:
+    """An /api/logs response body"""
+    rng = random.Random(seed)
+    logs = [
+        f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z INFO handler=PATCH /api/executions/exec-{rng.randint(0, 99999):08d}/steps latency_ms={rng.randint(1, 40)}"
+        for i in range(lines)
+    ]
+    return {"success": True, "data": {"lines": lines, "total_lines": lines * 5, "logs": logs}}
+
+
+def step_create_body(message_bytes: int = 200) -> dict:
+    """A POST /api/executions/{id}/steps request body"""
+    return {"step_name": "coding", "status": "running", "message": ("Implementing the change. " * 40)[:message_bytes]}
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Task Manager API, for tests and benchmarks
+
+A small ASGI app implementing the swagger endpoints on top of any
+TaskManagerClientBase (an in-memory MockTaskManagerClient by default),
+served from a background thread by uvicorn, or by hypercorn when HTTP/2 is
+requested. It also listens on a Unix socket when asked to.
+
+Usage:
+    with StandinServer() as server:
+        os.environ["TASK_MANAGER_PORT"] = str(server.port)
+        ...
+
+    python benchmarks/standin_server.py --port 8080    # run in the foreground
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.clients.base_client import TaskManagerClientBase
+from src.clients.compression import available_encodings, compress, decompress
+from src.clients.mock_client import MockTaskManagerClient
+
+
+# Responses at least this large are compressed when the client accepts it
+COMPRESS_MIN_BYTES = 1024
+
+ROUTES = [
+    ("GET", re.compile(r"^/api/health$"), "health"),
+    ("GET", re.compile(r"^/api/tasks$"), "list_tasks"),
+    ("GET", re.compile(r"^/api/tasks/(?P<task_id>[^/]+)$"), "get_task"),
+    ("GET", re.compile(r"^/api/tasks/(?P<task_id>[^/]+)/active-execution$"), "get_active_execution"),
+    ("GET", re.compile(r"^/api/executions$"), "list_executions"),
+    ("PATCH", re.compile(r"^/api/executions/(?P<execution_id>[^/]+)$"), "patch_execution"),
+    ("POST", re.compile(r"^/api/executions/(?P<execution_id>[^/]+)/steps$"), "create_step"),
+    ("PATCH", re.compile(r"^/api/executions/(?P<execution_id>[^/]+)/steps/(?P<step_id>[^/]+)$"), "patch_step"),
+]
+
+
+class StandinApp:
+    """ASGI app serving the Task Manager API from a TaskManagerClientBase"""
+
+    def __init__(self, backend: Optional[TaskManagerClientBase] = None, latency: float = 0.0):
+        """
+        Args:
+            backend: Store behind the API (default: a new MockTaskManagerClient)
+            latency: Extra seconds added to every response, to model backend work
+        """
+        self.backend = backend or MockTaskManagerClient()
+        self.latency = latency
+        self.requests = 0
+        # Set to False to answer compressed request bodies with 415
+        self.compressed_requests = True
+
+    async def __call__(self, scope: Dict[str, Any], receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        request_headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        encoding = request_headers.get("content-encoding")
+        if encoding and not self.compressed_requests:
+            status, payload = 415, {"success": False, "error": f"Unsupported Content-Encoding: {encoding}"}
+        else:
+            if encoding:
+                body = decompress(body, encoding)
+            status, payload = self.dispatch(scope["method"], scope["path"], scope["query_string"], body)
+        content = json.dumps(payload).encode("utf-8")
+        headers = [(b"content-type", b"application/json")]
+        accepted = [e.strip() for e in request_headers.get("accept-encoding", "").split(",")]
+        encoding = next((e for e in available_encodings() if e in accepted), None)
+        if encoding and len(content) >= COMPRESS_MIN_BYTES:
+            content = compress(content, encoding)
+            headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"content-length", str(len(content)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": content})
+
+    def dispatch(self, method: str, path: str, query_string: bytes, body: bytes):
+        """Route one request; returns (status, JSON payload)"""
+        query = {key: values[-1] for key, values in parse_qs(query_string.decode("latin-1")).items()}
+        fields: Optional[List[str]] = query["fields"].split(",") if query.get("fields") else None
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            return 400, {"success": False, "error": "Invalid JSON body"}
+
+        for route_method, pattern, name in ROUTES:
+            match = pattern.match(path)
+            if match is None or route_method != method:
+                continue
+            args = match.groupdict()
+            backend = self.backend
+            if name == "health":
+                result = backend.health_check()
+                result.pop("success", None)
+                return 200, result
+            if name == "list_tasks":
+                result = backend.list_tasks(status=query.get("status"), fields=fields)
+            elif name == "get_task":
+                result = backend.get_task(args["task_id"], fields=fields)
+            elif name == "get_active_execution":
+                result = backend.get_active_execution(args["task_id"], fields=fields)
+            elif name == "list_executions":
+                result = backend.list_executions(
+                    task_id=query.get("task-id"),
+                    status=query.get("status"),
+                    page=int(query.get("page", 1)),
+                    limit=int(query.get("limit", 20)),
+                    fields=fields
+                )
+            elif name == "patch_execution":
+                result = backend.patch_execution(args["execution_id"], data.get("session_id"))
+            elif name == "create_step":
+                if not data.get("step_name"):
+                    return 400, {"success": False, "error": "step_name is required"}
+                result = backend.create_step(
+                    args["execution_id"], data["step_name"], message=data.get("message"), status=data.get("status")
+                )
+            else:
+                result = backend.patch_step(
+                    args["execution_id"], args["step_id"], status=data.get("status"), message=data.get("message")
+                )
+            return self._status(name, result), result
+
+        return 404, {"success": False, "error": f"Not found: {method} {path}"}
+
+    @staticmethod
+    def _status(name: str, result: Dict[str, Any]) -> int:
+        if result.get("success"):
+            return 201 if name == "create_step" else 200
+        return result.pop("status_code", 400)
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class StandinServer:
+    """Run a StandinApp in a background thread"""
+
+    def __init__(
+        self,
+        backend: Optional[TaskManagerClientBase] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        uds: Optional[str] = None,
+        http2: bool = False,
+        latency: float = 0.0
+    ):
+        """
+        Args:
+            backend: Store behind the API (default: a new MockTaskManagerClient)
+            host, port: TCP address; port 0 picks a free port
+            uds: Listen on this Unix socket path instead of TCP
+            http2: Serve with hypercorn, which speaks HTTP/2 (h2c prior knowledge) and HTTP/1.1
+            latency: Extra seconds added to every response
+        """
+        self.app = StandinApp(backend, latency=latency)
+        self.host = host
+        self.port = port or _free_port(host)
+        self.uds = uds
+        self.http2 = http2
+        self._thread: Optional[threading.Thread] = None
+        self._stop: Optional[Any] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "StandinServer":
+        if self.http2:
+            self._thread = threading.Thread(target=self._run_hypercorn, daemon=True)
+        else:
+            import uvicorn
+            config = uvicorn.Config(
+                self.app, host=self.host, port=self.port, uds=self.uds,
+                log_level="warning", lifespan="off", access_log=False
+            )
+            self._stop = uvicorn.Server(config)
+            self._thread = threading.Thread(target=self._stop.run, daemon=True)
+        self._thread.start()
+        self._wait_ready()
+        return self
+
+    def _run_hypercorn(self) -> None:
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config
+
+        config = Config()
+        config.bind = [f"unix:{self.uds}"] if self.uds else [f"{self.host}:{self.port}"]
+        config.loglevel = "WARNING"
+        # hypercorn closes a connection after 1000 requests by default, which
+        # would make long benchmarks measure reconnects
+        config.keep_alive_max_requests = 10_000_000
+
+        async def main():
+            self._stop = asyncio.Event()
+            self._loop = asyncio.get_running_loop()
+            await serve(self.app, config, shutdown_trigger=self._stop.wait)
+
+        asyncio.run(main())
+
+    def _wait_ready(self, timeout: float = 10.0) -> None:
+        family = socket.AF_UNIX if self.uds else socket.AF_INET
+        address = self.uds if self.uds else (self.host, self.port)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                with socket.socket(family, socket.SOCK_STREAM) as sock:
+                    sock.connect(address)
+                    return
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError(f"Stand-in server did not start on {address}")
+
+    def stop(self) -> None:
+        if self.http2:
+            if self._stop is not None:
+                self._loop.call_soon_threadsafe(self._stop.set)
+        else:
+            self._stop.should_exit = True
+        self._thread.join(timeout=10)
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--uds", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--http2", action="store_true", help="Serve with hypercorn (HTTP/2 + HTTP/1.1)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    args = parser.parse_args()
+
+    server = StandinServer(host=args.host, port=args.port, uds=args.uds, http2=args.http2, latency=args.latency)
+    server.start()
+    print(f"✅ Stand-in Task Manager on {args.uds or server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Post-process the openapi-python-client output for a generation profile
+
+Run by ``make generate`` right after the generator, so the checked-in client
+is always "generator output + profile". Re-running on processed files is a no-op.
+
+Profiles:
+    default - leave the generated code untouched
+    compact - slotted, frozen models; ``additional_properties`` is only
+              allocated when the payload has unknown keys; models compare by
+              value but are unhashable, since the extra keys are a mutable
+              dict (key them by id, e.g. execution_id, instead); enum-like string
+              fields (status, trigger_type, ...) are interned in ``from_dict``;
+              heavy text fields (raw_output, ...) accept lazy values that are
+              decoded on first attribute access
+
+Usage:
+    python scripts/postprocess_generated.py --profile compact src/clients/generated/_client
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+
+PROFILES = ("default", "compact")
+
+# Fields whose values repeat across thousands of objects
+INTERN_FIELDS = ("status", "trigger_type", "sandbox_type", "step_name")
+
+# Fields that may hold megabytes of text; stored as given and resolved on access
+LAZY_FIELDS = ("raw_output", "error_message", "confidence_reason")
+
+MARKER = "# generation-profile: compact\n"
+
+COMPACT_DECORATOR = "@_attrs_define(slots=True, frozen=True, eq=True, hash=False)\n"
+
+INTERN_HELPER = '''
+
+def intern_str(value: T) -> T:
+    """Intern str values so repeated enum-like strings share one object"""
+    if type(value) is str:
+        return sys.intern(value)  # type: ignore[return-value]
+    return value
+
+
+class Lazy:
+    """Base class for field values that are decoded on first access"""
+
+    __slots__ = ()
+
+    def resolve(self) -> Any:
+        raise NotImplementedError
+
+
+def resolve_lazy(value: Any) -> Any:
+    """Return the decoded value of a Lazy, or value unchanged"""
+    if isinstance(value, Lazy):
+        return value.resolve()
+    return value
+'''
+
+LAZY_FIELD_PROPERTY = '''    @property
+    def {name}(self) -> {annotation}:
+        return resolve_lazy(self._{name})
+
+'''
+
+LAZY_PROPERTY = '''    @property
+    def additional_properties(self) -> dict[str, Any]:
+        if self._additional_properties is None:
+            object.__setattr__(self, "_additional_properties", {})
+        return self._additional_properties
+
+    @property
+    def additional_keys(self) -> list[str]:'''
+
+
+def compact_model(source: str) -> str:
+    """Apply the compact profile to one generated model module
+
+    Every step is idempotent, so the profile can be re-applied after it grows.
+    """
+    if "@_attrs_define" not in source:
+        return source
+
+    # eq without hash: a hash would cover additional_properties, so only models
+    # without extra keys could be hashed
+    for decorator in ("@_attrs_define\n", "@_attrs_define(slots=True, frozen=True)\n"):
+        source = source.replace(decorator + "class", COMPACT_DECORATOR + "class")
+
+    # additional_properties: stored as None until a payload actually has extra keys
+    source = source.replace(
+        "    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)\n",
+        "    _additional_properties: dict[str, Any] | None = _attrs_field(default=None, kw_only=True)\n",
+    )
+    source = source.replace(
+        "        field_dict.update(self.additional_properties)\n",
+        "        if self._additional_properties:\n"
+        "            field_dict.update(self._additional_properties)\n",
+    )
+    source = re.sub(
+        r"(        (\w+) = cls\(\n)((?:            .*\n)*)(        \)\n)\n        \2\.additional_properties = d\n",
+        r"\1\3            additional_properties=d or None,\n\4",
+        source,
+    )
+    if "def additional_properties(self)" not in source:
+        source = source.replace(
+            "    @property\n    def additional_keys(self) -> list[str]:",
+            LAZY_PROPERTY,
+        )
+    source = source.replace(
+        "return list(self.additional_properties.keys())",
+        "return list(self._additional_properties or ())",
+    )
+    source = source.replace(
+        "return self.additional_properties[key]",
+        "return (self._additional_properties or {})[key]",
+    )
+    source = source.replace(
+        "del self.additional_properties[key]",
+        "del (self._additional_properties or {})[key]",
+    )
+    source = source.replace(
+        "return key in self.additional_properties",
+        "return key in (self._additional_properties or ())",
+    )
+
+    # Intern enum-like strings
+    intern_pattern = r'^(        \w+ = )(d\.pop\("(?:' + "|".join(INTERN_FIELDS) + r')"(?:, UNSET)?\))$'
+    source, interned = re.subn(intern_pattern, r"\1intern_str(\2)", source, flags=re.MULTILINE)
+    if interned:
+        source = _add_types_import(source, "intern_str")
+
+    # Lazy heavy fields: private slot plus a resolving property
+    lazy_pattern = r"^    (" + "|".join(LAZY_FIELDS) + r"): (.+) = UNSET$"
+    lazy_fields = re.findall(lazy_pattern, source, flags=re.MULTILINE)
+    if lazy_fields:
+        source = re.sub(lazy_pattern, r"    _\1: \2 | Lazy = UNSET", source, flags=re.MULTILINE)
+        properties = "".join(
+            LAZY_FIELD_PROPERTY.format(name=name, annotation=annotation) for name, annotation in lazy_fields
+        )
+        source = source.replace("    def to_dict(self)", properties + "    def to_dict(self)", 1)
+        source = _add_types_import(source, "Lazy", "resolve_lazy")
+
+    if not source.startswith(MARKER):
+        source = MARKER + source
+    return source
+
+
+def _add_types_import(source: str, *names: str) -> str:
+    """Add names to the ``from ..types import ...`` line"""
+    match = re.search(r"^from \.\.types import (.+)$", source, flags=re.MULTILINE)
+    imported = [name.strip() for name in match.group(1).split(",")]
+    missing = [name for name in names if name not in imported]
+    if not missing:
+        return source
+    # Same order as ruff's isort: constants, classes, then functions
+    ordered = sorted(imported + missing, key=lambda name: (not name.isupper(), not name[0].isupper(), name))
+    line = "from ..types import " + ", ".join(ordered)
+    return source[:match.start()] + line + source[match.end():]
+
+
+def compact_types(source: str) -> str:
+    """Add the intern_str and lazy value helpers to types.py"""
+    if "def resolve_lazy" in source:
+        return source
+    source = source.replace(
+        "from collections.abc import Mapping, MutableMapping\n",
+        "import sys\nfrom collections.abc import Mapping, MutableMapping\n",
+    )
+    source = source.replace(
+        "from typing import IO, BinaryIO, Generic, Literal, TypeVar\n",
+        "from typing import IO, Any, BinaryIO, Generic, Literal, TypeVar\n",
+    )
+    source = source.replace(
+        '\n\n__all__ = ["UNSET", "File", "FileTypes", "RequestFiles", "Response", "Unset"]',
+        INTERN_HELPER + '\n\n__all__ = ["UNSET", "File", "FileTypes", "Lazy", "RequestFiles", "Response", "Unset", '
+        '"intern_str", "resolve_lazy"]',
+    )
+    return source
+
+
+def postprocess(package_dir: Path, profile: str) -> int:
+    """Apply profile to a generated package, returning the number of files changed"""
+    if profile == "default":
+        return 0
+
+    changed = 0
+    targets = [(package_dir / "types.py", compact_types)]
+    targets += [(path, compact_model) for path in sorted((package_dir / "models").glob("*.py"))]
+    for path, transform in targets:
+        source = path.read_text(encoding="utf-8")
+        processed = transform(source)
+        if processed != source:
+            path.write_text(processed, encoding="utf-8")
+            changed += 1
+    return changed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("package_dir", type=Path, help="Generated package directory (e.g. src/clients/generated/_client)")
+    parser.add_argument("--profile", choices=PROFILES, default="compact")
+    args = parser.parse_args()
+
+    if not (args.package_dir / "models").is_dir():
+        print(f"❌ {args.package_dir} does not look like a generated client package")
+        return 1
+
+    changed = postprocess(args.package_dir, args.profile)
+    print(f"✅ Profile '{args.profile}' applied to {changed} file(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Analytics over Task Manager data
+"""
+
+from src.analytics.clustering import FailureClusters
+from src.analytics.columns import ExecutionColumns
+from src.analytics.export import export_executions, export_steps
+from src.analytics.mirror import ExecutionMirror
+from src.analytics.steps import StepProfiler, TDigest
+
+__all__ = ['ExecutionColumns', 'ExecutionMirror', 'FailureClusters', 'StepProfiler', 'TDigest',
+           'export_executions', 'export_steps']
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Failure clustering over execution error messages with MinHash and LSH
+
+Error messages are normalized (numbers, ids, hex and quoted values become
+placeholders), split into word 3-gram shingles and summarized by a MinHash
+signature: the minimum of each of 64 independent 32-bit hashes (SHAKE-128
+output) over the shingles. Signatures are split into bands; messages sharing
+a band bucket are candidates, and a candidate cluster is joined when its
+representative's estimated Jaccard similarity reaches the threshold.
+Otherwise the message starts a new cluster.
+
+The index is incremental: each refresh pages failed executions newest first
+only until it reaches ones already clustered, or ones started before the
+oldest execution that was still running at the last refresh (it may have
+failed since), and assigns the new failures to existing clusters without
+recomputing them. Identical normalized messages
+share one signature, so repeated failures cost a dictionary lookup, and the
+hashes of recurring shingles are cached.
+
+Configuration:
+    TASK_MANAGER_CLUSTER_THRESHOLD: Estimated Jaccard similarity to join a cluster (default: 0.5)
+"""
+
+import hashlib
+import operator
+import os
+import re
+import struct
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.analytics.mirror import OPEN_STATUSES
+from src.clients.base_client import TaskManagerClientBase
+
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+# About 300 bytes each
+MAX_CACHED_SHINGLES = 100_000
+FAILURE_FIELDS = ["execution_id", "task_id", "started_at", "error_message"]
+OPEN_FIELDS = ["execution_id", "started_at"]
+PAGE_SIZE = 100
+# Indexes kept, one per task_id plus one across all tasks
+MAX_SCOPES = 64
+SAMPLE_EXECUTIONS = 5
+MAX_REPRESENTATIVE = 500
+
+_ROW = struct.Struct(f"<{NUM_PERM}I")
+_HASHES: Dict[bytes, bytes] = {}
+
+_NORMALIZERS = [
+    (re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"), " <uuid> "),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{12,}\b"), " <hex> "),
+    (re.compile(r"(['\"`]).*?\1"), " <str> "),
+    (re.compile(r"\d+(\.\d+)?"), " <num> "),
+    (re.compile(r"[^\w<>]+"), " "),
+]
+
+
+def normalize(message: Optional[str]) -> str:
+    """Error message with volatile values replaced by placeholders"""
+    text = (message or "").lower()
+    for pattern, replacement in _NORMALIZERS:
+        text = pattern.sub(replacement, text)
+    return " ".join(text.split())
+
+
+def shingles(text: str) -> Set[bytes]:
+    """Word SHINGLE_SIZE-grams of normalized text (the whole text when shorter)"""
+    words = text.split()
+    if len(words) <= SHINGLE_SIZE:
+        return {text.encode("utf-8")}
+    return {" ".join(words[i:i + SHINGLE_SIZE]).encode("utf-8") for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def signature(shingles: Iterable[bytes]) -> Tuple[int, ...]:
+    """MinHash signature of a set of shingles"""
+    return tuple(map(min, zip(*[_ROW.unpack(_hashes(shingle)) for shingle in shingles])))
+
+
+def _hashes(shingle: bytes) -> bytes:
+    """NUM_PERM independent 32-bit hashes of a shingle, cached: shingles recur across similar messages"""
+    hashes = _HASHES.get(shingle)
+    if hashes is None:
+        if len(_HASHES) >= MAX_CACHED_SHINGLES:
+            _HASHES.clear()
+        hashes = _HASHES[shingle] = hashlib.shake_128(shingle).digest(4 * NUM_PERM)
+    return hashes
+
+
+def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(map(operator.eq, first, second)) / NUM_PERM
+
+
+class _Cluster:
+    __slots__ = ("cluster_id", "signature", "representative", "members", "task_ids")
+
+    def __init__(self, cluster_id: int, signature: Tuple[int, ...], representative: str):
+        self.cluster_id = cluster_id
+        self.signature = signature
+        self.representative = representative
+        # (started_at, execution_id)
+        self.members: List[Tuple[str, str]] = []
+        self.task_ids: Counter = Counter()
+
+
+class FailureIndex:
+    """Incremental MinHash/LSH clusters of the failed executions of one scope"""
+
+    def __init__(self, client: TaskManagerClientBase, task_id: Optional[str] = None, threshold: float = 0.5):
+        """
+        Args:
+            client: Client failed executions are paged from
+            task_id: Only failures of this task (default: all tasks)
+            threshold: Estimated Jaccard similarity to join a cluster
+        """
+        self.client = client
+        self.task_id = task_id
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.clusters: List[_Cluster] = []
+        # Band bucket -> ids of every cluster with a member in it
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[int]] = {}
+        # Normalized message -> cluster id, so repeats skip MinHash and LSH entirely
+        self._assigned: Dict[str, int] = {}
+        self._seen: set = set()
+        # started_at range of the clustered failures; every failure in it is clustered
+        self.newest: Optional[str] = None
+        self.oldest: Optional[str] = None
+        # The range reaches back to the oldest failure
+        self.exhausted = False
+        # Oldest started_at of the executions still open at the last refresh:
+        # they may fail later, below newest
+        self.open_since: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, execution: Dict[str, Any]) -> int:
+        """Assign one failed execution to a cluster; returns the cluster id"""
+        message = execution.get("error_message") or ""
+        text = normalize(message)
+        cluster_id = self._assigned.get(text)
+        if cluster_id is None:
+            cluster_id = self._assign(text, message)
+            self._assigned[text] = cluster_id
+        cluster = self.clusters[cluster_id]
+        cluster.members.append((execution.get("started_at") or "", execution.get("execution_id")))
+        cluster.task_ids[execution.get("task_id")] += 1
+        self._seen.add(execution.get("execution_id"))
+        return cluster_id
+
+    def _assign(self, text: str, message: str) -> int:
+        sig = signature(shingles(text))
+        keys = [(band, sig[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+        best, best_similarity = None, 0.0
+        candidates = set()
+        for key in keys:
+            candidates.update(self._buckets.get(key, ()))
+        for candidate in sorted(candidates):
+            score = similarity(sig, self.clusters[candidate].signature)
+            if score >= self.threshold and (best is None or score > best_similarity):
+                best, best_similarity = candidate, score
+        if best is None:
+            best = len(self.clusters)
+            representative = message if len(message) <= MAX_REPRESENTATIVE else message[:MAX_REPRESENTATIVE] + "…"
+            self.clusters.append(_Cluster(best, sig, representative or "(no error message)"))
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(best)
+        return best
+
+    def refresh(self, since: Optional[str] = None) -> Dict[str, Any]:
+        """Cluster the failures not yet clustered, back to since (default: all)
+
+        The clustered failures cover one range of started_at, newest to oldest.
+        Pages are read newest first and in order, never skipped: through the
+        failures newer than the range or than open_since, then, only while the
+        range does not yet reach back to since, on through it to the older ones.
+        Open executions are listed first, so one failing while pages are read
+        is still open_since for the next refresh.
+
+        Returns:
+            Dict with 'success' bool and 'data' (new failures clustered) or 'error'
+        """
+        added = 0
+        open_since = None
+        for status in OPEN_STATUSES:
+            for result in self.client.iter_executions(
+                task_id=self.task_id, status=status, fields=OPEN_FIELDS, page_size=PAGE_SIZE
+            ):
+                if not result.get("success"):
+                    return {**result, "data": {"new_failures": added}}
+                for execution in result["data"]["executions"]:
+                    started_at = execution.get("started_at") or ""
+                    open_since = started_at if open_since is None else min(open_since, started_at)
+        floor = self.newest
+        if floor is not None and self.open_since is not None:
+            floor = min(floor, self.open_since)
+        page = 1
+        # Nothing clustered yet: there is no range to reach
+        reached = floor is None
+        top: Optional[str] = None
+        low: Optional[str] = None
+        result: Dict[str, Any] = {"success": True}
+        while True:
+            result = self.client.list_executions(
+                task_id=self.task_id, status="failed", page=page, limit=PAGE_SIZE, fields=FAILURE_FIELDS
+            )
+            if not result.get("success"):
+                break
+            executions = (result.get("data") or {}).get("executions") or []
+            started = [e.get("started_at") or "" for e in executions]
+            if started:
+                top = max(top or "", max(started))
+                low = min(low, min(started)) if low is not None else min(started)
+            if not reached and any(value < floor for value in started):
+                reached = True
+            for execution in executions:
+                if execution.get("execution_id") not in self._seen:
+                    self.add(execution)
+                    added += 1
+            if len(executions) < PAGE_SIZE:
+                # Read from the first page to the last: everything is clustered
+                reached = self.exhausted = True
+                break
+            if reached:
+                oldest = low if self.oldest is None else min(self.oldest, low or "")
+                if self.exhausted or (since is not None and oldest < since):
+                    break
+            page += 1
+        if reached and top is not None:
+            # Every page from the first down to low was read, and they joined the range
+            self.newest = max(self.newest or "", top)
+            self.oldest = min(self.oldest, low) if self.oldest is not None else low
+        if reached:
+            self.open_since = open_since
+        data = {"new_failures": added}
+        if not result.get("success"):
+            return {**result, "data": data}
+        return {"success": True, "data": data}
+
+    def summary(self, since: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        """Clusters by size, largest first, counting only failures started at or after since"""
+        clusters = []
+        for cluster in self.clusters:
+            members = [m for m in cluster.members if since is None or m[0] >= since]
+            if not members:
+                continue
+            members.sort(reverse=True)
+            clusters.append({
+                "cluster_id": cluster.cluster_id,
+                "count": len(members),
+                "representative": cluster.representative,
+                "first_seen": members[-1][0] or None,
+                "last_seen": members[0][0] or None,
+                "execution_ids": [execution_id for _, execution_id in members[:SAMPLE_EXECUTIONS]],
+                "task_ids": dict(cluster.task_ids.most_common(SAMPLE_EXECUTIONS)),
+            })
+        clusters.sort(key=lambda cluster: -cluster["count"])
+        return {
+            "failures": sum(cluster["count"] for cluster in clusters),
+            "cluster_count": len(clusters),
+            "clusters": clusters[:limit],
+        }
+
+
+class FailureClusters:
+    """One FailureIndex per scope (a task, or all tasks), refreshed on demand"""
+
+    def __init__(self, client: TaskManagerClientBase, threshold: Optional[float] = None):
+        """
+        Args:
+            client: Client failed executions are paged from
+            threshold: Estimated Jaccard similarity to join a cluster (default: TASK_MANAGER_CLUSTER_THRESHOLD or 0.5)
+        """
+        self.client = client
+        self.threshold = threshold if threshold is not None else float(os.getenv('TASK_MANAGER_CLUSTER_THRESHOLD', '0.5'))
+        self._lock = threading.Lock()
+        self._indexes: "OrderedDict[Optional[str], FailureIndex]" = OrderedDict()
+
+    def _index(self, task_id: Optional[str]) -> FailureIndex:
+        with self._lock:
+            index = self._indexes.pop(task_id, None) or FailureIndex(self.client, task_id, self.threshold)
+            self._indexes[task_id] = index
+            while len(self._indexes) > MAX_SCOPES:
+                self._indexes.popitem(last=False)
+            return index
+
+    def cluster(self, task_id: Optional[str] = None, since: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        """Clusters of the failed executions of a task, or of all tasks
+
+        Args:
+            task_id: Only failures of this task (optional)
+            since: Only failures started at or after this ISO time (optional)
+            limit: Clusters returned at most, largest first
+
+        Returns:
+            Dict with 'success' bool and 'data' (failures, cluster_count,
+            clusters, new_failures) or 'error'; partial: true with the error when
+            paging failed part way
+        """
+        index = self._index(task_id)
+        with index.lock:
+            refreshed = index.refresh(since)
+            data = {**index.summary(since, limit), "new_failures": refreshed["data"]["new_failures"]}
+        if not refreshed.get("success"):
+            if not len(index):
+                return {key: value for key, value in refreshed.items() if key != "data"}
+            return {"success": True, "data": data, "partial": True, "error": refreshed.get("error")}
+        return {"success": True, "data": data}
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Columnar execution analytics: cost, confidence and duration aggregates
+
+Executions are loaded once into typed columns: task_id, status and
+trigger_type dictionary-encoded as integer codes, cost_usd and
+confidence_level as float64 (NaN when unset), started_at and completed_at
+parsed once into epoch milliseconds. Columns are stdlib ``array`` buffers;
+with NumPy installed, aggregation runs on zero-copy views of them
+(bincount, lexsort, vectorized percentile interpolation). Without it the
+same aggregates are computed in plain passes over the arrays.
+
+Per group the aggregates are count, sum, mean and percentiles of each
+metric (cost_usd, confidence_level, duration_seconds), and optionally a
+histogram of one metric over bins shared by all groups.
+"""
+
+import math
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depends on environment
+    numpy = None
+
+from src.clients.base_client import MAX_PAGE_SIZE, TaskManagerClientBase
+
+
+ANALYTICS_FIELDS = [
+    "execution_id", "task_id", "status", "trigger_type", "cost_usd", "confidence_level", "started_at", "completed_at"
+]
+GROUP_KEYS = ("task_id", "status", "trigger_type")
+METRICS = ("cost_usd", "confidence_level", "duration_seconds")
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+# Epoch milliseconds of an unset timestamp
+MISSING = -(1 << 63)
+NAN = float("nan")
+
+# Mirror columns, with timestamps converted to epoch milliseconds by SQLite
+_MIRROR_COLUMNS = [
+    "task_id", "status", "trigger_type", "cost_usd", "confidence_level",
+    "CAST(ROUND((julianday(started_at) - 2440587.5) * 86400000) AS INTEGER)",
+    "CAST(ROUND((julianday(completed_at) - 2440587.5) * 86400000) AS INTEGER)",
+]
+
+
+def available_backends() -> List[str]:
+    """Names of the aggregation backends usable in this environment"""
+    return ["numpy", "stdlib"] if numpy is not None else ["stdlib"]
+
+
+def parse_timestamp(value: Optional[str]) -> int:
+    """ISO 8601 time as epoch milliseconds; MISSING when unset or unparseable"""
+    if not value:
+        return MISSING
+    try:
+        return int(datetime.fromisoformat(value).timestamp() * 1000)
+    except ValueError:
+        return MISSING
+
+
+class ExecutionColumns:
+    """Executions as typed columns, aggregated in vectorized passes"""
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Args:
+            backend: "numpy" or "stdlib" (default: numpy when installed)
+        """
+        if backend is not None and backend not in available_backends():
+            raise ValueError(f"Analytics backend '{backend}' is not available, expected one of {available_backends()}")
+        self.backend = backend or available_backends()[0]
+        self.labels: Dict[str, List[Optional[str]]] = {key: [] for key in GROUP_KEYS}
+        self._index: Dict[str, Dict[Optional[str], int]] = {key: {} for key in GROUP_KEYS}
+        self.codes = {key: array("q") for key in GROUP_KEYS}
+        self.cost_usd = array("d")
+        self.confidence_level = array("d")
+        self.started_at = array("q")
+        self.completed_at = array("q")
+
+    def __len__(self) -> int:
+        return len(self.started_at)
+
+    # Loading
+
+    def _code(self, key: str, label: Optional[str]) -> int:
+        index = self._index[key]
+        code = index.get(label)
+        if code is None:
+            code = index[label] = len(self.labels[key])
+            self.labels[key].append(label)
+        return code
+
+    def append_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        """Append rows of (task_id, status, trigger_type, cost_usd, confidence_level, started_ms, completed_ms)"""
+        task_ids, statuses, triggers = (self.codes[key] for key in GROUP_KEYS)
+        for task_id, status, trigger_type, cost, confidence, started, completed in rows:
+            task_ids.append(self._code("task_id", task_id))
+            statuses.append(self._code("status", status))
+            triggers.append(self._code("trigger_type", trigger_type))
+            self.cost_usd.append(NAN if cost is None else cost)
+            self.confidence_level.append(NAN if confidence is None else confidence)
+            self.started_at.append(MISSING if started is None else started)
+            self.completed_at.append(MISSING if completed is None else completed)
+
+    def append(self, executions: Iterable[Dict[str, Any]]) -> None:
+        """Append executions as returned by list_executions"""
+        self.append_rows(
+            (
+                e.get("task_id"), e.get("status"), e.get("trigger_type"), e.get("cost_usd"),
+                e.get("confidence_level"), parse_timestamp(e.get("started_at")), parse_timestamp(e.get("completed_at"))
+            )
+            for e in executions
+        )
+
+    @classmethod
+    def from_client(
+        cls,
+        client: TaskManagerClientBase,
+        task_id: Optional[str] = None,
+        status: Optional[str] = None,
+        page_size: int = 100,
+        backend: Optional[str] = None
+    ) -> Tuple["ExecutionColumns", Optional[str]]:
+        """Load executions by paging list_executions, projected to the analytics fields
+
+        Returns:
+            The columns and the error of the page that failed, if any
+
+        Raises:
+            ValueError: page_size is beyond what the API accepts
+        """
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+        columns = cls(backend)
+        for result in client.iter_executions(task_id=task_id, status=status, fields=ANALYTICS_FIELDS, page_size=page_size):
+            if not result.get("success"):
+                return columns, result.get("error")
+            columns.append(result["data"]["executions"])
+        return columns, None
+
+    @classmethod
+    def from_mirror(cls, mirror, backend: Optional[str] = None, **filters: Optional[str]) -> "ExecutionColumns":
+        """Load executions from an ExecutionMirror; SQLite parses the timestamps
+
+        Args:
+            mirror: ExecutionMirror to read
+            backend: As for the constructor
+            filters: status, trigger_type, task_id, since, until as for ExecutionMirror.query_stats
+        """
+        columns = cls(backend)
+        for rows in mirror.iter_executions(_MIRROR_COLUMNS, **filters):
+            columns.append_rows(rows)
+        return columns
+
+    # Aggregation
+
+    def aggregate(
+        self,
+        group_by: Optional[str] = None,
+        metrics: Sequence[str] = METRICS,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        histogram: Optional[str] = None,
+        bins: int = 10,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Aggregate metrics per group
+
+        Args:
+            group_by: task_id, status or trigger_type (default: one group of all executions)
+            metrics: Metrics to aggregate, from METRICS
+            percentiles: Percentiles of each metric, 0-100
+            histogram: Metric to bin per group (optional)
+            bins: Histogram bins, equally wide between the metric's minimum and maximum
+            limit: Groups returned at most, largest first
+
+        Returns:
+            Dict with group_by, backend, executions, groups (key, executions and one
+            {count, sum, mean, p<N>...} per metric, plus histogram counts) and the
+            histogram edges
+        """
+        check_options(group_by, metrics, percentiles, histogram, bins)
+        labels = self.labels[group_by] if group_by else ["all"]
+        aggregate = _NumpyAggregate(self, group_by) if self.backend == "numpy" else _StdlibAggregate(self, group_by)
+        counts = aggregate.counts(len(labels))
+        groups = [{"key": label, "executions": count} for label, count in zip(labels, counts)]
+        for metric in metrics:
+            for group, stats in zip(groups, aggregate.metric(metric, len(labels), percentiles)):
+                group[metric] = stats
+        result = {"group_by": group_by, "backend": self.backend, "executions": len(self)}
+        if histogram:
+            edges, histograms = aggregate.histogram(histogram, len(labels), bins)
+            for group, counts in zip(groups, histograms):
+                group["histogram"] = counts
+            result["histogram"] = {"metric": histogram, "edges": [_round(edge) for edge in edges]}
+
+        groups = [group for group in groups if group["executions"]]
+        groups.sort(key=lambda group: -group["executions"])
+        result["groups"] = groups[:limit] if limit else groups
+        return result
+
+
+def check_options(
+    group_by: Optional[str] = None,
+    metrics: Sequence[str] = METRICS,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    histogram: Optional[str] = None,
+    bins: int = 10,
+    limit: Optional[int] = None
+) -> None:
+    """Raise ValueError for aggregate options ExecutionColumns.aggregate does not accept"""
+    if group_by is not None and group_by not in GROUP_KEYS:
+        raise ValueError(f"Invalid group_by '{group_by}', expected one of {', '.join(GROUP_KEYS)}")
+    for metric in list(metrics) + ([histogram] if histogram else []):
+        if metric not in METRICS:
+            raise ValueError(f"Invalid metric '{metric}', expected one of {', '.join(METRICS)}")
+    if any(not 0 <= p <= 100 for p in percentiles):
+        raise ValueError("Percentiles must be between 0 and 100")
+    if not 1 <= bins <= 1000:
+        raise ValueError("bins must be between 1 and 1000")
+
+
+def analyze_mirror(
+    mirror,
+    group_by: Optional[str] = None,
+    filters: Optional[Dict[str, Optional[str]]] = None,
+    refresh: bool = True,
+    **options: Any
+) -> Dict[str, Any]:
+    """Aggregate the executions of an ExecutionMirror, syncing it first when stale
+
+    Args:
+        mirror: ExecutionMirror to read
+        group_by: As for ExecutionColumns.aggregate
+        filters: status, trigger_type, task_id, since, until as for ExecutionMirror.query_stats
+        refresh: Sync first when the last sync is older than the mirror's max_age
+        options: metrics, percentiles, histogram, bins, limit as for ExecutionColumns.aggregate
+
+    Returns:
+        Dict with 'success' bool and the aggregates as 'data', or 'error';
+        stale: true with sync_error when the mirror could not be synced
+    """
+    try:
+        check_options(group_by, **options)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    sync_error = mirror.refresh() if refresh else None
+    columns = ExecutionColumns.from_mirror(mirror, **(filters or {}))
+    data = columns.aggregate(group_by=group_by, **options)
+    result = {"success": True, "data": {**data, **mirror.freshness()}}
+    if sync_error is not None:
+        result["stale"] = True
+        result["sync_error"] = sync_error
+    return result
+
+
+def _round(value: float) -> Optional[float]:
+    return None if value is None or math.isnan(value) else round(value, 6)
+
+
+def _stats(count: int, total: float, quantiles: Dict[str, float]) -> Dict[str, Any]:
+    stats = {"count": count, "sum": _round(total) if count else None, "mean": _round(total / count) if count else None}
+    stats.update((name, _round(value) if count else None) for name, value in quantiles.items())
+    return stats
+
+
+def _percentile_name(p: float) -> str:
+    return f"p{p:g}".replace(".", "_")
+
+
+class _NumpyAggregate:
+    """Aggregates over NumPy views of the columns"""
+
+    def __init__(self, columns: ExecutionColumns, group_by: Optional[str]):
+        self.columns = columns
+        size = len(columns)
+        self.codes = (
+            numpy.frombuffer(columns.codes[group_by], dtype=numpy.int64) if group_by and size
+            else numpy.zeros(size, dtype=numpy.int64)
+        )
+
+    def counts(self, groups: int) -> List[int]:
+        return numpy.bincount(self.codes, minlength=groups).tolist()
+
+    def _values(self, metric: str):
+        if not len(self.columns):
+            return numpy.empty(0)
+        if metric == "duration_seconds":
+            started = numpy.frombuffer(self.columns.started_at, dtype=numpy.int64)
+            completed = numpy.frombuffer(self.columns.completed_at, dtype=numpy.int64)
+            known = (started != MISSING) & (completed != MISSING)
+            return numpy.where(known, (completed - started) / 1000.0, numpy.nan)
+        return numpy.frombuffer(getattr(self.columns, metric), dtype=numpy.float64)
+
+    def _valid(self, metric: str):
+        values = self._values(metric)
+        valid = ~numpy.isnan(values)
+        return self.codes[valid], values[valid]
+
+    def metric(self, metric: str, groups: int, percentiles: Sequence[float]) -> List[Dict[str, Any]]:
+        codes, values = self._valid(metric)
+        counts = numpy.bincount(codes, minlength=groups)
+        sums = numpy.bincount(codes, weights=values, minlength=groups)
+        quantiles = {}
+        if len(values):
+            # Sorted by group, then value: each group is a sorted run starting at its offset
+            ordered = values[numpy.lexsort((values, codes))]
+            starts = numpy.cumsum(counts) - counts
+            last = numpy.maximum(counts - 1, 0)
+            for p in percentiles:
+                position = p / 100.0 * last
+                low = numpy.floor(position).astype(numpy.int64)
+                high = numpy.minimum(low + 1, last)
+                fraction = position - low
+                low_index = numpy.clip(starts + low, 0, len(ordered) - 1)
+                high_index = numpy.clip(starts + high, 0, len(ordered) - 1)
+                quantiles[_percentile_name(p)] = (
+                    ordered[low_index] * (1 - fraction) + ordered[high_index] * fraction
+                ).tolist()
+        else:
+            quantiles = {_percentile_name(p): [NAN] * groups for p in percentiles}
+        counts, sums = counts.tolist(), sums.tolist()
+        return [
+            _stats(counts[g], sums[g], {name: values[g] for name, values in quantiles.items()})
+            for g in range(groups)
+        ]
+
+    def histogram(self, metric: str, groups: int, bins: int) -> Tuple[List[float], List[List[int]]]:
+        codes, values = self._valid(metric)
+        if not len(values):
+            return [], [[0] * bins for _ in range(groups)]
+        low, high = float(values.min()), float(values.max())
+        width = (high - low) / bins or 1.0
+        indexes = numpy.clip(((values - low) / width).astype(numpy.int64), 0, bins - 1)
+        counts = numpy.bincount(codes * bins + indexes, minlength=groups * bins).reshape(groups, bins)
+        return [low + width * i for i in range(bins + 1)], counts.tolist()
+
+
+class _StdlibAggregate:
+    """The same aggregates in plain passes over the arrays"""
+
+    def __init__(self, columns: ExecutionColumns, group_by: Optional[str]):
+        self.columns = columns
+        self.codes = columns.codes[group_by] if group_by else array("q", bytes(8 * len(columns)))
+
+    def counts(self, groups: int) -> List[int]:
+        counts = [0] * groups
+        for code in self.codes:
+            counts[code] += 1
+        return counts
+
+    def _valid(self, metric: str) -> Iterable[Tuple[int, float]]:
+        if metric == "duration_seconds":
+            return (
+                (code, (completed - started) / 1000.0)
+                for code, started, completed in zip(self.codes, self.columns.started_at, self.columns.completed_at)
+                if started != MISSING and completed != MISSING
+            )
+        return ((code, value) for code, value in zip(self.codes, getattr(self.columns, metric)) if value == value)
+
+    def metric(self, metric: str, groups: int, percentiles: Sequence[float]) -> List[Dict[str, Any]]:
+        per_group: List[List[float]] = [[] for _ in range(groups)]
+        for code, value in self._valid(metric):
+            per_group[code].append(value)
+        stats = []
+        for values in per_group:
+            values.sort()
+            quantiles = {}
+            for p in percentiles:
+                if not values:
+                    quantiles[_percentile_name(p)] = NAN
+                    continue
+                position = p / 100.0 * (len(values) - 1)
+                low = int(position)
+                high = min(low + 1, len(values) - 1)
+                fraction = position - low
+                quantiles[_percentile_name(p)] = values[low] * (1 - fraction) + values[high] * fraction
+            stats.append(_stats(len(values), math.fsum(values), quantiles))
+        return stats
+
+    def histogram(self, metric: str, groups: int, bins: int) -> Tuple[List[float], List[List[int]]]:
+        valid = list(self._valid(metric))
+        counts = [[0] * bins for _ in range(groups)]
+        if not valid:
+            return [], counts
+        low = min(value for _, value in valid)
+        high = max(value for _, value in valid)
+        width = (high - low) / bins or 1.0
+        for code, value in valid:
+            counts[code][min(max(int((value - low) / width), 0), bins - 1)] += 1
+        return [low + width * i for i in range(bins + 1)], counts
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Columnar export of executions and steps
+
+Executions are streamed through the paginated list_executions iterator and
+written in chunks of a fixed number of rows, so memory stays constant
+whatever the dataset size. Formats:
+
+- parquet: Parquet via pyarrow, one row group per chunk (zstd)
+- arrow: Arrow IPC file via pyarrow, one record batch per chunk (zstd)
+- npz: zip of per-chunk NumPy arrays, "<chunk>/<column>" keys (deflate);
+  strings as unicode arrays (None becomes ""), numbers as float64 (NaN
+  when unset) and timestamps as datetime64[ms] (NaT when unset)
+- csv: CSV, gzip-compressed when the path ends in .gz; values as the API
+  returns them
+
+"auto" picks the first of parquet, npz and csv whose dependencies are
+installed. Parquet and Arrow store timestamps as UTC timestamp[ms].
+
+raw_output is left out by default; it can be written inline as a column, or
+to a separate gzip JSON Lines file of {"execution_id", "raw_output"} next to
+the export. Task Manager has no endpoint listing steps, so steps are exported
+from a database of the sqlite backend.
+
+Usage:
+    python -m src.analytics.export executions.parquet [--format auto] [--task-id ID]
+        [--status STATUS] [--raw-output none|inline|separate] [--chunk-size N]
+    python -m src.analytics.export steps.csv.gz --steps-from task_manager.db
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import zipfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy
+    import numpy.lib.format
+except ImportError:  # pragma: no cover - depends on environment
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - depends on environment
+    pyarrow = None
+
+from src.analytics.columns import MISSING, parse_timestamp
+from src.clients.base_client import TaskManagerClientBase
+
+
+# (column, kind); kinds are string, int, float and timestamp
+EXECUTION_SCHEMA = [
+    ("execution_id", "string"), ("task_id", "string"), ("status", "string"), ("session_id", "string"),
+    ("worktree_path", "string"), ("trigger_type", "string"), ("sandbox_type", "string"),
+    ("commit_sha", "string"), ("comment_id", "int"), ("cost_usd", "float"), ("confidence_level", "int"),
+    ("confidence_reason", "string"), ("error_message", "string"),
+    ("started_at", "timestamp"), ("completed_at", "timestamp"),
+]
+STEP_SCHEMA = [
+    ("step_id", "string"), ("execution_id", "string"), ("step_name", "string"), ("status", "string"),
+    ("message", "string"), ("started_at", "timestamp"), ("completed_at", "timestamp"),
+]
+RAW_OUTPUT_MODES = ("none", "inline", "separate")
+DEFAULT_CHUNK_SIZE = 10_000
+PAGE_SIZE = 100
+
+Schema = List[Tuple[str, str]]
+
+
+def available_formats() -> List[str]:
+    """Names of the export formats usable in this environment, preferred first"""
+    formats = ["parquet", "arrow"] if pyarrow is not None else []
+    if numpy is not None:
+        formats.append("npz")
+    return formats + ["csv"]
+
+
+def raw_output_path(path: str) -> str:
+    """File the raw_output of an export to path is written to in "separate" mode"""
+    stem = path[:-3] if path.endswith(".gz") else path
+    return os.path.splitext(stem)[0] + ".raw_output.jsonl.gz"
+
+
+# Writers: write() takes a chunk as {column: [values]}, close() finishes the file
+
+
+class _ArrowWriter:
+    TYPES = {"string": "string", "int": "int64", "float": "float64"}
+
+    def __init__(self, path: str, schema: Schema, parquet: bool):
+        self.schema = pyarrow.schema([
+            (name, pyarrow.timestamp("ms", tz="UTC") if kind == "timestamp" else getattr(pyarrow, self.TYPES[kind])())
+            for name, kind in schema
+        ])
+        self.kinds = dict(schema)
+        if parquet:
+            self.writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            options = pyarrow.ipc.IpcWriteOptions(compression="zstd")
+            self.writer = pyarrow.ipc.new_file(path, self.schema, options=options)
+
+    def write(self, chunk: Dict[str, List[Any]]) -> None:
+        arrays = []
+        for field in self.schema:
+            values = chunk[field.name]
+            if self.kinds[field.name] == "timestamp":
+                values = [None if ms == MISSING else ms for ms in map(parse_timestamp, values)]
+            arrays.append(pyarrow.array(values, type=field.type))
+        self.writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _NpzWriter:
+    def __init__(self, path: str, schema: Schema):
+        self.schema = schema
+        self.zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self.chunks = 0
+
+    @staticmethod
+    def _array(values: List[Any], kind: str):
+        if kind == "string":
+            return numpy.array(["" if value is None else str(value) for value in values], dtype=str)
+        if kind == "timestamp":
+            return numpy.array([parse_timestamp(value) for value in values], dtype=numpy.int64).view("datetime64[ms]")
+        return numpy.array([numpy.nan if value is None else value for value in values], dtype=numpy.float64)
+
+    def write(self, chunk: Dict[str, List[Any]]) -> None:
+        for name, kind in self.schema:
+            with self.zip.open(f"{self.chunks:05d}/{name}.npy", "w", force_zip64=True) as member:
+                numpy.lib.format.write_array(member, self._array(chunk[name], kind), allow_pickle=False)
+        self.chunks += 1
+
+    def close(self) -> None:
+        self.zip.close()
+
+
+class _CsvWriter:
+    def __init__(self, path: str, schema: Schema):
+        self.columns = [name for name, _ in schema]
+        self.file = gzip.open(path, "wt", newline="", encoding="utf-8") if path.endswith(".gz") else \
+            open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+
+    def write(self, chunk: Dict[str, List[Any]]) -> None:
+        self.writer.writerows(zip(*(chunk[name] for name in self.columns)))
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _writer(path: str, schema: Schema, format: str):
+    if format in ("parquet", "arrow"):
+        return _ArrowWriter(path, schema, parquet=format == "parquet")
+    if format == "npz":
+        return _NpzWriter(path, schema)
+    return _CsvWriter(path, schema)
+
+
+def export_rows(
+    batches: Iterable[List[Dict[str, Any]]],
+    path: str,
+    schema: Schema,
+    format: str = "auto",
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """Write batches of row dicts to a columnar file, chunk_size rows at a time
+
+    Args:
+        batches: Lists of rows, e.g. pages of executions
+        path: Output file
+        schema: (column, kind) pairs to write; other fields are ignored
+        format: parquet, arrow, npz, csv or auto
+        chunk_size: Rows per chunk (row group, record batch or npz chunk)
+
+    Returns:
+        Dict with 'success' bool and 'data' (path, format, rows, chunks, bytes) or 'error'
+    """
+    if format == "auto":
+        format = available_formats()[0]
+    if format not in ("parquet", "arrow", "npz", "csv"):
+        return {"success": False, "error": f"Unknown export format '{format}'"}
+    if format not in available_formats():
+        needs = "pyarrow" if format in ("parquet", "arrow") else "numpy"
+        return {"success": False, "error": f"Export format '{format}' needs {needs}, which is not installed"}
+    if chunk_size < 1:
+        return {"success": False, "error": f"Invalid chunk_size {chunk_size}, must be at least 1"}
+
+    writer = _writer(path, schema, format)
+    columns = [name for name, _ in schema]
+    chunk: Dict[str, List[Any]] = {name: [] for name in columns}
+    rows = chunks = 0
+    try:
+        for batch in batches:
+            for row in batch:
+                for name in columns:
+                    chunk[name].append(row.get(name))
+                rows += 1
+                if rows % chunk_size == 0:
+                    writer.write(chunk)
+                    chunks += 1
+                    chunk = {name: [] for name in columns}
+        if rows % chunk_size or not chunks:
+            writer.write(chunk)
+            chunks += 1
+    finally:
+        writer.close()
+    return {
+        "success": True,
+        "data": {"path": path, "format": format, "rows": rows, "chunks": chunks, "bytes": os.path.getsize(path)}
+    }
+
+
+def export_executions(
+    client: TaskManagerClientBase,
+    path: str,
+    format: str = "auto",
+    task_id: Optional[str] = None,
+    status: Optional[str] = None,
+    raw_output: str = "none",
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """Export executions, streamed page by page, to a columnar file
+
+    Args:
+        client: Client to page executions from
+        path: Output file
+        format: parquet, arrow, npz, csv or auto
+        task_id: Only executions of this task (optional)
+        status: Only executions with this status (optional)
+        raw_output: none (left out), inline (a column) or separate (its own file, see raw_output_path)
+        chunk_size: Rows per chunk
+
+    Returns:
+        Dict with 'success' bool and 'data' (path, format, rows, chunks, bytes,
+        raw_output_path) or 'error'; a failed page stops the export with its error
+        and the rows written so far
+    """
+    if raw_output not in RAW_OUTPUT_MODES:
+        return {"success": False, "error": f"Invalid raw_output '{raw_output}', expected one of {', '.join(RAW_OUTPUT_MODES)}"}
+    if chunk_size < 1:
+        # Before the raw_output file is created
+        return {"success": False, "error": f"Invalid chunk_size {chunk_size}, must be at least 1"}
+    schema = EXECUTION_SCHEMA + ([("raw_output", "string")] if raw_output == "inline" else [])
+    fields = [name for name, _ in EXECUTION_SCHEMA] + (["raw_output"] if raw_output != "none" else [])
+    failure: Dict[str, Any] = {}
+    raw_file = gzip.open(raw_output_path(path), "wt", encoding="utf-8") if raw_output == "separate" else None
+
+    def pages() -> Iterator[List[Dict[str, Any]]]:
+        for result in client.iter_executions(task_id=task_id, status=status, fields=fields, page_size=PAGE_SIZE):
+            if not result.get("success"):
+                failure.update(result)
+                return
+            executions = result["data"]["executions"]
+            if raw_file is not None:
+                for execution in executions:
+                    raw_file.write(json.dumps(
+                        {"execution_id": execution.get("execution_id"), "raw_output": execution.get("raw_output")},
+                        ensure_ascii=False
+                    ) + "\n")
+            yield executions
+
+    try:
+        result = export_rows(pages(), path, schema, format=format, chunk_size=chunk_size)
+    finally:
+        if raw_file is not None:
+            raw_file.close()
+    if result.get("success") and raw_file is not None:
+        result["data"]["raw_output_path"] = raw_output_path(path)
+    if failure and result.get("success"):
+        return {"success": False, "error": failure.get("error"), "data": result["data"]}
+    return result
+
+
+def export_steps(
+    database: str,
+    path: str,
+    format: str = "auto",
+    execution_id: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """Export the steps of a sqlite backend database to a columnar file
+
+    Args:
+        database: Database file of the sqlite backend
+        path: Output file
+        format: parquet, arrow, npz, csv or auto
+        execution_id: Only steps of this execution (optional)
+        chunk_size: Rows per chunk
+
+    Returns:
+        Dict with 'success' bool and 'data' (path, format, rows, chunks, bytes) or 'error'
+    """
+    if not os.path.exists(database):
+        return {"success": False, "error": f"Database {database} does not exist"}
+    batches = iter_steps(database, execution_id=execution_id, batch_size=chunk_size)
+    try:
+        return export_rows(batches, path, STEP_SCHEMA, format=format, chunk_size=chunk_size)
+    finally:
+        batches.close()
+
+
+def iter_steps(
+    database: str,
+    execution_id: Optional[str] = None,
+    batch_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """Steps of a sqlite backend database in started_at order, batch_size rows at a time
+
+    The database is opened read-only; sqlite3.OperationalError is raised when
+    it cannot be opened or has no steps table.
+    """
+    conn = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        columns = ", ".join(name for name, _ in STEP_SCHEMA)
+        if execution_id is None:
+            cursor = conn.execute(f"SELECT {columns} FROM steps ORDER BY started_at")
+        else:
+            cursor = conn.execute(
+                f"SELECT {columns} FROM steps WHERE execution_id = ? ORDER BY started_at", (execution_id,)
+            )
+        for rows in iter(lambda: cursor.fetchmany(batch_size), []):
+            yield list(map(dict, rows))
+    finally:
+        conn.close()
+
+
+def _chunk_size(value: str) -> int:
+    size = int(value)
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {size}")
+    return size
+
+
+def main() -> int:
+    from src.clients import create_task_manager_client
+
+    parser = argparse.ArgumentParser(description="Export Task Manager executions or steps to a columnar file")
+    parser.add_argument("output", help="Output file")
+    parser.add_argument("--format", default="auto", choices=["auto", "parquet", "arrow", "npz", "csv"])
+    parser.add_argument("--task-id", default=None, help="Only executions of this task")
+    parser.add_argument("--status", default=None, help="Only executions with this status")
+    parser.add_argument("--raw-output", default="none", choices=RAW_OUTPUT_MODES)
+    parser.add_argument("--chunk-size", type=_chunk_size, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--steps-from", default=None, help="Export the steps of this sqlite backend database instead")
+    args = parser.parse_args()
+
+    if args.steps_from:
+        result = export_steps(args.steps_from, args.output, format=args.format, chunk_size=args.chunk_size)
+    else:
+        result = export_executions(
+            create_task_manager_client(), args.output, format=args.format, task_id=args.task_id,
+            status=args.status, raw_output=args.raw_output, chunk_size=args.chunk_size
+        )
+    print(json.dumps(result, indent=2))
+    return 0 if result.get("success") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Incremental local mirror of tasks and executions in SQLite
+
+Fleet questions ("which tasks failed most this week", "cost per trigger
+type") are answered from a local copy instead of paging all of
+/api/executions each time. The mirror uses the schema of the sqlite backend
+(sqlite_client.py), so it can also be opened as one.
+
+A sync pages /api/executions newest first and stops at the first page that
+reaches past the high-water mark: the newest ``started_at`` of the previous sync, or
+the oldest execution still open in the mirror, whose status may have changed
+since. Each page is upserted in one transaction together with a checkpoint,
+so an interrupted sync resumes at the page after the last one written and
+only then moves the mark. Tasks have no pagination; all are listed and those
+whose ``updated_at`` passed the task mark are upserted.
+
+``raw_output`` is not mirrored.
+
+Configuration:
+    TASK_MANAGER_MIRROR_PATH: Mirror database file (default: task_manager_mirror.db)
+    TASK_MANAGER_MIRROR_PAGE_SIZE: Executions per page while syncing, at most 100 (default: 100)
+    TASK_MANAGER_MIRROR_MAX_AGE: Seconds before query_execution_stats syncs again (default: 60)
+
+Usage:
+    python -m src.analytics.mirror [--path PATH] [--full]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.clients.base_client import MAX_PAGE_SIZE, TaskManagerClientBase
+from src.clients.sqlite_client import EXECUTION_COLUMNS, JSON_COLUMNS, SCHEMA, TASK_COLUMNS
+
+
+MIRRORED_EXECUTION_COLUMNS = tuple(column for column in EXECUTION_COLUMNS if column != "raw_output")
+OPEN_STATUSES = ("running",)
+
+MIRROR_SCHEMA = SCHEMA + """
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_executions_status_started ON executions (status, started_at);
+CREATE INDEX IF NOT EXISTS idx_executions_trigger_started ON executions (trigger_type, started_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON tasks (updated_at);
+"""
+
+# Expressions query_stats can group by
+GROUPS = {
+    "task_id": "task_id",
+    "status": "status",
+    "trigger_type": "trigger_type",
+    "day": "substr(started_at, 1, 10)",
+}
+# Orders query_stats can sort groups by, largest first
+ORDERS = ("executions", "failed", "total_cost_usd", "avg_duration_seconds")
+
+_DURATION = "(julianday(completed_at) - julianday(started_at)) * 86400.0"
+
+
+def _upsert(table: str, key: str, columns: tuple) -> str:
+    updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != key)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT ({key}) DO UPDATE SET {updates}"
+    )
+
+
+_UPSERT_TASK = _upsert("tasks", "task_id", TASK_COLUMNS)
+_UPSERT_EXECUTION = _upsert("executions", "execution_id", MIRRORED_EXECUTION_COLUMNS)
+
+
+class ExecutionMirror:
+    """SQLite mirror of Task Manager tasks and executions, synced incrementally"""
+
+    def __init__(
+        self,
+        client: TaskManagerClientBase,
+        path: Optional[str] = None,
+        page_size: Optional[int] = None,
+        max_age: Optional[float] = None
+    ):
+        """
+        Args:
+            client: Client the mirror is synced from
+            path: Database file (default: TASK_MANAGER_MIRROR_PATH or task_manager_mirror.db)
+            page_size: Executions per page, 1-100 (default: TASK_MANAGER_MIRROR_PAGE_SIZE or 100)
+            max_age: Seconds a sync is fresh for query_stats (default: TASK_MANAGER_MIRROR_MAX_AGE or 60)
+
+        Raises:
+            ValueError: page_size, or TASK_MANAGER_MIRROR_PAGE_SIZE, is beyond what the API accepts
+        """
+        self.client = client
+        self.path = path or os.getenv('TASK_MANAGER_MIRROR_PATH', 'task_manager_mirror.db')
+        self.page_size = page_size or int(os.getenv('TASK_MANAGER_MIRROR_PAGE_SIZE', str(MAX_PAGE_SIZE)))
+        if not 1 <= self.page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"Mirror page size must be between 1 and {MAX_PAGE_SIZE}, got {self.page_size}")
+        self.max_age = max_age if max_age is not None else float(os.getenv('TASK_MANAGER_MIRROR_MAX_AGE', '60'))
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        # Opened on first use, so creating a mirror touches no file
+        self._conn: Optional[sqlite3.Connection] = None
+        self.synced_at: Optional[float] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256)
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.execute("PRAGMA synchronous = NORMAL")
+                conn.executescript(MIRROR_SCHEMA)
+                self._conn = conn
+            return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # Sync state
+
+    def _state(self) -> Dict[str, str]:
+        with self._lock:
+            rows = self._connection().execute("SELECT key, value FROM sync_state").fetchall()
+        return {row["key"]: row["value"] for row in rows}
+
+    @staticmethod
+    def _set_state(conn: sqlite3.Connection, **values: Optional[str]) -> None:
+        for key, value in values.items():
+            if value is None:
+                conn.execute("DELETE FROM sync_state WHERE key = ?", (key,))
+            else:
+                conn.execute(
+                    "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (key, value)
+                )
+
+    @staticmethod
+    def _rows(items: List[Dict[str, Any]], columns: tuple) -> List[List[Any]]:
+        """Parameter rows for an upsert of items"""
+        encoded = [i for i, column in enumerate(columns) if column in JSON_COLUMNS]
+        rows = []
+        for item in items:
+            row = list(map(item.get, columns))
+            for i in encoded:
+                if row[i] is not None:
+                    row[i] = json.dumps(row[i])
+            rows.append(row)
+        return rows
+
+    # Sync
+
+    def sync(self, full: bool = False) -> Dict[str, Any]:
+        """Bring the mirror up to date with Task Manager
+
+        Args:
+            full: Ignore the high-water marks and page through everything
+
+        Returns:
+            Dict with 'success' bool and 'data' (tasks and executions upserted,
+            pages read, whether an interrupted sync was resumed, the marks) or 'error'
+        """
+        with self._sync_lock:
+            tasks = self._sync_tasks(full)
+            if not tasks.get("success"):
+                return tasks
+            executions = self._sync_executions(full)
+            if not executions.get("success"):
+                return executions
+            self.synced_at = time.monotonic()
+            return {"success": True, "data": {**tasks["data"], **executions["data"]}}
+
+    def _sync_tasks(self, full: bool) -> Dict[str, Any]:
+        result = self.client.list_tasks(fields=list(TASK_COLUMNS))
+        if not result.get("success"):
+            return result
+        mark = None if full else self._state().get("tasks_mark")
+        tasks = [
+            task for task in (result.get("data") or {}).get("tasks") or []
+            if task.get("task_id") and (mark is None or not task.get("updated_at") or task["updated_at"] > mark)
+        ]
+        new_mark = max((task["updated_at"] for task in tasks if task.get("updated_at")), default=mark)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(_UPSERT_TASK, self._rows(tasks, TASK_COLUMNS))
+                self._set_state(conn, tasks_mark=new_mark)
+        return {"success": True, "data": {"tasks": len(tasks), "tasks_mark": new_mark}}
+
+    def _sync_executions(self, full: bool) -> Dict[str, Any]:
+        state = self._state()
+        resumed = "executions_page" in state and not full
+        page = int(state["executions_page"]) + 1 if resumed else 1
+        pending_mark = state.get("executions_pending_mark") if resumed else None
+        floor = None if full else state.get("executions_mark")
+        if floor is not None:
+            with self._lock:
+                oldest_open = self._connection().execute(
+                    f"SELECT MIN(started_at) FROM executions WHERE status IN ({', '.join('?' * len(OPEN_STATUSES))})",
+                    OPEN_STATUSES
+                ).fetchone()[0]
+            if oldest_open is not None:
+                floor = min(floor, oldest_open)
+
+        upserted = pages = 0
+        while True:
+            result = self.client.list_executions(page=page, limit=self.page_size, fields=list(MIRRORED_EXECUTION_COLUMNS))
+            if not result.get("success"):
+                # The checkpoint stays, so the next sync resumes here
+                return {**result, "data": {"executions": upserted, "pages": pages, "resumed": resumed}}
+            executions = [e for e in (result.get("data") or {}).get("executions") or [] if e.get("execution_id")]
+            if pending_mark is None and executions:
+                pending_mark = max(e.get("started_at") or "" for e in executions) or None
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(_UPSERT_EXECUTION, self._rows(executions, MIRRORED_EXECUTION_COLUMNS))
+                    self._set_state(conn, executions_page=str(page), executions_pending_mark=pending_mark)
+            upserted += len(executions)
+            pages += 1
+            if len(executions) < self.page_size:
+                break
+            if floor is not None and any((e.get("started_at") or "") < floor for e in executions):
+                break
+            page += 1
+
+        mark = pending_mark
+        if not full and state.get("executions_mark"):
+            mark = max(mark or "", state["executions_mark"])
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                self._set_state(conn, executions_mark=mark, executions_page=None, executions_pending_mark=None)
+        return {
+            "success": True,
+            "data": {"executions": upserted, "pages": pages, "resumed": resumed, "executions_mark": mark}
+        }
+
+    # Queries
+
+    def query_stats(
+        self,
+        group_by: str = "status",
+        status: Optional[str] = None,
+        trigger_type: Optional[str] = None,
+        task_id: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        order_by: str = "executions",
+        limit: int = 20,
+        refresh: bool = True
+    ) -> Dict[str, Any]:
+        """Aggregate mirrored executions per group
+
+        Args:
+            group_by: task_id, status, trigger_type or day (of started_at)
+            status: Only executions with this status (optional)
+            trigger_type: Only executions with this trigger type (optional)
+            task_id: Only executions of this task (optional)
+            since: Only executions started at or after this ISO time (optional)
+            until: Only executions started before this ISO time (optional)
+            order_by: executions, failed, total_cost_usd or avg_duration_seconds, largest first
+            limit: Groups returned at most
+            refresh: Sync first when the last sync is older than max_age
+
+        Returns:
+            Dict with 'success' bool and 'data' (groups, synced_seconds_ago) or 'error'
+        """
+        if group_by not in GROUPS:
+            return {"success": False, "error": f"Invalid group_by '{group_by}', expected one of {', '.join(GROUPS)}"}
+        if order_by not in ORDERS:
+            return {"success": False, "error": f"Invalid order_by '{order_by}', expected one of {', '.join(ORDERS)}"}
+
+        sync_error = self.refresh() if refresh else None
+        where, params = self._where(status, trigger_type, task_id, since, until)
+        sql = (
+            f"SELECT {GROUPS[group_by]} AS key, COUNT(*) AS executions, "
+            f"SUM(status = 'failed') AS failed, "
+            f"ROUND(TOTAL(cost_usd), 6) AS total_cost_usd, AVG(cost_usd) AS avg_cost_usd, "
+            f"AVG(confidence_level) AS avg_confidence, "
+            f"ROUND(AVG(CASE WHEN completed_at IS NOT NULL THEN {_DURATION} END), 3) AS avg_duration_seconds "
+            f"FROM executions {where} GROUP BY key ORDER BY {order_by} DESC, key LIMIT ?"
+        )
+        with self._lock:
+            rows = self._connection().execute(sql, params + [limit]).fetchall()
+        data = {"group_by": group_by, "groups": [dict(row) for row in rows], **self.freshness()}
+        result = {"success": True, "data": data}
+        if sync_error is not None:
+            result["stale"] = True
+            result["sync_error"] = sync_error
+        return result
+
+    def refresh(self) -> Optional[str]:
+        """Sync when the last sync is older than max_age; the sync error if it failed
+
+        Callers answer from what is mirrored either way and report the error as staleness.
+        """
+        if self.synced_at is not None and time.monotonic() - self.synced_at <= self.max_age:
+            return None
+        synced = self.sync()
+        return None if synced.get("success") else synced.get("error")
+
+    def freshness(self) -> Dict[str, Any]:
+        return {"synced_seconds_ago": round(time.monotonic() - self.synced_at, 1) if self.synced_at else None}
+
+    def iter_executions(
+        self,
+        columns: List[str],
+        status: Optional[str] = None,
+        trigger_type: Optional[str] = None,
+        task_id: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        batch_size: int = 10_000
+    ) -> Iterator[List[sqlite3.Row]]:
+        """Mirrored executions in batches of rows, oldest first
+
+        Args:
+            columns: SQL expressions to select, e.g. column names
+            status, trigger_type, task_id, since, until: Filters as in query_stats
+            batch_size: Rows per batch
+
+        Yields:
+            Lists of at most batch_size rows
+        """
+        where, params = self._where(status, trigger_type, task_id, since, until)
+        with self._lock:
+            cursor = self._connection().execute(
+                f"SELECT {', '.join(columns)} FROM executions {where} ORDER BY started_at", params
+            )
+            # Fetched eagerly per batch so the lock is not held while the caller works
+            batches = iter(lambda: cursor.fetchmany(batch_size), [])
+        while True:
+            with self._lock:
+                batch = next(batches, None)
+            if batch is None:
+                return
+            yield batch
+
+    @staticmethod
+    def _where(
+        status: Optional[str],
+        trigger_type: Optional[str],
+        task_id: Optional[str],
+        since: Optional[str],
+        until: Optional[str]
+    ) -> Tuple[str, List[Any]]:
+        conditions, params = [], []
+        for column, value in (("status", status), ("trigger_type", trigger_type), ("task_id", task_id)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("started_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("started_at < ?")
+            params.append(until)
+        return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), params
+
+
+def main() -> int:
+    from src.clients import create_task_manager_client
+
+    parser = argparse.ArgumentParser(description="Sync the local Task Manager mirror")
+    parser.add_argument("--path", default=None, help="Mirror database file")
+    parser.add_argument("--full", action="store_true", help="Ignore the high-water marks")
+    args = parser.parse_args()
+
+    mirror = ExecutionMirror(create_task_manager_client(), path=args.path)
+    result = mirror.sync(full=args.full)
+    mirror.close()
+    print(json.dumps(result, indent=2))
+    return 0 if result.get("success") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Step duration profile across executions
+
+Steps are recorded as they pass through the server's create_step and
+update_step tools: a step is remembered when it starts and its duration
+(completed_at - started_at) is added once, when an update sets a final
+status. When the backend returns no timestamps, the times the step passed
+through are used instead; a step whose start was neither seen nor returned
+is skipped rather than counted as taking no time. Durations are kept per
+step_name in a merging t-digest, so memory stays bounded (about one hundred
+centroids per phase) whatever the number of steps, and p50/p95 stay accurate
+to a fraction of a percent in rank.
+
+Task Manager has no endpoint listing steps, so history is backfilled from a
+database of the sqlite backend: once, on first use, counting only steps that
+completed before the profiler started so live ones are not counted twice.
+
+Configuration:
+    TASK_MANAGER_STEP_PROFILE_BACKFILL: sqlite backend database to backfill from
+        (default: the database of a sqlite task client, otherwise none)
+    TASK_MANAGER_STEP_PROFILE_COMPRESSION: t-digest compression; more centroids,
+        more accurate tails (default: 100)
+"""
+
+import math
+import os
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.analytics.columns import MISSING, parse_timestamp
+from src.analytics.export import iter_steps
+from src.clients.base_client import TaskManagerClientBase
+from src.clients.sqlite_client import SqliteTaskManagerClient
+
+
+FINAL_STATUSES = ("completed", "failed", "skipped")
+DEFAULT_PERCENTILES = (50, 95)
+# Distinct step names profiled; later ones are counted under OTHER
+MAX_PHASES = 500
+OTHER = "(other)"
+# Started steps remembered until they finish, and finished ones until a late update
+MAX_PENDING = 10_000
+BACKFILL_BATCH = 5_000
+
+
+class TDigest:
+    """Merging t-digest: a streaming quantile sketch with bounded memory
+
+    Values are buffered and merged into centroids sorted by mean. The k1 scale
+    function bounds centroid sizes, keeping the ones near the tails small, so
+    high percentiles stay accurate with about `compression` centroids.
+    """
+
+    def __init__(self, compression: float = 100):
+        self.compression = compression
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._buffer: List[float] = []
+        self._buffer_size = int(5 * compression)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float) -> None:
+        self._buffer.append(value)
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= self._buffer_size:
+            self._merge()
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _merge(self) -> None:
+        if not self._buffer:
+            return
+        points = sorted(list(zip(self._means, self._weights)) + [(value, 1.0) for value in self._buffer])
+        self._buffer = []
+        means, weights = [], []
+        mean, weight = points[0]
+        cumulative = 0.0
+        k_left = self._k(0.0)
+        for value, value_weight in points[1:]:
+            if self._k((cumulative + weight + value_weight) / self.count) - k_left <= 1:
+                weight += value_weight
+                mean += (value - mean) * value_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                cumulative += weight
+                k_left = self._k(cumulative / self.count)
+                mean, weight = value, value_weight
+        means.append(mean)
+        weights.append(weight)
+        self._means, self._weights = means, weights
+
+    def centroids(self) -> int:
+        self._merge()
+        return len(self._means)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q (0-1); None when empty"""
+        self._merge()
+        if not self.count:
+            return None
+        if q <= 0 or q >= 1:
+            return self.min if q <= 0 else self.max
+        if len(self._means) == 1:
+            return self._means[0]
+        target = q * self.count
+        first, last = self._weights[0], self._weights[-1]
+        if target <= first / 2:
+            return self.min + (self._means[0] - self.min) * target / (first / 2) if first > 1 else self.min
+        if target >= self.count - last / 2:
+            if last <= 1:
+                return self.max
+            return self._means[-1] + (self.max - self._means[-1]) * (target - (self.count - last / 2)) / (last / 2)
+        center = first / 2
+        for i in range(len(self._means) - 1):
+            next_center = center + (self._weights[i] + self._weights[i + 1]) / 2
+            if target <= next_center:
+                fraction = (target - center) / (next_center - center)
+                return self._means[i] + (self._means[i + 1] - self._means[i]) * fraction
+            center = next_center
+        return self.max
+
+
+class _Phase:
+    __slots__ = ("digest", "statuses")
+
+    def __init__(self, compression: float):
+        self.digest = TDigest(compression)
+        self.statuses: Counter = Counter()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _duration(started_at: Optional[str], completed_at: Optional[str]) -> Optional[float]:
+    started, completed = parse_timestamp(started_at), parse_timestamp(completed_at)
+    if started == MISSING or completed == MISSING or completed < started:
+        return None
+    return (completed - started) / 1000
+
+
+def check_percentiles(percentiles: Sequence[float]) -> None:
+    """Raise ValueError unless every percentile is within 0-100"""
+    if not percentiles or any(not 0 <= p <= 100 for p in percentiles):
+        raise ValueError("percentiles must be between 0 and 100")
+
+
+def _label(percentile: float) -> str:
+    return f"p{percentile:g}".replace(".", "_")
+
+
+class StepProfiler:
+    """Per step_name duration sketches, fed by step lifecycles and a one-time backfill"""
+
+    def __init__(
+        self,
+        client: Optional[TaskManagerClientBase] = None,
+        backfill_path: Optional[str] = None,
+        compression: Optional[float] = None
+    ):
+        """
+        Args:
+            client: Task client; a sqlite client's database is the default backfill source
+            backfill_path: sqlite backend database to backfill from (default:
+                TASK_MANAGER_STEP_PROFILE_BACKFILL, else the sqlite client's database)
+            compression: t-digest compression (default: TASK_MANAGER_STEP_PROFILE_COMPRESSION or 100)
+        """
+        if backfill_path is None:
+            backfill_path = os.getenv('TASK_MANAGER_STEP_PROFILE_BACKFILL') or None
+        if backfill_path is None and isinstance(client, SqliteTaskManagerClient):
+            backfill_path = client.path
+        self.backfill_path = backfill_path
+        self.compression = compression or float(os.getenv('TASK_MANAGER_STEP_PROFILE_COMPRESSION', '100'))
+        # Steps that completed before this are left to the backfill
+        self.started = parse_timestamp(_now())
+        self._lock = threading.Lock()
+        self._phases: Dict[str, _Phase] = {}
+        # step_id -> (step_name, started_at) while running; None once recorded
+        self._steps: "OrderedDict[str, Optional[Tuple[Optional[str], str]]]" = OrderedDict()
+        self._backfill_lock = threading.Lock()
+        self._backfilled: Optional[int] = None
+        self._backfill_error: Optional[str] = None
+
+    def _add(self, step_name: Optional[str], status: Optional[str], duration: float) -> None:
+        name = step_name or "(unnamed)"
+        phase = self._phases.get(name)
+        if phase is None:
+            if len(self._phases) >= MAX_PHASES:
+                name = OTHER
+                phase = self._phases.get(name)
+            if phase is None:
+                phase = self._phases[name] = _Phase(self.compression)
+        phase.digest.add(duration)
+        phase.statuses[status or "completed"] += 1
+
+    def record(self, step: Dict[str, Any], created: bool = False) -> Optional[float]:
+        """Record a step as returned by create_step, or by patch_step when it set a status
+
+        Args:
+            step: The step; updates may carry only step_id and status
+            created: The step was just created here, so when the backend
+                returns no started_at, now is when it started
+
+        Returns:
+            Duration in seconds added to the profile, or None when the step is
+            still running, was already recorded, or its start is unknown
+        """
+        step_id = step.get("step_id")
+        status = step.get("status")
+        duration = None
+        with self._lock:
+            known = self._steps.get(step_id, ()) if step_id else ()
+            if known is None:
+                return None
+            step_name = step.get("step_name") or (known[0] if known else None)
+            started_at = step.get("started_at") or (known[1] if known else None)
+            if started_at is None and created:
+                started_at = _now()
+            if status not in FINAL_STATUSES:
+                if step_id:
+                    self._steps[step_id] = (step_name, started_at)
+                    self._steps.move_to_end(step_id)
+            else:
+                completed_at = step.get("completed_at") or _now()
+                if step_id:
+                    self._steps[step_id] = None
+                    self._steps.move_to_end(step_id)
+                # A step first seen finishing, that finished before the profiler
+                # started, is the backfill's
+                if known or created or parse_timestamp(completed_at) > self.started:
+                    duration = _duration(started_at, completed_at)
+                if duration is not None:
+                    self._add(step_name, status, duration)
+            while len(self._steps) > MAX_PENDING:
+                self._steps.popitem(last=False)
+        return duration
+
+    def backfill(self, steps: Iterable[Dict[str, Any]]) -> int:
+        """Add finished steps that completed before the profiler started; returns how many"""
+        added = 0
+        for step in steps:
+            if step.get("status") not in FINAL_STATUSES:
+                continue
+            completed = parse_timestamp(step.get("completed_at"))
+            if completed == MISSING or completed > self.started:
+                continue
+            duration = _duration(step.get("started_at"), step.get("completed_at"))
+            if duration is not None:
+                with self._lock:
+                    self._add(step.get("step_name"), step.get("status"), duration)
+                added += 1
+        return added
+
+    def ensure_backfilled(self) -> Optional[str]:
+        """Backfill from backfill_path once; returns the error if that failed"""
+        if self.backfill_path is None:
+            return None
+        with self._backfill_lock:
+            if self._backfilled is None and self._backfill_error is None:
+                if not os.path.exists(self.backfill_path):
+                    self._backfill_error = f"Database {self.backfill_path} does not exist"
+                else:
+                    try:
+                        self._backfilled = sum(
+                            self.backfill(batch) for batch in iter_steps(self.backfill_path, batch_size=BACKFILL_BATCH)
+                        )
+                    except sqlite3.Error as e:
+                        self._backfill_error = f"Backfill from {self.backfill_path} failed: {e}"
+            return self._backfill_error
+
+    def profile(
+        self,
+        step_name: Optional[str] = None,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        limit: int = 20
+    ) -> Dict[str, Any]:
+        """Duration percentiles per phase, the phases taking the most total time first
+
+        Args:
+            step_name: Only this phase (optional)
+            percentiles: Percentiles to estimate, 0-100
+            limit: Phases returned at most
+
+        Returns:
+            Dict with 'success' bool and 'data' (phases with count, total_seconds,
+            share of all step time, mean/min/max seconds, p<N> seconds and counts
+            per status) or 'error'; backfill_error when the backfill failed
+        """
+        try:
+            check_percentiles(percentiles)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        backfill_error = self.ensure_backfilled()
+        with self._lock:
+            total = sum(phase.digest.total for phase in self._phases.values())
+            phases = []
+            for name, phase in self._phases.items():
+                if step_name is not None and name != step_name:
+                    continue
+                digest = phase.digest
+                summary = {
+                    "step_name": name,
+                    "count": digest.count,
+                    "total_seconds": round(digest.total, 3),
+                    "share": round(digest.total / total, 4) if total else None,
+                    "mean_seconds": round(digest.total / digest.count, 3),
+                    "min_seconds": round(digest.min, 3),
+                    "max_seconds": round(digest.max, 3),
+                }
+                summary.update((_label(p), round(digest.quantile(p / 100), 3)) for p in percentiles)
+                summary["statuses"] = dict(phase.statuses)
+                phases.append(summary)
+            running = sum(1 for step in self._steps.values() if step is not None)
+        phases.sort(key=lambda phase: (-phase["total_seconds"], phase["step_name"]))
+        data = {
+            "phases": phases[:limit],
+            "phase_count": len(phases),
+            "steps": sum(phase["count"] for phase in phases),
+            "running": running,
+            "backfilled": self._backfilled or 0,
+        }
+        result = {"success": True, "data": data}
+        if backfill_error is not None:
+            result["backfill_error"] = backfill_error
+        return result
@@ -1,11 +1,23 @@
 from .base_client import TaskManagerClientBase
 from .mock_client import MockTaskManagerClient
 from .http_client import HttpTaskManagerClient
-from .client_factory import create_task_manager_client
+from .balanced_client import BalancedTaskManagerClient
+from .sharded_client import ShardedTaskManagerClient
+from .sqlite_client import SqliteTaskManagerClient
+from .sidecar_client import SidecarTaskManagerClient
+from .client_factory import create_task_manager_client, create_generated_client
+from .codec import JsonCodec, get_codec
 
 __all__ = [
     'TaskManagerClientBase',
     'HttpTaskManagerClient', 
+    'BalancedTaskManagerClient',
+    'ShardedTaskManagerClient',
     'MockTaskManagerClient',
-    'create_task_manager_client'
+    'SqliteTaskManagerClient',
+    'SidecarTaskManagerClient',
+    'create_task_manager_client',
+    'create_generated_client',
+    'JsonCodec',
+    'get_codec'
 ]
\ No newline at end of file
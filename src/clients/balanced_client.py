@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+HTTP client that spreads requests over several Task Manager endpoints
+
+- Balancing: power-of-two-choices (default) or least outstanding requests,
+  scored by in-flight requests and a moving average of each endpoint's latency
+- Health: endpoints are ejected after consecutive transport errors or 5xx
+  responses, or a failed ``/api/health`` probe, and re-admitted when a probe
+  succeeds. Probes run in a background thread.
+- Ordering: writes for one execution are pinned to one endpoint, so its
+  steps are created and updated in order on one backend
+- Failover: reads move to the next endpoint on errors; writes only when the
+  request could not have reached the backend (connection failed). All
+  attempts share the request's deadline.
+
+Configuration:
+    TASK_MANAGER_ENDPOINTS: Comma-separated endpoints, "host:port" or full base URLs
+    TASK_MANAGER_BALANCER: "p2c" (default) or "least-outstanding"
+    TASK_MANAGER_HEALTH_INTERVAL: Seconds between health probes (default: 5)
+"""
+
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from src.clients.deadline import request_limits
+from src.clients.hedging import attempt_cancelled
+from src.clients.http_client import HttpTaskManagerClient
+
+
+STRATEGIES = ("p2c", "least-outstanding")
+
+# Consecutive failures that eject an endpoint until its next successful probe
+EJECT_AFTER_FAILURES = 3
+# Weight of the newest sample in the latency moving average
+LATENCY_ALPHA = 0.3
+# Executions whose write endpoint is remembered
+MAX_PINNED_EXECUTIONS = 10000
+
+_EXECUTION_PATH = re.compile(r"^/api/executions/([^/]+)")
+_RETRYABLE_STATUS = (502, 503, 504)
+
+
+class Endpoint:
+    """Live state of one Task Manager endpoint"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.healthy = True
+        self.outstanding = 0
+        self.latency = 0.0  # seconds, moving average; 0 until measured
+        self.failures = 0  # consecutive
+        self.requests = 0
+        self.errors = 0
+
+    def score(self) -> float:
+        """Expected wait for one more request; lower is better"""
+        return (self.outstanding + 1) * self.latency
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "latency_ms": round(self.latency * 1000, 3),
+            "requests": self.requests,
+            "errors": self.errors
+        }
+
+
+def parse_endpoints(value: str) -> List[str]:
+    """Base URLs from a comma-separated TASK_MANAGER_ENDPOINTS value"""
+    endpoints = []
+    for item in value.split(","):
+        item = item.strip().rstrip("/")
+        if item:
+            endpoints.append(item if "://" in item else f"http://{item}")
+    return endpoints
+
+
+class BalancedTaskManagerClient(HttpTaskManagerClient):
+    """HttpTaskManagerClient over several endpoints with health-aware balancing"""
+
+    def __init__(
+        self,
+        endpoints: Optional[List[str]] = None,
+        strategy: Optional[str] = None,
+        health_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            endpoints: Endpoint base URLs (default: TASK_MANAGER_ENDPOINTS)
+            strategy: "p2c" or "least-outstanding" (default: TASK_MANAGER_BALANCER or p2c)
+            health_interval: Seconds between health probes (default: TASK_MANAGER_HEALTH_INTERVAL or 5)
+        """
+        super().__init__()
+        endpoints = endpoints or parse_endpoints(os.getenv('TASK_MANAGER_ENDPOINTS', ''))
+        if not endpoints:
+            raise ValueError("BalancedTaskManagerClient needs at least one endpoint (TASK_MANAGER_ENDPOINTS)")
+        self.strategy = (strategy or os.getenv('TASK_MANAGER_BALANCER', 'p2c')).lower()
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown balancer '{self.strategy}'. Must be one of: {', '.join(STRATEGIES)}")
+        self.health_interval = health_interval or float(os.getenv('TASK_MANAGER_HEALTH_INTERVAL', '5'))
+
+        self.endpoints = [Endpoint(url) for url in endpoints]
+        self.base_url = ",".join(endpoints)
+        self._lock = threading.Lock()
+        self._pins: "OrderedDict[str, Endpoint]" = OrderedDict()
+        self._prober: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    # Endpoint selection
+
+    def _choose(self, exclude: List[Endpoint]) -> Optional[Endpoint]:
+        """Pick an endpoint for the next request, called with the lock held"""
+        candidates = [e for e in self.endpoints if e not in exclude]
+        healthy = [e for e in candidates if e.healthy]
+        # With every endpoint ejected, keep trying them rather than failing outright
+        candidates = healthy or candidates
+        if not candidates:
+            return None
+        if self.strategy == "least-outstanding" or len(candidates) < 3:
+            return min(candidates, key=lambda e: (e.outstanding, e.latency))
+        first, second = random.sample(candidates, 2)
+        return first if first.score() <= second.score() else second
+
+    def _pinned(self, execution_id: str, exclude: List[Endpoint]) -> Optional[Endpoint]:
+        """The endpoint for writes of an execution, pinning a new one if needed"""
+        endpoint = self._pins.get(execution_id)
+        if endpoint is not None and endpoint.healthy and endpoint not in exclude:
+            self._pins.move_to_end(execution_id)
+            return endpoint
+        endpoint = self._choose(exclude)
+        if endpoint is not None:
+            self._pins[execution_id] = endpoint
+            self._pins.move_to_end(execution_id)
+            while len(self._pins) > MAX_PINNED_EXECUTIONS:
+                self._pins.popitem(last=False)
+        return endpoint
+
+    # Outcome tracking
+
+    def _succeeded(self, endpoint: Endpoint, elapsed: float) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+            endpoint.requests += 1
+            endpoint.failures = 0
+            if endpoint.latency == 0.0:
+                endpoint.latency = elapsed
+            else:
+                endpoint.latency += LATENCY_ALPHA * (elapsed - endpoint.latency)
+
+    def _failed(self, endpoint: Endpoint) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+            endpoint.requests += 1
+            endpoint.errors += 1
+            endpoint.failures += 1
+            if endpoint.failures >= EJECT_AFTER_FAILURES:
+                endpoint.healthy = False
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """Send one request to a chosen endpoint, failing over to the others"""
+        self._start_prober()
+        idempotent = method in ("GET", "HEAD")
+        match = _EXECUTION_PATH.match(path)
+        execution_id = match.group(1) if match and not idempotent else None
+
+        tried: List[Endpoint] = []
+        while True:
+            # Every failover attempt gets only what is left of the deadline
+            timeout, attempt_headers = request_limits(headers)
+            with self._lock:
+                endpoint = self._pinned(execution_id, tried) if execution_id else self._choose(tried)
+                if endpoint is None:
+                    break
+                endpoint.outstanding += 1
+            tried.append(endpoint)
+
+            start = time.monotonic()
+            try:
+                with self._client(endpoint.base_url) as client:
+                    response = client.request(
+                        method=method, url=path, params=params, content=content, headers=attempt_headers, timeout=timeout
+                    )
+            except httpx.TransportError as e:
+                if attempt_cancelled():
+                    # A hedge won and shut this attempt's connection; the endpoint is fine
+                    with self._lock:
+                        endpoint.outstanding -= 1
+                    raise
+                self._failed(endpoint)
+                error = e
+                # A write that may have reached the backend must not be sent twice
+                if idempotent or isinstance(e, httpx.ConnectError):
+                    continue
+                raise
+
+            if response.status_code >= 500:
+                self._failed(endpoint)
+                if idempotent and response.status_code in _RETRYABLE_STATUS and len(tried) < len(self.endpoints):
+                    continue
+            else:
+                self._succeeded(endpoint, time.monotonic() - start)
+            return response
+
+        raise error
+
+    # Health probes
+
+    def _start_prober(self) -> None:
+        if self._prober is None:
+            with self._lock:
+                if self._prober is None:
+                    self._prober = threading.Thread(target=self._probe_loop, name="task-manager-health", daemon=True)
+                    self._prober.start()
+
+    def _probe_loop(self) -> None:
+        while not self._stopped.wait(self.health_interval):
+            self.probe()
+
+    def probe(self) -> None:
+        """Check /api/health on every endpoint and update their health"""
+        for endpoint in self.endpoints:
+            try:
+                with self._client(endpoint.base_url) as client:
+                    healthy = client.get("/api/health", timeout=min(self.timeout, 2)).status_code < 500
+            except httpx.HTTPError:
+                healthy = False
+            with self._lock:
+                endpoint.healthy = healthy
+                if healthy:
+                    endpoint.failures = 0
+
+    def warm_up(self, connections: int = 1, probe: bool = False) -> Dict[str, Any]:
+        """Open pooled connections to every endpoint; a probe also updates their health"""
+        results = [self._warm(endpoint.base_url, connections, probe) for endpoint in self.endpoints]
+        if probe:
+            with self._lock:
+                for endpoint, result in zip(self.endpoints, results):
+                    endpoint.healthy = result.get("healthy", False)
+        self.warm_up_result = {
+            "success": any(result["success"] for result in results),
+            "connections": sum(result.get("connections", 0) for result in results),
+            "endpoints": results
+        }
+        return self.warm_up_result
+
+    def close(self) -> None:
+        """Stop the health probes"""
+        self._stopped.set()
+
+    def endpoint_stats(self) -> List[Dict[str, Any]]:
+        """Health, load and latency of each endpoint"""
+        with self._lock:
+            return [endpoint.stats() for endpoint in self.endpoints]
+
+    def health_check(self) -> Dict[str, Any]:
+        """Health check of every endpoint"""
+        self.probe()
+        endpoints = self.endpoint_stats()
+        healthy = sum(1 for endpoint in endpoints if endpoint["healthy"])
+        return {
+            "success": healthy > 0,
+            "message": f"{healthy}/{len(endpoints)} Task Manager endpoints healthy",
+            "endpoints": endpoints
+        }
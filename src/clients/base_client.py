@@ -4,7 +4,13 @@ Base client interface for Task Manager clients
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Set
+
+from src.clients.batch import fetch_tasks
+
+
+# Largest list_executions / list_tasks page the API accepts
+MAX_PAGE_SIZE = 100
 
 
 class TaskManagerClientBase(ABC):
@@ -77,3 +83,162 @@ class TaskManagerClientBase(ABC):
             Dict with 'success' bool and health information
         """
         pass
+    
+    # Read endpoints. Not every backend implements them, so they are optional.
+    
+    def list_executions(
+        self,
+        task_id: Optional[str] = None,
+        status: Optional[str] = None,
+        page: Optional[int] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Query executions with pagination
+        
+        Args:
+            task_id: Filter by task ID (optional)
+            status: Filter by status - running, completed, failed, rejected (optional)
+            page: Page number, 1-based (optional)
+            limit: Results per page, 1-100 (optional)
+            fields: Execution fields to return (optional, default: all).
+                Heavy fields left out of the projection are never decoded.
+            
+        Returns:
+            Dict with 'success' bool and 'data' (executions, page, limit, total_count) or 'error'
+        """
+        return self._unsupported("list_executions")
+    
+    def iter_executions(
+        self,
+        task_id: Optional[str] = None,
+        status: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        page_size: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """Page through list_executions, newest first
+        
+        Executions started while paging push older ones onto the next page;
+        those already yielded on the previous page are dropped from it, so
+        each execution is yielded once. Only one page is held at a time.
+        
+        Args:
+            task_id: Filter by task ID (optional)
+            status: Filter by status (optional)
+            fields: Execution fields to return (optional, default: all); execution_id
+                is needed to drop repeats
+            page_size: Results per page, 1-100
+            
+        Yields:
+            Each page's list_executions result; a failed page is yielded last
+        """
+        page = 1
+        previous: Set[str] = set()
+        while True:
+            result = self.list_executions(task_id=task_id, status=status, page=page, limit=page_size, fields=fields)
+            if not result.get("success"):
+                yield result
+                return
+            data = result.get("data") or {}
+            executions = data.get("executions") or []
+            result["data"] = {**data, "executions": [e for e in executions if e.get("execution_id") not in previous]}
+            yield result
+            if len(executions) < page_size:
+                return
+            previous = {e.get("execution_id") for e in executions if e.get("execution_id")}
+            page += 1
+    
+    def get_task(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get a task by ID, including JIRA ticket details
+        
+        Args:
+            task_id: Task identifier
+            fields: Task fields to return (optional, default: all)
+            
+        Returns:
+            Dict with 'success' bool and task data or 'error'
+        """
+        return self._unsupported("get_task")
+    
+    def get_tasks(self, task_ids: List[str], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get many tasks by ID
+        
+        Repeated ids are fetched once, and the rest concurrently by a bounded
+        number of workers (see batch.py). Backends that can look tasks up in
+        one query override this.
+        
+        Args:
+            task_ids: Task identifiers
+            fields: Task fields to return (optional, default: all)
+            
+        Returns:
+            Dict with 'success' bool and 'data' (tasks in input order, each with
+            its own 'success' and data or 'error'; total_count, failed_count,
+            cached_count) or 'error'
+        """
+        return fetch_tasks(self.get_task, task_ids, fields)
+    
+    def list_tasks(self, status: Optional[str] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """List all tasks
+        
+        Args:
+            status: Filter by status - running, success, failed (optional)
+            fields: Task fields to return (optional, default: all)
+            
+        Returns:
+            Dict with 'success' bool and 'data' (tasks, total_count) or 'error'
+        """
+        return self._unsupported("list_tasks")
+    
+    def get_active_execution(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get the currently running execution of a task
+        
+        Args:
+            task_id: Task identifier
+            fields: Execution fields to return (optional, default: all)
+            
+        Returns:
+            Dict with 'success' bool and execution data or 'error'
+        """
+        return self._unsupported("get_active_execution")
+    
+    def get_logs(self, lines: Optional[int] = None) -> Dict[str, Any]:
+        """Get the latest Task Manager log lines
+        
+        Args:
+            lines: Number of lines, 1-1000 (optional, default: 100)
+            
+        Returns:
+            Dict with 'success' bool and 'data' (logs, lines, total_lines) or 'error'
+        """
+        return self._unsupported("get_logs")
+    
+    def dashboard_health(self) -> Dict[str, Any]:
+        """Check service health with system metrics
+        
+        Returns:
+            Dict with 'success' bool, status, timestamp, cpu_percent,
+            memory_percent, memory_used_mb and avg_latency_ms, or 'error'
+        """
+        return self._unsupported("dashboard_health")
+    
+    def warm_up(self, connections: int = 1, probe: bool = False) -> Dict[str, Any]:
+        """Prepare for the first call, e.g. open connections ahead of time
+        
+        Clients without connections have nothing to warm up.
+        
+        Args:
+            connections: Connections to open per endpoint
+            probe: Also check /api/health
+            
+        Returns:
+            Dict with 'success' bool and what was warmed up
+        """
+        return {"success": True, "connections": 0}
+    
+    def _unsupported(self, operation: str) -> Dict[str, Any]:
+        """Error result for an optional operation this client does not implement"""
+        return {
+            "success": False,
+            "error": f"{operation} is not supported by {type(self).__name__}"
+        }
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Batch task lookup: many /api/tasks/{task-id} reads as one call
+
+Ids are deduplicated, tasks still in the cache are served from it, and the
+rest are fetched concurrently by at most TASK_MANAGER_BATCH_CONCURRENCY
+workers. That bounds the pooled connections a batch of hundreds of ids
+opens. Results come back in input order, one per input id, each with its
+own success or error.
+
+Configuration:
+    TASK_MANAGER_BATCH_CONCURRENCY: Tasks fetched at once by one batch (default: 8)
+    TASK_MANAGER_TASK_CACHE_TTL: Seconds a fetched task is reused by batches (default: 2, 0 disables)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Most ids one batch accepts
+MAX_BATCH = 500
+
+
+class TaskCache:
+    """Short-lived cache of get_task results, keyed by task and projection"""
+
+    def __init__(self, ttl: float = 2.0, max_entries: int = 10_000):
+        """
+        Args:
+            ttl: Seconds a task is served from the cache
+            max_entries: Entries kept at most; the oldest are dropped first
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, Optional[Tuple[str, ...]]], Tuple[float, Dict[str, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "TaskCache":
+        return cls(ttl=float(os.getenv('TASK_MANAGER_TASK_CACHE_TTL', '2')))
+
+    @staticmethod
+    def _key(task_id: str, fields: Optional[List[str]]) -> Tuple[str, Optional[Tuple[str, ...]]]:
+        return task_id, tuple(fields) if fields else None
+
+    def get(self, task_id: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """A cached successful get_task result, or None"""
+        key = self._key(task_id, fields)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, task_id: str, fields: Optional[List[str]], result: Dict[str, Any]) -> None:
+        if self.ttl <= 0 or not result.get("success"):
+            return
+        key = self._key(task_id, fields)
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"ttl": self.ttl, "entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def batch_concurrency() -> int:
+    return max(1, int(os.getenv('TASK_MANAGER_BATCH_CONCURRENCY', '8')))
+
+
+def fetch_tasks(
+    get_task: Callable[..., Dict[str, Any]],
+    task_ids: List[str],
+    fields: Optional[List[str]] = None,
+    cache: Optional[TaskCache] = None,
+    concurrency: Optional[int] = None
+) -> Dict[str, Any]:
+    """Look up tasks with get_task, deduplicated, cached and bounded
+
+    Args:
+        get_task: The client's get_task(task_id, fields=...)
+        task_ids: Task ids, possibly repeated
+        fields: Task fields to return (optional, default: all)
+        cache: Cache to serve from and fill (optional)
+        concurrency: Tasks fetched at once (default: TASK_MANAGER_BATCH_CONCURRENCY or 8)
+
+    Returns:
+        Dict with 'data' holding one result per input id in input order, and
+        total_count, failed_count and cached_count. 'success' is False only
+        when every lookup failed for a reason other than "not found".
+    """
+    if len(task_ids) > MAX_BATCH:
+        return {"success": False, "error": f"At most {MAX_BATCH} task ids per batch, got {len(task_ids)}"}
+
+    unique = list(dict.fromkeys(task_ids))
+    results: Dict[str, Dict[str, Any]] = {}
+    cached = 0
+    if cache is not None:
+        for task_id in unique:
+            hit = cache.get(task_id, fields)
+            if hit is not None:
+                results[task_id] = hit
+                cached += 1
+    missing = [task_id for task_id in unique if task_id not in results]
+
+    def fetch(task_id: str) -> Dict[str, Any]:
+        try:
+            result = get_task(task_id, fields=fields)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        if cache is not None:
+            cache.put(task_id, fields, result)
+        return result
+
+    workers = min(concurrency or batch_concurrency(), len(missing))
+    if workers == 1:
+        for task_id in missing:
+            results[task_id] = fetch(task_id)
+    elif workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="get-tasks") as pool:
+            # Each fetch runs in a copy of the caller's context, so it keeps the caller's deadline
+            futures = [pool.submit(copy_context().run, fetch, task_id) for task_id in missing]
+            for task_id, future in zip(missing, futures):
+                results[task_id] = future.result()
+
+    tasks = []
+    for task_id in task_ids:
+        result = results[task_id]
+        item = {"task_id": task_id, "success": bool(result.get("success"))}
+        if result.get("success"):
+            item["data"] = result.get("data")
+        else:
+            item["error"] = result.get("error")
+            if "status_code" in result:
+                item["status_code"] = result["status_code"]
+        tasks.append(item)
+
+    failed = [item for item in tasks if not item["success"]]
+    if tasks and len(failed) == len(tasks) and all(item.get("status_code") != 404 for item in failed):
+        return {"success": False, "error": failed[0]["error"], "data": {"tasks": tasks}}
+    return {
+        "success": True,
+        "data": {
+            "tasks": tasks,
+            "total_count": len(tasks),
+            "failed_count": len(failed),
+            "cached_count": cached
+        }
+    }
@@ -5,20 +5,86 @@ Factory for creating Task Manager clients
 
 import os
 
+import httpx
+
 from src.clients.base_client import TaskManagerClientBase
 from src.clients.mock_client import MockTaskManagerClient
 from src.clients.http_client import HttpTaskManagerClient
+from src.clients.balanced_client import BalancedTaskManagerClient
+from src.clients.sharded_client import ShardedTaskManagerClient
+from src.clients.sidecar_client import SidecarTaskManagerClient
+from src.clients.sqlite_client import SqliteTaskManagerClient
+from src.clients.codec import get_codec, codec_response_hook
+from src.clients.lazy_json import LazyCodec
+from src.clients.transport import create_transport
+from src.clients.generated._client import Client
 
 
 def create_task_manager_client() -> TaskManagerClientBase:
     """Factory method to create Task Manager client
     
+    TASK_MANAGER_CLIENT selects the backend: "http" (default), "mock",
+    "sqlite" or "sidecar" (forward to the local sidecar daemon, started on
+    first use). USE_MOCK_CLIENT=true still selects the mock client. An http
+    client balances over TASK_MANAGER_ENDPOINTS when that is set, or shards
+    data across TASK_MANAGER_SHARDS.
+    
     Returns:
         TaskManagerClientBase: A client instance implementing the TaskManagerClientBase interface
     """
+    kind = os.getenv('TASK_MANAGER_CLIENT', 'http').lower()
+    
     # Use mock client if in test mode
-    if os.getenv('USE_MOCK_CLIENT', 'false').lower() == 'true':
+    if kind == 'mock' or os.getenv('USE_MOCK_CLIENT', 'false').lower() == 'true':
         return MockTaskManagerClient()
     
+    if kind == 'sqlite':
+        return SqliteTaskManagerClient()
+    
+    if kind == 'sidecar':
+        return SidecarTaskManagerClient()
+    
+    if kind != 'http':
+        raise ValueError(f"Unknown TASK_MANAGER_CLIENT '{kind}'. Must be one of: http, mock, sqlite, sidecar")
+    
+    if os.getenv('TASK_MANAGER_SHARDS'):
+        return ShardedTaskManagerClient()
+    
+    if os.getenv('TASK_MANAGER_ENDPOINTS'):
+        return BalancedTaskManagerClient()
+    
     # Default to HTTP client
-    return HttpTaskManagerClient()
\ No newline at end of file
+    return HttpTaskManagerClient()
+
+
+def create_generated_client(lazy: bool = False) -> Client:
+    """Factory method to create the generated API client
+    
+    Uses the same TASK_MANAGER_* settings, JSON codec and transport (record/replay)
+    as HttpTaskManagerClient.
+    
+    Args:
+        lazy: Lazy-field model mode. Heavy ExecutionInfo fields (raw_output,
+            error_message, confidence_reason) keep a reference to the response
+            buffer and are only decoded when the model attribute is read.
+    
+    Returns:
+        Client: A generated client whose ``response.json()`` goes through the codec
+    """
+    host = os.getenv('TASK_MANAGER_HOST', 'localhost')
+    port = os.getenv('TASK_MANAGER_PORT', '8080')
+    timeout = int(os.getenv('TASK_MANAGER_TIMEOUT', '30'))
+    codec = get_codec()
+    if lazy:
+        codec = LazyCodec(codec)
+    
+    httpx_args = {
+        "event_hooks": {"response": [codec_response_hook(codec)]},
+        "transport": create_transport()
+    }
+    
+    return Client(
+        base_url=f"http://{host}:{port}",
+        timeout=httpx.Timeout(timeout),
+        httpx_args=httpx_args
+    )
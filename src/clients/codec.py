@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+JSON codec layer for Task Manager request/response bodies
+
+Bodies are encoded straight to bytes and decoded straight from bytes, so no
+intermediate str copy is made. orjson is used when it is installed, with the
+stdlib json module as fallback.
+
+Configuration:
+    TASK_MANAGER_JSON_CODEC: "auto" (default), "orjson" or "stdlib"
+"""
+
+import json
+import os
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+JsonInput = Union[bytes, bytearray, memoryview, str]
+
+
+class JsonCodec:
+    """Stdlib JSON codec"""
+
+    name = "stdlib"
+    content_type = "application/json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode an object to compact UTF-8 JSON bytes"""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: JsonInput) -> Any:
+        """Decode JSON from bytes or str"""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson-backed JSON codec"""
+
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: JsonInput) -> Any:
+        return orjson.loads(data)
+
+
+_codecs: Dict[str, JsonCodec] = {}
+
+
+def available_codecs() -> list:
+    """Names of the codecs usable in this environment"""
+    names = ["stdlib"]
+    if orjson is not None:
+        names.append("orjson")
+    return names
+
+
+def get_codec(name: str = None) -> JsonCodec:
+    """Return the codec for name, or the configured/default codec
+
+    Args:
+        name: "auto", "orjson" or "stdlib". Defaults to TASK_MANAGER_JSON_CODEC.
+
+    Returns:
+        JsonCodec: A shared codec instance
+    """
+    if name is None:
+        name = os.getenv('TASK_MANAGER_JSON_CODEC', 'auto')
+    name = name.lower()
+    if name == "auto":
+        name = "orjson" if orjson is not None else "stdlib"
+    if name not in ("orjson", "stdlib"):
+        raise ValueError(f"Unknown JSON codec '{name}'. Must be one of: auto, orjson, stdlib")
+    if name == "orjson" and orjson is None:
+        raise ValueError("JSON codec 'orjson' requested but orjson is not installed")
+
+    if name not in _codecs:
+        _codecs[name] = OrjsonCodec() if name == "orjson" else JsonCodec()
+    return _codecs[name]
+
+
+def codec_response_hook(codec: JsonCodec):
+    """Build an httpx response event hook that decodes ``response.json()`` with codec
+
+    The generated API modules parse bodies with ``response.json()``; installing
+    this hook through ``httpx_args={"event_hooks": ...}`` routes that call through
+    the codec without touching the generated code. The same hook works for the
+    sync and the async httpx client, because the generated ``Client`` passes
+    one ``httpx_args`` dict to both.
+    """
+    def hook(response):
+        response.json = lambda **kwargs: codec.loads(response.content)
+        return _DONE
+    return hook
+
+
+class _Done:
+    """Awaitable no-op so one hook can serve sync and async httpx clients"""
+
+    def __await__(self):
+        return iter(())
+
+
+_DONE = _Done()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Compression of Task Manager request and response bodies
+
+Responses: each request advertises the encodings this process can decode
+(zstd and brotli when their packages are installed, gzip always), and httpx
+decodes the response. Request bodies above a size threshold can be
+compressed too, on endpoints that are configured for it. A server answering
+415 to a compressed body gets it again uncompressed, and that endpoint is
+not compressed any more. Counters record the bytes saved in each direction.
+
+Endpoint lists are comma-separated "METHOD /route" or "/route" entries, with
+ids written as {id}, or "all" / "none".
+
+Configuration:
+    TASK_MANAGER_COMPRESS_RESPONSES: Endpoints whose responses may be compressed (default: all)
+    TASK_MANAGER_COMPRESS_REQUESTS: Endpoints whose request bodies are compressed (default: none),
+        e.g. "POST /api/executions/{id}/steps,PATCH /api/executions/{id}/steps/{id}"
+    TASK_MANAGER_COMPRESS_MIN_BYTES: Smallest request body worth compressing (default: 1024)
+    TASK_MANAGER_REQUEST_ENCODING: gzip (default), zstd or br
+"""
+
+import gzip
+import importlib
+import os
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+
+# Levels favour speed: Task Manager bodies are compressed once per request
+LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+
+def _module(*names: str) -> Optional[Any]:
+    for name in names:
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    return None
+
+
+_zstd = _module("zstandard")
+_brotli = _module("brotli", "brotlicffi")
+
+
+def available_encodings() -> List[str]:
+    """Encodings this process can produce and decode, best first"""
+    encodings = []
+    if _zstd is not None:
+        encodings.append("zstd")
+    if _brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress data with one of available_encodings()"""
+    level = LEVELS[encoding] if level is None else level
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == "zstd" and _zstd is not None:
+        return _zstd.ZstdCompressor(level=level).compress(data)
+    if encoding == "br" and _brotli is not None:
+        return _brotli.compress(data, quality=level)
+    raise ValueError(f"Encoding '{encoding}' is not available. Must be one of: {', '.join(available_encodings())}")
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    """Reverse compress()"""
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "zstd" and _zstd is not None:
+        return _zstd.ZstdDecompressor().decompressobj().decompress(data)
+    if encoding == "br" and _brotli is not None:
+        return _brotli.decompress(data)
+    raise ValueError(f"Encoding '{encoding}' is not available. Must be one of: {', '.join(available_encodings())}")
+
+
+def _endpoints(value: str) -> Optional[Set[str]]:
+    """Parsed endpoint list; None means all endpoints"""
+    value = value.strip()
+    if value.lower() == "all":
+        return None
+    if value.lower() in ("", "none"):
+        return set()
+    return {item.strip() for item in value.split(",") if item.strip()}
+
+
+def _matches(endpoints: Optional[Set[str]], method: str, route: str) -> bool:
+    return endpoints is None or f"{method} {route}" in endpoints or route in endpoints
+
+
+class CompressionPolicy:
+    """Per-endpoint compression settings and bytes-saved counters"""
+
+    def __init__(
+        self,
+        responses: str = "all",
+        requests: str = "none",
+        min_bytes: int = 1024,
+        request_encoding: str = "gzip"
+    ):
+        """
+        Args:
+            responses: Endpoints whose responses may be compressed
+            requests: Endpoints whose request bodies are compressed
+            min_bytes: Smallest request body worth compressing
+            request_encoding: Encoding of compressed request bodies
+        """
+        if request_encoding not in available_encodings():
+            raise ValueError(
+                f"Request encoding '{request_encoding}' is not available. "
+                f"Must be one of: {', '.join(available_encodings())}"
+            )
+        self.responses = _endpoints(responses)
+        self.requests = _endpoints(requests)
+        self.min_bytes = min_bytes
+        self.request_encoding = request_encoding
+        self.accept = ", ".join(available_encodings())
+        self._rejected: Set[str] = set()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_env(cls) -> "CompressionPolicy":
+        return cls(
+            responses=os.getenv('TASK_MANAGER_COMPRESS_RESPONSES', 'all'),
+            requests=os.getenv('TASK_MANAGER_COMPRESS_REQUESTS', 'none'),
+            min_bytes=int(os.getenv('TASK_MANAGER_COMPRESS_MIN_BYTES', '1024')),
+            request_encoding=os.getenv('TASK_MANAGER_REQUEST_ENCODING', 'gzip')
+        )
+
+    def accept_encoding(self, method: str, route: str) -> str:
+        """Accept-Encoding header value for a request"""
+        return self.accept if _matches(self.responses, method, route) else "identity"
+
+    def encode_request(
+        self, method: str, route: str, content: Optional[bytes], headers: Optional[Dict[str, str]]
+    ) -> Tuple[Optional[bytes], Dict[str, str]]:
+        """Request body and headers, compressed if the endpoint and size call for it"""
+        headers = dict(headers or {})
+        headers["Accept-Encoding"] = self.accept_encoding(method, route)
+        endpoint = f"{method} {route}"
+        if (
+            content is None
+            or len(content) < self.min_bytes
+            or not _matches(self.requests, method, route)
+            or endpoint in self._rejected
+        ):
+            return content, headers
+
+        encoded = compress(content, self.request_encoding)
+        if len(encoded) >= len(content):
+            return content, headers
+        self._count(endpoint, requests_compressed=1, request_bytes=len(content), request_bytes_sent=len(encoded))
+        headers["Content-Encoding"] = self.request_encoding
+        return encoded, headers
+
+    def reject(self, method: str, route: str) -> None:
+        """The server does not accept compressed bodies on this endpoint"""
+        with self._lock:
+            self._rejected.add(f"{method} {route}")
+
+    def record_response(self, method: str, route: str, response: httpx.Response) -> None:
+        """Count the bytes a compressed response saved on the wire"""
+        if response.headers.get("Content-Encoding", "identity") == "identity":
+            return
+        self._count(
+            f"{method} {route}",
+            responses_compressed=1,
+            response_bytes=len(response.content),
+            response_bytes_received=response.num_bytes_downloaded
+        )
+
+    def _count(self, endpoint: str, **values: int) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(endpoint, {})
+            for name, value in values.items():
+                counters[name] = counters.get(name, 0) + value
+
+    def stats(self) -> Dict[str, Any]:
+        """Bytes saved per endpoint and in total"""
+        with self._lock:
+            endpoints = {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
+            rejected = sorted(self._rejected)
+        for counters in endpoints.values():
+            counters["bytes_saved"] = (
+                counters.get("request_bytes", 0) - counters.get("request_bytes_sent", 0)
+                + counters.get("response_bytes", 0) - counters.get("response_bytes_received", 0)
+            )
+        return {
+            "bytes_saved": sum(counters["bytes_saved"] for counters in endpoints.values()),
+            "endpoints": endpoints,
+            "request_compression_rejected": rejected
+        }
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Deadlines shared by everything one MCP tool call does
+
+A tool call opens a deadline with its budget; every Task Manager request made
+under it opens a nested one with the endpoint's budget, and the earlier of
+the two applies. Time spent queueing, acquiring a pooled connection, failing
+over and hedging all comes out of the same remaining budget, and each HTTP
+attempt sends what is left to the server in the ``X-Deadline-Ms`` header.
+
+The deadline lives in a context variable, so it follows the call into
+threads only when they are started with ``contextvars.copy_context()``.
+
+Configuration:
+    TASK_MANAGER_TOOL_DEADLINES: Per-tool budgets overriding the defaults, e.g. "create_step=3,list_tasks=20"
+    TASK_MANAGER_ENDPOINT_DEADLINES: Per-endpoint budgets, e.g. "GET /api/logs=120,GET /api/health=2"
+"""
+
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import httpx
+
+
+DEADLINE_HEADER = "X-Deadline-Ms"
+
+# Seconds; tools not listed here are bounded by their requests' endpoint budgets
+TOOL_DEADLINES: Dict[str, float] = {
+    "update_execution_session": 5,
+    "create_step": 5,
+    "update_step": 5,
+    "get_task": 10,
+    "get_tasks": 20,
+    "get_active_execution": 10,
+    "get_task_overview": 10,
+    "list_executions": 15,
+    "list_tasks": 15,
+    "query_execution_stats": 60,
+    "execution_analytics": 60,
+    "cluster_failures": 60,
+    "step_duration_profile": 30,
+    "health_check": 3,
+}
+
+# Seconds, keyed by "METHOD route" with ids replaced by {id}; other endpoints
+# use TASK_MANAGER_TIMEOUT
+ENDPOINT_DEADLINES: Dict[str, float] = {
+    "PATCH /api/executions/{id}": 5,
+    "POST /api/executions/{id}/steps": 5,
+    "PATCH /api/executions/{id}/steps/{id}": 5,
+    "GET /api/health": 3,
+    "GET /api/logs": 60,
+}
+
+
+class DeadlineExceeded(httpx.TimeoutException):
+    """The budget ran out before a request could be sent"""
+
+
+class Deadline:
+    """A point in time (monotonic clock) by which a call must finish"""
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("task_manager_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextmanager
+def deadline(budget: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """Run the block under a budget of seconds, or the enclosing deadline if that is sooner
+
+    None keeps the enclosing deadline unchanged.
+    """
+    outer = _current.get()
+    if budget is None or (outer is not None and outer.remaining() <= budget):
+        yield outer
+        return
+    token = _current.set(Deadline(budget))
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def request_limits(
+    headers: Optional[Dict[str, str]] = None
+) -> Tuple[Union[httpx.Timeout, Any], Optional[Dict[str, str]]]:
+    """httpx timeout and headers for one attempt under the current deadline
+
+    Returns:
+        (timeout, headers): the remaining budget as an httpx.Timeout covering
+        pool acquisition, connect, write and read, and headers with
+        X-Deadline-Ms added; the client default and unchanged headers when no
+        deadline is set
+
+    Raises:
+        DeadlineExceeded: The budget is already used up
+    """
+    current = _current.get()
+    if current is None:
+        return httpx.USE_CLIENT_DEFAULT, headers
+    remaining = current.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded(f"Deadline of {current.budget:g}s exceeded")
+    headers = dict(headers or {})
+    headers[DEADLINE_HEADER] = str(int(remaining * 1000))
+    return httpx.Timeout(remaining), headers
+
+
+def _parse_budgets(value: str) -> Dict[str, float]:
+    budgets = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, seconds = item.rsplit("=", 1)
+            budgets[name.strip()] = float(seconds)
+    return budgets
+
+
+def endpoint_budget(method: str, route: str, default: float) -> float:
+    """Budget for one request to an endpoint, in seconds"""
+    key = f"{method} {route}"
+    overrides = _parse_budgets(os.getenv('TASK_MANAGER_ENDPOINT_DEADLINES', ''))
+    return overrides.get(key, ENDPOINT_DEADLINES.get(key, default))
+
+
+def tool_budget(name: str) -> Optional[float]:
+    """Budget for one call of an MCP tool, in seconds; None if it has none"""
+    overrides = _parse_budgets(os.getenv('TASK_MANAGER_TOOL_DEADLINES', ''))
+    return overrides.get(name, TOOL_DEADLINES.get(name))
+
+
+def with_tool_deadline(func: Callable) -> Callable:
+    """Run an MCP tool, sync or async, under its budget from tool_budget()"""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with deadline(tool_budget(func.__name__)):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with deadline(tool_budget(func.__name__)):
+            return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+DNS cache for Task Manager connections
+
+httpcore resolves the host on every new connection. In Docker the host is
+often ``host.docker.internal``, whose lookup can cost as much as the request,
+so resolved addresses are kept for a TTL and shared by every connection of
+a transport. Addresses that all fail to connect are dropped from the cache
+so the next connection resolves again.
+
+Configuration:
+    TASK_MANAGER_DNS_TTL: Seconds to keep resolved addresses (default: 60, 0 disables the cache)
+"""
+
+import ipaddress
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import anyio
+import httpcore
+
+
+class DnsCache:
+    """Thread-safe host -> addresses cache with a TTL"""
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, host: str, port: int) -> Optional[List[str]]:
+        """Addresses of host if known and fresh; IP literals resolve to themselves"""
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+        return None
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """Addresses of host, looked up with getaddrinfo on a miss
+
+        Raises:
+            httpcore.ConnectError: The host does not resolve
+        """
+        addresses = self.cached(host, port)
+        if addresses is not None:
+            return addresses
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as e:
+            raise httpcore.ConnectError(f"Cannot resolve {host}: {e}") from e
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self.misses += 1
+            self._entries[(host, port)] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"ttl": self.ttl, "hosts": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class CachingNetworkBackend(httpcore.NetworkBackend):
+    """httpcore network backend that connects to cached addresses
+
+    TLS still verifies and sends SNI for the original host name, which
+    httpcore passes separately from the connect address.
+    """
+
+    def __init__(self, backend: httpcore.NetworkBackend, cache: DnsCache):
+        self.backend = backend
+        self.cache = cache
+
+    def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Any] = None
+    ) -> httpcore.NetworkStream:
+        error: Optional[Exception] = None
+        for address in self.cache.resolve(host, port):
+            try:
+                return self.backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except httpcore.ConnectError as e:
+                error = e
+        self.cache.invalidate(host, port)
+        raise error
+
+    def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options: Optional[Any] = None):
+        return self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    def sleep(self, seconds: float) -> None:
+        self.backend.sleep(seconds)
+
+
+class AsyncCachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """Async counterpart of CachingNetworkBackend; lookups run in a worker thread"""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, cache: DnsCache):
+        self.backend = backend
+        self.cache = cache
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Any] = None
+    ) -> httpcore.AsyncNetworkStream:
+        addresses = self.cache.cached(host, port)
+        if addresses is None:
+            addresses = await anyio.to_thread.run_sync(self.cache.resolve, host, port)
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self.backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except httpcore.ConnectError as e:
+                error = e
+        self.cache.invalidate(host, port)
+        raise error
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options: Optional[Any] = None):
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
@@ -1,3 +1,4 @@
+# generation-profile: compact
 from __future__ import annotations
 
 from collections.abc import Mapping
@@ -15,7 +16,7 @@ if TYPE_CHECKING:
 T = TypeVar("T", bound="HttpActiveExecutionResponse")
 
 
-@_attrs_define
+@_attrs_define(slots=True, frozen=True, eq=True, hash=False)
 class HttpActiveExecutionResponse:
     """
     Attributes:
@@ -25,7 +26,7 @@ class HttpActiveExecutionResponse:
 
     data: HttpExecutionInfo | Unset = UNSET
     success: bool | Unset = UNSET
-    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+    _additional_properties: dict[str, Any] | None = _attrs_field(default=None, kw_only=True)
 
     def to_dict(self) -> dict[str, Any]:
         data: dict[str, Any] | Unset = UNSET
@@ -35,7 +36,8 @@ class HttpActiveExecutionResponse:
         success = self.success
 
         field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
         field_dict.update({})
         if data is not UNSET:
             field_dict["data"] = data
@@ -61,23 +63,28 @@ class HttpActiveExecutionResponse:
         http_active_execution_response = cls(
             data=data,
             success=success,
+            additional_properties=d or None,
         )
-
-        http_active_execution_response.additional_properties = d
         return http_active_execution_response
 
+    @property
+    def additional_properties(self) -> dict[str, Any]:
+        if self._additional_properties is None:
+            object.__setattr__(self, "_additional_properties", {})
+        return self._additional_properties
+
     @property
     def additional_keys(self) -> list[str]:
-        return list(self.additional_properties.keys())
+        return list(self._additional_properties or ())
 
     def __getitem__(self, key: str) -> Any:
-        return self.additional_properties[key]
+        return (self._additional_properties or {})[key]
 
     def __setitem__(self, key: str, value: Any) -> None:
         self.additional_properties[key] = value
 
     def __delitem__(self, key: str) -> None:
-        del self.additional_properties[key]
+        del (self._additional_properties or {})[key]
 
     def __contains__(self, key: str) -> bool:
-        return key in self.additional_properties
+        return key in (self._additional_properties or ())
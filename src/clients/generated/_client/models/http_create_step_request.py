@@ -1,3 +1,4 @@
+# generation-profile: compact
 from __future__ import annotations
 
 from collections.abc import Mapping
@@ -6,12 +7,12 @@ from typing import Any, TypeVar
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
 
-from ..types import UNSET, Unset
+from ..types import UNSET, Unset, intern_str
 
 T = TypeVar("T", bound="HttpCreateStepRequest")
 
 
-@_attrs_define
+@_attrs_define(slots=True, frozen=True, eq=True, hash=False)
 class HttpCreateStepRequest:
     """
     Attributes:
@@ -23,7 +24,7 @@ class HttpCreateStepRequest:
     step_name: str
     message: str | Unset = UNSET
     status: str | Unset = UNSET
-    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+    _additional_properties: dict[str, Any] | None = _attrs_field(default=None, kw_only=True)
 
     def to_dict(self) -> dict[str, Any]:
         step_name = self.step_name
@@ -33,7 +34,8 @@ class HttpCreateStepRequest:
         status = self.status
 
         field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
         field_dict.update(
             {
                 "step_name": step_name,
@@ -49,33 +51,38 @@ class HttpCreateStepRequest:
     @classmethod
     def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
         d = dict(src_dict)
-        step_name = d.pop("step_name")
+        step_name = intern_str(d.pop("step_name"))
 
         message = d.pop("message", UNSET)
 
-        status = d.pop("status", UNSET)
+        status = intern_str(d.pop("status", UNSET))
 
         http_create_step_request = cls(
             step_name=step_name,
             message=message,
             status=status,
+            additional_properties=d or None,
         )
-
-        http_create_step_request.additional_properties = d
         return http_create_step_request
 
+    @property
+    def additional_properties(self) -> dict[str, Any]:
+        if self._additional_properties is None:
+            object.__setattr__(self, "_additional_properties", {})
+        return self._additional_properties
+
     @property
     def additional_keys(self) -> list[str]:
-        return list(self.additional_properties.keys())
+        return list(self._additional_properties or ())
 
     def __getitem__(self, key: str) -> Any:
-        return self.additional_properties[key]
+        return (self._additional_properties or {})[key]
 
     def __setitem__(self, key: str, value: Any) -> None:
         self.additional_properties[key] = value
 
     def __delitem__(self, key: str) -> None:
-        del self.additional_properties[key]
+        del (self._additional_properties or {})[key]
 
     def __contains__(self, key: str) -> bool:
-        return key in self.additional_properties
+        return key in (self._additional_properties or ())
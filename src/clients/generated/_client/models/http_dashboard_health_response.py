@@ -1,3 +1,4 @@
+# generation-profile: compact
 from __future__ import annotations
 
 from collections.abc import Mapping
@@ -6,12 +7,12 @@ from typing import Any, TypeVar
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
 
-from ..types import UNSET, Unset
+from ..types import UNSET, Unset, intern_str
 
 T = TypeVar("T", bound="HttpDashboardHealthResponse")
 
 
-@_attrs_define
+@_attrs_define(slots=True, frozen=True, eq=True, hash=False)
 class HttpDashboardHealthResponse:
     """
     Attributes:
@@ -29,7 +30,7 @@ class HttpDashboardHealthResponse:
     memory_used_mb: float | Unset = UNSET
     status: str | Unset = UNSET
     timestamp: str | Unset = UNSET
-    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+    _additional_properties: dict[str, Any] | None = _attrs_field(default=None, kw_only=True)
 
     def to_dict(self) -> dict[str, Any]:
         avg_latency_ms = self.avg_latency_ms
@@ -45,7 +46,8 @@ class HttpDashboardHealthResponse:
         timestamp = self.timestamp
 
         field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
         field_dict.update({})
         if avg_latency_ms is not UNSET:
             field_dict["avg_latency_ms"] = avg_latency_ms
@@ -73,7 +75,7 @@ class HttpDashboardHealthResponse:
 
         memory_used_mb = d.pop("memory_used_mb", UNSET)
 
-        status = d.pop("status", UNSET)
+        status = intern_str(d.pop("status", UNSET))
 
         timestamp = d.pop("timestamp", UNSET)
 
@@ -84,23 +86,28 @@ class HttpDashboardHealthResponse:
             memory_used_mb=memory_used_mb,
             status=status,
             timestamp=timestamp,
+            additional_properties=d or None,
         )
-
-        http_dashboard_health_response.additional_properties = d
         return http_dashboard_health_response
 
+    @property
+    def additional_properties(self) -> dict[str, Any]:
+        if self._additional_properties is None:
+            object.__setattr__(self, "_additional_properties", {})
+        return self._additional_properties
+
     @property
     def additional_keys(self) -> list[str]:
-        return list(self.additional_properties.keys())
+        return list(self._additional_properties or ())
 
     def __getitem__(self, key: str) -> Any:
-        return self.additional_properties[key]
+        return (self._additional_properties or {})[key]
 
     def __setitem__(self, key: str, value: Any) -> None:
         self.additional_properties[key] = value
 
     def __delitem__(self, key: str) -> None:
-        del self.additional_properties[key]
+        del (self._additional_properties or {})[key]
 
     def __contains__(self, key: str) -> bool:
-        return key in self.additional_properties
+        return key in (self._additional_properties or ())
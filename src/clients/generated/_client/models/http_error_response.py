@@ -1,3 +1,4 @@
+# generation-profile: compact
 from __future__ import annotations
 
 from collections.abc import Mapping
@@ -11,7 +12,7 @@ from ..types import UNSET, Unset
 T = TypeVar("T", bound="HttpErrorResponse")
 
 
-@_attrs_define
+@_attrs_define(slots=True, frozen=True, eq=True, hash=False)
 class HttpErrorResponse:
     """
     Attributes:
@@ -25,7 +26,7 @@ class HttpErrorResponse:
     error_code: str | Unset = UNSET
     success: bool | Unset = UNSET
     timestamp: str | Unset = UNSET
-    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+    _additional_properties: dict[str, Any] | None = _attrs_field(default=None, kw_only=True)
 
     def to_dict(self) -> dict[str, Any]:
         error = self.error
@@ -37,7 +38,8 @@ class HttpErrorResponse:
         timestamp = self.timestamp
 
         field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
         field_dict.update({})
         if error is not UNSET:
             field_dict["error"] = error
@@ -66,23 +68,28 @@ class HttpErrorResponse:
             error_code=error_code,
             success=success,
             timestamp=timestamp,
+            additional_properties=d or None,
         )
-
-        http_error_response.additional_properties = d
         return http_error_response
 
+    @property
+    def additional_properties(self) -> dict[str, Any]:
+        if self._additional_properties is None:
+            object.__setattr__(self, "_additional_properties", {})
+        return self._additional_properties
+
     @property
     def additional_keys(self) -> list[str]:
-        return list(self.additional_properties.keys())
+        return list(self._additional_properties or ())
 
     def __getitem__(self, key: str) -> Any:
-        return self.additional_properties[key]
+        return (self._additional_properties or {})[key]
 
     def __setitem__(self, key: str, value: Any) -> None:
         self.additional_properties[key] = value
 
     def __delitem__(self, key: str) -> None:
-        del self.additional_properties[key]
+        del (self._additional_properties or {})[key]
 
     def __contains__(self, key: str) -> bool:
-        return key in self.additional_properties
+        return key in (self._additional_properties or ())
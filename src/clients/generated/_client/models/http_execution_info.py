@@ -1,3 +1,4 @@
+# generation-profile: compact
 from __future__ import annotations
 
 from collections.abc import Mapping
@@ -6,12 +7,12 @@ from typing import Any, TypeVar
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
 
-from ..types import UNSET, Unset
+from ..types import UNSET, Lazy, Unset, intern_str, resolve_lazy
 
 T = TypeVar("T", bound="HttpExecutionInfo")
 
 
-@_attrs_define
+@_attrs_define(slots=True, frozen=True, eq=True, hash=False)
 class HttpExecutionInfo:
     """
     Attributes:
@@ -37,11 +38,11 @@ class HttpExecutionInfo:
     commit_sha: str | Unset = UNSET
     completed_at: str | Unset = UNSET
     confidence_level: int | Unset = UNSET
-    confidence_reason: str | Unset = UNSET
+    _confidence_reason: str | Unset | Lazy = UNSET
     cost_usd: float | Unset = UNSET
-    error_message: str | Unset = UNSET
+    _error_message: str | Unset | Lazy = UNSET
     execution_id: str | Unset = UNSET
-    raw_output: str | Unset = UNSET
+    _raw_output: str | Unset | Lazy = UNSET
     sandbox_type: str | Unset = UNSET
     session_id: str | Unset = UNSET
     started_at: str | Unset = UNSET
@@ -49,7 +50,19 @@ class HttpExecutionInfo:
     task_id: str | Unset = UNSET
     trigger_type: str | Unset = UNSET
     worktree_path: str | Unset = UNSET
-    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+    _additional_properties: dict[str, Any] | None = _attrs_field(default=None, kw_only=True)
+
+    @property
+    def confidence_reason(self) -> str | Unset:
+        return resolve_lazy(self._confidence_reason)
+
+    @property
+    def error_message(self) -> str | Unset:
+        return resolve_lazy(self._error_message)
+
+    @property
+    def raw_output(self) -> str | Unset:
+        return resolve_lazy(self._raw_output)
 
     def to_dict(self) -> dict[str, Any]:
         comment_id = self.comment_id
@@ -85,7 +98,8 @@ class HttpExecutionInfo:
         worktree_path = self.worktree_path
 
         field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
         field_dict.update({})
         if comment_id is not UNSET:
             field_dict["comment_id"] = comment_id
@@ -143,17 +157,17 @@ class HttpExecutionInfo:
 
         raw_output = d.pop("raw_output", UNSET)
 
-        sandbox_type = d.pop("sandbox_type", UNSET)
+        sandbox_type = intern_str(d.pop("sandbox_type", UNSET))
 
         session_id = d.pop("session_id", UNSET)
 
         started_at = d.pop("started_at", UNSET)
 
-        status = d.pop("status", UNSET)
+        status = intern_str(d.pop("status", UNSET))
 
         task_id = d.pop("task_id", UNSET)
 
-        trigger_type = d.pop("trigger_type", UNSET)
+        trigger_type = intern_str(d.pop("trigger_type", UNSET))
 
         worktree_path = d.pop("worktree_path", UNSET)
 
@@ -174,23 +188,28 @@ class HttpExecutionInfo:
             task_id=task_id,
             trigger_type=trigger_type,
             worktree_path=worktree_path,
+            additional_properties=d or None,
         )
-
-        http_execution_info.additional_properties = d
         return http_execution_info
 
+    @property
+    def additional_properties(self) -> dict[str, Any]:
+        if self._additional_properties is None:
+            object.__setattr__(self, "_additional_properties", {})
+        return self._additional_properties
+
     @property
     def additional_keys(self) -> list[str]:
-        return list(self.additional_properties.keys())
+        return list(self._additional_properties or ())
 
     def __getitem__(self, key: str) -> Any:
-        return self.additional_properties[key]
+        return (self._additional_properties or {})[key]
 
     def __setitem__(self, key: str, value: Any) -> None:
         self.additional_properties[key] = value
 
     def __delitem__(self, key: str) -> None:
-        del self.additional_properties[key]
+        del (self._additional_properties or {})[key]
 
     def __contains__(self, key: str) -> bool:
-        return key in self.additional_properties
+        return key in (self._additional_properties or ())
@@ -1,3 +1,4 @@
+# generation-profile: compact
 from __future__ import annotations
 
 from collections.abc import Mapping
@@ -6,12 +7,12 @@ from typing import Any, TypeVar
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
 
-from ..types import UNSET, Unset
+from ..types import UNSET, Unset, intern_str
 
 T = TypeVar("T", bound="HttpJIRATicketInfo")
 
 
-@_attrs_define
+@_attrs_define(slots=True, frozen=True, eq=True, hash=False)
 class HttpJIRATicketInfo:
     """
     Attributes:
@@ -29,7 +30,7 @@ class HttpJIRATicketInfo:
     reporter: str | Unset = UNSET
     status: str | Unset = UNSET
     summary: str | Unset = UNSET
-    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+    _additional_properties: dict[str, Any] | None = _attrs_field(default=None, kw_only=True)
 
     def to_dict(self) -> dict[str, Any]:
         assignee = self.assignee
@@ -45,7 +46,8 @@ class HttpJIRATicketInfo:
         summary = self.summary
 
         field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
         field_dict.update({})
         if assignee is not UNSET:
             field_dict["assignee"] = assignee
@@ -73,7 +75,7 @@ class HttpJIRATicketInfo:
 
         reporter = d.pop("reporter", UNSET)
 
-        status = d.pop("status", UNSET)
+        status = intern_str(d.pop("status", UNSET))
 
         summary = d.pop("summary", UNSET)
 
@@ -84,23 +86,28 @@ class HttpJIRATicketInfo:
             reporter=reporter,
             status=status,
             summary=summary,
+            additional_properties=d or None,
         )
-
-        http_jira_ticket_info.additional_properties = d
         return http_jira_ticket_info
 
+    @property
+    def additional_properties(self) -> dict[str, Any]:
+        if self._additional_properties is None:
+            object.__setattr__(self, "_additional_properties", {})
+        return self._additional_properties
+
     @property
     def additional_keys(self) -> list[str]:
-        return list(self.additional_properties.keys())
+        return list(self._additional_properties or ())
 
     def __getitem__(self, key: str) -> Any:
-        return self.additional_properties[key]
+        return (self._additional_properties or {})[key]
 
     def __setitem__(self, key: str, value: Any) -> None:
         self.additional_properties[key] = value
 
     def __delitem__(self, key: str) -> None:
-        del self.additional_properties[key]
+        del (self._additional_properties or {})[key]
 
     def __contains__(self, key: str) -> bool:
-        return key in self.additional_properties
+        return key in (self._additional_properties or ())
@@ -1,3 +1,4 @@
+# generation-profile: compact
 from __future__ import annotations
 
 from collections.abc import Mapping
@@ -11,7 +12,7 @@ from ..types import UNSET, Unset
 T = TypeVar("T", bound="HttpPatchExecutionRequest")
 
 
-@_attrs_define
+@_attrs_define(slots=True, frozen=True, eq=True, hash=False)
 class HttpPatchExecutionRequest:
     """
     Attributes:
@@ -21,7 +22,7 @@ class HttpPatchExecutionRequest:
 
     session_id: str | Unset = UNSET
     worktree_path: str | Unset = UNSET
-    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+    _additional_properties: dict[str, Any] | None = _attrs_field(default=None, kw_only=True)
 
     def to_dict(self) -> dict[str, Any]:
         session_id = self.session_id
@@ -29,7 +30,8 @@ class HttpPatchExecutionRequest:
         worktree_path = self.worktree_path
 
         field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
         field_dict.update({})
         if session_id is not UNSET:
             field_dict["session_id"] = session_id
@@ -48,23 +50,28 @@ class HttpPatchExecutionRequest:
         http_patch_execution_request = cls(
             session_id=session_id,
             worktree_path=worktree_path,
+            additional_properties=d or None,
         )
-
-        http_patch_execution_request.additional_properties = d
         return http_patch_execution_request
 
+    @property
+    def additional_properties(self) -> dict[str, Any]:
+        if self._additional_properties is None:
+            object.__setattr__(self, "_additional_properties", {})
+        return self._additional_properties
+
     @property
     def additional_keys(self) -> list[str]:
-        return list(self.additional_properties.keys())
+        return list(self._additional_properties or ())
 
     def __getitem__(self, key: str) -> Any:
-        return self.additional_properties[key]
+        return (self._additional_properties or {})[key]
 
     def __setitem__(self, key: str, value: Any) -> None:
         self.additional_properties[key] = value
 
     def __delitem__(self, key: str) -> None:
-        del self.additional_properties[key]
+        del (self._additional_properties or {})[key]
 
     def __contains__(self, key: str) -> bool:
-        return key in self.additional_properties
+        return key in (self._additional_properties or ())
@@ -1,3 +1,4 @@
+# generation-profile: compact
 from __future__ import annotations
 
 from collections.abc import Mapping
@@ -6,12 +7,12 @@ from typing import Any, TypeVar
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
 
-from ..types import UNSET, Unset
+from ..types import UNSET, Unset, intern_str
 
 T = TypeVar("T", bound="HttpStepInfo")
 
 
-@_attrs_define
+@_attrs_define(slots=True, frozen=True, eq=True, hash=False)
 class HttpStepInfo:
     """
     Attributes:
@@ -31,7 +32,7 @@ class HttpStepInfo:
     status: str | Unset = UNSET
     step_id: str | Unset = UNSET
     step_name: str | Unset = UNSET
-    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+    _additional_properties: dict[str, Any] | None = _attrs_field(default=None, kw_only=True)
 
     def to_dict(self) -> dict[str, Any]:
         completed_at = self.completed_at
@@ -49,7 +50,8 @@ class HttpStepInfo:
         step_name = self.step_name
 
         field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
         field_dict.update({})
         if completed_at is not UNSET:
             field_dict["completed_at"] = completed_at
@@ -79,11 +81,11 @@ class HttpStepInfo:
 
         started_at = d.pop("started_at", UNSET)
 
-        status = d.pop("status", UNSET)
+        status = intern_str(d.pop("status", UNSET))
 
         step_id = d.pop("step_id", UNSET)
 
-        step_name = d.pop("step_name", UNSET)
+        step_name = intern_str(d.pop("step_name", UNSET))
 
         http_step_info = cls(
             completed_at=completed_at,
@@ -93,23 +95,28 @@ class HttpStepInfo:
             status=status,
             step_id=step_id,
             step_name=step_name,
+            additional_properties=d or None,
         )
-
-        http_step_info.additional_properties = d
         return http_step_info
 
+    @property
+    def additional_properties(self) -> dict[str, Any]:
+        if self._additional_properties is None:
+            object.__setattr__(self, "_additional_properties", {})
+        return self._additional_properties
+
     @property
     def additional_keys(self) -> list[str]:
-        return list(self.additional_properties.keys())
+        return list(self._additional_properties or ())
 
     def __getitem__(self, key: str) -> Any:
-        return self.additional_properties[key]
+        return (self._additional_properties or {})[key]
 
     def __setitem__(self, key: str, value: Any) -> None:
         self.additional_properties[key] = value
 
     def __delitem__(self, key: str) -> None:
-        del self.additional_properties[key]
+        del (self._additional_properties or {})[key]
 
     def __contains__(self, key: str) -> bool:
-        return key in self.additional_properties
+        return key in (self._additional_properties or ())
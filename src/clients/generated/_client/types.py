@@ -1,8 +1,9 @@
 """Contains some shared types for properties"""
 
+import sys
 from collections.abc import Mapping, MutableMapping
 from http import HTTPStatus
-from typing import IO, BinaryIO, Generic, Literal, TypeVar
+from typing import IO, Any, BinaryIO, Generic, Literal, TypeVar
 
 from attrs import define
 
@@ -51,4 +52,27 @@ class Response(Generic[T]):
     parsed: T | None
 
 
-__all__ = ["UNSET", "File", "FileTypes", "RequestFiles", "Response", "Unset"]
+def intern_str(value: T) -> T:
+    """Intern str values so repeated enum-like strings share one object"""
+    if type(value) is str:
+        return sys.intern(value)  # type: ignore[return-value]
+    return value
+
+
+class Lazy:
+    """Base class for field values that are decoded on first access"""
+
+    __slots__ = ()
+
+    def resolve(self) -> Any:
+        raise NotImplementedError
+
+
+def resolve_lazy(value: Any) -> Any:
+    """Return the decoded value of a Lazy, or value unchanged"""
+    if isinstance(value, Lazy):
+        return value.resolve()
+    return value
+
+
+__all__ = ["UNSET", "File", "FileTypes", "Lazy", "RequestFiles", "Response", "Unset", "intern_str", "resolve_lazy"]
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Hedged requests for idempotent reads
+
+When a GET has not answered after the client's own p95 (configurable)
+latency for that route, the same request is sent again - to another
+endpoint for BalancedTaskManagerClient, over another pooled connection
+otherwise - and the first answer wins. A budget caps hedges at a fraction of
+requests, so a slow backend does not see its load doubled during an
+incident.
+
+A synchronous request cannot be interrupted, so each attempt runs as an
+Attempt that collects the sockets it reads and writes (see
+AttemptNetworkBackend, installed by the HTTP/1.1 transports). When one attempt
+wins, the other's sockets are shut down, which ends its blocked read at once
+and frees its worker thread and connection. HTTP/2 streams share their
+connection with other requests, so there the losing attempt is abandoned.
+
+Configuration:
+    TASK_MANAGER_HEDGE: "true" to hedge GET requests
+    TASK_MANAGER_HEDGE_PERCENTILE: Latency percentile to wait before hedging (default: 95)
+    TASK_MANAGER_HEDGE_BUDGET: Maximum fraction of requests that may be hedged (default: 0.1)
+"""
+
+import bisect
+import os
+import re
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Dict, List, Optional, Set, TypeVar
+
+import httpcore
+
+T = TypeVar("T")
+
+# Samples a route needs before its percentile is trusted
+MIN_SAMPLES = 20
+# Hedge delays are never shorter than this, in seconds
+MIN_DELAY = 0.002
+# Unused budget is capped, so a long quiet period cannot fund a burst of hedges
+MAX_BUDGET_TOKENS = 10.0
+
+_ID_SEGMENT = re.compile(r"/(tasks|executions|steps)/[^/]+")
+
+
+def route_of(path: str) -> str:
+    """Path with ids replaced, so all requests for one endpoint share a histogram"""
+    return _ID_SEGMENT.sub(r"/\1/{id}", path)
+
+
+class Attempt:
+    """One of the attempts of a hedged call; cancel() shuts down the sockets it is using"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sockets: Set[socket.socket] = set()
+        self.cancelled = False
+        self.finished = False
+
+    def use(self, sock: socket.socket) -> None:
+        """Called by the network streams the attempt reads or writes"""
+        with self._lock:
+            if not self.cancelled:
+                if not self.finished:
+                    self._sockets.add(sock)
+                return
+        _shutdown(sock)
+
+    def finish(self) -> None:
+        """The attempt returned; its connections are back in the pool and no longer its own"""
+        with self._lock:
+            self.finished = True
+            self._sockets.clear()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            sockets, self._sockets = self._sockets, set()
+        for sock in sockets:
+            _shutdown(sock)
+
+
+def _shutdown(sock: socket.socket) -> None:
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass  # already closed
+
+
+_current_attempt: ContextVar[Optional[Attempt]] = ContextVar("task_manager_hedge_attempt", default=None)
+
+
+def attempt_cancelled() -> bool:
+    """True when the hedged attempt running in this context lost to the other one"""
+    attempt = _current_attempt.get()
+    return attempt is not None and attempt.cancelled
+
+
+class _AttemptStream(httpcore.NetworkStream):
+    """Network stream that hands its socket to the attempt using it"""
+
+    def __init__(self, stream: httpcore.NetworkStream):
+        self.stream = stream
+
+    def _enlist(self) -> None:
+        attempt = _current_attempt.get()
+        if attempt is not None:
+            sock = self.stream.get_extra_info("socket")
+            if sock is not None:
+                attempt.use(sock)
+
+    def read(self, max_bytes: int, timeout: Optional[float] = None) -> bytes:
+        self._enlist()
+        return self.stream.read(max_bytes, timeout)
+
+    def write(self, buffer: bytes, timeout: Optional[float] = None) -> None:
+        self._enlist()
+        self.stream.write(buffer, timeout)
+
+    def close(self) -> None:
+        self.stream.close()
+
+    def start_tls(self, ssl_context: Any, server_hostname: Optional[str] = None, timeout: Optional[float] = None):
+        return _AttemptStream(self.stream.start_tls(ssl_context, server_hostname, timeout))
+
+    def get_extra_info(self, info: str) -> Any:
+        return self.stream.get_extra_info(info)
+
+
+class AttemptNetworkBackend(httpcore.NetworkBackend):
+    """httpcore network backend whose streams can be shut down by a cancelled Attempt"""
+
+    def __init__(self, backend: httpcore.NetworkBackend):
+        self.backend = backend
+
+    def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Any] = None
+    ) -> httpcore.NetworkStream:
+        return _AttemptStream(self.backend.connect_tcp(host, port, timeout, local_address, socket_options))
+
+    def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options: Optional[Any] = None):
+        return _AttemptStream(self.backend.connect_unix_socket(path, timeout, socket_options))
+
+    def sleep(self, seconds: float) -> None:
+        self.backend.sleep(seconds)
+
+
+class LatencyHistogram:
+    """Thread-safe latency histogram with log-spaced buckets (1.1x wide, from 0.1ms)"""
+
+    _BOUNDS: List[float] = [0.0001 * 1.1 ** i for i in range(160)]  # up to ~400s
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self._BOUNDS) + 1)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        index = bisect.bisect_left(self._BOUNDS, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound of the bucket holding the p-th percentile; None if empty"""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = self.count * p / 100
+            seen = 0
+            for index, count in enumerate(self._counts):
+                seen += count
+                if seen >= rank and count:
+                    return self._BOUNDS[min(index, len(self._BOUNDS) - 1)]
+        return self._BOUNDS[-1]
+
+
+class HedgeBudget:
+    """Token bucket: every request earns ``ratio`` tokens, every hedge spends one"""
+
+    def __init__(self, ratio: float):
+        self.ratio = ratio
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, MAX_BUDGET_TOKENS)
+
+    def spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0 - 1e-9:  # ratio 0.1 earned ten times sums to 0.999...
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class Hedger:
+    """Runs idempotent calls with a hedged second attempt"""
+
+    def __init__(self, percentile: float = 95.0, budget: float = 0.1, max_workers: int = 32):
+        """
+        Args:
+            percentile: Latency percentile of the route to wait before hedging
+            budget: Maximum fraction of requests that may be hedged
+            max_workers: Threads running attempts
+        """
+        self.percentile = percentile
+        self.budget = HedgeBudget(budget)
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task-manager-hedge")
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.denied = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["Hedger"]:
+        """Hedger configured by TASK_MANAGER_HEDGE_*; None unless TASK_MANAGER_HEDGE=true"""
+        if os.getenv('TASK_MANAGER_HEDGE', 'false').lower() != 'true':
+            return None
+        return cls(
+            percentile=float(os.getenv('TASK_MANAGER_HEDGE_PERCENTILE', '95')),
+            budget=float(os.getenv('TASK_MANAGER_HEDGE_BUDGET', '0.1'))
+        )
+
+    def histogram(self, route: str) -> LatencyHistogram:
+        histogram = self._histograms.get(route)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(route, LatencyHistogram())
+        return histogram
+
+    def delay(self, route: str) -> Optional[float]:
+        """Seconds to wait before hedging a request to route; None until enough samples"""
+        histogram = self.histogram(route)
+        if histogram.count < MIN_SAMPLES:
+            return None
+        return max(histogram.percentile(self.percentile), MIN_DELAY)
+
+    def _timed(self, route: str, attempt: Callable[[], T], handle: Optional[Attempt] = None) -> T:
+        start = time.monotonic()
+        token = _current_attempt.set(handle) if handle is not None else None
+        try:
+            result = attempt()
+        finally:
+            if handle is not None:
+                handle.finish()
+                _current_attempt.reset(token)
+        self.histogram(route).record(time.monotonic() - start)
+        return result
+
+    def call(self, route: str, attempt: Callable[[], T]) -> T:
+        """Run attempt, and once more if the first has not finished after the hedge delay
+
+        Returns the first attempt to succeed; raises the first error if both
+        fail. The losing attempt is cancelled: the connections it is using are
+        shut down, so it fails at once and nothing waits for it.
+        """
+        self.budget.earn()
+        with self._lock:
+            self.requests += 1
+        delay = self.delay(route)
+        if delay is None:
+            return self._timed(route, attempt)
+
+        # Each attempt runs in a copy of the caller's context, so it keeps the caller's deadline
+        handles = {}
+        primary = self._submit(route, attempt, handles)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        if not self.budget.spend():
+            with self._lock:
+                self.denied += 1
+            return primary.result()
+
+        hedge = self._submit(route, attempt, handles)
+        with self._lock:
+            self.hedged += 1
+        return self._first_success(handles, hedge)
+
+    def _submit(self, route: str, attempt: Callable[[], T], handles: Dict[Future, Attempt]) -> Future:
+        handle = Attempt()
+        future = self._pool.submit(copy_context().run, self._timed, route, attempt, handle)
+        handles[future] = handle
+        return future
+
+    def _first_success(self, handles: Dict[Future, Attempt], hedge: Future) -> Any:
+        pending = set(handles)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()  # not started yet
+                        handles[loser].cancel()  # started: its connections are shut down
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def stats(self) -> Dict[str, Any]:
+        """Hedge counters and the current hedge delay of each route"""
+        with self._lock:
+            routes = list(self._histograms)
+            stats = {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "budget_denied": self.denied
+            }
+        stats["delay_ms"] = {
+            route: round(delay * 1000, 3) if delay is not None else None
+            for route, delay in ((route, self.delay(route)) for route in routes)
+        }
+        return stats
@@ -4,36 +4,113 @@ HTTP client implementation for Task Manager API
 """
 
 import os
-from typing import Dict, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
 import httpx
 
 from src.clients.base_client import TaskManagerClientBase
+from src.clients.batch import TaskCache, fetch_tasks
+from src.clients.codec import get_codec
+from src.clients.compression import CompressionPolicy
+from src.clients.deadline import deadline, endpoint_budget, request_limits
+from src.clients.hedging import Hedger, route_of
+from src.clients.lazy_json import LazyCodec, materialize, project
+from src.clients.transport import create_transport
 
 
 class HttpTaskManagerClient(TaskManagerClientBase):
     """HTTP implementation for Task Manager API"""
     
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None):
+        """
+        Args:
+            base_url: Task Manager base URL (default: from TASK_MANAGER_HOST/PORT)
+        """
         self.host = os.getenv('TASK_MANAGER_HOST', 'localhost')
         self.port = os.getenv('TASK_MANAGER_PORT', '8080')
-        self.base_url = f"http://{self.host}:{self.port}"
+        self.base_url = base_url or f"http://{self.host}:{self.port}"
         self.timeout = int(os.getenv('TASK_MANAGER_TIMEOUT', '30'))
+        # Set when the backend understands the "fields" query parameter
+        self.backend_projection = os.getenv('TASK_MANAGER_BACKEND_PROJECTION', 'false').lower() == 'true'
+        self.codec = get_codec()
+        self.lazy_codec = LazyCodec(self.codec)
+        self.transport: Optional[httpx.BaseTransport] = create_transport()
+        self.hedger: Optional[Hedger] = Hedger.from_env()
+        self.compression = CompressionPolicy.from_env()
+        self.warm_up_result: Optional[Dict[str, Any]] = None
+        # Recently fetched tasks, reused by get_tasks
+        self.task_cache = TaskCache.from_env()
+    
+    def _client(self, base_url: Optional[str] = None) -> httpx.Client:
+        """httpx client for one request"""
+        return httpx.Client(base_url=base_url or self.base_url, timeout=self.timeout, transport=self.transport)
+    
+    def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """Send one request within the current deadline and return its response; httpx errors propagate"""
+        timeout, headers = request_limits(headers)
+        with self._client() as client:
+            return client.request(method=method, url=path, params=params, content=content, headers=headers, timeout=timeout)
+    
+    @contextmanager
+    def _exchange(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Iterator[httpx.Response]:
+        """Send one request under its endpoint's deadline, hedged if it is a GET and hedging is on
+        
+        Yields the response; the deadline is the endpoint budget or the
+        enclosing (tool) deadline, whichever ends first. Bodies are compressed
+        as the compression policy says.
+        """
+        route = route_of(path)
+        body, body_headers = self.compression.encode_request(method, route, content, headers)
+        with deadline(endpoint_budget(method, route, self.timeout)):
+            if self.hedger is not None and method == "GET":
+                response = self.hedger.call(route, lambda: self._send(method, path, params, body, body_headers))
+            else:
+                response = self._send(method, path, params, body, body_headers)
+            if response.status_code == 415 and body is not content:
+                # The server does not take compressed bodies here; send it as is from now on
+                self.compression.reject(method, route)
+                body_headers.pop("Content-Encoding")
+                response = self._send(method, path, params, content, body_headers)
+        self.compression.record_response(method, route, response)
+        yield response
     
     def _make_request(
         self, 
         method: str, 
         path: str, 
-        json_data: Optional[Dict] = None
+        json_data: Optional[Dict] = None,
+        params: Optional[Dict[str, Any]] = None,
+        lazy: bool = False
     ) -> Dict[str, Any]:
-        """Make HTTP request and handle response"""
+        """Make HTTP request and handle response
+        
+        With lazy=True heavy execution fields in the response are left as
+        LazyText; the caller must project or materialize the result.
+        """
+        content = None
+        headers = None
+        if json_data is not None:
+            content = self.codec.dumps(json_data)
+            headers = {"Content-Type": self.codec.content_type}
+        
         try:
-            with httpx.Client(base_url=self.base_url, timeout=self.timeout) as client:
-                response = client.request(
-                    method=method,
-                    url=path,
-                    json=json_data
-                )
-                
+            with self._exchange(method, path, params=params, content=content, headers=headers) as response:
                 if response.status_code >= 400:
                     # 特殊处理常见的 HTTP 错误状态码
                     if response.status_code == 404:
@@ -53,7 +130,7 @@ class HttpTaskManagerClient(TaskManagerClientBase):
                     
                     # 尝试解析 JSON 错误响应
                     try:
-                        error_data = response.json()
+                        error_data = self.codec.loads(response.content)
                         return {
                             "success": False,
                             "error": error_data.get("error", f"HTTP {response.status_code} error"),
@@ -68,13 +145,15 @@ class HttpTaskManagerClient(TaskManagerClientBase):
                             "status_code": response.status_code
                         }
                 
-                return response.json()
+                if lazy:
+                    return self.lazy_codec.loads(response.content)
+                return self.codec.loads(response.content)
                 
-        except httpx.TimeoutException:
+        except httpx.TimeoutException as e:
             return {
                 "success": False, 
-                "error": f"Request timeout after {self.timeout} seconds",
-                "hint": "The Task Manager service may be slow or unresponsive. Try increasing TASK_MANAGER_TIMEOUT."
+                "error": f"Request timeout: {str(e) or 'deadline exceeded'}",
+                "hint": "The Task Manager service may be slow or unresponsive. Budgets are set by TASK_MANAGER_TOOL_DEADLINES, TASK_MANAGER_ENDPOINT_DEADLINES and TASK_MANAGER_TIMEOUT."
             }
         except httpx.ConnectError:
             return {
@@ -144,6 +223,50 @@ class HttpTaskManagerClient(TaskManagerClientBase):
             json_data=body
         )
     
+    def _warm(self, base_url: str, connections: int, probe: bool) -> Dict[str, Any]:
+        """Open up to ``connections`` pooled connections to base_url with concurrent requests
+        
+        Resolving the host also fills the transport's DNS cache. Without a
+        probe the requests are HEADs whose status does not matter.
+        """
+        start = time.monotonic()
+        
+        def connect(_) -> int:
+            with self._client(base_url) as client:
+                if probe:
+                    return client.get("/api/health", timeout=self.timeout).status_code
+                return client.head("/api/health", timeout=self.timeout).status_code
+        
+        try:
+            with ThreadPoolExecutor(max_workers=connections) as pool:
+                statuses = list(pool.map(connect, range(connections)))
+        except httpx.HTTPError as e:
+            return {"success": False, "base_url": base_url, "error": f"Warm-up failed: {str(e) or type(e).__name__}"}
+        
+        result = {
+            "success": True,
+            "base_url": base_url,
+            "connections": connections,
+            "elapsed_ms": round((time.monotonic() - start) * 1000, 1)
+        }
+        if probe:
+            result["healthy"] = all(status < 500 for status in statuses)
+        return result
+    
+    def warm_up(self, connections: int = 1, probe: bool = False) -> Dict[str, Any]:
+        """Resolve the host and open pooled connections before the first call
+        
+        Args:
+            connections: Connections to open
+            probe: Also check /api/health
+            
+        Returns:
+            Dict with 'success' bool, 'connections' opened, 'elapsed_ms' and,
+            with a probe, 'healthy'
+        """
+        self.warm_up_result = self._warm(self.base_url, connections, probe)
+        return self.warm_up_result
+    
     def health_check(self) -> Dict[str, Any]:
         """Health check"""
         result = self._make_request("GET", "/api/health")
@@ -159,3 +282,87 @@ class HttpTaskManagerClient(TaskManagerClientBase):
                 **result
             }
         return result
+    
+    def dashboard_health(self) -> Dict[str, Any]:
+        """Health check with system metrics"""
+        result = self._make_request("GET", "/api/dashboard/health")
+        if result.get("success", True) and "error" not in result:
+            return {"success": True, **result}
+        return result
+    
+    def _get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+        items_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET a read endpoint, projecting ``data`` (or ``data[items_key]``) to fields
+        
+        The projection is sent to the backend when it supports it, and always
+        applied here as well. Heavy fields are decoded lazily, so the ones left
+        out of the projection are never decoded.
+        """
+        params = dict(params or {})
+        if fields and self.backend_projection:
+            params["fields"] = ",".join(fields)
+        
+        # Only a projection can skip heavy fields; a full result decodes them all anyway
+        result = self._make_request("GET", path, params=params or None, lazy=bool(fields))
+        
+        data = result.get("data")
+        if fields and isinstance(data, dict):
+            if items_key is None:
+                result["data"] = project(data, fields)
+            elif isinstance(data.get(items_key), list):
+                data[items_key] = [project(item, fields) for item in data[items_key]]
+        return materialize(result)
+    
+    def get_task(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get a task by ID"""
+        result = self._get(f"/api/tasks/{task_id}", fields=fields)
+        self.task_cache.put(task_id, fields, result)
+        return result
+    
+    def get_tasks(self, task_ids: List[str], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get many tasks by ID, reusing recently fetched ones"""
+        return fetch_tasks(self._fetch_task, task_ids, fields, cache=self.task_cache)
+    
+    def _fetch_task(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        # fetch_tasks fills the cache itself
+        return self._get(f"/api/tasks/{task_id}", fields=fields)
+    
+    def list_tasks(self, status: Optional[str] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """List all tasks"""
+        params = {"status": status} if status is not None else None
+        return self._get("/api/tasks", params=params, fields=fields, items_key="tasks")
+    
+    def get_active_execution(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get the currently running execution of a task"""
+        return self._get(f"/api/tasks/{task_id}/active-execution", fields=fields)
+    
+    def get_logs(self, lines: Optional[int] = None) -> Dict[str, Any]:
+        """Get the latest Task Manager log lines"""
+        params = {"lines": lines} if lines is not None else None
+        return self._make_request("GET", "/api/logs", params=params)
+    
+    def list_executions(
+        self,
+        task_id: Optional[str] = None,
+        status: Optional[str] = None,
+        page: Optional[int] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Query executions with pagination"""
+        params = {}
+        if task_id is not None:
+            params["task-id"] = task_id
+        if status is not None:
+            params["status"] = status
+        if page is not None:
+            params["page"] = page
+        if limit is not None:
+            params["limit"] = limit
+        
+        return self._get("/api/executions", params=params, fields=fields, items_key="executions")
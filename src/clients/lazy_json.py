@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Lazy JSON decoding for heavy string fields
+
+``loads_lazy`` locates the string values of selected keys (e.g. ``raw_output``)
+in the raw response bytes without decoding them, parses the rest of the body
+with the codec, and puts ``LazyText`` placeholders in their place. A LazyText
+keeps a reference to the response buffer and decodes its slice on first access,
+so a listing that only needs ``status`` never pays for megabytes of transcript.
+
+The generated models (compact profile) accept LazyText for their heavy fields
+and resolve it on attribute access; ``materialize`` resolves them in plain
+dict/list results before they leave the client.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.clients.codec import JsonCodec, get_codec
+from src.clients.generated._client.types import Lazy
+
+
+# Heavy ExecutionInfo fields that are decoded lazily by default
+HEAVY_EXECUTION_FIELDS = ("raw_output", "error_message", "confidence_reason")
+
+# A quote that may close a value: every unescaped one that ends a value is followed
+# by one of these. Literal prefix, so sre scans for it in C
+_VALUE_CLOSE = re.compile(rb'"[ \t\r\n]*+(?:,[ \t\r\n]*+"|[}\]])')
+# Escaped closers tolerated before giving up on lazy decoding of a document
+_MAX_ESCAPED_CLOSERS = 16
+_WHITESPACE = b" \t\r\n"
+_QUOTE = 0x22
+_COLON = 0x3A
+_BACKSLASH = 0x5C
+
+# Placeholder that replaces each lazy value in the skeleton body (decoded form / encoded form)
+_PLACEHOLDER_PREFIX = "\x00lazy:"
+_PLACEHOLDER_JSON = '"\\u0000lazy:{}"'
+
+
+class LazyText(Lazy):
+    """A JSON string value decoded from the response buffer on first access"""
+
+    __slots__ = ("_buffer", "_start", "_end", "_codec", "_value")
+
+    def __init__(self, buffer: bytes, start: int, end: int, codec: JsonCodec):
+        self._buffer = buffer
+        self._start = start
+        self._end = end
+        self._codec = codec
+        self._value = None
+
+    @property
+    def encoded_size(self) -> int:
+        """Size of the encoded JSON string in bytes"""
+        return self._end - self._start
+
+    def resolve(self) -> str:
+        if self._value is None:
+            self._value = self._codec.loads(memoryview(self._buffer)[self._start:self._end])
+            self._buffer = None
+        return self._value
+
+    def __str__(self) -> str:
+        return self.resolve()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyText):
+            other = other.resolve()
+        return self.resolve() == other
+
+    def __hash__(self) -> int:
+        return hash(self.resolve())
+
+    def __repr__(self) -> str:
+        if self._value is not None:
+            return f"LazyText({self._value[:40]!r}..., decoded)"
+        return f"LazyText(<{self.encoded_size} bytes>)"
+
+
+def _escaped(buffer: bytes, index: int) -> bool:
+    """True if the byte at index is preceded by an odd number of backslashes"""
+    count = 0
+    while index > 0 and buffer[index - 1] == _BACKSLASH:
+        count += 1
+        index -= 1
+    return count % 2 == 1
+
+
+def _string_end(buffer: bytes, start: int) -> Optional[int]:
+    """Index just past the JSON string whose opening quote is at start
+
+    The value ends at its first unescaped quote, which is followed by the next
+    key's quote after a comma, or by ``}``, with or without whitespace between
+    them whatever the separators. Quotes inside the value are escaped, and plain text rarely has an
+    escaped quote followed by one of those, so the end is usually found by a
+    single C-speed search. Returns None for values dense with escaped JSON (e.g.
+    stream-json transcripts), which the C decoder parses faster than Python can
+    skip them.
+    """
+    position = start + 1
+    for _ in range(_MAX_ESCAPED_CLOSERS):
+        match = _VALUE_CLOSE.search(buffer, position)
+        if match is None:
+            raise ValueError("Unterminated JSON string")
+        if not _escaped(buffer, match.start()):
+            return match.start() + 1
+        position = match.start() + 1
+    return None
+
+
+def _lazy_value_start(buffer: bytes, key_start: int, key_size: int) -> Optional[int]:
+    """Index of the opening quote of a key's string value, or None
+
+    None means the match is not a key (escaped, or not followed by a colon) or
+    its value is not a string.
+    """
+    if _escaped(buffer, key_start):
+        return None
+    size = len(buffer)
+    index = key_start + key_size
+    while index < size and buffer[index] in _WHITESPACE:
+        index += 1
+    if index >= size or buffer[index] != _COLON:
+        return None
+    index += 1
+    while index < size and buffer[index] in _WHITESPACE:
+        index += 1
+    if index >= size or buffer[index] != _QUOTE:  # null, number or object value
+        return None
+    return index
+
+
+def _scan(buffer: bytes, keys: Iterable[str]) -> Optional[Tuple[bytes, List[Tuple[int, int]]]]:
+    """Return the body with lazy string values replaced by placeholders, plus their spans
+
+    Keys are located with bytes.find instead of tokenizing the document, and the
+    search resumes after each lazy value so the heavy bytes are only scanned once.
+    A quoted key can only occur outside string values when its opening quote is
+    unescaped and it is followed by a colon. Returns None when a lazy value is
+    too expensive to skip.
+    """
+    needles = [b'"' + key.encode("utf-8") + b'"' for key in keys]
+    next_hits = [buffer.find(needle) for needle in needles]
+
+    spans: List[Tuple[int, int]] = []
+    parts: List[bytes] = []
+    last = 0
+    while True:
+        found = [(hit, i) for i, hit in enumerate(next_hits) if hit != -1]
+        if not found:
+            break
+        key_start, i = min(found)
+        value_start = _lazy_value_start(buffer, key_start, len(needles[i]))
+        if value_start is None:
+            next_hits[i] = buffer.find(needles[i], key_start + 1)
+            continue
+        value_end = _string_end(buffer, value_start)
+        if value_end is None:
+            return None
+        spans.append((value_start, value_end))
+        parts.append(buffer[last:value_start])
+        parts.append(_PLACEHOLDER_JSON.format(len(spans) - 1).encode("ascii"))
+        last = value_end
+        # Hits inside the lazy value are not keys; search again after it
+        next_hits = [
+            buffer.find(needles[j], value_end) if hit != -1 and hit < value_end else hit
+            for j, hit in enumerate(next_hits)
+        ]
+
+    if not spans:
+        return buffer, spans
+    parts.append(buffer[last:])
+    return b"".join(parts), spans
+
+
+def _attach(node: Any, keys: frozenset, buffer: bytes, spans: List[Tuple[int, int]], codec: JsonCodec) -> None:
+    """Swap placeholders under lazy keys for LazyText values, in place"""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key in keys and type(value) is str and value.startswith(_PLACEHOLDER_PREFIX):
+                start, end = spans[int(value[len(_PLACEHOLDER_PREFIX):])]
+                node[key] = LazyText(buffer, start, end, codec)
+            elif isinstance(value, (dict, list)):
+                _attach(value, keys, buffer, spans, codec)
+    elif isinstance(node, list):
+        for item in node:
+            if isinstance(item, (dict, list)):
+                _attach(item, keys, buffer, spans, codec)
+
+
+def loads_lazy(
+    data: bytes,
+    lazy_fields: Iterable[str] = HEAVY_EXECUTION_FIELDS,
+    codec: Optional[JsonCodec] = None
+) -> Any:
+    """Decode JSON, leaving string values of lazy_fields undecoded
+
+    Args:
+        data: Raw response body
+        lazy_fields: Keys whose string values become LazyText (at any depth)
+        codec: JSON codec (default: the configured codec)
+
+    Returns:
+        The decoded document with LazyText in place of the lazy string values.
+        Documents whose lazy values are dense with escapes are decoded eagerly.
+    """
+    codec = codec or get_codec()
+    data = bytes(data)
+    keys = frozenset(lazy_fields)
+    scanned = _scan(data, keys)
+    if scanned is None:
+        return codec.loads(data)
+    skeleton, spans = scanned
+    document = codec.loads(skeleton)
+    if spans:
+        _attach(document, keys, data, spans, codec)
+    return document
+
+
+class LazyCodec(JsonCodec):
+    """Codec whose loads() leaves the string values of lazy_fields undecoded"""
+
+    def __init__(self, codec: Optional[JsonCodec] = None, lazy_fields: Iterable[str] = HEAVY_EXECUTION_FIELDS):
+        self.codec = codec or get_codec()
+        self.lazy_fields = tuple(lazy_fields)
+        self.name = f"{self.codec.name}+lazy"
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.codec.dumps(obj)
+
+    def loads(self, data: Any) -> Any:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return loads_lazy(data, self.lazy_fields, self.codec)
+
+
+def materialize(node: Any) -> Any:
+    """Resolve every LazyText in a decoded document, in place, and return it"""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if isinstance(value, Lazy):
+                node[key] = value.resolve()
+            elif isinstance(value, (dict, list)):
+                materialize(value)
+    elif isinstance(node, list):
+        for index, item in enumerate(node):
+            if isinstance(item, Lazy):
+                node[index] = item.resolve()
+            elif isinstance(item, (dict, list)):
+                materialize(item)
+    return node
+
+
+def project(item: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Keep only fields of item, resolving the kept lazy values
+
+    Dropped LazyText values are never decoded.
+    """
+    projected = {}
+    for field in fields:
+        if field in item:
+            value = item[field]
+            projected[field] = value.resolve() if isinstance(value, Lazy) else value
+    return projected
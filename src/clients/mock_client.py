@@ -1,71 +1,175 @@
 #!/usr/bin/env python3
 """
 Mock client implementation for testing
+
+An in-memory Task Manager store, safe to share between threads and usable as
+a backend for benchmarks. Steps are indexed per execution and executions per
+task, so no operation scans the whole store except unfiltered listings.
+
+Every mutation holds one lock and never awaits, so async callers can use the
+client from worker threads (``asyncio.to_thread``) as well. Returned data is a
+copy; mutating it does not change the store.
 """
 
-from typing import Dict, Any, Optional
-from datetime import datetime, timezone
+import os
+import threading
 import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
 
 from src.clients.base_client import TaskManagerClientBase
+from src.clients.batch import fetch_tasks
+from src.clients.lazy_json import project
+
+
+# Log lines kept, the most GET /api/logs returns
+MAX_LOG_LINES = 1000
 
 
 class MockTaskManagerClient(TaskManagerClientBase):
     """Mock implementation for testing without real API"""
     
-    def __init__(self):
-        self._executions: Dict[str, Dict] = {}
+    def __init__(
+        self,
+        max_executions: Optional[int] = None,
+        max_steps_per_execution: Optional[int] = None
+    ):
+        """
+        Args:
+            max_executions: Executions kept before the oldest is evicted with its
+                steps (default: MOCK_MAX_EXECUTIONS or 10000)
+            max_steps_per_execution: Steps kept per execution before the oldest
+                is evicted (default: MOCK_MAX_STEPS_PER_EXECUTION or 1000)
+        """
+        self.max_executions = max_executions or int(os.getenv('MOCK_MAX_EXECUTIONS', '10000'))
+        self.max_steps_per_execution = max_steps_per_execution or int(
+            os.getenv('MOCK_MAX_STEPS_PER_EXECUTION', '1000')
+        )
+        self._lock = threading.RLock()
+        self._tasks: Dict[str, Dict] = {}
+        # Insertion ordered, oldest first; eviction pops from the front
+        self._executions: "OrderedDict[str, Dict]" = OrderedDict()
+        self._executions_by_task: Dict[str, "OrderedDict[str, None]"] = {}
         self._steps: Dict[str, Dict] = {}
+        self._steps_by_execution: Dict[str, "OrderedDict[str, None]"] = {}
+        self._logs: "deque[str]" = deque(maxlen=MAX_LOG_LINES)
+        self._log_count = 0
+        self.evicted_executions = 0
+        self.evicted_steps = 0
+    
+    # Store helpers, called with the lock held
+    
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat()
+    
+    def _new_step_id(self) -> str:
+        """Short step id that is not in use"""
+        while True:
+            step_id = uuid.uuid4().hex[:8]
+            if step_id not in self._steps:
+                return step_id
+    
+    def _ensure_execution(self, execution_id: str) -> Dict:
+        """Return the execution, creating a running one if it does not exist"""
+        execution = self._executions.get(execution_id)
+        if execution is None:
+            execution = {
+                "execution_id": execution_id,
+                "status": "running",
+                "started_at": self._now()
+            }
+            self._insert_execution(execution)
+        return execution
+    
+    def _insert_execution(self, execution: Dict) -> None:
+        execution_id = execution["execution_id"]
+        previous = self._executions.pop(execution_id, None)
+        if previous is not None and previous.get("task_id") != execution.get("task_id"):
+            self._executions_by_task.get(previous.get("task_id"), {}).pop(execution_id, None)
+        self._executions[execution_id] = execution
+        if execution.get("task_id"):
+            self._executions_by_task.setdefault(execution["task_id"], OrderedDict())[execution_id] = None
+        self._steps_by_execution.setdefault(execution_id, OrderedDict())
+        while len(self._executions) > self.max_executions:
+            self._evict_execution(next(iter(self._executions)))
+    
+    def _evict_execution(self, execution_id: str) -> None:
+        execution = self._executions.pop(execution_id)
+        task_executions = self._executions_by_task.get(execution.get("task_id"))
+        if task_executions is not None:
+            task_executions.pop(execution_id, None)
+            if not task_executions:
+                del self._executions_by_task[execution["task_id"]]
+        for step_id in self._steps_by_execution.pop(execution_id, ()):
+            del self._steps[step_id]
+            self.evicted_steps += 1
+        self.evicted_executions += 1
+    
+    def _log(self, message: str) -> None:
+        self._logs.append(f"{self._now()} {message}")
+        self._log_count += 1
+    
+    def _project(self, item: Dict, fields: Optional[List[str]]) -> Dict:
+        return project(item, fields) if fields else dict(item)
+    
+    # Write endpoints
     
     def patch_execution(
-        self, 
-        execution_id: str, 
+        self,
+        execution_id: str,
         session_id: str
     ) -> Dict[str, Any]:
         """Update execution's session_id"""
-        if execution_id not in self._executions:
-            self._executions[execution_id] = {
-                "execution_id": execution_id,
-                "status": "running",
-                "started_at": datetime.now(timezone.utc).isoformat()
-            }
-        
-        self._executions[execution_id]["session_id"] = session_id
+        with self._lock:
+            execution = self._ensure_execution(execution_id)
+            execution["session_id"] = session_id
+            self._log(f"patch_execution {execution_id} session_id={session_id}")
+            data = dict(execution)
         
         return {
             "success": True,
-            "data": self._executions[execution_id]
+            "data": data
         }
     
     def create_step(
-        self, 
-        execution_id: str, 
+        self,
+        execution_id: str,
         step_name: str,
         message: Optional[str] = None,
         status: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a new step for an execution"""
-        step_id = str(uuid.uuid4())[:8]
-        
-        step = {
-            "step_id": step_id,
-            "execution_id": execution_id,
-            "step_name": step_name,
-            "status": status if status else "running",
-            "message": message,
-            "started_at": datetime.now(timezone.utc).isoformat()
-        }
-        
-        self._steps[step_id] = step
+        with self._lock:
+            self._ensure_execution(execution_id)
+            step_id = self._new_step_id()
+            step = {
+                "step_id": step_id,
+                "execution_id": execution_id,
+                "step_name": step_name,
+                "status": status if status else "running",
+                "message": message,
+                "started_at": self._now()
+            }
+            self._steps[step_id] = step
+            execution_steps = self._steps_by_execution[execution_id]
+            execution_steps[step_id] = None
+            while len(execution_steps) > self.max_steps_per_execution:
+                oldest, _ = execution_steps.popitem(last=False)
+                del self._steps[oldest]
+                self.evicted_steps += 1
+            self._log(f"create_step {execution_id} {step_id} {step_name} status={step['status']}")
+            data = dict(step)
         
         return {
             "success": True,
-            "data": step
+            "data": data
         }
     
     def patch_step(
-        self, 
-        execution_id: str, 
+        self,
+        execution_id: str,
         step_id: str,
         status: Optional[str] = None,
         message: Optional[str] = None
@@ -74,20 +178,23 @@ class MockTaskManagerClient(TaskManagerClientBase):
         if not status and not message:
             return {"success": False, "error": "No fields to update"}
         
-        if step_id not in self._steps:
-            return {"success": False, "error": f"Step {step_id} not found"}
-        
-        step = self._steps[step_id]
-        if status:
-            step["status"] = status
-            if status in ("completed", "failed", "skipped"):
-                step["completed_at"] = datetime.now(timezone.utc).isoformat()
-        if message:
-            step["message"] = message
+        with self._lock:
+            if step_id not in self._steps_by_execution.get(execution_id, ()):
+                return {"success": False, "error": f"Step {step_id} not found", "status_code": 404}
+            
+            step = self._steps[step_id]
+            if status:
+                step["status"] = status
+                if status in ("completed", "failed", "skipped"):
+                    step["completed_at"] = self._now()
+            if message:
+                step["message"] = message
+            self._log(f"patch_step {execution_id} {step_id} status={step['status']}")
+            data = dict(step)
         
         return {
             "success": True,
-            "data": step
+            "data": data
         }
     
     def health_check(self) -> Dict[str, Any]:
@@ -95,6 +202,103 @@ class MockTaskManagerClient(TaskManagerClientBase):
         return {
             "success": True,
             "status": "healthy",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": self._now(),
             "version": "mock-1.0.0"
         }
+    
+    def dashboard_health(self) -> Dict[str, Any]:
+        """Health check; an in-memory store has no system metrics, so they are 0"""
+        return {
+            "success": True,
+            "status": "healthy",
+            "timestamp": self._now(),
+            "cpu_percent": 0.0,
+            "memory_percent": 0.0,
+            "memory_used_mb": 0.0,
+            "avg_latency_ms": 0.0
+        }
+    
+    # Seeding, for tests and benchmarks
+    
+    def put_task(self, task: Dict[str, Any]) -> None:
+        """Insert or replace a task; task must have a task_id"""
+        with self._lock:
+            self._tasks[task["task_id"]] = dict(task)
+    
+    def put_execution(self, execution: Dict[str, Any]) -> None:
+        """Insert or replace an execution; execution must have an execution_id"""
+        with self._lock:
+            self._insert_execution(dict(execution))
+    
+    # Read endpoints
+    
+    def get_task(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get a task by ID"""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return {"success": False, "error": f"Task {task_id} not found", "status_code": 404}
+            return {"success": True, "data": self._project(task, fields)}
+    
+    def get_tasks(self, task_ids: List[str], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get many tasks by ID; in memory there is nothing to fetch concurrently"""
+        return fetch_tasks(self.get_task, task_ids, fields, concurrency=1)
+    
+    def list_tasks(self, status: Optional[str] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """List all tasks"""
+        with self._lock:
+            tasks = [
+                self._project(task, fields)
+                for task in self._tasks.values()
+                if status is None or task.get("status") == status
+            ]
+        return {"success": True, "data": {"tasks": tasks, "total_count": len(tasks)}}
+    
+    def get_active_execution(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get the most recent running execution of a task"""
+        with self._lock:
+            for execution_id in reversed(self._executions_by_task.get(task_id, ())):
+                execution = self._executions[execution_id]
+                if execution.get("status") == "running":
+                    return {"success": True, "data": self._project(execution, fields)}
+        return {"success": False, "error": f"No active execution for task {task_id}", "status_code": 404}
+    
+    def get_logs(self, lines: Optional[int] = None) -> Dict[str, Any]:
+        """Latest log lines, one per write, oldest first"""
+        lines = 100 if lines is None else lines
+        if not 1 <= lines <= MAX_LOG_LINES:
+            return {"success": False, "error": f"lines must be between 1 and {MAX_LOG_LINES}", "status_code": 400}
+        with self._lock:
+            logs = list(self._logs)[-lines:]
+            total = self._log_count
+        return {"success": True, "data": {"logs": logs, "lines": len(logs), "total_lines": total}}
+    
+    def list_executions(
+        self,
+        task_id: Optional[str] = None,
+        status: Optional[str] = None,
+        page: Optional[int] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Query executions with pagination, newest first"""
+        page = page or 1
+        limit = limit or 20
+        with self._lock:
+            if task_id is not None:
+                candidates = (self._executions[i] for i in reversed(self._executions_by_task.get(task_id, ())))
+            else:
+                candidates = reversed(self._executions.values())
+            matches = [e for e in candidates if status is None or e.get("status") == status]
+            start = (page - 1) * limit
+            executions = [self._project(e, fields) for e in matches[start:start + limit]]
+        
+        return {
+            "success": True,
+            "data": {
+                "executions": executions,
+                "page": page,
+                "limit": limit,
+                "total_count": len(matches)
+            }
+        }
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Record and replay Task Manager HTTP traffic
+
+``RecordingTransport`` wraps a transport and appends every exchange (request,
+response and timing) to a JSON Lines file. ``ReplayTransport`` serves a
+recording back without a backend, with the recorded latency at original,
+scaled or maximum speed. ``replay_session`` re-issues the recorded requests
+with their original pacing, e.g. against a stand-in backend.
+
+File format, one compact JSON object per line:
+    {"v": 1, "started": "<iso time>"}   session header, written on open
+    {"t": 0.0123, "d": 0.0045, "m": "GET", "u": "/api/health", "s": 200, "c": "application/json", "b": "..."}
+t is the request start relative to the session start and d the time to the
+full response body, in seconds. Request bodies are stored in "q", as sent,
+with their Content-Encoding in "e" when compressed. Bodies that are not
+UTF-8 are stored base64-encoded in "q64"/"b64" instead.
+"""
+
+import asyncio
+import base64
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from src.clients.codec import get_codec
+
+
+FORMAT_VERSION = 1
+
+# Response headers that no longer apply once the body is stored decoded
+_DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def _pack(record: Dict[str, Any], key: str, data: bytes) -> None:
+    if not data:
+        return
+    try:
+        record[key] = data.decode("utf-8")
+    except UnicodeDecodeError:
+        record[key + "64"] = base64.b64encode(data).decode("ascii")
+
+
+def _unpack(record: Dict[str, Any], key: str) -> bytes:
+    if key in record:
+        return record[key].encode("utf-8")
+    if key + "64" in record:
+        return base64.b64decode(record[key + "64"])
+    return b""
+
+
+def _target(url: httpx.URL) -> str:
+    """Path and query of a request URL, the part a recording is keyed on"""
+    return url.raw_path.decode("ascii")
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """Read the exchanges of a recording, sessions laid end to end on one timeline"""
+    codec = get_codec()
+    records = []
+    offset = 0.0
+    session_end = 0.0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = codec.loads(line)
+            if "v" in record:
+                offset = session_end
+                continue
+            record["t"] += offset
+            session_end = max(session_end, record["t"] + record["d"])
+            records.append(record)
+    return records
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Transport that records every exchange of the wrapped transport to a file"""
+
+    def __init__(self, path: str, transport: Any):
+        """
+        Args:
+            path: Recording file; new sessions are appended
+            transport: Wrapped transport (sync, async or both)
+        """
+        self.path = path
+        self.transport = transport
+        self.codec = get_codec()
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        self._started = time.monotonic()
+        self._write({"v": FORMAT_VERSION, "started": datetime.now(timezone.utc).isoformat()})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = self.codec.dumps(record) + b"\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def _record(self, request: httpx.Request, response: httpx.Response, start: float) -> httpx.Response:
+        end = time.monotonic()
+        record = {
+            "t": round(start - self._started, 6),
+            "d": round(end - start, 6),
+            "m": request.method,
+            "u": _target(request.url),
+            "s": response.status_code
+        }
+        _pack(record, "q", request.content)
+        if "content-encoding" in request.headers:
+            record["e"] = request.headers["content-encoding"]
+        if "content-type" in response.headers:
+            record["c"] = response.headers["content-type"]
+        _pack(record, "b", response.content)
+        self._write(record)
+
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _DROPPED_HEADERS]
+        return httpx.Response(response.status_code, headers=headers, content=response.content, request=request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        start = time.monotonic()
+        response = self.transport.handle_request(request)
+        try:
+            response.read()
+        finally:
+            response.close()
+        return self._record(request, response, start)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        start = time.monotonic()
+        response = await self.transport.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        return self._record(request, response, start)
+
+    def close(self) -> None:
+        # Clients are short-lived, the recording is not; only flush here
+        with self._lock:
+            self._file.flush()
+        self.transport.close()
+
+    async def aclose(self) -> None:
+        with self._lock:
+            self._file.flush()
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Transport that answers requests from a recording
+
+    Requests are matched on method and path+query. Repeated requests get the
+    recorded responses in order; once they run out, the last one is repeated,
+    so a replay can run longer than the capture.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], speed: Optional[float] = 1.0):
+        """
+        Args:
+            records: Exchanges from load_records()
+            speed: 1.0 replays recorded latency, 2.0 halves it, None serves immediately
+        """
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._responses: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        for record in records:
+            self._responses.setdefault((record["m"], record["u"]), deque()).append(record)
+        self.misses = 0
+
+    def _next(self, request: httpx.Request) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            queue = self._responses.get((request.method, _target(request.url)))
+            if not queue:
+                self.misses += 1
+                return None
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def _delay(self, record: Optional[Dict[str, Any]]) -> float:
+        if record is None or not self.speed:
+            return 0.0
+        return record["d"] / self.speed
+
+    @staticmethod
+    def _response(request: httpx.Request, record: Optional[Dict[str, Any]]) -> httpx.Response:
+        if record is None:
+            body = get_codec().dumps({
+                "success": False,
+                "error": f"No recorded response for {request.method} {_target(request.url)}",
+                "error_code": "replay_miss"
+            })
+            return httpx.Response(404, content=body, headers={"Content-Type": "application/json"}, request=request)
+        headers = {"Content-Type": record["c"]} if "c" in record else None
+        return httpx.Response(record["s"], content=_unpack(record, "b"), headers=headers, request=request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        record = self._next(request)
+        delay = self._delay(record)
+        if delay:
+            time.sleep(delay)
+        return self._response(request, record)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        record = self._next(request)
+        delay = self._delay(record)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._response(request, record)
+
+
+def replay_session(
+    records: List[Dict[str, Any]],
+    client: httpx.Client,
+    speed: Optional[float] = 1.0,
+    max_workers: int = 32
+) -> List[Dict[str, Any]]:
+    """Re-issue recorded requests through client with their recorded pacing
+
+    Args:
+        records: Exchanges from load_records()
+        client: Client to send the requests with (base_url set to the target)
+        speed: 1.0 keeps the original pacing, 2.0 doubles the rate, None sends
+            every request as soon as a worker is free
+        max_workers: Requests allowed in flight at once
+
+    Returns:
+        One result per record, in request start order: method, url, status,
+        recorded_status and latency (seconds)
+    """
+    def send(record: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.monotonic()
+        content = _unpack(record, "q") or None
+        headers = {"Content-Type": "application/json"} if content else None
+        if content and "e" in record:
+            headers["Content-Encoding"] = record["e"]
+        response = client.request(record["m"], record["u"], content=content, headers=headers)
+        response.read()
+        return {
+            "method": record["m"],
+            "url": record["u"],
+            "status": response.status_code,
+            "recorded_status": record["s"],
+            "latency": time.monotonic() - start
+        }
+
+    started = time.monotonic()
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for record in sorted(records, key=lambda r: r["t"]):
+            if speed:
+                wait = started + record["t"] / speed - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+            futures.append(pool.submit(send, record))
+    return [future.result() for future in futures]
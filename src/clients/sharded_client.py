@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Client that shards Task Manager data across several instances
+
+Executions are owned by the shard that ``execution_id`` hashes to on a
+consistent-hash ring with virtual nodes, and tasks by the shard of their
+``task_id``. Execution and step writes go to the owning shard; list queries
+and the active-execution lookup fan out to every shard and merge the results.
+Adding or removing a shard moves only the keys on its arcs of the ring; each
+change records how much of the keyspace moved.
+
+Configuration:
+    TASK_MANAGER_SHARDS: Comma-separated shard endpoints, "host:port" or full base URLs
+    TASK_MANAGER_VIRTUAL_NODES: Ring points per shard (default: 128)
+"""
+
+import bisect
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.clients.balanced_client import parse_endpoints
+from src.clients.base_client import MAX_PAGE_SIZE, TaskManagerClientBase
+from src.clients.http_client import HttpTaskManagerClient
+
+
+KEYSPACE = 1 << 64
+DEFAULT_VIRTUAL_NODES = 128
+# Rebalances kept for shard_stats()
+MAX_REBALANCES = 20
+# Merged list_executions queries whose shard cursors are kept for the next page,
+# and for how many seconds
+MAX_CURSORS = 32
+CURSOR_TTL = 60.0
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Immutable consistent-hash ring; changes return a new ring"""
+
+    def __init__(self, nodes: List[str] = (), virtual_nodes: int = DEFAULT_VIRTUAL_NODES):
+        self.nodes = tuple(dict.fromkeys(nodes))
+        self.virtual_nodes = virtual_nodes
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(virtual_nodes)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> str:
+        """Node owning a key: the first ring point at or after the key's hash"""
+        if not self._points:
+            raise LookupError("Hash ring has no nodes")
+        return self._owner_at(_hash(key))
+
+    def _owner_at(self, position: int) -> str:
+        index = bisect.bisect_left(self._points, position)
+        return self._owners[index % len(self._owners)]
+
+    def with_node(self, node: str) -> "HashRing":
+        return HashRing(list(self.nodes) + [node], self.virtual_nodes)
+
+    def without_node(self, node: str) -> "HashRing":
+        return HashRing([n for n in self.nodes if n != node], self.virtual_nodes)
+
+    def ownership(self) -> Dict[str, float]:
+        """Fraction of the keyspace owned by each node"""
+        shares = dict.fromkeys(self.nodes, 0.0)
+        previous = self._points[-1] - KEYSPACE if self._points else 0
+        for point, node in zip(self._points, self._owners):
+            shares[node] += (point - previous) / KEYSPACE
+            previous = point
+        return shares
+
+    def moved_fraction(self, other: "HashRing") -> float:
+        """Fraction of the keyspace whose owner differs between two rings
+
+        Between consecutive points of the two rings combined, both rings have a
+        single owner, so comparing the owners at each point is exact.
+        """
+        if not self._points or not other._points:
+            return 1.0
+        points = sorted(set(self._points) | set(other._points))
+        moved = 0
+        previous = points[-1] - KEYSPACE
+        for point in points:
+            if self._owner_at(point) != other._owner_at(point):
+                moved += point - previous
+            previous = point
+        return moved / KEYSPACE
+
+
+class _ShardCursor:
+    """Position in one shard's executions, newest first, read a page at a time"""
+
+    __slots__ = ("name", "page", "limit", "buffer", "previous", "exhausted", "total_count")
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.page = 0
+        self.limit = limit
+        self.buffer: List[Dict[str, Any]] = []
+        self.previous: Set[str] = set()
+        self.exhausted = False
+        self.total_count = 0
+
+    def take(self, result: Dict[str, Any]) -> None:
+        """Buffer the next page of the shard
+
+        Executions started while paging push older ones onto the next page;
+        those already read from the previous page are dropped from it.
+        """
+        data = result.get("data") or {}
+        executions = data.get("executions") or []
+        self.page += 1
+        self.total_count = data.get("total_count", self.total_count)
+        self.buffer = [e for e in executions if e.get("execution_id") not in self.previous]
+        self.previous = {e.get("execution_id") for e in executions if e.get("execution_id")}
+        self.exhausted = len(executions) < self.limit
+
+    def head(self) -> str:
+        return str(self.buffer[0].get("started_at") or "")
+
+
+class ShardedTaskManagerClient(TaskManagerClientBase):
+    """Routes Task Manager calls to shards on a consistent-hash ring"""
+
+    def __init__(
+        self,
+        shards: Optional[Dict[str, TaskManagerClientBase]] = None,
+        virtual_nodes: Optional[int] = None
+    ):
+        """
+        Args:
+            shards: Shard name -> client (default: an HttpTaskManagerClient per
+                TASK_MANAGER_SHARDS endpoint, named by its base URL)
+            virtual_nodes: Ring points per shard (default: TASK_MANAGER_VIRTUAL_NODES or 128)
+        """
+        if shards is None:
+            shards = {url: HttpTaskManagerClient(base_url=url) for url in parse_endpoints(os.getenv('TASK_MANAGER_SHARDS', ''))}
+        if not shards:
+            raise ValueError("ShardedTaskManagerClient needs at least one shard (TASK_MANAGER_SHARDS)")
+        virtual_nodes = virtual_nodes or int(os.getenv('TASK_MANAGER_VIRTUAL_NODES', str(DEFAULT_VIRTUAL_NODES)))
+
+        self.shards = dict(shards)
+        self.ring = HashRing(list(self.shards), virtual_nodes)
+        self._lock = threading.Lock()
+        self._requests = dict.fromkeys(self.shards, 0)
+        self._errors = dict.fromkeys(self.shards, 0)
+        self._rebalances: List[Dict[str, Any]] = []
+        # Query -> (next page, expiry, shard cursors, failed shards) of recent merged list_executions
+        self._cursors: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="task-manager-shard")
+
+    # Routing
+
+    def shard_for(self, key: str) -> str:
+        """Name of the shard owning an execution_id or task_id"""
+        return self.ring.owner(str(key))
+
+    def _call(self, name: str, operation: Callable[[TaskManagerClientBase], Dict[str, Any]]) -> Dict[str, Any]:
+        result = operation(self.shards[name])
+        with self._lock:
+            self._requests[name] += 1
+            if not result.get("success", True):
+                self._errors[name] += 1
+        return result
+
+    def _routed(self, key: str, operation: Callable[[TaskManagerClientBase], Dict[str, Any]]) -> Dict[str, Any]:
+        return self._call(self.shard_for(key), operation)
+
+    def _fan_out(
+        self, operation: Callable[[TaskManagerClientBase], Dict[str, Any]]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Run an operation on every shard concurrently; (shard, result) pairs in ring order"""
+        names = list(self.ring.nodes)
+        # Each shard call runs in a copy of the caller's context, so it keeps the caller's deadline
+        futures = [self._pool.submit(copy_context().run, self._call, name, operation) for name in names]
+        return [(name, future.result()) for name, future in zip(names, futures)]
+
+    @staticmethod
+    def _merge(
+        results: List[Tuple[str, Dict[str, Any]]], merge: Callable[[List[Dict[str, Any]]], Any]
+    ) -> Dict[str, Any]:
+        """Merge the data of the shards that answered
+
+        Fails only when every shard failed; otherwise a partial result names the
+        failed shards under ``shard_errors``.
+        """
+        succeeded = [result["data"] for _, result in results if result.get("success")]
+        failed = [(name, result) for name, result in results if not result.get("success")]
+        if not succeeded and failed:
+            return failed[0][1]
+        merged = {"success": True, "data": merge(succeeded)}
+        if failed:
+            merged["partial"] = True
+            merged["shard_errors"] = {name: result.get("error") for name, result in failed}
+        return merged
+
+    # Writes: owned by the execution's shard
+
+    def patch_execution(self, execution_id: str, session_id: str) -> Dict[str, Any]:
+        """Update execution's session_id on the owning shard"""
+        return self._routed(execution_id, lambda shard: shard.patch_execution(execution_id, session_id))
+
+    def create_step(
+        self,
+        execution_id: str,
+        step_name: str,
+        message: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Create a step on the execution's shard"""
+        return self._routed(
+            execution_id, lambda shard: shard.create_step(execution_id, step_name, message=message, status=status)
+        )
+
+    def patch_step(
+        self,
+        execution_id: str,
+        step_id: str,
+        status: Optional[str] = None,
+        message: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Update a step on the execution's shard"""
+        return self._routed(
+            execution_id, lambda shard: shard.patch_step(execution_id, step_id, status=status, message=message)
+        )
+
+    # Reads
+
+    def get_task(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get a task from its shard"""
+        return self._routed(task_id, lambda shard: shard.get_task(task_id, fields=fields))
+
+    def list_tasks(self, status: Optional[str] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """List tasks of every shard"""
+        def merge(pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+            tasks = [task for page in pages for task in page.get("tasks", [])]
+            return {"tasks": tasks, "total_count": len(tasks)}
+
+        return self._merge(self._fan_out(lambda shard: shard.list_tasks(status=status, fields=fields)), merge)
+
+    def get_active_execution(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get a task's running execution, which may live on any shard"""
+        results = self._fan_out(lambda shard: shard.get_active_execution(task_id, fields=fields))
+        found = [result for _, result in results if result.get("success")]
+        if found:
+            return max(found, key=lambda result: str(result["data"].get("started_at") or ""))
+        errors = [result for _, result in results if result.get("status_code") != 404]
+        return errors[0] if errors else results[0][1]
+
+    def list_executions(
+        self,
+        task_id: Optional[str] = None,
+        status: Optional[str] = None,
+        page: Optional[int] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Query executions of every shard, newest first
+
+        A k-way merge by ``started_at`` over a cursor per shard, each reading
+        its shard in pages of at most MAX_PAGE_SIZE as the merge consumes them.
+        The cursors left after a page are kept, so asking for the next page of
+        the same query continues the merge instead of reading every shard from
+        the start again.
+        """
+        page = page or 1
+        limit = limit or 20
+        # The merge orders by started_at, so it is fetched even when not projected
+        shard_fields = fields if not fields or "started_at" in fields else list(fields) + ["started_at"]
+        key = (self.ring.nodes, task_id, status, limit, tuple(fields) if fields else None)
+
+        def read(cursor: _ShardCursor) -> Dict[str, Any]:
+            return self._call(cursor.name, lambda shard: shard.list_executions(
+                task_id=task_id, status=status, page=cursor.page + 1, limit=cursor.limit, fields=shard_fields
+            ))
+
+        with self._lock:
+            resumed = self._cursors.pop(key, None)
+        if resumed is not None and resumed[0] == page and resumed[1] > time.monotonic():
+            _, _, cursors, failed = resumed
+            skip = 0
+        else:
+            shard_limit = min(MAX_PAGE_SIZE, page * limit)
+            cursors = [_ShardCursor(name, shard_limit) for name in self.ring.nodes]
+            skip = (page - 1) * limit
+            # First pages concurrently, in copies of the caller's context so they keep its deadline
+            futures = [self._pool.submit(copy_context().run, read, cursor) for cursor in cursors]
+            results = [(cursor.name, future.result()) for cursor, future in zip(cursors, futures)]
+            failed = [(name, result) for name, result in results if not result.get("success")]
+            if len(failed) == len(cursors):
+                return failed[0][1]
+            for cursor, (_, result) in zip(cursors, results):
+                if result.get("success"):
+                    cursor.take(result)
+            cursors = [cursor for cursor in cursors if cursor.page]
+
+        executions: List[Dict[str, Any]] = []
+        while len(executions) < limit:
+            for cursor in cursors:
+                while not cursor.buffer and not cursor.exhausted:
+                    result = read(cursor)
+                    if not result.get("success"):
+                        failed.append((cursor.name, result))
+                        cursor.exhausted = True
+                        break
+                    cursor.take(result)
+            live = [cursor for cursor in cursors if cursor.buffer]
+            if not live:
+                break
+            newest = max(live, key=_ShardCursor.head)
+            execution = newest.buffer.pop(0)
+            if skip:
+                skip -= 1
+            else:
+                executions.append(execution)
+
+        if shard_fields is not fields:
+            for execution in executions:
+                execution.pop("started_at", None)
+        if any(cursor.buffer or not cursor.exhausted for cursor in cursors):
+            with self._lock:
+                self._cursors[key] = (page + 1, time.monotonic() + CURSOR_TTL, cursors, failed)
+                while len(self._cursors) > MAX_CURSORS:
+                    self._cursors.popitem(last=False)
+
+        result = {
+            "success": True,
+            "data": {
+                "executions": executions,
+                "page": page,
+                "limit": limit,
+                "total_count": sum(cursor.total_count for cursor in cursors)
+            }
+        }
+        if failed:
+            result["partial"] = True
+            result["shard_errors"] = {name: error.get("error") for name, error in failed}
+        return result
+
+    def health_check(self) -> Dict[str, Any]:
+        """Health check of every shard; healthy only if all shards are"""
+        results = self._fan_out(lambda shard: shard.health_check())
+        healthy = sum(1 for _, result in results if result.get("success"))
+        return {
+            "success": healthy == len(results),
+            "message": f"{healthy}/{len(results)} Task Manager shards healthy",
+            "shards": {name: result for name, result in results}
+        }
+
+    def warm_up(self, connections: int = 1, probe: bool = False) -> Dict[str, Any]:
+        """Warm up every shard concurrently"""
+        results = self._fan_out(lambda shard: shard.warm_up(connections, probe))
+        return {
+            "success": all(result.get("success") for _, result in results),
+            "connections": sum(result.get("connections", 0) for _, result in results),
+            "shards": {name: result for name, result in results}
+        }
+
+    # Rebalancing
+
+    def _rebalance(self, ring: HashRing, change: str) -> Dict[str, Any]:
+        before = self.ring.ownership()
+        after = ring.ownership()
+        report = {
+            "change": change,
+            "at": time.time(),
+            "moved_fraction": round(self.ring.moved_fraction(ring), 6),
+            "ownership_delta": {
+                name: round(after.get(name, 0.0) - before.get(name, 0.0), 6)
+                for name in dict.fromkeys(list(before) + list(after))
+            }
+        }
+        self.ring = ring
+        self._rebalances = (self._rebalances + [report])[-MAX_REBALANCES:]
+        return report
+
+    def add_shard(self, name: str, client: TaskManagerClientBase) -> Dict[str, Any]:
+        """Add a shard to the ring
+
+        Returns:
+            Rebalance report: the fraction of the keyspace that moved to the new
+            shard and each shard's change in keyspace share
+        """
+        with self._lock:
+            if name in self.shards:
+                raise ValueError(f"Shard '{name}' already exists")
+            self.shards[name] = client
+            self._requests.setdefault(name, 0)
+            self._errors.setdefault(name, 0)
+            return self._rebalance(self.ring.with_node(name), f"add {name}")
+
+    def remove_shard(self, name: str) -> Dict[str, Any]:
+        """Remove a shard from the ring; its keys move to the remaining shards
+
+        Returns:
+            Rebalance report, as for add_shard
+        """
+        with self._lock:
+            if name not in self.shards:
+                raise ValueError(f"Unknown shard '{name}'")
+            if len(self.shards) == 1:
+                raise ValueError("Cannot remove the last shard")
+            report = self._rebalance(self.ring.without_node(name), f"remove {name}")
+            del self.shards[name]
+            return report
+
+    def shard_stats(self) -> Dict[str, Any]:
+        """Keyspace share and traffic of each shard, and recent rebalances"""
+        ownership = self.ring.ownership()
+        with self._lock:
+            return {
+                "virtual_nodes": self.ring.virtual_nodes,
+                "shards": {
+                    name: {
+                        "keyspace": round(ownership.get(name, 0.0), 6),
+                        "requests": self._requests.get(name, 0),
+                        "errors": self._errors.get(name, 0)
+                    }
+                    for name in self.ring.nodes
+                },
+                "rebalances": list(self._rebalances)
+            }
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Sidecar daemon shared by the stdio MCP processes of one host
+
+Each agent runs its own stdio MCP server. With TASK_MANAGER_CLIENT=sidecar
+they forward client calls over a Unix socket to this daemon (see
+sidecar_client.py), which owns what a single process cannot share: the
+pooled connections and DNS cache of one Task Manager client, a short-lived
+read cache, and a write batcher that coalesces and flushes writes from all
+agents together.
+
+Task Manager has no batch endpoint, so a batch is the writes that arrive
+within a short window: adjacent updates of the same execution or step are
+coalesced into one request, and the rest are sent concurrently, each
+execution's writes in arrival order. A slow execution holds up only its own
+later writes, not the next batch.
+
+Every request carries the remaining deadline of the tool that made it. Calls
+to Task Manager run under it, and a write still queued when it expires is
+dropped rather than applied after the caller has reported a timeout.
+
+The daemon is started by the first client that needs it and exits after
+TASK_MANAGER_SIDECAR_IDLE seconds without requests. A lock file next to the
+socket keeps it to one daemon per socket.
+
+Wire format: each message is a 4-byte big-endian length and a JSON body.
+Requests are {"op", "args", "deadline_ms"}, responses {"result"}.
+
+Configuration:
+    TASK_MANAGER_SIDECAR_SOCKET: Socket path (default: task-manager-sidecar-<uid>.sock in the temp dir)
+    TASK_MANAGER_SIDECAR_BACKEND: Client the daemon uses, as TASK_MANAGER_CLIENT (default: http)
+    TASK_MANAGER_SIDECAR_IDLE: Seconds without requests before the daemon exits (default: 300)
+    TASK_MANAGER_SIDECAR_CACHE_TTL: Seconds read results are shared (default: 1, 0 disables)
+    TASK_MANAGER_SIDECAR_BATCH_WINDOW: Milliseconds writes are collected before a flush (default: 2)
+
+Usage:
+    python -m src.clients.sidecar [--socket PATH]
+"""
+
+import argparse
+import fcntl
+import os
+import queue
+import socket
+import socketserver
+import struct
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.clients.base_client import TaskManagerClientBase
+from src.clients.codec import get_codec
+from src.clients.deadline import deadline
+from src.clients.warmup import start_warm_up
+
+
+READS = ("get_task", "get_tasks", "list_tasks", "get_active_execution", "list_executions")
+WRITES = ("patch_execution", "create_step", "patch_step")
+OPERATIONS = READS + WRITES + ("health_check", "stats")
+
+_LENGTH = struct.Struct(">I")
+# Largest message accepted, to fail fast on a corrupt stream
+MAX_MESSAGE_BYTES = 256 * 1024 * 1024
+
+
+def default_socket_path() -> str:
+    return os.getenv(
+        'TASK_MANAGER_SIDECAR_SOCKET',
+        os.path.join(tempfile.gettempdir(), f"task-manager-sidecar-{os.getuid()}.sock")
+    )
+
+
+def send_message(sock: socket.socket, message: Any) -> None:
+    body = get_codec().dumps(message)
+    sock.sendall(_LENGTH.pack(len(body)) + body)
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            return None
+        buffer += chunk
+    return bytes(buffer)
+
+
+def receive_message(sock: socket.socket) -> Optional[Any]:
+    """Next message, or None when the peer closed the connection"""
+    header = _receive_exactly(sock, _LENGTH.size)
+    if header is None:
+        return None
+    (size,) = _LENGTH.unpack(header)
+    if size > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Sidecar message of {size} bytes exceeds {MAX_MESSAGE_BYTES}")
+    body = _receive_exactly(sock, size)
+    if body is None:
+        return None
+    return get_codec().loads(body)
+
+
+class WriteBatcher:
+    """Collects writes for a short window, coalesces them and flushes them concurrently"""
+
+    def __init__(self, backend: TaskManagerClientBase, window: float = 0.002, max_batch: int = 256, workers: int = 16):
+        """
+        Args:
+            backend: Client the writes are sent with
+            window: Seconds to collect writes after the first one arrives
+            max_batch: Writes flushed at most at once
+            workers: Executions written concurrently
+        """
+        self.backend = backend
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Tuple[str, Dict[str, Any], Future, Optional[float]]]" = queue.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sidecar-write")
+        # execution_id -> writes waiting for the worker already writing that execution
+        self._pending: Dict[str, List[List[Any]]] = {}
+        self._pending_lock = threading.Lock()
+        self.batches = 0
+        self.writes = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.on_flush = None  # called after each write, e.g. to drop cached reads
+        threading.Thread(target=self._run, name="sidecar-batcher", daemon=True).start()
+
+    def submit(self, op: str, args: Dict[str, Any], expires_at: Optional[float] = None) -> Dict[str, Any]:
+        """Queue a write and wait for its result
+
+        Args:
+            op: Write operation
+            args: Its arguments
+            expires_at: time.monotonic() after which the caller no longer waits;
+                the write is dropped if it has not been sent by then
+        """
+        future: Future = Future()
+        self._queue.put((op, args, future, expires_at))
+        return future.result()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            window_end = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = window_end - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[str, Dict[str, Any], Future, Optional[float]]]) -> None:
+        """Coalesce a batch per execution and hand each execution's writes to a worker, without waiting"""
+        groups: "OrderedDict[str, List[List[Any]]]" = OrderedDict()
+        for op, args, future, expires_at in batch:
+            group = groups.setdefault(args["execution_id"], [])
+            last = group[-1] if group else None
+            if last is not None and self._coalesce(last, op, args):
+                last[2].append(future)
+                # Sent while any of the callers still waits
+                last[3] = None if last[3] is None or expires_at is None else max(last[3], expires_at)
+                self.coalesced += 1
+            else:
+                group.append([op, dict(args), [future], expires_at])
+        self.batches += 1
+        self.writes += len(batch)
+
+        for execution_id, group in groups.items():
+            with self._pending_lock:
+                waiting = self._pending.get(execution_id)
+                if waiting is not None:
+                    # A worker is writing this execution; it takes these next, in order
+                    waiting.extend(group)
+                    continue
+                self._pending[execution_id] = group
+            self._pool.submit(self._write_execution, execution_id)
+
+    @staticmethod
+    def _coalesce(last: List[Any], op: str, args: Dict[str, Any]) -> bool:
+        """Fold a write into the previous one of its execution when the later one supersedes it"""
+        last_op, last_args = last[0], last[1]
+        if op != last_op:
+            return False
+        if op == "patch_execution":
+            last_args["session_id"] = args["session_id"]
+            return True
+        if op == "patch_step" and args["step_id"] == last_args["step_id"]:
+            for field in ("status", "message"):
+                if args.get(field) is not None:
+                    last_args[field] = args[field]
+            return True
+        return False
+
+    def _write_execution(self, execution_id: str) -> None:
+        """Send an execution's pending writes in order, until none are left"""
+        while True:
+            with self._pending_lock:
+                group = self._pending[execution_id]
+                if not group:
+                    del self._pending[execution_id]
+                    return
+                self._pending[execution_id] = []
+            for op, args, futures, expires_at in group:
+                result = self._write(op, args, expires_at)
+                if self.on_flush is not None:
+                    self.on_flush()
+                for future in futures:
+                    future.set_result(result)
+
+    def _write(self, op: str, args: Dict[str, Any], expires_at: Optional[float]) -> Dict[str, Any]:
+        budget = None
+        if expires_at is not None:
+            budget = expires_at - time.monotonic()
+            if budget <= 0:
+                self.expired += 1
+                return {"success": False, "error": "Request timeout: deadline exceeded before the sidecar sent the write"}
+        try:
+            with deadline(budget):
+                return getattr(self.backend, op)(**args)
+        except Exception as e:
+            return {"success": False, "error": f"Sidecar write failed: {str(e)}"}
+
+
+class SidecarDaemon:
+    """Serves TaskManagerClientBase calls from local MCP processes"""
+
+    def __init__(
+        self,
+        backend: TaskManagerClientBase,
+        path: Optional[str] = None,
+        idle_timeout: Optional[float] = None,
+        cache_ttl: Optional[float] = None,
+        batch_window: Optional[float] = None
+    ):
+        """
+        Args:
+            backend: Client calls are served with
+            path: Socket path (default: TASK_MANAGER_SIDECAR_SOCKET)
+            idle_timeout: Seconds without requests before exiting (default: TASK_MANAGER_SIDECAR_IDLE or 300)
+            cache_ttl: Seconds read results are shared (default: TASK_MANAGER_SIDECAR_CACHE_TTL or 1)
+            batch_window: Seconds writes are collected (default: TASK_MANAGER_SIDECAR_BATCH_WINDOW ms or 2ms)
+        """
+        self.backend = backend
+        self.path = path or default_socket_path()
+        self.idle_timeout = idle_timeout if idle_timeout is not None else float(os.getenv('TASK_MANAGER_SIDECAR_IDLE', '300'))
+        self.cache_ttl = cache_ttl if cache_ttl is not None else float(os.getenv('TASK_MANAGER_SIDECAR_CACHE_TTL', '1'))
+        if batch_window is None:
+            batch_window = float(os.getenv('TASK_MANAGER_SIDECAR_BATCH_WINDOW', '2')) / 1000
+        self.batcher = WriteBatcher(backend, window=batch_window)
+        self.batcher.on_flush = self._invalidate
+
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._cache_lock = threading.Lock()
+        self._last_request = time.monotonic()
+        self._lock_file = None
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.cache_hits = 0
+        self.connections = 0
+
+    def _count(self, counter: str, delta: int) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + delta)
+
+    # Request handling
+
+    def handle(self, op: str, args: Dict[str, Any], deadline_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Serve one request
+
+        Args:
+            op: Operation name
+            args: Its arguments
+            deadline_ms: Milliseconds the caller still waits (optional)
+        """
+        self._last_request = time.monotonic()
+        self._count("requests", 1)
+        if op not in OPERATIONS:
+            return {"success": False, "error": f"Unknown sidecar operation '{op}'"}
+        if op == "stats":
+            return {"success": True, "data": self.stats()}
+        budget = deadline_ms / 1000 if deadline_ms is not None else None
+        if op in WRITES:
+            return self.batcher.submit(op, args, time.monotonic() + budget if budget is not None else None)
+        with deadline(budget):
+            if op in READS and self.cache_ttl > 0:
+                return self._cached_read(op, args)
+            return getattr(self.backend, op)(**args)
+
+    def _cached_read(self, op: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        key = op + get_codec().dumps(sorted(args.items())).decode("utf-8")
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > now:
+                self.cache_hits += 1  # under the cache lock
+                return entry[1]
+        result = getattr(self.backend, op)(**args)
+        if result.get("success"):
+            with self._cache_lock:
+                self._cache[key] = (now + self.cache_ttl, result)
+        return result
+
+    def _invalidate(self) -> None:
+        # Any write can change any read result
+        with self._cache_lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "socket": self.path,
+            "connections": self.connections,
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "writes": self.batcher.writes,
+            "write_batches": self.batcher.batches,
+            "writes_coalesced": self.batcher.coalesced,
+            "writes_expired": self.batcher.expired
+        }
+
+    # Serving
+
+    def _acquire_lock(self) -> bool:
+        """Hold the lock file next to the socket; False if another daemon does"""
+        self._lock_file = open(self.path + ".lock", "w")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+        return True
+
+    def serve(self) -> bool:
+        """Serve until idle for idle_timeout seconds
+
+        Returns:
+            False if another daemon already serves this socket
+        """
+        if not self._acquire_lock():
+            return False
+        # Holding the lock means any existing socket file is stale
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        daemon = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                daemon._count("connections", 1)
+                try:
+                    while True:
+                        request = receive_message(self.request)
+                        if request is None:
+                            return
+                        op = request.get("op")
+                        try:
+                            result = daemon.handle(op, request.get("args") or {}, request.get("deadline_ms"))
+                        except Exception as e:
+                            result = {"success": False, "error": f"Sidecar {op} failed: {str(e)}"}
+                        send_message(self.request, {"result": result})
+                except (ConnectionError, ValueError):
+                    return
+                finally:
+                    daemon._count("connections", -1)
+
+        class Server(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+
+        self._server = Server(self.path, Handler)
+        threading.Thread(target=self._watch_idle, name="sidecar-idle", daemon=True).start()
+        start_warm_up(self.backend)
+        try:
+            self._server.serve_forever(poll_interval=0.1)
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self._lock_file.close()
+        return True
+
+    def _watch_idle(self) -> None:
+        while True:
+            time.sleep(min(1.0, self.idle_timeout / 4))
+            if time.monotonic() - self._last_request > self.idle_timeout:
+                self.shutdown()
+                return
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Task Manager sidecar daemon")
+    parser.add_argument("--socket", default=None, help="Unix socket path")
+    args = parser.parse_args()
+
+    # The daemon talks to Task Manager itself, never to another sidecar
+    os.environ['TASK_MANAGER_CLIENT'] = os.getenv('TASK_MANAGER_SIDECAR_BACKEND', 'http')
+    from src.clients.client_factory import create_task_manager_client
+
+    daemon = SidecarDaemon(create_task_manager_client(), path=args.socket)
+    return 0 if daemon.serve() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
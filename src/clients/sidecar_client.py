@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Thin client forwarding Task Manager calls to the local sidecar daemon
+
+Selected with TASK_MANAGER_CLIENT=sidecar. Every call is sent over the
+daemon's Unix socket (see sidecar.py); the daemon is started on first use if
+it is not running, and again after it shut down while idle. Connections are
+kept and reused, one per concurrent caller. A call waits at most for the
+remaining deadline of the tool that made it.
+"""
+
+import queue
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.clients.base_client import TaskManagerClientBase
+from src.clients.deadline import current_deadline
+from src.clients.sidecar import default_socket_path, receive_message, send_message
+
+
+project_root = Path(__file__).parent.parent.parent
+
+# Seconds to wait for a freshly started daemon to listen
+STARTUP_TIMEOUT = 10.0
+# Seconds a call may take when no deadline is set
+DEFAULT_TIMEOUT = 60.0
+
+
+class SidecarTaskManagerClient(TaskManagerClientBase):
+    """TaskManagerClientBase that forwards every call to the sidecar daemon"""
+
+    def __init__(self, path: Optional[str] = None, autostart: bool = True):
+        """
+        Args:
+            path: Daemon socket path (default: TASK_MANAGER_SIDECAR_SOCKET)
+            autostart: Start the daemon when nothing listens on the socket
+        """
+        self.path = path or default_socket_path()
+        self.autostart = autostart
+        self._idle: "queue.LifoQueue[socket.socket]" = queue.LifoQueue()
+        self.started_daemon = False
+
+    # Connections
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _start_daemon(self) -> socket.socket:
+        """Start the daemon and connect to it once it listens"""
+        subprocess.Popen(
+            [sys.executable, "-m", "src.clients.sidecar", "--socket", self.path],
+            cwd=str(project_root),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        self.started_daemon = True
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                return self._connect()
+            except OSError:
+                # Another process may have won the start; its daemon is as good
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.02)
+
+    def _acquire(self) -> socket.socket:
+        """An open connection: an idle one that is still alive, or a new one"""
+        while True:
+            try:
+                sock = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._alive(sock):
+                return sock
+            sock.close()
+        try:
+            return self._connect()
+        except OSError:
+            if not self.autostart:
+                raise
+            return self._start_daemon()
+
+    @staticmethod
+    def _alive(sock: socket.socket) -> bool:
+        """False if the daemon closed the connection, e.g. on idle shutdown"""
+        try:
+            sock.setblocking(False)
+            try:
+                return sock.recv(1, socket.MSG_PEEK) != b""
+            except BlockingIOError:
+                return True
+            finally:
+                sock.setblocking(True)
+        except OSError:
+            return False
+
+    def _call(self, op: str, **args: Any) -> Dict[str, Any]:
+        current = current_deadline()
+        timeout = current.remaining() if current is not None else DEFAULT_TIMEOUT
+        if timeout <= 0:
+            return {"success": False, "error": f"Request timeout: deadline of {current.budget:g}s exceeded"}
+        try:
+            sock = self._acquire()
+        except OSError as e:
+            return {
+                "success": False,
+                "error": f"Cannot connect to the Task Manager sidecar at {self.path}: {str(e)}",
+                "hint": "Start it with 'python -m src.clients.sidecar' or check TASK_MANAGER_SIDECAR_SOCKET."
+            }
+
+        try:
+            sock.settimeout(timeout)
+            # The daemon drops work the caller no longer waits for
+            send_message(sock, {"op": op, "args": args, "deadline_ms": int(timeout * 1000)})
+            response = receive_message(sock)
+        except socket.timeout:
+            # The answer may still arrive; this connection can't be reused
+            sock.close()
+            return {"success": False, "error": f"Request timeout: no answer from the sidecar within {timeout:.1f}s"}
+        except (OSError, ValueError) as e:
+            sock.close()
+            return {"success": False, "error": f"Sidecar connection failed: {str(e)}"}
+        if response is None:
+            sock.close()
+            return {"success": False, "error": "Sidecar closed the connection before answering"}
+        sock.settimeout(None)
+        self._idle.put(sock)
+        return response["result"]
+
+    def close(self) -> None:
+        """Close the idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    # TaskManagerClientBase
+
+    def patch_execution(self, execution_id: str, session_id: str) -> Dict[str, Any]:
+        """Update execution's session_id"""
+        return self._call("patch_execution", execution_id=execution_id, session_id=session_id)
+
+    def create_step(
+        self,
+        execution_id: str,
+        step_name: str,
+        message: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Create a new step for an execution"""
+        return self._call("create_step", execution_id=execution_id, step_name=step_name, message=message, status=status)
+
+    def patch_step(
+        self,
+        execution_id: str,
+        step_id: str,
+        status: Optional[str] = None,
+        message: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Partially update a step"""
+        return self._call("patch_step", execution_id=execution_id, step_id=step_id, status=status, message=message)
+
+    def health_check(self) -> Dict[str, Any]:
+        """Health check of Task Manager, through the sidecar"""
+        return self._call("health_check")
+
+    def get_task(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get a task by ID"""
+        return self._call("get_task", task_id=task_id, fields=fields)
+
+    def get_tasks(self, task_ids: List[str], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get many tasks by ID, fetched by the sidecar's client"""
+        return self._call("get_tasks", task_ids=task_ids, fields=fields)
+
+    def list_tasks(self, status: Optional[str] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """List all tasks"""
+        return self._call("list_tasks", status=status, fields=fields)
+
+    def get_active_execution(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get the currently running execution of a task"""
+        return self._call("get_active_execution", task_id=task_id, fields=fields)
+
+    def list_executions(
+        self,
+        task_id: Optional[str] = None,
+        status: Optional[str] = None,
+        page: Optional[int] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Query executions with pagination"""
+        return self._call(
+            "list_executions", task_id=task_id, status=status, page=page, limit=limit, fields=fields
+        )
+
+    def sidecar_stats(self) -> Dict[str, Any]:
+        """Requests, cache hits and write batching of the daemon"""
+        return self._call("stats")
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed Task Manager client
+
+A persistent local backend for offline development and long soak benchmarks.
+Data survives restarts and can grow to millions of steps.
+
+- WAL journal, so readers in other processes do not block the writer
+- Every statement is a constant SQL string, so sqlite3's statement cache
+  prepares each one once per connection
+- Writes are committed in batches (every ``batch_size`` writes or
+  ``commit_interval`` seconds, and on ``flush()``/``close()``); a timer commits
+  a batch that is still open after ``commit_interval`` seconds, so an idle
+  client does not keep the database's write lock. Reads on this client always
+  see its own uncommitted writes
+- Indexes on steps ``(execution_id, started_at)`` and executions ``(task_id, status)``
+
+Configuration:
+    TASK_MANAGER_SQLITE_PATH: Database file (default: task_manager.db)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, List, Optional
+
+from src.clients.base_client import TaskManagerClientBase
+from src.clients.batch import MAX_BATCH, fetch_tasks
+
+
+TASK_COLUMNS = (
+    "task_id", "status", "jira_ticket_id", "jira_info", "failure_reason",
+    "retry_count", "created_at", "updated_at"
+)
+EXECUTION_COLUMNS = (
+    "execution_id", "task_id", "status", "session_id", "worktree_path", "trigger_type",
+    "sandbox_type", "commit_sha", "comment_id", "cost_usd", "confidence_level",
+    "confidence_reason", "error_message", "raw_output", "started_at", "completed_at"
+)
+
+# Columns stored as JSON text
+JSON_COLUMNS = frozenset({"jira_info"})
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    status TEXT,
+    jira_ticket_id TEXT,
+    jira_info TEXT,
+    failure_reason TEXT,
+    retry_count INTEGER,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS executions (
+    execution_id TEXT PRIMARY KEY,
+    task_id TEXT,
+    status TEXT,
+    session_id TEXT,
+    worktree_path TEXT,
+    trigger_type TEXT,
+    sandbox_type TEXT,
+    commit_sha TEXT,
+    comment_id INTEGER,
+    cost_usd REAL,
+    confidence_level INTEGER,
+    confidence_reason TEXT,
+    error_message TEXT,
+    raw_output TEXT,
+    started_at TEXT,
+    completed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS steps (
+    step_id TEXT PRIMARY KEY,
+    execution_id TEXT NOT NULL,
+    step_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    message TEXT,
+    started_at TEXT NOT NULL,
+    completed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_executions_task_status ON executions (task_id, status);
+CREATE INDEX IF NOT EXISTS idx_executions_started_at ON executions (started_at);
+CREATE INDEX IF NOT EXISTS idx_steps_execution_started ON steps (execution_id, started_at);
+"""
+
+_UPSERT_SESSION = (
+    "INSERT INTO executions (execution_id, status, session_id, started_at) VALUES (?, 'running', ?, ?) "
+    "ON CONFLICT (execution_id) DO UPDATE SET session_id = excluded.session_id"
+)
+_ENSURE_EXECUTION = "INSERT OR IGNORE INTO executions (execution_id, status, started_at) VALUES (?, 'running', ?)"
+_INSERT_STEP = (
+    "INSERT INTO steps (step_id, execution_id, step_name, status, message, started_at) VALUES (?, ?, ?, ?, ?, ?)"
+)
+_PATCH_STEP = (
+    "UPDATE steps SET status = COALESCE(?, status), message = COALESCE(?, message), "
+    "completed_at = CASE WHEN ? IN ('completed', 'failed', 'skipped') THEN ? ELSE completed_at END "
+    "WHERE step_id = ? AND execution_id = ?"
+)
+_SELECT_EXECUTION = "SELECT * FROM executions WHERE execution_id = ?"
+_SELECT_STEP = "SELECT * FROM steps WHERE step_id = ?"
+
+
+def _commit_later(ref: "weakref.ref[SqliteTaskManagerClient]") -> None:
+    """Commit timer callback; holds the client weakly so it can still be collected"""
+    client = ref()
+    if client is not None:
+        client.flush()
+
+
+def _close_connection(connection: sqlite3.Connection) -> None:
+    """Commit pending writes and close; runs on close() or when the client is collected"""
+    try:
+        connection.commit()
+    finally:
+        connection.close()
+
+
+class SqliteTaskManagerClient(TaskManagerClientBase):
+    """SQLite implementation of the Task Manager API"""
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        batch_size: int = 100,
+        commit_interval: float = 0.5
+    ):
+        """
+        Args:
+            path: Database file (default: TASK_MANAGER_SQLITE_PATH or task_manager.db)
+            batch_size: Writes per commit
+            commit_interval: Maximum seconds between a write and its commit;
+                a timer commits when no later write does
+        """
+        self.path = path or os.getenv('TASK_MANAGER_SQLITE_PATH', 'task_manager.db')
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._first_pending = 0.0
+        self._timer: Optional[threading.Timer] = None
+        
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._finalizer = weakref.finalize(self, _close_connection, self._conn)
+    
+    # Connection helpers, called with the lock held
+    
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat()
+    
+    def _wrote(self) -> None:
+        """Count a write and commit the batch when it is full or old enough"""
+        if self._pending == 0:
+            self._first_pending = time.monotonic()
+        self._pending += 1
+        if self._pending >= self.batch_size or time.monotonic() - self._first_pending >= self.commit_interval:
+            self._commit()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.commit_interval, _commit_later, (weakref.ref(self),))
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _commit(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending and self._finalizer.alive:
+            self._conn.commit()
+            self._pending = 0
+    
+    @staticmethod
+    def _error(operation: str, error: sqlite3.Error) -> Dict[str, Any]:
+        return {"success": False, "error": f"{operation} failed: {error}"}
+    
+    @staticmethod
+    def _row(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        """Row as an API dict; NULL columns are left out like unset API fields"""
+        if row is None:
+            return None
+        item = {}
+        for key in row.keys():
+            value = row[key]
+            if value is not None:
+                item[key] = json.loads(value) if key in JSON_COLUMNS else value
+        return item
+    
+    @staticmethod
+    def _select_list(columns: Iterable[str], fields: Optional[List[str]]) -> str:
+        """SELECT column list for a projection; unknown fields are ignored"""
+        if not fields:
+            return "*"
+        selected = [field for field in fields if field in columns]
+        return ", ".join(selected) if selected else "NULL AS _none"
+    
+    def _put(self, table: str, columns: Iterable[str], item: Dict[str, Any]) -> None:
+        names = [column for column in columns if column in item]
+        values = [json.dumps(item[name]) if name in JSON_COLUMNS else item[name] for name in names]
+        placeholders = ", ".join("?" * len(names))
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) VALUES ({placeholders})", values
+            )
+            self._wrote()
+    
+    def flush(self) -> None:
+        """Commit pending writes"""
+        with self._lock:
+            self._commit()
+    
+    def close(self) -> None:
+        """Commit pending writes and close the database"""
+        with self._lock:
+            self._commit()
+            self._finalizer()
+    
+    # Write endpoints
+    
+    def patch_execution(
+        self,
+        execution_id: str,
+        session_id: str
+    ) -> Dict[str, Any]:
+        """Update execution's session_id"""
+        with self._lock:
+            try:
+                self._conn.execute(_UPSERT_SESSION, (execution_id, session_id, self._now()))
+                self._wrote()
+                data = self._row(self._conn.execute(_SELECT_EXECUTION, (execution_id,)).fetchone())
+            except sqlite3.Error as e:
+                return self._error("patch_execution", e)
+        
+        return {
+            "success": True,
+            "data": data
+        }
+    
+    def create_step(
+        self,
+        execution_id: str,
+        step_name: str,
+        message: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Create a new step for an execution"""
+        now = self._now()
+        status = status if status else "running"
+        with self._lock:
+            try:
+                self._conn.execute(_ENSURE_EXECUTION, (execution_id, now))
+                while True:
+                    step_id = uuid.uuid4().hex[:8]
+                    try:
+                        self._conn.execute(_INSERT_STEP, (step_id, execution_id, step_name, status, message, now))
+                        break
+                    except sqlite3.IntegrityError:  # step id collision
+                        continue
+                self._wrote()
+            except sqlite3.Error as e:
+                return self._error("create_step", e)
+        
+        step = {
+            "step_id": step_id,
+            "execution_id": execution_id,
+            "step_name": step_name,
+            "status": status,
+            "message": message,
+            "started_at": now
+        }
+        return {
+            "success": True,
+            "data": step
+        }
+    
+    def patch_step(
+        self,
+        execution_id: str,
+        step_id: str,
+        status: Optional[str] = None,
+        message: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Partially update a step"""
+        if not status and not message:
+            return {"success": False, "error": "No fields to update"}
+        
+        with self._lock:
+            try:
+                cursor = self._conn.execute(_PATCH_STEP, (status, message, status, self._now(), step_id, execution_id))
+                if cursor.rowcount == 0:
+                    return {"success": False, "error": f"Step {step_id} not found", "status_code": 404}
+                self._wrote()
+                data = self._row(self._conn.execute(_SELECT_STEP, (step_id,)).fetchone())
+            except sqlite3.Error as e:
+                return self._error("patch_step", e)
+        
+        return {
+            "success": True,
+            "data": data
+        }
+    
+    def health_check(self) -> Dict[str, Any]:
+        """Health check"""
+        with self._lock:
+            self._conn.execute("SELECT 1").fetchone()
+        return {
+            "success": True,
+            "status": "healthy",
+            "timestamp": self._now(),
+            "version": f"sqlite-{sqlite3.sqlite_version}",
+            "path": self.path
+        }
+    
+    # Seeding, for tests and benchmarks
+    
+    def put_task(self, task: Dict[str, Any]) -> None:
+        """Insert or replace a task; task must have a task_id"""
+        self._put("tasks", TASK_COLUMNS, task)
+    
+    def put_execution(self, execution: Dict[str, Any]) -> None:
+        """Insert or replace an execution; execution must have an execution_id"""
+        self._put("executions", EXECUTION_COLUMNS, execution)
+    
+    # Read endpoints
+    
+    def get_task(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get a task by ID"""
+        columns = self._select_list(TASK_COLUMNS, fields)
+        with self._lock:
+            row = self._conn.execute(f"SELECT {columns} FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        if row is None:
+            return {"success": False, "error": f"Task {task_id} not found", "status_code": 404}
+        return {"success": True, "data": self._row(row)}
+    
+    def get_tasks(self, task_ids: List[str], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get many tasks by ID in one query"""
+        if len(task_ids) > MAX_BATCH:
+            return fetch_tasks(self.get_task, task_ids, fields)
+        unique = list(dict.fromkeys(task_ids))
+        # task_id keys the rows even when the projection leaves it out
+        keyed = fields if not fields or "task_id" in fields else list(fields) + ["task_id"]
+        columns = self._select_list(TASK_COLUMNS, keyed)
+        placeholders = ", ".join("?" * len(unique))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM tasks WHERE task_id IN ({placeholders})", unique
+            ).fetchall() if unique else []
+        found = {}
+        for row in rows:
+            task = self._row(row)
+            task_id = task["task_id"] if keyed is fields else task.pop("task_id")
+            found[task_id] = task
+        
+        def lookup(task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+            if task_id not in found:
+                return {"success": False, "error": f"Task {task_id} not found", "status_code": 404}
+            return {"success": True, "data": found[task_id]}
+        
+        return fetch_tasks(lookup, task_ids, fields, concurrency=1)
+    
+    def list_tasks(self, status: Optional[str] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """List all tasks"""
+        columns = self._select_list(TASK_COLUMNS, fields)
+        with self._lock:
+            if status is None:
+                rows = self._conn.execute(f"SELECT {columns} FROM tasks ORDER BY created_at").fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"SELECT {columns} FROM tasks WHERE status = ? ORDER BY created_at", (status,)
+                ).fetchall()
+        tasks = [self._row(row) for row in rows]
+        return {"success": True, "data": {"tasks": tasks, "total_count": len(tasks)}}
+    
+    def get_active_execution(self, task_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get the most recent running execution of a task"""
+        columns = self._select_list(EXECUTION_COLUMNS, fields)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {columns} FROM executions WHERE task_id = ? AND status = 'running' "
+                "ORDER BY started_at DESC LIMIT 1",
+                (task_id,)
+            ).fetchone()
+        if row is None:
+            return {"success": False, "error": f"No active execution for task {task_id}", "status_code": 404}
+        return {"success": True, "data": self._row(row)}
+    
+    def list_executions(
+        self,
+        task_id: Optional[str] = None,
+        status: Optional[str] = None,
+        page: Optional[int] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Query executions with pagination, newest first
+        
+        Projected columns are selected in SQL, so unrequested fields such as
+        raw_output are never read from the database.
+        """
+        page = page or 1
+        limit = limit or 20
+        conditions = []
+        params: List[Any] = []
+        if task_id is not None:
+            conditions.append("task_id = ?")
+            params.append(task_id)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        columns = self._select_list(EXECUTION_COLUMNS, fields)
+        
+        with self._lock:
+            total_count = self._conn.execute(f"SELECT COUNT(*) FROM executions{where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM executions{where} ORDER BY started_at DESC LIMIT ? OFFSET ?",
+                params + [limit, (page - 1) * limit]
+            ).fetchall()
+        
+        return {
+            "success": True,
+            "data": {
+                "executions": [self._row(row) for row in rows],
+                "page": page,
+                "limit": limit,
+                "total_count": total_count
+            }
+        }
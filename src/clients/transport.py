@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+httpx transport shared by HttpTaskManagerClient and the generated Client
+
+Configuration:
+    TASK_MANAGER_HTTP2: "true" to multiplex requests over HTTP/2 (needs the h2 package)
+    TASK_MANAGER_UDS: Connect to a co-located Task Manager over this Unix socket
+        instead of TCP (TASK_MANAGER_HOST still sets the Host header)
+    TASK_MANAGER_RECORD: Append all Task Manager traffic to this file
+    TASK_MANAGER_REPLAY: Answer requests from this recording instead of the backend
+    TASK_MANAGER_REPLAY_SPEED: "1" recorded latency (default), "N" N times faster, "max" no delay
+    TASK_MANAGER_KEEPALIVE_EXPIRY: Seconds an idle pooled connection is kept (default: 60)
+    TASK_MANAGER_DNS_TTL: Seconds resolved addresses are cached (default: 60, 0 disables)
+
+Outside replay, every client in the process shares one pooled transport per
+configuration, so connections (and the warm-up in warmup.py) outlive any
+single request.
+"""
+
+import importlib.util
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import anyio
+import httpcore
+import httpx
+
+from src.clients.dns import AsyncCachingNetworkBackend, CachingNetworkBackend, DnsCache
+from src.clients.hedging import AttemptNetworkBackend
+from src.clients.recording import RecordingTransport, ReplayTransport, load_records
+
+
+class DualTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """One object that is both a sync and an async httpx transport
+
+    The generated Client passes the same ``httpx_args`` to ``httpx.Client`` and
+    ``httpx.AsyncClient``, so a transport given there must serve both. The
+    underlying transports are created on first use with the same arguments.
+    """
+
+    def __init__(self, shared: bool = False, dns_cache: Optional[DnsCache] = None, **kwargs: Any):
+        """
+        Args:
+            shared: Used by several clients at once, so closing one client
+                keeps the sync connection pool open for the others
+            dns_cache: Resolve hosts through this cache instead of on every connection
+            kwargs: httpx.HTTPTransport / httpx.AsyncHTTPTransport arguments
+        """
+        self.shared = shared
+        self.dns_cache = dns_cache
+        self.kwargs = kwargs
+        self._lock = threading.Lock()
+        self._sync: Optional[httpx.HTTPTransport] = None
+        self._async: Optional[httpx.AsyncHTTPTransport] = None
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._sync is None:
+            with self._lock:
+                if self._sync is None:
+                    transport = httpx.HTTPTransport(**self.kwargs)
+                    # httpx has no network backend argument; the pool reads this for each new connection
+                    pool = transport._pool
+                    if self.dns_cache is not None:
+                        pool._network_backend = CachingNetworkBackend(pool._network_backend, self.dns_cache)
+                    if not self.kwargs.get("http2"):
+                        # Hedged attempts shut down their connection when they lose; an HTTP/2
+                        # connection carries other requests too
+                        pool._network_backend = AttemptNetworkBackend(pool._network_backend)
+                    self._sync = transport
+        return self._sync.handle_request(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._async is None:
+            transport = httpx.AsyncHTTPTransport(**self.kwargs)
+            if self.dns_cache is not None:
+                pool = transport._pool
+                pool._network_backend = AsyncCachingNetworkBackend(pool._network_backend, self.dns_cache)
+            self._async = transport
+        return await self._async.handle_async_request(request)
+
+    def close(self) -> None:
+        if self._sync is not None and not self.shared:
+            self._sync.close()
+
+    async def aclose(self) -> None:
+        # Async connections belong to one event loop, so they are never kept
+        if self._async is not None:
+            transport, self._async = self._async, None
+            await transport.aclose()
+
+
+# Client connection preface and an empty SETTINGS frame: what an HTTP/2 client sends first
+_HTTP2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n" + b"\x00\x00\x00\x04\x00\x00\x00\x00\x00"
+_SETTINGS_FRAME = 0x4
+
+
+class Http2Transport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """HTTP/2 transport that falls back to HTTP/1.1
+
+    https URLs negotiate the protocol with ALPN. Plain http URLs (the usual
+    TASK_MANAGER_HOST/PORT setup) have no negotiation, so before the first
+    request the server is probed on a connection of its own: the HTTP/2
+    preface is sent, and an HTTP/2 server answers with a SETTINGS frame where
+    an HTTP/1.1 server answers with an HTTP/1.1 error or closes the
+    connection. The transport then stays on the protocol found. No request is
+    ever sent twice; if the probe cannot reach the server, nothing is decided
+    and the request fails as it would have.
+    """
+
+    def __init__(self, shared: bool = False, **kwargs: Any):
+        """
+        Args:
+            shared: As for DualTransport
+            kwargs: DualTransport arguments (dns_cache and httpx transport arguments)
+        """
+        self.negotiated: Optional[str] = None  # "HTTP/2" or "HTTP/1.1" once known
+        self._uds: Optional[str] = kwargs.get("uds")
+        self._dns_cache: Optional[DnsCache] = kwargs.get("dns_cache")
+        self._negotiate_lock = threading.Lock()
+        self._alpn = DualTransport(shared, http2=True, **kwargs)
+        self._prior_knowledge = DualTransport(shared, http1=False, http2=True, **kwargs)
+        self._http1 = DualTransport(shared, **kwargs)
+
+    def _pick(self, request: httpx.Request) -> DualTransport:
+        if request.url.scheme == "https":
+            return self._alpn
+        if self.negotiated == "HTTP/1.1":
+            return self._http1
+        return self._prior_knowledge
+
+    def _negotiate(self, request: httpx.Request) -> None:
+        """Probe a plain http server for HTTP/2 once, setting negotiated"""
+        with self._negotiate_lock:
+            if self.negotiated is not None:
+                return
+            timeout = request.extensions.get("timeout", {}).get("connect")
+            backend: httpcore.NetworkBackend = httpcore.SyncBackend()
+            try:
+                if self._uds:
+                    stream = backend.connect_unix_socket(self._uds, timeout)
+                else:
+                    if self._dns_cache is not None:
+                        backend = CachingNetworkBackend(backend, self._dns_cache)
+                    stream = backend.connect_tcp(request.url.host, request.url.port or 80, timeout)
+                try:
+                    stream.write(_HTTP2_PREFACE, timeout)
+                    reply = stream.read(9, timeout)  # an HTTP/2 frame header
+                finally:
+                    stream.close()
+            except httpcore.ConnectError:
+                return  # unreachable: the request reports it
+            except (httpcore.ReadError, httpcore.WriteError):
+                reply = b""  # closed on the preface
+            except httpcore.TimeoutException:
+                return
+            if len(reply) >= 4 and reply[3] == _SETTINGS_FRAME:
+                self.negotiated = "HTTP/2"
+            else:
+                self.negotiated = "HTTP/1.1"
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.scheme != "https" and self.negotiated is None:
+            self._negotiate(request)
+        return self._pick(request).handle_request(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.scheme != "https" and self.negotiated is None:
+            await anyio.to_thread.run_sync(self._negotiate, request)
+        return await self._pick(request).handle_async_request(request)
+
+    def close(self) -> None:
+        for transport in (self._alpn, self._prior_knowledge, self._http1):
+            transport.close()
+
+    async def aclose(self) -> None:
+        for transport in (self._alpn, self._prior_knowledge, self._http1):
+            await transport.aclose()
+
+
+def http2_available() -> bool:
+    """True if the optional h2 package is installed"""
+    return importlib.util.find_spec("h2") is not None
+
+
+# One transport per configuration, shared by every client in the process
+_shared: Dict[str, Any] = {}
+_shared_lock = threading.Lock()
+
+
+def _dns_cache() -> Optional[DnsCache]:
+    """The process-wide DNS cache; None when TASK_MANAGER_DNS_TTL is 0"""
+    ttl = float(os.getenv('TASK_MANAGER_DNS_TTL', '60'))
+    if ttl <= 0:
+        return None
+    key = f"dns:{ttl}"
+    if key not in _shared:
+        _shared[key] = DnsCache(ttl)
+    return _shared[key]
+
+
+def parse_speed(value: str) -> Optional[float]:
+    """TASK_MANAGER_REPLAY_SPEED value as a speed factor; None means no delay"""
+    if value.lower() == "max":
+        return None
+    speed = float(value)
+    if speed <= 0:
+        raise ValueError(f"Invalid replay speed '{value}'. Must be a positive number or 'max'")
+    return speed
+
+
+def create_transport() -> Any:
+    """Transport for the configured protocol and record/replay mode
+
+    Returns:
+        A transport usable by both sync and async httpx clients
+    """
+    replay = os.getenv('TASK_MANAGER_REPLAY')
+    record = os.getenv('TASK_MANAGER_RECORD')
+    http2 = os.getenv('TASK_MANAGER_HTTP2', 'false').lower() == 'true'
+    uds = os.getenv('TASK_MANAGER_UDS')
+    if http2 and not http2_available():
+        raise ValueError("TASK_MANAGER_HTTP2=true but the h2 package is not installed (pip install 'httpx[http2]')")
+
+    with _shared_lock:
+        if replay:
+            speed = parse_speed(os.getenv('TASK_MANAGER_REPLAY_SPEED', '1'))
+            key = f"replay:{replay}:{speed}"
+            if key not in _shared:
+                _shared[key] = ReplayTransport(load_records(replay), speed=speed)
+            return _shared[key]
+
+        kwargs = {"uds": uds} if uds else {"dns_cache": _dns_cache()}
+        kwargs["limits"] = httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=float(os.getenv('TASK_MANAGER_KEEPALIVE_EXPIRY', '60'))
+        )
+        key = f"{'http2' if http2 else 'http1'}:{uds or 'tcp'}"
+        if key not in _shared:
+            _shared[key] = Http2Transport(shared=True, **kwargs) if http2 else DualTransport(shared=True, **kwargs)
+        transport = _shared[key]
+
+        if record:
+            key = f"record:{record}:{key}"
+            if key not in _shared:
+                _shared[key] = RecordingTransport(record, transport)
+            transport = _shared[key]
+        return transport
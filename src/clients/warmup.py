@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Background warm-up of a Task Manager client at server start
+
+The first tool call of an agent session would otherwise pay DNS resolution
+and connection setup. The warm-up runs in a daemon thread, so the MCP
+``initialize`` handshake never waits for it, and leaves resolved addresses
+in the DNS cache and open connections in the shared pool.
+
+Configuration:
+    TASK_MANAGER_WARMUP_CONNECTIONS: Connections to open per endpoint (default: 2, 0 disables warm-up)
+    TASK_MANAGER_WARMUP_PROBE: "true" to also check /api/health
+"""
+
+import os
+import threading
+from typing import Optional
+
+from src.clients.base_client import TaskManagerClientBase
+
+
+def start_warm_up(client: TaskManagerClientBase) -> Optional[threading.Thread]:
+    """Warm up client in a background thread
+
+    Returns:
+        The started thread, or None when warm-up is disabled
+    """
+    connections = int(os.getenv('TASK_MANAGER_WARMUP_CONNECTIONS', '2'))
+    if connections <= 0:
+        return None
+    probe = os.getenv('TASK_MANAGER_WARMUP_PROBE', 'false').lower() == 'true'
+    thread = threading.Thread(
+        target=client.warm_up, args=(connections, probe), name="task-manager-warmup", daemon=True
+    )
+    thread.start()
+    return thread
@@ -6,20 +6,59 @@ Tools:
 - update_execution_session: Update execution's session_id
 - create_step: Create a new step in an execution
 - update_step: Update an existing step's status/message
+- list_executions: Query executions, optionally projected to a field subset
+- get_active_execution: Get the running execution of a task
+- wait_for_execution_status: Wait until an execution reaches a status
+- get_task: Get a task with its JIRA ticket details
+- get_tasks: Get many tasks in one call
+- get_task_overview: Task, JIRA summary, active and recent executions in one call
+- list_tasks: List tasks, optionally filtered by status
+- query_execution_stats: Aggregate executions from a local SQLite mirror
+- execution_analytics: Cost, confidence and duration distributions per group
+- cluster_failures: Group failed executions by similar error message
+- step_duration_profile: Step duration percentiles per step name
 - health_check: Check Task Manager service health
+
+Resources (see src/server/resources.py):
+- task://{task_id}: A task and its active execution
+- execution://{execution_id}: An execution, without raw_output
+
+Each tool runs under a deadline budget (see src/clients/deadline.py); the
+Task Manager requests it makes share that budget.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import fastmcp
 
+from src.analytics.clustering import FailureClusters
+from src.analytics.columns import analyze_mirror
+from src.analytics.mirror import ExecutionMirror
+from src.analytics.steps import StepProfiler
 from src.clients import create_task_manager_client
+from src.clients.deadline import current_deadline, with_tool_deadline
+from src.clients.warmup import start_warm_up
+from src.server.overview import TaskOverviews
+from src.server.resources import register_resources
+from src.server.watcher import ResourceWatcher
 
 
 task_client = create_task_manager_client()
+start_warm_up(task_client)
 mcp = fastmcp.FastMCP("Nova Task Manager")
+watcher = ResourceWatcher(task_client)
+register_resources(mcp, watcher)
+overviews = TaskOverviews(task_client)
+watcher.add_listener(overviews.invalidate)
+mirror = ExecutionMirror(task_client)
+failure_clusters = FailureClusters(task_client)
+step_profiler = StepProfiler(task_client)
+
+# Longest wait_for_execution_status call, in seconds
+MAX_WAIT_SECONDS = 1800
 
 
 @mcp.tool()
+@with_tool_deadline
 def update_execution_session(
     execution_id: str,
     session_id: str
@@ -41,6 +80,7 @@ def update_execution_session(
         )
         
         if result.get("success"):
+            overviews.invalidate_execution(execution_id, (result.get("data") or {}).get("task_id"))
             return {
                 "success": True,
                 "message": f"Execution {execution_id} updated with session {session_id}",
@@ -53,6 +93,7 @@ def update_execution_session(
 
 
 @mcp.tool()
+@with_tool_deadline
 def create_step(
     execution_id: str,
     step_name: str,
@@ -86,7 +127,11 @@ def create_step(
         )
         
         if result.get("success"):
+            overviews.invalidate_execution(execution_id)
             step_data = result.get("data", {})
+            step_profiler.record(
+                {"step_name": step_name, "status": status or "running", **(step_data or {})}, created=True
+            )
             return {
                 "success": True,
                 "message": f"Step '{step_name}' created",
@@ -100,6 +145,7 @@ def create_step(
 
 
 @mcp.tool()
+@with_tool_deadline
 def update_step(
     execution_id: str,
     step_id: str,
@@ -137,6 +183,10 @@ def update_step(
         )
         
         if result.get("success"):
+            overviews.invalidate_execution(execution_id)
+            if status:
+                # Message-only updates are not lifecycle transitions
+                step_profiler.record({"step_id": step_id, "status": status, **(result.get("data") or {})})
             return {
                 "success": True,
                 "message": f"Step {step_id} updated",
@@ -149,6 +199,386 @@ def update_step(
 
 
 @mcp.tool()
+@with_tool_deadline
+def list_executions(
+    task_id: Optional[str] = None,
+    status: Optional[str] = None,
+    page: int = 1,
+    limit: int = 20,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Query executions with pagination.
+    
+    Args:
+        task_id: Only return executions of this task (optional)
+        status: Only return executions with this status - "running", "completed", "failed" or "rejected" (optional)
+        page: Page number, starting at 1 (default: 1)
+        limit: Results per page, 1-100 (default: 20)
+        fields: Execution fields to return, e.g. ["execution_id", "status", "completed_at"].
+            Leave out "raw_output" unless you need the full agent transcript; it can be megabytes.
+            Default: all fields.
+    
+    Returns:
+        Executions on the requested page with page, limit and total_count
+    """
+    valid_statuses = {"running", "completed", "failed", "rejected"}
+    if status and status not in valid_statuses:
+        return {
+            "success": False,
+            "error": f"Invalid status '{status}'. Must be one of: running, completed, failed, rejected"
+        }
+    
+    try:
+        return task_client.list_executions(
+            task_id=task_id,
+            status=status,
+            page=page,
+            limit=limit,
+            fields=fields
+        )
+        
+    except Exception as e:
+        return {"success": False, "error": f"Failed to list executions: {str(e)}"}
+
+
+@mcp.tool()
+@with_tool_deadline
+def get_active_execution(
+    task_id: str,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Get the currently running execution of a task.
+    
+    Args:
+        task_id: The task ID
+        fields: Execution fields to return, e.g. ["execution_id", "status", "session_id"].
+            Leave out "raw_output" unless you need the full agent transcript. Default: all fields.
+    
+    Returns:
+        The active execution information
+    """
+    try:
+        return task_client.get_active_execution(task_id=task_id, fields=fields)
+        
+    except Exception as e:
+        return {"success": False, "error": f"Failed to get active execution: {str(e)}"}
+
+
+@mcp.tool()
+@with_tool_deadline
+async def wait_for_execution_status(
+    execution_id: str,
+    target_statuses: List[str],
+    timeout: float = 300
+) -> Dict[str, Any]:
+    """
+    Wait until an execution reaches one of the target statuses, e.g. until another agent's
+    execution has completed. Use this instead of polling get_active_execution or list_executions.
+    
+    Args:
+        execution_id: The execution ID to wait for
+        target_statuses: Statuses to wait for - any of "running", "completed", "failed", "rejected"
+        timeout: Seconds to wait at most (default: 300, max: 1800)
+    
+    Returns:
+        The execution (without raw_output) once it matches; otherwise an error with the last
+        known status - on timeout (timed_out: true), or when it finished with another status
+    """
+    valid_statuses = {"running", "completed", "failed", "rejected"}
+    invalid = [status for status in target_statuses if status not in valid_statuses]
+    if invalid or not target_statuses:
+        return {
+            "success": False,
+            "error": f"Invalid target_statuses {invalid or target_statuses}. "
+                     f"Must be one or more of: running, completed, failed, rejected"
+        }
+    
+    timeout = min(max(timeout, 0), MAX_WAIT_SECONDS)
+    current = current_deadline()
+    if current is not None:
+        timeout = min(timeout, current.remaining())
+    
+    try:
+        return await watcher.wait_for_execution_status(execution_id, target_statuses, timeout)
+        
+    except Exception as e:
+        return {"success": False, "error": f"Failed to wait for execution: {str(e)}"}
+
+
+@mcp.tool()
+@with_tool_deadline
+def get_task(
+    task_id: str,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Get a task by ID, including its JIRA ticket details.
+    
+    Args:
+        task_id: The task ID
+        fields: Task fields to return, e.g. ["task_id", "status", "retry_count"]. Default: all fields.
+    
+    Returns:
+        Task information
+    """
+    try:
+        return task_client.get_task(task_id=task_id, fields=fields)
+        
+    except Exception as e:
+        return {"success": False, "error": f"Failed to get task: {str(e)}"}
+
+
+@mcp.tool()
+@with_tool_deadline
+def get_tasks(
+    task_ids: List[str],
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Get many tasks by ID in one call. Prefer this over calling get_task once per task.
+    
+    Args:
+        task_ids: The task IDs, at most 500; repeated IDs are fetched once
+        fields: Task fields to return, e.g. ["task_id", "status"]. Default: all fields.
+    
+    Returns:
+        tasks in the order of task_ids, each with success and data or error;
+        total_count, failed_count and cached_count
+    """
+    try:
+        return task_client.get_tasks(task_ids=task_ids, fields=fields)
+        
+    except Exception as e:
+        return {"success": False, "error": f"Failed to get tasks: {str(e)}"}
+
+
+@mcp.tool()
+@with_tool_deadline
+def get_task_overview(
+    task_id: str,
+    recent_executions: int = 5
+) -> Dict[str, Any]:
+    """
+    Get a compact overview of a task in one call: task status, JIRA summary, the active
+    execution and the most recent executions. Prefer this over calling get_task,
+    get_active_execution and list_executions one after another.
+    
+    Args:
+        task_id: The task ID
+        recent_executions: Number of recent executions to include, 1-20 (default: 5)
+    
+    Returns:
+        task, jira, active_execution, recent_executions and execution_count; partial: true
+        with errors when a part could not be read
+    """
+    if not 1 <= recent_executions <= 20:
+        return {"success": False, "error": "recent_executions must be between 1 and 20"}
+    
+    try:
+        return overviews.get(task_id, recent=recent_executions)
+        
+    except Exception as e:
+        return {"success": False, "error": f"Failed to get task overview: {str(e)}"}
+
+
+@mcp.tool()
+@with_tool_deadline
+def list_tasks(
+    status: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    List tasks.
+    
+    Args:
+        status: Only return tasks with this status - "running", "success" or "failed" (optional)
+        fields: Task fields to return, e.g. ["task_id", "status"]. Default: all fields.
+    
+    Returns:
+        Tasks with total_count
+    """
+    valid_statuses = {"running", "success", "failed"}
+    if status and status not in valid_statuses:
+        return {
+            "success": False,
+            "error": f"Invalid status '{status}'. Must be one of: running, success, failed"
+        }
+    
+    try:
+        return task_client.list_tasks(status=status, fields=fields)
+        
+    except Exception as e:
+        return {"success": False, "error": f"Failed to list tasks: {str(e)}"}
+
+
+@mcp.tool()
+@with_tool_deadline
+def query_execution_stats(
+    group_by: str = "status",
+    status: Optional[str] = None,
+    trigger_type: Optional[str] = None,
+    task_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    order_by: str = "executions",
+    limit: int = 20
+) -> Dict[str, Any]:
+    """
+    Aggregate executions across the fleet, e.g. which tasks failed most this week or total
+    cost per trigger type. Answered from a local mirror that is synced incrementally first.
+    
+    Args:
+        group_by: "task_id", "status", "trigger_type" or "day" (default: "status")
+        status: Only executions with this status (optional)
+        trigger_type: Only executions with this trigger type (optional)
+        task_id: Only executions of this task (optional)
+        since: Only executions started at or after this ISO time, e.g. "2026-10-12" (optional)
+        until: Only executions started before this ISO time (optional)
+        order_by: "executions", "failed", "total_cost_usd" or "avg_duration_seconds", largest first
+        limit: Number of groups to return, 1-500 (default: 20)
+    
+    Returns:
+        groups with executions, failed, total_cost_usd, avg_cost_usd, avg_confidence and
+        avg_duration_seconds; stale: true with sync_error when the mirror could not be synced
+    """
+    if not 1 <= limit <= 500:
+        return {"success": False, "error": "limit must be between 1 and 500"}
+    
+    try:
+        return mirror.query_stats(
+            group_by=group_by, status=status, trigger_type=trigger_type, task_id=task_id,
+            since=since, until=until, order_by=order_by, limit=limit
+        )
+        
+    except Exception as e:
+        return {"success": False, "error": f"Failed to query execution stats: {str(e)}"}
+
+
+@mcp.tool()
+@with_tool_deadline
+def execution_analytics(
+    group_by: Optional[str] = "status",
+    task_id: Optional[str] = None,
+    status: Optional[str] = None,
+    trigger_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    metrics: Optional[List[str]] = None,
+    percentiles: Optional[List[float]] = None,
+    histogram: Optional[str] = None,
+    bins: int = 10,
+    limit: int = 20
+) -> Dict[str, Any]:
+    """
+    Distributions of execution cost, confidence and duration per group: count, sum, mean,
+    percentiles and optionally a histogram. Computed over the local mirror (see
+    query_execution_stats), which is synced incrementally first.
+    
+    Args:
+        group_by: "task_id", "status" or "trigger_type"; null for one group of all executions
+        task_id: Only executions of this task (optional)
+        status: Only executions with this status (optional)
+        trigger_type: Only executions with this trigger type (optional)
+        since: Only executions started at or after this ISO time (optional)
+        until: Only executions started before this ISO time (optional)
+        metrics: Any of "cost_usd", "confidence_level", "duration_seconds". Default: all three.
+        percentiles: Percentiles to compute, 0-100 (default: [50, 90, 99])
+        histogram: Metric to bin per group, e.g. "duration_seconds" (optional)
+        bins: Histogram bins, 1-1000 (default: 10)
+        limit: Number of groups to return, largest first, 1-500 (default: 20)
+    
+    Returns:
+        groups with executions and per-metric count, sum, mean and p<N>; histogram edges
+        when a histogram was requested
+    """
+    if not 1 <= limit <= 500:
+        return {"success": False, "error": "limit must be between 1 and 500"}
+    options = {"bins": bins, "limit": limit}
+    if metrics is not None:
+        options["metrics"] = metrics
+    if percentiles is not None:
+        options["percentiles"] = percentiles
+    if histogram is not None:
+        options["histogram"] = histogram
+    filters = {"task_id": task_id, "status": status, "trigger_type": trigger_type, "since": since, "until": until}
+    
+    try:
+        return analyze_mirror(mirror, group_by=group_by, filters=filters, **options)
+        
+    except Exception as e:
+        return {"success": False, "error": f"Failed to compute execution analytics: {str(e)}"}
+
+
+@mcp.tool()
+@with_tool_deadline
+def cluster_failures(
+    task_id: Optional[str] = None,
+    since: Optional[str] = None,
+    limit: int = 20
+) -> Dict[str, Any]:
+    """
+    Group failed executions whose error messages are similar (numbers, ids and quoted
+    values ignored), largest group first. Failures clustered by earlier calls are kept;
+    each call only fetches and assigns the failures that are new since.
+    
+    Args:
+        task_id: Only failures of this task (optional)
+        since: Only failures started at or after this ISO time (optional)
+        limit: Number of clusters to return, 1-500 (default: 20)
+    
+    Returns:
+        failures, cluster_count and clusters with count, representative error message,
+        first_seen, last_seen, sample execution_ids and the task_ids most affected;
+        partial: true with error when not every page could be fetched
+    """
+    if not 1 <= limit <= 500:
+        return {"success": False, "error": "limit must be between 1 and 500"}
+    
+    try:
+        return failure_clusters.cluster(task_id=task_id, since=since, limit=limit)
+        
+    except Exception as e:
+        return {"success": False, "error": f"Failed to cluster failures: {str(e)}"}
+
+
+@mcp.tool()
+@with_tool_deadline
+def step_duration_profile(
+    step_name: Optional[str] = None,
+    percentiles: Optional[List[float]] = None,
+    limit: int = 20
+) -> Dict[str, Any]:
+    """
+    Which agent phases (step names such as "analyzing", "coding", "testing") take the
+    most wall time: step duration percentiles per step name across executions, from
+    steps created and updated through this server plus history backfilled once from
+    a sqlite backend database when one is configured.
+    
+    Args:
+        step_name: Only this step name (optional)
+        percentiles: Percentiles to estimate, 0-100 (default: [50, 95])
+        limit: Number of step names to return, most total time first, 1-500 (default: 20)
+    
+    Returns:
+        phases with count, total_seconds, share of all step time, mean/min/max seconds,
+        p<N> seconds and counts per final status; running steps not yet finished
+    """
+    if not 1 <= limit <= 500:
+        return {"success": False, "error": "limit must be between 1 and 500"}
+    
+    try:
+        if percentiles is None:
+            return step_profiler.profile(step_name=step_name, limit=limit)
+        return step_profiler.profile(step_name=step_name, percentiles=percentiles, limit=limit)
+        
+    except Exception as e:
+        return {"success": False, "error": f"Failed to profile step durations: {str(e)}"}
+
+
+@mcp.tool()
+@with_tool_deadline
 def health_check() -> Dict[str, Any]:
     """
     Check Task Manager service health status.
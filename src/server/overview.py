@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Composite task overview: a task, its active execution and recent executions
+
+The three reads are issued concurrently over the pooled client, so an
+overview costs one round-trip time instead of three. Each is projected to
+the fields the overview shows, and the merged result is cached per task.
+
+A cached overview depends on its task and on every execution it shows. It is
+dropped when any of them is written through this server, when the resource
+watcher sees one of them change, or after TASK_MANAGER_OVERVIEW_TTL seconds.
+
+Configuration:
+    TASK_MANAGER_OVERVIEW_TTL: Seconds a cached overview is served (default: 5, 0 disables)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.clients.base_client import TaskManagerClientBase
+
+
+TASK_FIELDS = ["task_id", "status", "jira_ticket_id", "jira_info", "failure_reason", "retry_count", "updated_at"]
+JIRA_FIELDS = ("key", "summary", "status", "assignee")
+ACTIVE_EXECUTION_FIELDS = ["execution_id", "status", "session_id", "trigger_type", "started_at"]
+RECENT_EXECUTION_FIELDS = [
+    "execution_id", "status", "trigger_type", "started_at", "completed_at", "cost_usd", "error_message"
+]
+
+# Overviews cached at most
+MAX_CACHED = 1024
+
+
+class TaskOverviews:
+    """Builds task overviews and caches them with dependency-aware invalidation"""
+
+    def __init__(self, client: TaskManagerClientBase, ttl: Optional[float] = None):
+        """
+        Args:
+            client: Client the reads are made with
+            ttl: Seconds a cached overview is served (default: TASK_MANAGER_OVERVIEW_TTL or 5)
+        """
+        self.client = client
+        self.ttl = ttl if ttl is not None else float(os.getenv('TASK_MANAGER_OVERVIEW_TTL', '5'))
+        self._pool = ThreadPoolExecutor(max_workers=12, thread_name_prefix="overview")
+        self._lock = threading.Lock()
+        # (task_id, recent) -> (expires_at, overview)
+        self._cache: Dict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = {}
+        # "task://id" / "execution://id" -> cache keys of the overviews showing it
+        self._dependents: Dict[str, Set[Tuple[str, int]]] = {}
+        # Bumped by every invalidation, so a read that raced one is not cached
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, task_id: str, recent: int = 5) -> Dict[str, Any]:
+        """Overview of a task with its `recent` latest executions"""
+        key = (task_id, recent)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return {**entry[1], "cached": True}
+            self.misses += 1
+            generation = self._generation
+
+        task, active, executions = self._fan_out(
+            lambda: self.client.get_task(task_id, fields=TASK_FIELDS),
+            lambda: self.client.get_active_execution(task_id, fields=ACTIVE_EXECUTION_FIELDS),
+            lambda: self.client.list_executions(task_id=task_id, limit=recent, fields=RECENT_EXECUTION_FIELDS)
+        )
+        if not task.get("success"):
+            return task
+        overview, errors = self._merge(task["data"], active, executions)
+        result = {"success": True, "data": overview}
+        if errors:
+            # Partial overviews are not cached
+            result["partial"] = True
+            result["errors"] = errors
+        elif self.ttl > 0:
+            self._store(key, result, overview, generation)
+        return {**result, "cached": False}
+
+    def _fan_out(self, *reads: Callable[[], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run reads concurrently, each in a copy of the caller's context to keep its deadline"""
+        futures = [self._pool.submit(copy_context().run, self._call, read) for read in reads]
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _call(read: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        try:
+            return read()
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    def _merge(
+        task: Dict[str, Any], active: Dict[str, Any], executions: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        errors = {}
+        jira = task.get("jira_info") or None
+        overview = {
+            "task": {field: task.get(field) for field in TASK_FIELDS if field != "jira_info" and field in task},
+            "jira": {field: jira.get(field) for field in JIRA_FIELDS if field in jira} if jira else None,
+            "active_execution": None,
+            "recent_executions": [],
+            "execution_count": None
+        }
+        if active.get("success"):
+            overview["active_execution"] = active.get("data")
+        elif active.get("status_code") != 404:
+            errors["active_execution"] = active.get("error")
+        if executions.get("success"):
+            data = executions.get("data") or {}
+            overview["recent_executions"] = [
+                {field: value for field, value in execution.items() if value is not None}
+                for execution in data.get("executions") or []
+            ]
+            overview["execution_count"] = data.get("total_count")
+        else:
+            errors["recent_executions"] = executions.get("error")
+        return overview, errors
+
+    # Cache
+
+    def _store(
+        self, key: Tuple[str, int], result: Dict[str, Any], overview: Dict[str, Any], generation: int
+    ) -> None:
+        dependencies = {f"task://{key[0]}"}
+        executions = overview["recent_executions"] + [overview["active_execution"] or {}]
+        dependencies.update(f"execution://{e['execution_id']}" for e in executions if e.get("execution_id"))
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._cache.pop(key, None)
+            if len(self._cache) >= MAX_CACHED:
+                # Oldest first
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = (time.monotonic() + self.ttl, result)
+            for dependency in dependencies:
+                self._dependents.setdefault(dependency, set()).add(key)
+
+    def invalidate(self, uri: str) -> None:
+        """Drop the cached overviews showing a task:// or execution:// resource"""
+        with self._lock:
+            self._generation += 1
+            for key in self._dependents.pop(uri, ()):
+                if self._cache.pop(key, None) is not None:
+                    self.invalidations += 1
+            if len(self._dependents) > 4 * len(self._cache) + 64:
+                # Drop index entries of overviews that were invalidated through another dependency
+                for dependency in list(self._dependents):
+                    self._dependents[dependency] &= self._cache.keys()
+                    if not self._dependents[dependency]:
+                        del self._dependents[dependency]
+
+    def invalidate_execution(self, execution_id: str, task_id: Optional[str] = None) -> None:
+        """An execution was written; the overviews showing it, or its task when known, are stale"""
+        self.invalidate(f"execution://{execution_id}")
+        if task_id:
+            self.invalidate(f"task://{task_id}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cached": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations
+            }
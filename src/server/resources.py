@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+MCP resources for task and execution status
+
+Resources:
+- task://{task_id}: A task and its active execution
+- execution://{execution_id}: An execution (without raw_output)
+
+Both are backed by one ResourceWatcher (see watcher.py). Clients get change
+notifications either way the protocol offers them: resources/subscribe on
+earlier protocol versions, subscriptions/listen streams from 2026-07-28 on.
+"""
+
+import asyncio
+import weakref
+from typing import Any, Dict, Optional
+
+import fastmcp
+from mcp import types
+from mcp.server.subscriptions import InMemorySubscriptionBus, ListenHandler, ResourceUpdated
+
+from src.server.watcher import EXECUTION_URI, TASK_URI, ResourceWatcher, parse_uri
+
+
+class _SessionNotifier:
+    """Sends resources/updated to one session subscribed with resources/subscribe"""
+
+    def __init__(self, watcher: ResourceWatcher, session: Any, loop: asyncio.AbstractEventLoop):
+        self.watcher = watcher
+        self.session = session
+        self.loop = loop
+
+    def __call__(self, uri: str) -> None:
+        future = asyncio.run_coroutine_threadsafe(self.session.send_resource_updated(uri), self.loop)
+        future.add_done_callback(self._sent)
+
+    def _sent(self, future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            self.watcher.unsubscribe_all(self)
+
+
+class _WatchingListenHandler(ListenHandler):
+    """subscriptions/listen handler that watches the requested resources while the stream is open"""
+
+    def __init__(self, watcher: ResourceWatcher):
+        super().__init__(InMemorySubscriptionBus())
+        self.watcher = watcher
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _publish(self, uri: str) -> None:
+        # One event per change, fanned out by the bus to every stream listening for uri
+        asyncio.run_coroutine_threadsafe(self._bus.publish(ResourceUpdated(uri=uri)), self._loop)
+
+    async def __call__(self, ctx, params: types.SubscriptionsListenRequestParams) -> types.SubscriptionsListenResult:
+        self._loop = asyncio.get_running_loop()
+        uris = []
+        for uri in params.notifications.resource_subscriptions or ():
+            try:
+                self.watcher.subscribe(uri, self._publish)
+                uris.append(uri)
+            except ValueError:
+                continue  # Not ours; honored and never fires
+        try:
+            return await super().__call__(ctx, params)
+        finally:
+            for uri in uris:
+                self.watcher.unsubscribe(uri, self._publish)
+
+
+def register_resources(mcp: fastmcp.FastMCP, watcher: ResourceWatcher) -> None:
+    """Add the task:// and execution:// resources and their subscription handlers to mcp"""
+
+    @mcp.resource(TASK_URI, mime_type="application/json")
+    def task_resource(task_id: str) -> Dict[str, Any]:
+        """A task and its active execution. Subscribe to be notified when either changes."""
+        return watcher.read(f"task://{task_id}")
+
+    @mcp.resource(EXECUTION_URI, mime_type="application/json")
+    def execution_resource(execution_id: str) -> Dict[str, Any]:
+        """An execution, without raw_output. Subscribe to be notified when its status or fields change."""
+        return watcher.read(f"execution://{execution_id}")
+
+    notifiers: "weakref.WeakKeyDictionary[Any, _SessionNotifier]" = weakref.WeakKeyDictionary()
+
+    async def subscribe(ctx, params: types.SubscribeRequestParams) -> types.EmptyResult:
+        uri = str(params.uri)
+        parse_uri(uri)
+        notifier = notifiers.get(ctx.session)
+        if notifier is None:
+            notifier = notifiers[ctx.session] = _SessionNotifier(watcher, ctx.session, asyncio.get_running_loop())
+        # Repeated subscriptions of a session count once
+        if not watcher.subscribed(uri, notifier):
+            watcher.subscribe(uri, notifier)
+        return types.EmptyResult()
+
+    async def unsubscribe(ctx, params: types.UnsubscribeRequestParams) -> types.EmptyResult:
+        notifier = notifiers.get(ctx.session)
+        if notifier is not None:
+            watcher.unsubscribe(str(params.uri), notifier)
+        return types.EmptyResult()
+
+    server = mcp._mcp_server
+    server.add_request_handler("resources/subscribe", types.SubscribeRequestParams, subscribe)
+    server.add_request_handler("resources/unsubscribe", types.UnsubscribeRequestParams, unsubscribe)
+    server.add_request_handler(
+        "subscriptions/listen", types.SubscriptionsListenRequestParams, _WatchingListenHandler(watcher)
+    )
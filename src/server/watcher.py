@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+Shared background watcher behind the task:// and execution:// MCP resources
+
+Agents subscribe to a resource instead of polling for it. However many
+subscribers a task has, one thread polls it: /api/tasks/{id} and
+/api/tasks/{id}/active-execution on each round. A subscribed execution is
+followed through the active execution of its task, and its final state is
+looked up once when it stops being active. Each poll is compared with the
+previous one; subscribers of a resource that changed are notified, and the
+resource content carries the changed fields. Reads of a watched resource are
+answered from the last poll.
+
+Polling is adaptive: a task is polled every min interval after a change or
+a new subscription and backs off by BACKOFF per unchanged round, up to the
+max interval; errors back off twice as fast. Intervals are jittered so that
+the MCP processes of many agents do not poll in step.
+
+wait_for_execution_status() blocks a caller until an execution reaches a
+status, on the same shared poll stream.
+
+Configuration:
+    TASK_MANAGER_WATCH_MIN_INTERVAL: Seconds between polls of a changing task (default: 1)
+    TASK_MANAGER_WATCH_MAX_INTERVAL: Seconds between polls of a quiet task (default: 30)
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.clients.base_client import MAX_PAGE_SIZE, TaskManagerClientBase
+from src.clients.deadline import deadline, tool_budget
+
+
+logger = logging.getLogger(__name__)
+
+TASK_URI = "task://{task_id}"
+EXECUTION_URI = "execution://{execution_id}"
+
+# Everything but raw_output, which can be megabytes and changes on every poll
+WATCHED_EXECUTION_FIELDS = [
+    "execution_id", "task_id", "status", "session_id", "worktree_path", "trigger_type",
+    "sandbox_type", "commit_sha", "comment_id", "cost_usd", "confidence_level",
+    "confidence_reason", "error_message", "started_at", "completed_at"
+]
+TERMINAL_EXECUTION_STATUSES = frozenset({"completed", "failed", "rejected"})
+
+# Interval growth per unchanged poll
+BACKOFF = 1.5
+# Intervals vary by up to this fraction either way
+JITTER = 0.2
+
+Subscriber = Callable[[str], None]
+
+
+def parse_uri(uri: str) -> Tuple[str, str]:
+    """("task", task_id) or ("execution", execution_id) for a resource URI"""
+    scheme, separator, resource_id = uri.partition("://")
+    if not separator or scheme not in ("task", "execution") or not resource_id or "/" in resource_id:
+        raise ValueError(f"Unknown resource '{uri}'. Must be task://{{task_id}} or execution://{{execution_id}}")
+    return scheme, resource_id
+
+
+def diff(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Changed top-level fields as {field: {"old", "new"}}"""
+    old = old or {}
+    new = new or {}
+    return {
+        field: {"old": old.get(field), "new": new.get(field)}
+        for field in sorted(set(old) | set(new))
+        if old.get(field) != new.get(field)
+    }
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class _TaskPoll:
+    """Poll state of one watched task"""
+
+    def __init__(self, task_id: str, interval: float):
+        self.task_id = task_id
+        self.interval = interval
+        self.next_at = 0.0
+        self.polled = False
+        self.task: Optional[Dict[str, Any]] = None
+        self.active: Optional[Dict[str, Any]] = None
+        self.changes: Dict[str, Any] = {}
+        self.version = 0
+        self.polled_at: Optional[str] = None
+        self.error: Optional[str] = None
+
+
+class _ExecutionWatch:
+    """State of one watched execution"""
+
+    def __init__(self, execution_id: str):
+        self.execution_id = execution_id
+        self.task_id: Optional[str] = None
+        self.retry_at = 0.0
+        self.missing = False
+        # Newest started_at listed when it was last searched for; a retry only
+        # searches executions started since
+        self.searched_to: Optional[str] = None
+        self.execution: Optional[Dict[str, Any]] = None
+        self.changes: Dict[str, Any] = {}
+        self.version = 0
+        self.polled_at: Optional[str] = None
+        self.error: Optional[str] = None
+
+
+class ResourceWatcher:
+    """One poll stream per watched task, shared by all subscribers"""
+
+    def __init__(
+        self,
+        client: TaskManagerClientBase,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            client: Client the watcher polls with
+            min_interval: Seconds between polls of a changing task (default: TASK_MANAGER_WATCH_MIN_INTERVAL or 1)
+            max_interval: Seconds between polls of a quiet task (default: TASK_MANAGER_WATCH_MAX_INTERVAL or 30)
+        """
+        self.client = client
+        if min_interval is None:
+            min_interval = float(os.getenv('TASK_MANAGER_WATCH_MIN_INTERVAL', '1'))
+        if max_interval is None:
+            max_interval = float(os.getenv('TASK_MANAGER_WATCH_MAX_INTERVAL', '30'))
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+
+        self._lock = threading.Condition()
+        # uri -> subscriber -> subscription count
+        self._subscribers: Dict[str, Dict[Subscriber, int]] = {}
+        self._tasks: Dict[str, _TaskPoll] = {}
+        self._executions: Dict[str, _ExecutionWatch] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Subscriber] = []
+        self.polls = 0
+        self.notifications = 0
+
+    # Subscriptions
+
+    def subscribe(self, uri: str, subscriber: Subscriber) -> None:
+        """Call subscriber(uri) whenever the resource changes
+
+        Raises:
+            ValueError: uri is not a task:// or execution:// URI
+        """
+        kind, resource_id = parse_uri(uri)
+        with self._lock:
+            counts = self._subscribers.setdefault(uri, {})
+            counts[subscriber] = counts.get(subscriber, 0) + 1
+            if kind == "execution":
+                watch = self._executions.get(resource_id)
+                if watch is None:
+                    watch = self._executions[resource_id] = _ExecutionWatch(resource_id)
+                resource_id = watch.task_id
+            if resource_id is not None:
+                # A new subscriber wants fresh state soon: poll fast again
+                poll = self._watch_task(resource_id)
+                poll.interval = self.min_interval
+                poll.next_at = min(poll.next_at, time.monotonic() + self.min_interval)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="resource-watcher", daemon=True)
+                self._thread.start()
+            self._lock.notify()
+
+    def add_listener(self, listener: Subscriber) -> None:
+        """Call listener(uri) for every change of any watched resource, without watching anything"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def subscribed(self, uri: str, subscriber: Subscriber) -> bool:
+        with self._lock:
+            return subscriber in self._subscribers.get(uri, {})
+
+    def unsubscribe(self, uri: str, subscriber: Subscriber) -> None:
+        """Undo one subscribe(uri, subscriber); the resource stops being watched with its last subscriber"""
+        with self._lock:
+            counts = self._subscribers.get(uri, {})
+            if subscriber not in counts:
+                return
+            counts[subscriber] -= 1
+            if counts[subscriber] == 0:
+                del counts[subscriber]
+            if not counts:
+                self._subscribers.pop(uri, None)
+                self._forget(uri)
+
+    def unsubscribe_all(self, subscriber: Subscriber) -> None:
+        """Drop every subscription of subscriber, e.g. when its session is gone"""
+        with self._lock:
+            for uri in [uri for uri, counts in self._subscribers.items() if subscriber in counts]:
+                del self._subscribers[uri][subscriber]
+                if not self._subscribers[uri]:
+                    del self._subscribers[uri]
+                    self._forget(uri)
+
+    def _watch_task(self, task_id: str) -> _TaskPoll:
+        poll = self._tasks.get(task_id)
+        if poll is None:
+            poll = self._tasks[task_id] = _TaskPoll(task_id, self.min_interval)
+        return poll
+
+    def _forget(self, uri: str) -> None:
+        """Stop watching what no subscription needs any more; caller holds the lock"""
+        kind, resource_id = parse_uri(uri)
+        if kind == "execution":
+            self._executions.pop(resource_id, None)
+        needed = {parse_uri(uri)[1] for uri in self._subscribers if uri.startswith("task://")}
+        needed.update(watch.task_id for watch in self._executions.values() if watch.task_id)
+        for task_id in list(self._tasks):
+            if task_id not in needed:
+                del self._tasks[task_id]
+
+    def watched(self) -> Dict[str, Any]:
+        """Watched tasks and executions with their poll intervals"""
+        with self._lock:
+            return {
+                "tasks": {task_id: round(poll.interval, 3) for task_id, poll in self._tasks.items()},
+                "executions": {execution_id: watch.task_id for execution_id, watch in self._executions.items()},
+                "subscriptions": {uri: sum(counts.values()) for uri, counts in self._subscribers.items()},
+                "polls": self.polls,
+                "notifications": self.notifications
+            }
+
+    # Waiting
+
+    async def wait_for_execution_status(
+        self, execution_id: str, statuses: List[str], timeout: float
+    ) -> Dict[str, Any]:
+        """Wait until an execution has one of statuses, without holding a thread
+
+        Concurrent waiters on one execution share its poll stream.
+
+        Returns:
+            The execution once it matches; otherwise an error with the last
+            known status: on timeout, when the execution finished with another
+            status, or when it does not exist
+        """
+        uri = f"execution://{execution_id}"
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+
+        def subscriber(_: str) -> None:
+            loop.call_soon_threadsafe(changed.set)
+
+        started = time.monotonic()
+        self.subscribe(uri, subscriber)
+        try:
+            while True:
+                changed.clear()
+                content = await asyncio.to_thread(self.read, uri)
+                waited = round(time.monotonic() - started, 3)
+                if not content.get("success"):
+                    if content.get("status_code") == 404:
+                        return content
+                    execution = None
+                else:
+                    execution = content["execution"]
+                status = (execution or {}).get("status")
+                if status in statuses:
+                    return {"success": True, "status": status, "waited_seconds": waited, "data": execution}
+                if status in TERMINAL_EXECUTION_STATUSES:
+                    return {
+                        "success": False,
+                        "error": f"Execution {execution_id} finished with status '{status}'",
+                        "status": status,
+                        "waited_seconds": waited,
+                        "data": execution
+                    }
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    return {
+                        "success": False,
+                        "error": f"Timed out after {timeout:g}s waiting for execution {execution_id} "
+                                 f"to reach {', '.join(statuses)}",
+                        "timed_out": True,
+                        "status": status,
+                        "waited_seconds": waited,
+                        "data": execution
+                    }
+                try:
+                    await asyncio.wait_for(changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.unsubscribe(uri, subscriber)
+
+    # Reads
+
+    def read(self, uri: str) -> Dict[str, Any]:
+        """Resource content: the last poll when watched, otherwise fetched now
+
+        A watched resource read before its first poll is fetched into the
+        watch, so later changes are reported against what the reader saw.
+        """
+        kind, resource_id = parse_uri(uri)
+        with self._lock:
+            if kind == "task":
+                poll = self._tasks.get(resource_id)
+                if poll is not None and poll.polled:
+                    return self._task_content(poll)
+            else:
+                watch = self._executions.get(resource_id)
+                if watch is not None and watch.polled_at is not None:
+                    return self._execution_content(watch)
+
+        if kind == "task":
+            poll = poll or _TaskPoll(resource_id, self.min_interval)
+            self._poll_task(poll)
+            return self._task_content(poll)
+        if watch is None:
+            watch = _ExecutionWatch(resource_id)
+            self._resolve(watch, [])
+        else:
+            self._resolve_watch(watch)
+        return self._execution_content(watch)
+
+    @staticmethod
+    def _task_content(poll: _TaskPoll) -> Dict[str, Any]:
+        if poll.task is None and poll.error:
+            return {"success": False, "error": poll.error}
+        return {
+            "success": True,
+            "task": poll.task,
+            "active_execution": poll.active,
+            "changes": poll.changes,
+            "version": poll.version,
+            "polled_at": poll.polled_at
+        }
+
+    @staticmethod
+    def _execution_content(watch: _ExecutionWatch) -> Dict[str, Any]:
+        if watch.execution is None:
+            if watch.missing:
+                return {"success": False, "error": watch.error, "status_code": 404}
+            return {"success": False, "error": watch.error or f"Execution {watch.execution_id} not resolved yet"}
+        return {
+            "success": True,
+            "execution": watch.execution,
+            "changes": watch.changes,
+            "version": watch.version,
+            "polled_at": watch.polled_at
+        }
+
+    # Polling
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                due = [poll for poll in self._tasks.values() if poll.next_at <= now]
+                unresolved = [
+                    watch for watch in self._executions.values()
+                    if watch.task_id is None and watch.retry_at <= now
+                ]
+                if not due and not unresolved:
+                    waits = [poll.next_at for poll in self._tasks.values()]
+                    waits += [watch.retry_at for watch in self._executions.values() if watch.task_id is None]
+                    self._lock.wait(min(waits) - now if waits else None)
+                    continue
+
+            # A failure is logged and retried later; it never stops the thread
+            for watch in unresolved:
+                try:
+                    self._resolve_watch(watch)
+                except Exception:
+                    logger.exception("Looking up execution %s failed", watch.execution_id)
+                    with self._lock:
+                        watch.retry_at = time.monotonic() + self.max_interval
+            changed: List[str] = []
+            for poll in due:
+                try:
+                    changed += self._poll(poll)
+                except Exception as e:
+                    logger.exception("Polling task %s failed", poll.task_id)
+                    with self._lock:
+                        poll.error = f"Poll failed: {str(e)}"
+                        self._schedule(poll, min(poll.interval * BACKOFF * BACKOFF, self.max_interval))
+            self._notify(changed)
+
+    def _resolve_watch(self, watch: _ExecutionWatch) -> None:
+        """Find the task of a newly watched execution and start watching that task"""
+        with self._lock:
+            known = [poll.active for poll in self._tasks.values() if poll.active]
+        self._resolve(watch, known)
+        with self._lock:
+            if self._executions.get(watch.execution_id) is not watch:
+                return
+            if watch.task_id is None:
+                # Not created yet, or Task Manager unreachable
+                watch.retry_at = time.monotonic() + self.max_interval
+            else:
+                self._watch_task(watch.task_id)
+
+    def _resolve(self, watch: _ExecutionWatch, known: List[Dict[str, Any]]) -> None:
+        """Look up an execution by ID: among known active executions, else in the execution list"""
+        watch.polled_at = _now()
+        for active in known:
+            if active.get("execution_id") == watch.execution_id:
+                self._update_execution(watch, active)
+                return
+        found, newest = self._lookup(watch.execution_id, since=watch.searched_to)
+        if found is None and newest is not None:
+            watch.searched_to = max(newest, watch.searched_to or "")
+        if isinstance(found, dict):
+            self._update_execution(watch, found)
+        else:
+            watch.missing = found is None
+            watch.error = found or f"Execution {watch.execution_id} not found"
+
+    def _lookup(
+        self, execution_id: str, task_id: Optional[str] = None, since: Optional[str] = None
+    ) -> Tuple[Any, Optional[str]]:
+        """Page through the executions, newest first, until one is found
+
+        Args:
+            execution_id: Execution to find
+            task_id: Its task, to list only that task's executions (optional)
+            since: Stop at executions started before this, which the execution
+                is not among (optional, default: search them all)
+
+        Returns:
+            (the execution, None if not found, or an error message; the newest
+            started_at listed)
+        """
+        newest = None
+        pages = self.client.iter_executions(task_id=task_id, fields=WATCHED_EXECUTION_FIELDS, page_size=MAX_PAGE_SIZE)
+        while True:
+            # Each page is a request of its own, with its own budget
+            with deadline(tool_budget("list_executions")):
+                result = next(pages, None)
+            if result is None:
+                break
+            if not result.get("success"):
+                return result.get("error", "Failed to list executions"), newest
+            executions = result["data"]["executions"]
+            for execution in executions:
+                if execution.get("execution_id") == execution_id:
+                    return execution, newest
+                started_at = str(execution.get("started_at") or "")
+                newest = max(newest or started_at, started_at)
+            if since is not None and executions and str(executions[-1].get("started_at") or "") < since:
+                break
+        return None, newest
+
+    @staticmethod
+    def _update_execution(watch: _ExecutionWatch, execution: Dict[str, Any]) -> bool:
+        """Store a newer state of the execution; True if it changed"""
+        watch.task_id = watch.task_id or execution.get("task_id")
+        watch.error = None
+        watch.missing = False
+        if watch.execution is None:
+            watch.execution = execution
+            watch.version = 1
+            return False
+        changes = diff(watch.execution, execution)
+        if not changes:
+            return False
+        watch.execution = execution
+        watch.changes = changes
+        watch.version += 1
+        return True
+
+    def _poll(self, poll: _TaskPoll) -> List[str]:
+        """Poll one task and the executions followed through it; URIs of the resources that changed"""
+        changed = self._poll_task(poll)
+        uris = [f"task://{poll.task_id}"] if changed else []
+
+        with self._lock:
+            watches = [watch for watch in self._executions.values() if watch.task_id == poll.task_id]
+        for watch in watches:
+            watch.polled_at = poll.polled_at
+            if poll.active and poll.active.get("execution_id") == watch.execution_id:
+                updated = self._update_execution(watch, poll.active)
+            elif changed is not None and (watch.execution or {}).get("status") not in TERMINAL_EXECUTION_STATUSES:
+                # No longer active: fetch its final state
+                found, _ = self._lookup(
+                    watch.execution_id, task_id=poll.task_id, since=(watch.execution or {}).get("started_at")
+                )
+                updated = isinstance(found, dict) and self._update_execution(watch, found)
+            else:
+                updated = False
+            if updated:
+                uris.append(f"execution://{watch.execution_id}")
+
+        with self._lock:
+            if changed is None:
+                self._schedule(poll, min(poll.interval * BACKOFF * BACKOFF, self.max_interval))
+            elif uris:
+                self._schedule(poll, self.min_interval)
+            else:
+                self._schedule(poll, min(poll.interval * BACKOFF, self.max_interval))
+        return uris
+
+    def _schedule(self, poll: _TaskPoll, interval: float) -> None:
+        """Count a poll and set when the next one is due; called with the lock held"""
+        self.polls += 1
+        poll.interval = interval
+        poll.next_at = time.monotonic() + interval * random.uniform(1 - JITTER, 1 + JITTER)
+
+    def _poll_task(self, poll: _TaskPoll) -> Optional[bool]:
+        """Fetch a task and its active execution into poll
+
+        Returns:
+            True if either changed since the previous poll, False if not or on
+            the first poll, None if Task Manager could not be read
+        """
+        with deadline(tool_budget("get_task")):
+            task = self.client.get_task(poll.task_id)
+        with deadline(tool_budget("get_active_execution")):
+            active = self.client.get_active_execution(poll.task_id, fields=WATCHED_EXECUTION_FIELDS)
+
+        poll.polled_at = _now()
+        poll.error = None
+        if task.get("success"):
+            new_task = task.get("data")
+        elif task.get("status_code") == 404:
+            new_task = None
+            poll.error = task.get("error") or f"Task {poll.task_id} not found"
+        else:
+            poll.error = task.get("error") or "Failed to get task"
+            poll.polled = True
+            return None
+
+        if active.get("success"):
+            new_active = active.get("data")
+        elif active.get("status_code") == 404:
+            new_active = None
+        else:
+            new_active = poll.active
+
+        with self._lock:
+            first = not poll.polled
+            changes = {}
+            task_changes = diff(poll.task, new_task)
+            if task_changes:
+                changes["task"] = task_changes
+            active_changes = diff(poll.active, new_active)
+            if active_changes:
+                changes["active_execution"] = active_changes
+            poll.polled = True
+            if not changes:
+                return False
+            poll.task = new_task
+            poll.active = new_active
+            poll.changes = {} if first else changes
+            poll.version += 1
+        return not first
+
+    def _notify(self, uris: List[str]) -> None:
+        for uri in uris:
+            with self._lock:
+                listeners = list(self._listeners)
+                subscribers = list(self._subscribers.get(uri, {}))
+            for listener in listeners:
+                try:
+                    listener(uri)
+                except Exception:
+                    logger.exception("Resource listener failed for %s", uri)
+            for subscriber in subscribers:
+                try:
+                    subscriber(uri)
+                    self.notifications += 1
+                except Exception:
+                    # The subscriber's session is gone
+                    self.unsubscribe_all(subscriber)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for columnar execution analytics
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastmcp import Client
+
+from src.analytics.columns import ExecutionColumns, analyze_mirror, available_backends, parse_timestamp
+from src.analytics.mirror import ExecutionMirror
+from src.clients.mock_client import MockTaskManagerClient
+from src.server import mcp_tools
+
+
+def executions(count: int = 1000, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    result = []
+    for i in range(count):
+        result.append({
+            "execution_id": f"e{i}",
+            "task_id": f"t{i % 13}",
+            "status": rng.choice(["completed", "failed", "running"]),
+            "trigger_type": rng.choice(["manual", "scheduled", None]),
+            "cost_usd": None if i % 7 == 0 else round(rng.random() * 3, 4),
+            "confidence_level": rng.randint(0, 100),
+            "started_at": f"2026-09-21T{(i // 60) % 24:02d}:{i % 60:02d}:00Z",
+            "completed_at": None if i % 5 == 0 else f"2026-09-21T{(i // 60) % 24:02d}:{i % 60:02d}:{i % 50 + 1:02d}.250Z",
+        })
+    return result
+
+
+def test_aggregates_match_a_direct_computation():
+    rows = [
+        {"task_id": "a", "status": "failed", "cost_usd": 1.0, "confidence_level": 10,
+         "started_at": "2026-10-01T00:00:00Z", "completed_at": "2026-10-01T00:00:10Z"},
+        {"task_id": "a", "status": "failed", "cost_usd": 3.0, "confidence_level": 30,
+         "started_at": "2026-10-01T00:00:00Z", "completed_at": "2026-10-01T00:00:30Z"},
+        {"task_id": "a", "status": "completed", "cost_usd": None, "confidence_level": 50,
+         "started_at": "2026-10-01T00:00:00Z", "completed_at": None},
+        {"task_id": "b", "status": "completed", "cost_usd": 2.0, "confidence_level": 90,
+         "started_at": "2026-10-01T00:00:00+00:00", "completed_at": "2026-10-01T00:01:00+00:00"},
+    ]
+    for backend in available_backends():
+        columns = ExecutionColumns(backend)
+        columns.append(rows)
+        result = columns.aggregate("task_id", percentiles=[50, 100], histogram="cost_usd", bins=2)
+        a, b = result["groups"]
+        assert a["key"] == "a" and a["executions"] == 3
+        assert a["cost_usd"] == {"count": 2, "sum": 4.0, "mean": 2.0, "p50": 2.0, "p100": 3.0}
+        assert a["duration_seconds"] == {"count": 2, "sum": 40.0, "mean": 20.0, "p50": 20.0, "p100": 30.0}
+        assert a["confidence_level"]["p50"] == 30.0
+        assert b["duration_seconds"]["p50"] == 60.0
+        assert result["histogram"] == {"metric": "cost_usd", "edges": [1.0, 2.0, 3.0]}
+        assert a["histogram"] == [1, 1] and b["histogram"] == [0, 1]
+
+        overall = columns.aggregate(metrics=["cost_usd"], percentiles=[25])
+        assert overall["groups"] == [{"key": "all", "executions": 4, "cost_usd": {
+            "count": 3, "sum": 6.0, "mean": 2.0, "p25": 1.5
+        }}]
+        empty = ExecutionColumns(backend).aggregate("status", histogram="duration_seconds")
+        assert empty["groups"] == [] and empty["histogram"]["edges"] == []
+    print(f"✓ grouped sums, means, percentiles and histograms ({', '.join(available_backends())})")
+
+
+def test_backends_agree():
+    if len(available_backends()) < 2:
+        print("✓ backends agree (skipped: numpy not installed)")
+        return
+    results = []
+    for backend in available_backends():
+        columns = ExecutionColumns(backend)
+        columns.append(executions(5000))
+        result = columns.aggregate("trigger_type", percentiles=[1, 50, 95.5], histogram="duration_seconds", bins=7)
+        result.pop("backend")
+        results.append(result)
+    assert results[0] == results[1]
+    print("✓ numpy and stdlib backends agree")
+
+
+def test_invalid_options():
+    columns = ExecutionColumns()
+    for options in ({"group_by": "day"}, {"metrics": ["raw_output"]}, {"percentiles": [101]}, {"bins": 0}):
+        try:
+            columns.aggregate(**options)
+            assert False, options
+        except ValueError:
+            pass
+    print("✓ invalid options are rejected")
+
+
+def test_load_from_client_and_mirror():
+    backend = MockTaskManagerClient()
+    for execution in executions(250):
+        backend.put_execution(execution)
+    from_client, error = ExecutionColumns.from_client(backend, page_size=100)
+    assert error is None and len(from_client) == 250
+    try:
+        ExecutionColumns.from_client(backend, page_size=500)
+        assert False
+    except ValueError:
+        pass
+
+    with tempfile.TemporaryDirectory() as directory:
+        mirror = ExecutionMirror(backend, path=os.path.join(directory, "mirror.db"))
+        assert mirror.sync()["success"]
+        from_mirror = ExecutionColumns.from_mirror(mirror)
+        # SQLite parses the timestamps to the same epoch milliseconds
+        assert sorted(from_mirror.completed_at) == sorted(from_client.completed_at)
+        assert sorted(from_mirror.started_at) == sorted(from_client.started_at)
+        filtered = analyze_mirror(mirror, group_by="status", filters={"task_id": "t1"}, metrics=["cost_usd"])
+        mirror.close()
+    assert sum(group["executions"] for group in filtered["data"]["groups"]) == 20
+    assert parse_timestamp("2026-10-01T00:00:01.5Z") == 1_790_812_801_500
+    assert parse_timestamp("not a time") == parse_timestamp(None)
+    print("✓ columns loaded from the client and from the mirror")
+
+
+def test_execution_analytics_tool():
+    backend = MockTaskManagerClient()
+    for execution in executions(300):
+        backend.put_execution(execution)
+    with tempfile.TemporaryDirectory() as directory:
+        original = mcp_tools.mirror
+        mcp_tools.mirror = ExecutionMirror(backend, path=os.path.join(directory, "mirror.db"))
+
+        async def main():
+            async with Client(mcp_tools.mcp) as session:
+                result = await session.call_tool("execution_analytics", {
+                    "group_by": "task_id", "metrics": ["duration_seconds"], "histogram": "duration_seconds", "limit": 3
+                })
+                invalid = await session.call_tool("execution_analytics", {"histogram": "raw_output"})
+                return result.data, invalid.data
+
+        try:
+            result, invalid = asyncio.run(main())
+        finally:
+            mcp_tools.mirror.close()
+            mcp_tools.mirror = original
+    assert result["success"] and len(result["data"]["groups"]) == 3
+    assert set(result["data"]["groups"][0]) == {"key", "executions", "duration_seconds", "histogram"}
+    assert not invalid["success"] and "raw_output" in invalid["error"]
+    print("✓ execution_analytics tool")
+
+
+if __name__ == "__main__":
+    test_aggregates_match_a_direct_computation()
+    test_backends_agree()
+    test_invalid_options()
+    test_load_from_client_and_mirror()
+    test_execution_analytics_tool()
+    print("✅ All passed!")
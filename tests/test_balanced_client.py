@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-endpoint balanced client, against several stand-in servers
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.standin_server import StandinServer
+from src.clients.balanced_client import BalancedTaskManagerClient, parse_endpoints
+from src.clients.client_factory import create_task_manager_client
+from src.clients.mock_client import MockTaskManagerClient
+
+
+def backend() -> MockTaskManagerClient:
+    store = MockTaskManagerClient()
+    store.put_task({"task_id": "1", "title": "Task 1", "status": "running"})
+    return store
+
+
+def test_parse_endpoints():
+    assert parse_endpoints(" a:1, https://b/ ,") == ["http://a:1", "https://b"]
+    os.environ["TASK_MANAGER_ENDPOINTS"] = "127.0.0.1:1,127.0.0.1:2"
+    use_mock = os.environ.pop("USE_MOCK_CLIENT", None)
+    try:
+        client = create_task_manager_client()
+        assert isinstance(client, BalancedTaskManagerClient)
+        assert [e.base_url for e in client.endpoints] == ["http://127.0.0.1:1", "http://127.0.0.1:2"]
+    finally:
+        os.environ.pop("TASK_MANAGER_ENDPOINTS")
+        if use_mock is not None:
+            os.environ["USE_MOCK_CLIENT"] = use_mock
+    print("✓ endpoints parsed from env")
+
+
+def test_balancing_and_write_pinning():
+    servers = [StandinServer(backend()).start() for _ in range(3)]
+    try:
+        for strategy in ("p2c", "least-outstanding"):
+            client = BalancedTaskManagerClient([s.base_url for s in servers], strategy=strategy, health_interval=60)
+            before = [s.app.requests for s in servers]
+
+            def agent(n: int):
+                execution_id = f"{strategy}-{n}"
+                for i in range(3):
+                    assert client.create_step(execution_id, f"step-{i}")["success"]
+                assert client.get_task(1)["success"]
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(agent, range(30)))
+            client.close()
+
+            served = [s.app.requests - b for s, b in zip(servers, before)]
+            assert sum(served) == 120
+            assert all(n > 0 for n in served), served
+            # Every step of one execution landed on one backend
+            for n in range(30):
+                holders = [s for s in servers if s.app.backend._steps_by_execution.get(f"{strategy}-{n}")]
+                assert len(holders) == 1
+            assert all(e["outstanding"] == 0 and e["healthy"] for e in client.endpoint_stats())
+    finally:
+        for server in servers:
+            server.stop()
+    print("✓ requests balanced, writes pinned per execution")
+
+
+def test_failover_and_readmission():
+    servers = [StandinServer(backend()).start() for _ in range(2)]
+    try:
+        client = BalancedTaskManagerClient([s.base_url for s in servers], health_interval=0.1)
+        assert client.create_step("exec-1", "build")["success"]
+        pinned = next(s for s in servers if s.app.backend._steps_by_execution.get("exec-1"))
+        other = next(s for s in servers if s is not pinned)
+        pinned.stop()
+
+        # Reads and writes fail over; the execution is repinned to the live endpoint
+        for _ in range(5):
+            assert client.get_task(1)["success"]
+        assert client.create_step("exec-1", "test")["success"]
+        assert len(other.app.backend._steps_by_execution["exec-1"]) == 1
+
+        time.sleep(0.3)
+        down = next(e for e in client.endpoint_stats() if e["base_url"] == pinned.base_url)
+        assert not down["healthy"]
+        assert client.health_check()["message"] == "1/2 Task Manager endpoints healthy"
+
+        restarted = StandinServer(backend(), port=pinned.port).start()
+        servers[servers.index(pinned)] = restarted
+        time.sleep(0.3)
+        assert all(e["healthy"] for e in client.endpoint_stats())
+        client.close()
+    finally:
+        for server in servers:
+            if server is not pinned:
+                server.stop()
+    print("✓ failover, ejection and re-admission")
+
+
+if __name__ == "__main__":
+    test_parse_endpoints()
+    test_balancing_and_write_pinning()
+    test_failover_and_readmission()
+    print("✅ All passed!")
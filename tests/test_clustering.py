@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Tests for failure clustering over execution error messages
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastmcp import Client
+
+from src.analytics import clustering
+from src.analytics.clustering import FailureClusters, FailureIndex, normalize, shingles, signature, similarity
+from src.clients.mock_client import MockTaskManagerClient
+from src.clients.sqlite_client import SqliteTaskManagerClient
+from src.server import mcp_tools
+
+
+FAMILIES = [
+    "Timeout after {n}s waiting for response from https://api.example.com/v1/jobs/{n}",
+    "KeyError: 'field_{n}' while parsing the JIRA ticket payload for PROJ-{n}",
+    "Git push rejected: remote branch feature/{n} was updated by another process, fetch and retry",
+    "Out of memory: model context exceeded {n} tokens during code generation step {n}",
+]
+
+
+def failure(i: int, family: int, minute: int = None) -> dict:
+    minute = i if minute is None else minute
+    return {
+        "execution_id": f"e{i:05d}",
+        "task_id": f"t{i % 3}",
+        "status": "failed",
+        "error_message": FAMILIES[family].format(n=i * 7919 % 1000),
+        "started_at": f"2026-10-{1 + minute // 1440:02d}T{minute // 60 % 24:02d}:{minute % 60:02d}:00Z",
+    }
+
+
+def seeded(count: int) -> MockTaskManagerClient:
+    backend = MockTaskManagerClient(max_executions=count * 2 + 100)
+    for i in range(count):
+        backend.put_execution(failure(i, i % len(FAMILIES)))
+        if i % 5 == 0:
+            backend.put_execution({"execution_id": f"ok{i}", "status": "completed", "error_message": "x"})
+    return backend
+
+
+def test_signatures():
+    assert normalize("Timeout after 30s on 'job-a' 0xdeadbeef") == normalize("timeout after 45s on \"job-b\" 0x1f")
+    first, second = (signature(shingles(normalize(FAMILIES[0].format(n=n)))) for n in (1, 2))
+    assert similarity(first, second) == 1.0
+    other = signature(shingles(normalize(FAMILIES[2].format(n=1))))
+    assert similarity(first, other) < 0.2
+    assert signature(shingles(normalize(""))) == signature(shingles(normalize(None)))
+    print("✓ normalized messages share signatures; unrelated messages do not")
+
+
+def test_clusters_and_incremental_assignment():
+    backend = seeded(400)
+    index = FailureIndex(backend)
+    assert index.refresh()["data"]["new_failures"] == 400
+    summary = index.summary()
+    assert summary["failures"] == 400 and summary["cluster_count"] == 4
+    assert all(cluster["count"] == 100 for cluster in summary["clusters"])
+    assert {c["representative"].split()[0] for c in summary["clusters"]} == {"Timeout", "KeyError:", "Git", "Out"}
+
+    calls = []
+    pages = backend.list_executions
+
+    def counting(**kwargs):
+        if kwargs["status"] == "failed":
+            calls.append(kwargs["page"])
+        return pages(**kwargs)
+
+    backend.list_executions = counting
+    for i in range(400, 420):
+        backend.put_execution(failure(i, 1))
+    # A message close to an existing family joins it; a new kind starts a cluster
+    backend.put_execution({**failure(420, 0), "error_message": FAMILIES[0].format(n=5) + " (attempt 3)"})
+    backend.put_execution({**failure(421, 0), "error_message": "Permission denied writing /srv/repo/.git/index.lock"})
+    assert index.refresh()["data"]["new_failures"] == 22
+    # The first page already reaches failures clustered before
+    assert calls == [1]
+    counts = sorted(cluster["count"] for cluster in index.summary()["clusters"])
+    assert counts == [1, 100, 100, 101, 120]
+    print("✓ clusters, and new failures assigned without reclustering")
+
+
+def test_clusters_sharing_a_band_stay_reachable():
+    # Signatures set by hand: b shares only band 0 with a; c shares only band 0
+    # with both, but agrees with b on three of four rows in every other band
+    a = (0,) * 64
+    b = (0,) * 4 + (1,) * 60
+    c = (0,) * 4 + tuple(2 if i % 4 == 0 else 1 for i in range(60))
+    signatures = {"a": a, "b": b, "c": c}
+    original = clustering.shingles, clustering.signature
+    clustering.shingles = lambda text: text
+    clustering.signature = lambda text: signatures[text]
+    try:
+        index = FailureIndex(MockTaskManagerClient())
+        ids = [index.add({"execution_id": name, "error_message": name}) for name in ("a", "b", "c")]
+    finally:
+        clustering.shingles, clustering.signature = original
+    assert clustering.similarity(b, c) > 0.5 > clustering.similarity(a, c)
+    assert ids == [0, 1, 1]
+    print("✓ a band bucket leads to every cluster in it")
+
+
+def test_since_extends_the_index_on_demand():
+    backend = seeded(500)
+    index = FailureIndex(backend)
+    since = failure(300, 0)["started_at"]
+    index.refresh(since)
+    assert 200 <= len(index) < 500 and not index.exhausted
+    assert index.summary(since)["failures"] == 200
+
+    calls = []
+    pages = backend.list_executions
+
+    def counting(**kwargs):
+        if kwargs["status"] == "failed":
+            calls.append(kwargs["page"])
+        return pages(**kwargs)
+
+    backend.list_executions = counting
+    index.refresh()
+    # Pages are read in order through the clustered range, never guessed
+    assert len(index) == 500 and index.exhausted and calls == [1, 2, 3, 4, 5, 6]
+    assert index.summary()["failures"] == 500
+    print("✓ since bounds paging; older failures are clustered when asked for")
+
+
+def test_no_gap_after_a_since_refresh():
+    backend = seeded(200)
+    backend.max_executions = 5000
+    index = FailureIndex(backend)
+    index.refresh(failure(190, 0)["started_at"])
+    for i in range(200, 1200):
+        backend.put_execution(failure(i, i % len(FAMILIES)))
+    # The recent since must not leave the failures between the two batches out
+    index.refresh(failure(1190, 0)["started_at"])
+    index.refresh()
+    assert len(index) == 1200 and index.exhausted
+    assert index.summary()["failures"] == 1200
+    assert index.oldest == failure(0, 0)["started_at"] and index.newest == failure(1199, 0)["started_at"]
+
+    # Nor does a page failing before the clustered range is reached
+    for i in range(1200, 1500):
+        backend.put_execution(failure(i, 0))
+    pages = backend.list_executions
+    backend.list_executions = lambda **kwargs: (
+        {"success": False, "error": "reset"} if kwargs["page"] == 2 else pages(**kwargs)
+    )
+    assert index.refresh()["data"]["new_failures"] == 100
+    backend.list_executions = pages
+    assert index.refresh()["data"]["new_failures"] == 200 and len(index) == 1500
+    print("✓ refreshes with since leave no unclustered gap")
+
+
+def test_execution_failing_below_the_range():
+    # The sqlite backend lists by started_at, so a long execution that fails
+    # late sorts below failures clustered before
+    backend = SqliteTaskManagerClient(path=":memory:")
+    backend.put_execution({**failure(0, 0), "execution_id": "long", "status": "running", "error_message": None})
+    for i in range(1, 151):
+        backend.put_execution(failure(i, i % len(FAMILIES)))
+    index = FailureIndex(backend)
+    assert index.refresh()["data"]["new_failures"] == 150
+
+    backend.put_execution({**failure(0, 2), "execution_id": "long"})
+    assert index.refresh()["data"]["new_failures"] == 1 and "long" in index._seen
+    # Nothing is open any more: the next refresh stops at the first page
+    assert index.open_since is None and index.refresh()["data"]["new_failures"] == 0
+    backend.close()
+    print("✓ executions open at the last refresh are clustered when they fail")
+
+
+def test_failed_pages_and_scopes():
+    backend = seeded(250)
+    pages = backend.list_executions
+
+    def failing(**kwargs):
+        if kwargs.get("page") == 2:
+            return {"success": False, "error": "connection reset"}
+        return pages(**kwargs)
+
+    backend.list_executions = failing
+    clusters = FailureClusters(backend, threshold=0.5)
+    partial = clusters.cluster()
+    assert partial["success"] and partial["partial"] and partial["error"] == "connection reset"
+    assert partial["data"]["failures"] == 100
+
+    scoped = FailureClusters(seeded(250)).cluster(task_id="t1", limit=2)
+    assert scoped["data"]["failures"] == 83 and len(scoped["data"]["clusters"]) == 2
+    assert all(set(c["task_ids"]) == {"t1"} for c in scoped["data"]["clusters"])
+
+    backend.list_executions = lambda **kwargs: {"success": False, "error": "down", "status_code": 503}
+    assert FailureClusters(backend).cluster() == {"success": False, "error": "down", "status_code": 503}
+    print("✓ failed pages return partial clusters; task scopes are separate")
+
+
+def test_cluster_failures_tool():
+    original = mcp_tools.failure_clusters
+    mcp_tools.failure_clusters = FailureClusters(seeded(120))
+
+    async def main():
+        async with Client(mcp_tools.mcp) as session:
+            first = await session.call_tool("cluster_failures", {"limit": 3})
+            again = await session.call_tool("cluster_failures", {})
+            invalid = await session.call_tool("cluster_failures", {"limit": 0})
+            return first.data, again.data, invalid.data
+
+    try:
+        first, again, invalid = asyncio.run(main())
+    finally:
+        mcp_tools.failure_clusters = original
+    assert first["success"] and len(first["data"]["clusters"]) == 3 and first["data"]["new_failures"] == 120
+    assert set(first["data"]["clusters"][0]) == {
+        "cluster_id", "count", "representative", "first_seen", "last_seen", "execution_ids", "task_ids"
+    }
+    assert again["data"]["new_failures"] == 0 and again["data"]["cluster_count"] == 4
+    assert not invalid["success"]
+    print("✓ cluster_failures tool")
+
+
+if __name__ == "__main__":
+    test_signatures()
+    test_clusters_and_incremental_assignment()
+    test_clusters_sharing_a_band_stay_reachable()
+    test_since_extends_the_index_on_demand()
+    test_no_gap_after_a_since_refresh()
+    test_execution_failing_below_the_range()
+    test_failed_pages_and_scopes()
+    test_cluster_failures_tool()
+    print("✅ All passed!")
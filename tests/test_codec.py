@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON codec layer
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.clients.codec import available_codecs, get_codec, codec_response_hook
+from src.clients.lazy_json import LazyCodec, LazyText, loads_lazy, materialize, project
+from src.clients.generated._client.models import HttpExecutionsResponse
+
+
+PAYLOAD = {
+    "success": True,
+    "data": {
+        "executions": [
+            {"execution_id": "exec-1", "status": "completed", "raw_output": "第一行\n\"quoted\"", "cost_usd": 0.25}
+        ],
+        "page": 1,
+        "limit": 20,
+        "total_count": 1
+    }
+}
+
+
+def test_codec_roundtrip():
+    for name in available_codecs():
+        codec = get_codec(name)
+        encoded = codec.dumps(PAYLOAD)
+        assert isinstance(encoded, bytes)
+        assert codec.loads(encoded) == PAYLOAD
+        assert codec.loads(memoryview(encoded)) == PAYLOAD
+        assert codec.loads(encoded.decode("utf-8")) == PAYLOAD
+        print(f"✓ codec roundtrip ({name})")
+
+
+def test_unknown_codec():
+    try:
+        get_codec("msgpack")
+    except ValueError as e:
+        assert "msgpack" in str(e)
+        print("✓ unknown codec rejected")
+    else:
+        raise AssertionError("Unknown codec should raise ValueError")
+
+
+def _handler(request):
+    return httpx.Response(200, content=get_codec("stdlib").dumps(PAYLOAD))
+
+
+def test_response_hook_sync_and_async():
+    codec = get_codec()
+    hook = codec_response_hook(codec)
+    
+    with httpx.Client(transport=httpx.MockTransport(_handler), event_hooks={"response": [hook]}) as client:
+        response = client.get("http://test/api/executions")
+        parsed = HttpExecutionsResponse.from_dict(response.json())
+        assert parsed.data.executions[0].raw_output == "第一行\n\"quoted\""
+    
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_handler), event_hooks={"response": [hook]}) as client:
+            response = await client.get("http://test/api/executions")
+            return response.json()
+    
+    assert asyncio.run(run()) == PAYLOAD
+    print("✓ response hook (sync + async)")
+
+
+def test_loads_lazy():
+    document = {
+        "executions": [
+            {"status": "failed", "raw_output": None, "error_message": "bad \"raw_output\": \"x\""},
+            {"status": "completed", "raw_output": "line\\n\"raw_output\":\"y\"", "nested": {"raw_output": "z"}}
+        ]
+    }
+    for name in available_codecs():
+        codec = get_codec(name)
+        decoded = loads_lazy(codec.dumps(document), codec=codec)
+        executions = decoded["executions"]
+        assert executions[0]["raw_output"] is None
+        assert isinstance(executions[0]["error_message"], LazyText)
+        assert isinstance(executions[1]["nested"]["raw_output"], LazyText)
+        assert project(executions[1], ["status", "missing"]) == {"status": "completed"}
+        assert materialize(decoded) == document
+        print(f"✓ loads_lazy ({name})")
+
+    # Closing quotes followed by a space: the first unescaped quote ends the value
+    assert loads_lazy(b'{"raw_output":"a", "status":"running"}') == {"raw_output": "a", "status": "running"}
+    for separators in ((", ", ":"), (", ", ": ")):
+        spaced = json.dumps(document, separators=separators).encode()
+        assert materialize(loads_lazy(spaced)) == document
+    assert materialize(loads_lazy(json.dumps(document, indent=2).encode())) == document
+    escaped = {"raw_output": 'ends with \\" , "status":"x"}', "status": "failed"}
+    assert materialize(loads_lazy(json.dumps(escaped, separators=(", ", ":")).encode())) == escaped
+    print("✓ loads_lazy with spaces after separators")
+
+    # Escape-dense values (JSON inside JSON) are decoded eagerly
+    stream = {"raw_output": "".join(json.dumps({"type": "text", "text": str(i)}) for i in range(50))}
+    decoded = loads_lazy(get_codec().dumps(stream))
+    assert type(decoded["raw_output"]) is str and decoded == stream
+    print("✓ loads_lazy eager fallback")
+
+
+def test_lazy_generated_model():
+    body = get_codec().dumps(PAYLOAD)
+    parsed = HttpExecutionsResponse.from_dict(LazyCodec().loads(body))
+    info = parsed.data.executions[0]
+    assert isinstance(info._raw_output, LazyText)
+    assert info.status == "completed"
+    assert info.raw_output == "第一行\n\"quoted\""
+    assert parsed.to_dict() == PAYLOAD
+    print("✓ lazy generated model")
+
+
+if __name__ == "__main__":
+    test_codec_roundtrip()
+    test_unknown_codec()
+    test_response_hook_sync_and_async()
+    test_loads_lazy()
+    test_lazy_generated_model()
+    print("✅ All passed!")
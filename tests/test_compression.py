@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for request/response body compression
+"""
+
+import os
+import random
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.payloads import transcript
+from benchmarks.standin_server import StandinServer
+from src.clients.compression import CompressionPolicy, available_encodings, compress, decompress
+from src.clients.http_client import HttpTaskManagerClient
+
+
+STEPS = "POST /api/executions/{id}/steps"
+
+
+def test_codecs_and_policy():
+    data = transcript(random.Random(1), 20_000).encode("utf-8")
+    for encoding in available_encodings():
+        encoded = compress(data, encoding)
+        assert len(encoded) < len(data) / 3
+        assert decompress(encoded, encoding) == data
+
+    policy = CompressionPolicy(responses="GET /api/executions", requests=STEPS, min_bytes=100)
+    assert policy.accept_encoding("GET", "/api/executions") == ", ".join(available_encodings())
+    assert policy.accept_encoding("GET", "/api/tasks") == "identity"
+
+    small, headers = policy.encode_request("POST", "/api/executions/{id}/steps", b"{}", None)
+    assert small == b"{}" and "Content-Encoding" not in headers
+    body, headers = policy.encode_request("POST", "/api/executions/{id}/steps", data, None)
+    assert headers["Content-Encoding"] == "gzip" and decompress(body, "gzip") == data
+    same, _ = policy.encode_request("PATCH", "/api/executions/{id}", data, None)
+    assert same is data
+    assert policy.stats()["bytes_saved"] == len(data) - len(body)
+    print("✓ codecs and per-endpoint policy")
+
+
+def test_against_standin_server():
+    rng = random.Random(2)
+    os.environ["TASK_MANAGER_COMPRESS_REQUESTS"] = STEPS
+    try:
+        with StandinServer() as server:
+            client = HttpTaskManagerClient(base_url=server.base_url)
+            message = transcript(rng, 10_000)
+            step = client.create_step("exec-1", "build", message=message)
+            assert step["success"] and step["data"]["message"] == message
+            server.app.backend.put_execution({"execution_id": "exec-1", "raw_output": transcript(rng, 50_000)})
+            assert len(client.list_executions()["data"]["executions"][0]["raw_output"]) >= 50_000
+
+            stats = client.compression.stats()["endpoints"]
+            assert stats[STEPS]["requests_compressed"] == 1
+            assert stats[STEPS]["request_bytes_sent"] < stats[STEPS]["request_bytes"] / 3
+            executions = stats["GET /api/executions"]
+            assert executions["response_bytes_received"] < executions["response_bytes"] / 3
+            assert client.compression.stats()["bytes_saved"] > 40_000
+
+            # A server refusing compressed bodies gets them plain, and only once compressed
+            server.app.compressed_requests = False
+            for _ in range(2):
+                assert client.create_step("exec-1", "test", message=message)["success"]
+            assert client.compression.stats()["request_compression_rejected"] == [STEPS]
+            assert client.compression.stats()["endpoints"][STEPS]["requests_compressed"] == 2
+    finally:
+        os.environ.pop("TASK_MANAGER_COMPRESS_REQUESTS")
+    print("✓ compressed requests and responses against the stand-in server")
+
+
+def test_responses_disabled():
+    os.environ["TASK_MANAGER_COMPRESS_RESPONSES"] = "none"
+    try:
+        with StandinServer() as server:
+            server.app.backend.put_execution({"execution_id": "exec-1", "raw_output": "x" * 10_000})
+            client = HttpTaskManagerClient(base_url=server.base_url)
+            assert client.list_executions()["success"]
+            assert client.compression.stats()["endpoints"] == {}
+    finally:
+        os.environ.pop("TASK_MANAGER_COMPRESS_RESPONSES")
+    print("✓ response compression off per endpoint")
+
+
+if __name__ == "__main__":
+    test_codecs_and_policy()
+    test_against_standin_server()
+    test_responses_disabled()
+    print("✅ All passed!")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for deadline propagation from tool call to HTTP request
+"""
+
+import asyncio
+import inspect
+import os
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.standin_server import StandinServer
+from src.clients.balanced_client import BalancedTaskManagerClient
+from src.clients.deadline import (
+    DEADLINE_HEADER, DeadlineExceeded, current_deadline, deadline, request_limits, with_tool_deadline
+)
+from src.clients.http_client import HttpTaskManagerClient
+
+
+def test_nested_deadlines():
+    assert request_limits({"A": "1"}) == (httpx.USE_CLIENT_DEFAULT, {"A": "1"})
+    with deadline(0.5) as outer:
+        with deadline(10) as inner:
+            assert inner is outer  # the sooner deadline wins
+        with deadline(0.1) as inner:
+            assert inner.budget == 0.1
+            timeout, headers = request_limits()
+            assert 0 < timeout.read <= 0.1 and 0 < int(headers[DEADLINE_HEADER]) <= 100
+        time.sleep(0.5)
+        try:
+            request_limits()
+            assert False, "expired deadline must not send"
+        except DeadlineExceeded:
+            pass
+    assert current_deadline() is None
+    print("✓ nested deadlines")
+
+
+def test_endpoint_budgets_sent_as_header():
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen[request.method + " " + request.url.path] = int(request.headers[DEADLINE_HEADER])
+        return httpx.Response(200, json={"success": True, "data": {"step_id": "s-1"}})
+
+    client = HttpTaskManagerClient()
+    client.transport = httpx.MockTransport(handler)
+    client.create_step("exec-1", "build")
+    client.health_check()
+    client.list_tasks()
+    assert 4000 < seen["POST /api/executions/exec-1/steps"] <= 5000
+    assert 2000 < seen["GET /api/health"] <= 3000
+    assert seen["GET /api/tasks"] <= client.timeout * 1000
+
+    with deadline(0.8):
+        client.list_tasks()
+    assert seen["GET /api/tasks"] <= 800
+
+    os.environ["TASK_MANAGER_ENDPOINT_DEADLINES"] = "GET /api/tasks=1.5"
+    try:
+        client.list_tasks()
+        assert 1000 < seen["GET /api/tasks"] <= 1500
+    finally:
+        os.environ.pop("TASK_MANAGER_ENDPOINT_DEADLINES")
+    print("✓ endpoint budgets sent in X-Deadline-Ms")
+
+
+def test_budget_bounds_the_wait():
+    servers = [StandinServer(latency=1.0).start() for _ in range(2)]
+    try:
+        client = HttpTaskManagerClient(base_url=servers[0].base_url)
+        start = time.monotonic()
+        with deadline(0.2):
+            result = client.create_step("exec-1", "build")
+        assert not result["success"] and result["error"].startswith("Request timeout")
+        assert time.monotonic() - start < 0.6
+
+        # Failover attempts share the same budget rather than getting one each
+        balanced = BalancedTaskManagerClient([s.base_url for s in servers], health_interval=60)
+        start = time.monotonic()
+        with deadline(0.3):
+            assert not balanced.get_task("1")["success"]
+        assert time.monotonic() - start < 0.7
+        balanced.close()
+    finally:
+        for server in servers:
+            server.stop()
+    print("✓ the budget bounds requests and failover")
+
+
+def test_tool_budgets():
+    @with_tool_deadline
+    def update_step():
+        return current_deadline().budget
+
+    assert update_step() == 5
+    os.environ["TASK_MANAGER_TOOL_DEADLINES"] = "update_step=0.25"
+    try:
+        assert update_step() == 0.25
+    finally:
+        os.environ.pop("TASK_MANAGER_TOOL_DEADLINES")
+    assert update_step.__name__ == "update_step"
+
+    @with_tool_deadline
+    async def get_task():
+        return current_deadline().budget
+
+    assert inspect.iscoroutinefunction(get_task)
+    assert asyncio.run(get_task()) == 10
+    print("✓ per-tool budgets")
+
+
+if __name__ == "__main__":
+    test_nested_deadlines()
+    test_endpoint_budgets_sent_as_header()
+    test_budget_bounds_the_wait()
+    test_tool_budgets()
+    print("✅ All passed!")
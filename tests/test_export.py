@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar export of executions and steps
+"""
+
+import csv
+import gzip
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.analytics.export import (
+    available_formats, export_executions, export_steps, raw_output_path
+)
+from src.clients.mock_client import MockTaskManagerClient
+from src.clients.sqlite_client import SqliteTaskManagerClient
+
+
+def seeded(count: int) -> MockTaskManagerClient:
+    backend = MockTaskManagerClient(max_executions=count + 100)
+    for i in range(count):
+        backend.put_execution({
+            "execution_id": f"e{i:05d}",
+            "task_id": f"t{i % 3}",
+            "status": "failed" if i % 4 == 0 else "completed",
+            "cost_usd": None if i % 10 == 0 else i / 100,
+            "confidence_level": i % 100,
+            "error_message": "boom, \"quoted\"\nline" if i % 4 == 0 else None,
+            "started_at": f"2026-10-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z",
+            "raw_output": f"output {i} " * 20,
+        })
+    return backend
+
+
+def read_csv(path: str) -> list:
+    with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_export_with_separate_raw_output():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "executions.csv.gz")
+        result = export_executions(seeded(250), path, format="csv", raw_output="separate", chunk_size=100)
+        assert result["success"] and result["data"]["rows"] == 250 and result["data"]["chunks"] == 3
+        rows = read_csv(path)
+        assert len(rows) == 250 and "raw_output" not in rows[0]
+        # Newest first, values as the API returns them
+        assert rows[0]["execution_id"] == "e00249" and rows[-1]["cost_usd"] == ""
+        assert rows[-1]["error_message"] == "boom, \"quoted\"\nline" and rows[-2]["error_message"] == ""
+
+        assert result["data"]["raw_output_path"] == raw_output_path(path) == os.path.join(
+            directory, "executions.raw_output.jsonl.gz"
+        )
+        with gzip.open(raw_output_path(path), "rt", encoding="utf-8") as f:
+            raw = [json.loads(line) for line in f]
+        assert len(raw) == 250 and raw[0] == {"execution_id": "e00249", "raw_output": "output 249 " * 20}
+
+        inline = os.path.join(directory, "inline.csv.gz")
+        assert export_executions(seeded(5), inline, format="csv", raw_output="inline")["success"]
+        assert read_csv(inline)[0]["raw_output"].startswith("output 4 ")
+        assert not os.path.exists(raw_output_path(inline))
+        assert "raw_output" not in read_csv(path)[0]
+    print("✓ csv export, raw_output inline or in its own file")
+
+
+def test_constant_memory():
+    peaks = []
+    with tempfile.TemporaryDirectory() as directory:
+        for count in (2000, 8000):
+            backend = seeded(count)
+            tracemalloc.start()
+            result = export_executions(backend, os.path.join(directory, f"{count}.csv.gz"), format="csv", chunk_size=500)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            assert result["data"]["rows"] == count
+    # Four times the rows, about the same peak: one page and one chunk at a time
+    assert peaks[1] < peaks[0] * 1.5, peaks
+    print(f"✓ constant memory ({peaks[0] // 1024} KiB and {peaks[1] // 1024} KiB peaks)")
+
+
+def test_executions_arriving_during_export():
+    backend = seeded(250)
+
+    class Growing(MockTaskManagerClient):
+        def list_executions(self, **kwargs):
+            result = backend.list_executions(**kwargs)
+            if kwargs.get("page") == 1:
+                # Two new executions push two exported ones onto page 2
+                for i in (250, 251):
+                    backend.put_execution({"execution_id": f"e{i:05d}", "status": "running"})
+            return result
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "executions.csv.gz")
+        result = export_executions(Growing(), path, format="csv")
+        ids = [row["execution_id"] for row in read_csv(path)]
+    assert result["data"]["rows"] == 250 and len(set(ids)) == 250
+    print("✓ executions pushed onto the next page are exported once")
+
+
+def test_failures_and_options():
+    with tempfile.TemporaryDirectory() as directory:
+        backend = seeded(250)
+        pages = backend.list_executions
+
+        def failing(**kwargs):
+            if kwargs.get("page") == 2:
+                return {"success": False, "error": "connection reset"}
+            return pages(**kwargs)
+
+        backend.list_executions = failing
+        failed = export_executions(backend, os.path.join(directory, "partial.csv.gz"), format="csv")
+        assert not failed["success"] and failed["error"] == "connection reset" and failed["data"]["rows"] == 100
+
+        assert not export_executions(backend, os.path.join(directory, "x.csv"), raw_output="all")["success"]
+        assert not export_executions(backend, os.path.join(directory, "x.xls"), format="xls")["success"]
+        for chunk_size in (0, -1):
+            invalid = export_executions(backend, os.path.join(directory, "x.csv"), format="csv",
+                                        raw_output="separate", chunk_size=chunk_size)
+            assert "chunk_size" in invalid["error"]
+            assert not os.path.exists(raw_output_path(os.path.join(directory, "x.csv")))
+        missing = [f for f in ("parquet", "npz") if f not in available_formats()]
+        for format in missing:
+            result = export_executions(backend, os.path.join(directory, "x"), format=format)
+            assert "not installed" in result["error"]
+        empty = export_executions(MockTaskManagerClient(), os.path.join(directory, "empty.csv"), format="csv")
+        assert empty["data"]["rows"] == 0
+        backend.list_executions = lambda **kwargs: {"success": True, "data": None}
+        pages = list(backend.iter_executions())
+        assert pages == [{"success": True, "data": {"executions": []}}]
+    print("✓ failed pages, invalid options and missing dependencies")
+
+
+def test_columnar_formats():
+    formats = [f for f in available_formats() if f != "csv"]
+    if not formats:
+        print("✓ parquet, arrow and npz (skipped: pyarrow and numpy not installed)")
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        backend = seeded(250)
+        for format in formats:
+            path = os.path.join(directory, f"executions.{format}")
+            result = export_executions(backend, path, format=format, chunk_size=100)
+            assert result["success"] and result["data"]["chunks"] == 3
+            if format == "npz":
+                import numpy
+                with numpy.load(path) as npz:
+                    assert len(npz.files) == 3 * 15 and "00002/completed_at" in npz.files
+                    assert npz["00000/execution_id"][0] == "e00249"
+                    assert numpy.isnat(npz["00002/completed_at"]).all()
+                    assert numpy.isnan(npz["00002/cost_usd"][-1])
+                    assert str(npz["00000/started_at"][0]) == "2026-10-01T00:04:09.000"
+            else:
+                import pyarrow.ipc
+                import pyarrow.parquet
+                table = (
+                    pyarrow.parquet.read_table(path) if format == "parquet"
+                    else pyarrow.ipc.open_file(path).read_all()
+                )
+                assert table.num_rows == 250 and "raw_output" not in table.column_names
+                assert str(table.schema.field("started_at").type) == "timestamp[ms, tz=UTC]"
+                assert table.column("cost_usd").null_count == 25
+                if format == "parquet":
+                    assert pyarrow.parquet.ParquetFile(path).num_row_groups == 3
+    print(f"✓ {', '.join(formats)} exports")
+
+
+def test_steps_export():
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "tasks.db")
+        client = SqliteTaskManagerClient(path=database)
+        for i in range(30):
+            step = client.create_step(f"e{i % 3}", f"step {i}", message="m")
+            if i % 2:
+                client.patch_step(f"e{i % 3}", step["data"]["step_id"], status="completed")
+        client.close()
+
+        path = os.path.join(directory, "steps.csv.gz")
+        result = export_steps(database, path, format="csv", chunk_size=7)
+        assert result["success"] and result["data"]["rows"] == 30 and result["data"]["chunks"] == 5
+        rows = read_csv(path)
+        assert rows[0]["step_name"] == "step 0" and rows[1]["completed_at"]
+        assert export_steps(database, path, format="csv", execution_id="e1")["data"]["rows"] == 10
+        assert not export_steps(os.path.join(directory, "nope.db"), path)["success"]
+        assert "chunk_size" in export_steps(database, path, format="csv", chunk_size=0)["error"]
+    print("✓ steps exported from a sqlite backend database")
+
+
+if __name__ == "__main__":
+    test_csv_export_with_separate_raw_output()
+    test_constant_memory()
+    test_executions_arriving_during_export()
+    test_failures_and_options()
+    test_columnar_formats()
+    test_steps_export()
+    print("✅ All passed!")
@@ -90,7 +90,42 @@ def test_factory_selection():
     print("✅ Factory selection test completed!")
 
 
+def test_compact_models():
+    """Test the compact generation profile of the generated models"""
+    from src.clients.generated._client.models import HttpExecutionInfo
+    
+    print("\nTesting compact generated models...")
+    a = HttpExecutionInfo.from_dict({"execution_id": "exec-1", "status": "".join(["run", "ning"])})
+    b = HttpExecutionInfo.from_dict({"execution_id": "exec-2", "status": "".join(["run", "ning"]), "extra": 1})
+    
+    assert not hasattr(a, "__dict__"), "Models should be slotted"
+    assert a._additional_properties is None, "No extra keys should mean no dict"
+    assert b["extra"] == 1 and "extra" in b and "extra" not in a
+    assert a.status is b.status, "Enum-like strings should be interned"
+    assert b.to_dict() == {"execution_id": "exec-2", "status": "running", "extra": 1}
+    
+    try:
+        a.status = "failed"
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("Models should be frozen")
+
+    # Equal by value, but never hashable, with or without extra keys
+    assert a == HttpExecutionInfo.from_dict({"execution_id": "exec-1", "status": "running"})
+    for model in (a, b):
+        try:
+            hash(model)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("Models should be unhashable")
+
+    print("✅ Compact models test completed!")
+
+
 if __name__ == "__main__":
     test_factory_selection()
     test_generated_client()
+    test_compact_models()
 
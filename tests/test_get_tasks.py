@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for batch task lookup (get_tasks)
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastmcp import Client
+
+from benchmarks.standin_server import StandinServer
+from src.clients.batch import MAX_BATCH, TaskCache, fetch_tasks
+from src.clients.http_client import HttpTaskManagerClient
+from src.clients.mock_client import MockTaskManagerClient
+from src.clients.sqlite_client import SqliteTaskManagerClient
+from src.server import mcp_tools
+
+
+def seed(backend, count: int = 3) -> None:
+    for i in range(1, count + 1):
+        backend.put_task({"task_id": str(i), "status": "running", "retry_count": i})
+
+
+def test_input_order_and_partial_failures():
+    backend = MockTaskManagerClient()
+    seed(backend)
+    result = backend.get_tasks(["2", "1", "2", "missing", "3"], fields=["task_id", "status"])
+    assert result["success"]
+    tasks = result["data"]["tasks"]
+    assert [task["task_id"] for task in tasks] == ["2", "1", "2", "missing", "3"]
+    assert tasks[0] == {"task_id": "2", "success": True, "data": {"task_id": "2", "status": "running"}}
+    assert tasks[3]["status_code"] == 404 and not tasks[3]["success"]
+    assert result["data"]["total_count"] == 5 and result["data"]["failed_count"] == 1
+
+    assert backend.get_tasks([])["data"]["total_count"] == 0
+    assert backend.get_tasks(["nope"])["success"]
+    too_many = backend.get_tasks([str(i) for i in range(MAX_BATCH + 1)])
+    assert not too_many["success"] and "At most" in too_many["error"]
+    print("✓ results and failures in input order")
+
+
+def test_dedupe_and_cache():
+    calls = []
+
+    def get_task(task_id, fields=None):
+        calls.append(task_id)
+        if task_id == "boom":
+            raise RuntimeError("boom")
+        return {"success": True, "data": {"task_id": task_id}}
+
+    cache = TaskCache(ttl=60)
+    first = fetch_tasks(get_task, ["a", "b", "a", "boom"], cache=cache, concurrency=4)
+    assert sorted(calls) == ["a", "b", "boom"]
+    assert first["data"]["tasks"][3] == {"task_id": "boom", "success": False, "error": "boom"}
+    second = fetch_tasks(get_task, ["b", "a", "c"], cache=cache, concurrency=4)
+    # Failures are not cached; a and b are
+    assert sorted(calls) == ["a", "b", "boom", "c"]
+    assert second["data"]["cached_count"] == 2
+    # Projections are cached separately
+    fetch_tasks(get_task, ["a"], fields=["status"], cache=cache)
+    assert calls.count("a") == 2
+
+    everything_down = fetch_tasks(lambda task_id, fields=None: {"success": False, "error": "down"}, ["a", "b"])
+    assert not everything_down["success"] and everything_down["error"] == "down"
+    print("✓ repeated ids fetched once, successes cached")
+
+
+def test_bounded_concurrency_over_http():
+    previous = os.environ.get("TASK_MANAGER_BATCH_CONCURRENCY")
+    os.environ["TASK_MANAGER_BATCH_CONCURRENCY"] = "8"
+    try:
+        with StandinServer(latency=0.05) as server:
+            seed(server.app.backend, 200)
+            client = HttpTaskManagerClient(base_url=server.base_url)
+            lock = threading.Lock()
+            in_flight = [0, 0]
+            fetch = client._fetch_task
+
+            def counting_fetch(task_id, fields=None):
+                with lock:
+                    in_flight[0] += 1
+                    in_flight[1] = max(in_flight[1], in_flight[0])
+                try:
+                    return fetch(task_id, fields)
+                finally:
+                    with lock:
+                        in_flight[0] -= 1
+
+            client._fetch_task = counting_fetch
+            ids = [str(i) for i in range(1, 201)] * 2
+            started = time.monotonic()
+            result = client.get_tasks(ids, fields=["task_id", "retry_count"])
+            elapsed = time.monotonic() - started
+            requests = server.app.requests
+            again = client.get_tasks(ids[:50], fields=["task_id", "retry_count"])
+            assert server.app.requests == requests
+    finally:
+        if previous is None:
+            os.environ.pop("TASK_MANAGER_BATCH_CONCURRENCY")
+        else:
+            os.environ["TASK_MANAGER_BATCH_CONCURRENCY"] = previous
+
+    assert result["success"] and result["data"]["failed_count"] == 0
+    assert [task["data"]["retry_count"] for task in result["data"]["tasks"]] == list(range(1, 201)) * 2
+    # 200 unique tasks, never more than 8 in flight, about 25 round trips
+    assert in_flight[1] <= 8
+    assert requests == 200
+    assert elapsed < 200 * 0.05 / 4, elapsed
+    assert again["data"]["cached_count"] == 50
+    print(f"✓ 400 ids over HTTP in {elapsed:.2f}s with at most {in_flight[1]} requests in flight")
+
+
+def test_sqlite_single_query():
+    with tempfile.TemporaryDirectory() as directory:
+        client = SqliteTaskManagerClient(path=os.path.join(directory, "tasks.db"))
+        seed(client)
+        result = client.get_tasks(["3", "x", "1", "3"], fields=["retry_count"])
+        client.close()
+    tasks = result["data"]["tasks"]
+    assert [task["task_id"] for task in tasks] == ["3", "x", "1", "3"]
+    assert tasks[0]["data"] == {"retry_count": 3} and tasks[2]["data"] == {"retry_count": 1}
+    assert tasks[1]["status_code"] == 404
+    print("✓ sqlite looks tasks up in one query")
+
+
+def test_get_tasks_tool():
+    backend = MockTaskManagerClient()
+    seed(backend)
+    original = mcp_tools.task_client
+    mcp_tools.task_client = backend
+
+    async def main():
+        async with Client(mcp_tools.mcp) as session:
+            result = await session.call_tool("get_tasks", {"task_ids": ["1", "9", "1"], "fields": ["status"]})
+            return result.data
+
+    try:
+        result = asyncio.run(main())
+    finally:
+        mcp_tools.task_client = original
+    assert [task["success"] for task in result["data"]["tasks"]] == [True, False, True]
+    assert result["data"]["tasks"][0]["data"] == {"status": "running"}
+    print("✓ get_tasks tool")
+
+
+if __name__ == "__main__":
+    test_input_order_and_partial_failures()
+    test_dedupe_and_cache()
+    test_bounded_concurrency_over_http()
+    test_sqlite_single_query()
+    test_get_tasks_tool()
+    print("✅ All passed!")
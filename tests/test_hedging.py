@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for hedged GET requests
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+from benchmarks.standin_server import StandinServer
+from src.clients.balanced_client import BalancedTaskManagerClient
+from src.clients.hedging import MIN_SAMPLES, HedgeBudget, Hedger, LatencyHistogram, route_of
+from src.clients.mock_client import MockTaskManagerClient
+from src.clients.transport import DualTransport
+
+
+def test_histogram_and_budget():
+    histogram = LatencyHistogram()
+    for i in range(1, 101):
+        histogram.record(i / 1000)
+    assert 0.045 < histogram.percentile(50) < 0.056
+    assert 0.094 < histogram.percentile(95) < 0.105
+
+    budget = HedgeBudget(0.1)
+    assert not budget.spend()
+    for _ in range(10):
+        budget.earn()
+    assert budget.spend() and not budget.spend()
+
+    assert route_of("/api/tasks/42/active-execution") == "/api/tasks/{id}/active-execution"
+    assert route_of("/api/executions/e-1/steps/s-2") == "/api/executions/{id}/steps/{id}"
+    print("✓ latency histogram and hedge budget")
+
+
+def test_hedge_beats_stalled_attempt():
+    hedger = Hedger(percentile=95, budget=0.5)
+    for _ in range(MIN_SAMPLES):
+        hedger.call("/r", lambda: time.sleep(0.001))
+
+    calls = []
+    lock = threading.Lock()
+
+    def stalls_first():
+        with lock:
+            calls.append(None)
+            first = len(calls) == 1
+        time.sleep(1.0 if first else 0.001)
+        return "first" if first else "hedge"
+
+    start = time.monotonic()
+    assert hedger.call("/r", stalls_first) == "hedge"
+    assert time.monotonic() - start < 0.5
+    assert hedger.stats()["hedged"] == 1 and hedger.stats()["hedge_wins"] == 1
+
+    # Without budget the slow attempt is simply awaited
+    broke = Hedger(budget=0.0)
+    for _ in range(MIN_SAMPLES):
+        broke.call("/r", lambda: time.sleep(0.001))
+    assert broke.call("/r", lambda: time.sleep(0.05) or "slow") == "slow"
+    assert broke.stats()["hedged"] == 0 and broke.stats()["budget_denied"] == 1
+    print("✓ hedge wins over a stalled attempt, budget caps hedges")
+
+
+def test_losing_attempt_is_shut_down():
+    stall = threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if stall.is_set():
+                stall.clear()
+                time.sleep(3)
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = httpx.Client(base_url=f"http://127.0.0.1:{server.server_port}", transport=DualTransport())
+    hedger = Hedger(budget=0.5)
+    outcomes = []
+
+    def attempt():
+        try:
+            return client.get("/").text
+        except httpx.TransportError as e:
+            outcomes.append((type(e).__name__, time.monotonic()))
+            raise
+
+    try:
+        for _ in range(MIN_SAMPLES):
+            hedger.call("/", attempt)
+        stall.set()
+        start = time.monotonic()
+        assert hedger.call("/", attempt) == "ok"
+        wait_until = time.monotonic() + 2
+        while not outcomes and time.monotonic() < wait_until:
+            time.sleep(0.01)
+        # The stalled attempt failed as soon as the hedge won, not after the server's 3s
+        assert outcomes and outcomes[0][1] - start < 1, outcomes
+        assert hedger.stats()["hedge_wins"] == 1
+        # The pool recovers: later requests succeed
+        assert hedger.call("/", attempt) == "ok"
+    finally:
+        client.close()
+        server.shutdown()
+    print("✓ the losing attempt's connection is shut down")
+
+
+def test_hedged_read_goes_to_other_endpoint():
+    backends = [MockTaskManagerClient() for _ in range(2)]
+    for backend in backends:
+        backend.put_task({"task_id": "1", "status": "running"})
+    servers = [StandinServer(backend).start() for backend in backends]
+    os.environ["TASK_MANAGER_HEDGE"] = "true"
+    os.environ["TASK_MANAGER_HEDGE_BUDGET"] = "0.5"
+    try:
+        client = BalancedTaskManagerClient([s.base_url for s in servers], strategy="least-outstanding", health_interval=60)
+        for _ in range(MIN_SAMPLES + 5):
+            assert client.get_task("1")["success"]
+
+        # Stall the endpoint the next request will be sent to
+        next_endpoint = min(client.endpoints, key=lambda e: (e.outstanding, e.latency))
+        stalled = servers[[e.base_url for e in client.endpoints].index(next_endpoint.base_url)]
+        stalled.app.latency = 1.0
+
+        start = time.monotonic()
+        assert client.get_task("1")["success"]
+        assert time.monotonic() - start < 0.5
+        assert client.hedger.stats()["hedge_wins"] >= 1
+        client.close()
+    finally:
+        os.environ.pop("TASK_MANAGER_HEDGE")
+        os.environ.pop("TASK_MANAGER_HEDGE_BUDGET")
+        for server in servers:
+            server.stop()
+    print("✓ hedged read answered by the other endpoint")
+
+
+if __name__ == "__main__":
+    test_histogram_and_budget()
+    test_hedge_beats_stalled_attempt()
+    test_losing_attempt_is_shut_down()
+    test_hedged_read_goes_to_other_endpoint()
+    print("✅ All passed!")
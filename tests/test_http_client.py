@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for HttpTaskManagerClient against an in-process httpx transport
+"""
+
+import sys
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.clients.codec import get_codec
+from src.clients.http_client import HttpTaskManagerClient
+
+
+EXECUTION = {
+    "execution_id": "exec-1",
+    "task_id": "task-1",
+    "status": "running",
+    "session_id": "session-1",
+    "raw_output": "transcript " * 1000
+}
+TASK = {"task_id": "task-1", "status": "running", "retry_count": 2, "failure_reason": "flaky"}
+
+
+def make_client(requests: list) -> HttpTaskManagerClient:
+    """Client whose requests are answered in-process and recorded"""
+    routes = {
+        "/api/executions": {"executions": [EXECUTION, EXECUTION], "page": 1, "limit": 20, "total_count": 2},
+        "/api/tasks": {"tasks": [TASK], "total_count": 1},
+        "/api/tasks/task-1": TASK,
+        "/api/tasks/task-1/active-execution": EXECUTION,
+        "/api/logs": {"logs": ["started"], "lines": 1, "total_lines": 40},
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/api/dashboard/health":
+            body = get_codec().dumps({"status": "healthy", "cpu_percent": 12.5, "avg_latency_ms": 3.0})
+            return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+        body = get_codec().dumps({"success": True, "data": routes[request.url.path]})
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+    client = HttpTaskManagerClient()
+    client.transport = httpx.MockTransport(handler)
+    return client
+
+
+def test_projection():
+    requests = []
+    client = make_client(requests)
+
+    result = client.list_executions(task_id="task-1", fields=["execution_id", "status"])
+    assert result["data"]["executions"] == [{"execution_id": "exec-1", "status": "running"}] * 2
+    assert result["data"]["total_count"] == 2
+
+    assert client.get_active_execution("task-1", fields=["session_id"])["data"] == {"session_id": "session-1"}
+    assert client.get_task("task-1", fields=["status", "missing"])["data"] == {"status": "running"}
+    assert client.list_tasks(fields=["task_id"])["data"]["tasks"] == [{"task_id": "task-1"}]
+
+    # Without a projection everything comes back, fully decoded
+    assert client.get_active_execution("task-1")["data"] == EXECUTION
+    assert "fields" not in requests[0].url.params
+    print("✓ client-side projection")
+
+
+def test_backend_projection():
+    requests = []
+    client = make_client(requests)
+    client.backend_projection = True
+
+    client.list_executions(status="running", fields=["execution_id", "status"])
+    assert requests[0].url.params["fields"] == "execution_id,status"
+    assert requests[0].url.params["status"] == "running"
+    print("✓ projection forwarded to backend")
+
+
+def test_logs_and_dashboard_health():
+    requests = []
+    client = make_client(requests)
+
+    assert client.get_logs(lines=1)["data"]["logs"] == ["started"]
+    assert requests[0].url.params["lines"] == "1"
+    health = client.dashboard_health()
+    assert health["success"] and health["cpu_percent"] == 12.5
+    print("✓ logs and dashboard health")
+
+
+if __name__ == "__main__":
+    test_projection()
+    test_backend_projection()
+    test_logs_and_dashboard_health()
+    print("✅ All passed!")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental SQLite mirror and query_execution_stats
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastmcp import Client
+
+from src.analytics.mirror import ExecutionMirror
+from src.clients.mock_client import MockTaskManagerClient
+from src.clients.sqlite_client import SqliteTaskManagerClient
+from src.server import mcp_tools
+
+
+class Backend(MockTaskManagerClient):
+    """Mock ordering executions by started_at like Task Manager, counting and optionally failing pages"""
+
+    def __init__(self):
+        super().__init__()
+        self.pages = []
+        self.fail_page = None
+
+    def list_executions(self, task_id=None, status=None, page=None, limit=None, fields=None):
+        self.pages.append(page)
+        if page == self.fail_page:
+            return {"success": False, "error": "connection reset"}
+        with self._lock:
+            executions = sorted(self._executions.values(), key=lambda e: e["started_at"], reverse=True)
+            start = (page - 1) * limit
+            selected = [self._project(e, fields) for e in executions[start:start + limit]]
+        return {"success": True, "data": {"executions": selected, "page": page, "limit": limit,
+                                          "total_count": len(executions)}}
+
+
+def execution(i: int, status: str = "completed", **fields) -> dict:
+    return {
+        "execution_id": f"e{i:03d}",
+        "task_id": f"t{i % 4}",
+        "status": status,
+        "trigger_type": "manual" if i % 2 else "scheduled",
+        "cost_usd": 0.5,
+        "confidence_level": 80,
+        "started_at": f"2026-10-{1 + i // 10:02d}T00:{i % 10:02d}:00Z",
+        "completed_at": f"2026-10-{1 + i // 10:02d}T00:{i % 10:02d}:30Z",
+        "raw_output": "x" * 1000,
+        **fields
+    }
+
+
+def seeded(count: int = 100) -> Backend:
+    backend = Backend()
+    for i in range(4):
+        backend.put_task({"task_id": f"t{i}", "status": "running", "updated_at": f"2026-10-01T00:00:0{i}Z"})
+    for i in range(count):
+        backend.put_execution(execution(i, status="failed" if i % 5 == 0 else "completed"))
+    return backend
+
+
+def test_sync_and_query():
+    backend = seeded()
+    with tempfile.TemporaryDirectory() as directory:
+        mirror = ExecutionMirror(backend, path=os.path.join(directory, "mirror.db"), page_size=30)
+        result = mirror.sync()
+        assert result["success"] and result["data"]["executions"] == 100 and result["data"]["tasks"] == 4
+        assert result["data"]["executions_mark"] == "2026-10-10T00:09:00Z"
+
+        by_status = mirror.query_stats(group_by="status")["data"]["groups"]
+        assert [(g["key"], g["executions"]) for g in by_status] == [("completed", 80), ("failed", 20)]
+        assert by_status[0]["total_cost_usd"] == 40 and by_status[0]["avg_duration_seconds"] == 30
+        top = mirror.query_stats(group_by="task_id", status="failed", order_by="failed", limit=1)["data"]["groups"]
+        # Ties are ordered by key
+        assert top == [{"key": "t0", "executions": 5, "failed": 5, "total_cost_usd": 2.5, "avg_cost_usd": 0.5,
+                        "avg_confidence": 80.0, "avg_duration_seconds": 30.0}]
+        week = mirror.query_stats(group_by="day", since="2026-10-09", refresh=False)["data"]["groups"]
+        assert [(g["key"], g["executions"]) for g in week] == [("2026-10-09", 10), ("2026-10-10", 10)]
+        assert not mirror.query_stats(group_by="raw_output")["success"]
+
+        # The mirror is a database of the sqlite backend, without raw_output
+        mirror.close()
+        offline = SqliteTaskManagerClient(path=os.path.join(directory, "mirror.db"))
+        assert "raw_output" not in offline.list_executions(limit=1)["data"]["executions"][0]
+        offline.close()
+    print("✓ full sync and indexed aggregates")
+
+
+def test_incremental_sync():
+    backend = seeded()
+    backend.put_execution(execution(100, status="running", completed_at=None))
+    with tempfile.TemporaryDirectory() as directory:
+        mirror = ExecutionMirror(backend, path=os.path.join(directory, "mirror.db"), page_size=10)
+        mirror.sync()
+        backend.pages.clear()
+        assert mirror.sync()["data"]["executions"] == 10
+        # Nothing new: one page, stopped by the mark
+        assert backend.pages == [1]
+
+        for i in range(101, 104):
+            backend.put_execution(execution(i))
+        backend.put_execution(execution(100, status="completed"))
+        backend.put_task({"task_id": "t1", "status": "failed", "updated_at": "2026-10-02T00:00:00Z"})
+        backend.pages.clear()
+        result = mirror.sync()
+        assert result["data"]["tasks"] == 1 and backend.pages == [1]
+        assert mirror.query_stats(group_by="status", refresh=False)["data"]["groups"][0]["executions"] == 84
+    print("✓ incremental sync pages down to the high-water mark only")
+
+
+def test_resume_after_interruption():
+    backend = seeded()
+    with tempfile.TemporaryDirectory() as directory:
+        mirror = ExecutionMirror(backend, path=os.path.join(directory, "mirror.db"), page_size=10)
+        backend.fail_page = 4
+        failed = mirror.sync()
+        assert not failed["success"] and failed["data"]["executions"] == 30
+        # Answered from what was mirrored, marked stale
+        stale = mirror.query_stats(group_by="status")
+        assert stale["stale"] and stale["sync_error"] == "connection reset"
+        assert sum(g["executions"] for g in stale["data"]["groups"]) == 30
+
+        backend.fail_page = None
+        backend.pages.clear()
+        resumed = mirror.sync()
+        assert resumed["data"]["resumed"] and backend.pages[0] == 4
+        assert resumed["data"]["executions_mark"] == "2026-10-10T00:09:00Z"
+        assert sum(g["executions"] for g in mirror.query_stats(refresh=False)["data"]["groups"]) == 100
+    print("✓ interrupted sync resumes at its checkpoint")
+
+
+def test_page_size_limit():
+    for page_size in (101, 500):
+        try:
+            ExecutionMirror(Backend(), path=":memory:", page_size=page_size)
+            assert False, page_size
+        except ValueError:
+            pass
+    os.environ["TASK_MANAGER_MIRROR_PAGE_SIZE"] = "200"
+    try:
+        ExecutionMirror(Backend(), path=":memory:")
+        assert False
+    except ValueError:
+        pass
+    finally:
+        del os.environ["TASK_MANAGER_MIRROR_PAGE_SIZE"]
+    assert ExecutionMirror(Backend(), path=":memory:").page_size == 100
+    print("✓ page sizes beyond the API's 100 are rejected")
+
+
+def test_query_execution_stats_tool():
+    backend = seeded(20)
+    with tempfile.TemporaryDirectory() as directory:
+        original = mcp_tools.mirror
+        mcp_tools.mirror = ExecutionMirror(backend, path=os.path.join(directory, "mirror.db"))
+
+        async def main():
+            async with Client(mcp_tools.mcp) as session:
+                stats = await session.call_tool("query_execution_stats", {"group_by": "trigger_type"})
+                invalid = await session.call_tool("query_execution_stats", {"limit": 0})
+                return stats.data, invalid.data
+
+        try:
+            stats, invalid = asyncio.run(main())
+        finally:
+            mcp_tools.mirror.close()
+            mcp_tools.mirror = original
+    assert {g["key"]: g["executions"] for g in stats["data"]["groups"]} == {"manual": 10, "scheduled": 10}
+    assert not invalid["success"]
+    print("✓ query_execution_stats tool")
+
+
+if __name__ == "__main__":
+    test_sync_and_query()
+    test_incremental_sync()
+    test_resume_after_interruption()
+    test_page_size_limit()
+    test_query_execution_stats_tool()
+    print("✅ All passed!")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory MockTaskManagerClient store
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.clients.mock_client import MockTaskManagerClient
+
+
+def test_concurrent_steps():
+    client = MockTaskManagerClient()
+    step_ids = []
+
+    def agent(n: int):
+        for i in range(200):
+            result = client.create_step(f"exec-{n}", f"step-{i}")
+            step_ids.append(result["data"]["step_id"])
+            client.patch_step(f"exec-{n}", result["data"]["step_id"], status="completed")
+
+    threads = [threading.Thread(target=agent, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(step_ids)) == 8 * 200
+    assert all(len(client._steps_by_execution[f"exec-{n}"]) == 200 for n in range(8))
+    assert client.list_executions(limit=100)["data"]["total_count"] == 8
+    print("✓ concurrent steps")
+
+
+def test_steps_belong_to_execution():
+    client = MockTaskManagerClient()
+    step_id = client.create_step("exec-1", "build")["data"]["step_id"]
+    assert not client.patch_step("exec-2", step_id, status="failed")["success"]
+
+    result = client.patch_step("exec-1", step_id, status="completed")
+    assert result["data"]["status"] == "completed" and "completed_at" in result["data"]
+
+    # Returned data is a copy
+    result["data"]["status"] = "failed"
+    assert client._steps[step_id]["status"] == "completed"
+    print("✓ steps belong to their execution")
+
+
+def test_eviction():
+    client = MockTaskManagerClient(max_executions=3, max_steps_per_execution=2)
+    for n in range(5):
+        client.put_execution({"execution_id": f"exec-{n}", "task_id": "task-1", "status": "completed"})
+        for i in range(3):
+            client.create_step(f"exec-{n}", f"step-{i}")
+
+    assert list(client._executions) == ["exec-2", "exec-3", "exec-4"]
+    assert len(client._steps) == 3 * 2
+    assert client.evicted_executions == 2
+    assert client.evicted_steps == 5 + 2 * 2
+    assert list(client._executions_by_task["task-1"]) == ["exec-2", "exec-3", "exec-4"]
+    print("✓ bounded retention")
+
+
+def test_read_endpoints():
+    client = MockTaskManagerClient()
+    client.put_task({"task_id": "task-1", "status": "running", "retry_count": 0})
+    client.put_task({"task_id": "task-2", "status": "failed", "retry_count": 3})
+    for n, status in enumerate(["completed", "failed", "running"]):
+        client.put_execution({"execution_id": f"exec-{n}", "task_id": "task-1", "status": status, "raw_output": "..."})
+    client.put_execution({"execution_id": "exec-other", "task_id": "task-2", "status": "failed"})
+
+    assert client.get_task("task-1", fields=["status"])["data"] == {"status": "running"}
+    assert client.get_task("missing")["status_code"] == 404
+    assert [t["task_id"] for t in client.list_tasks(status="failed")["data"]["tasks"]] == ["task-2"]
+
+    active = client.get_active_execution("task-1", fields=["execution_id", "status"])
+    assert active["data"] == {"execution_id": "exec-2", "status": "running"}
+    assert not client.get_active_execution("task-2")["success"]
+
+    page = client.list_executions(task_id="task-1", page=1, limit=2, fields=["execution_id"])["data"]
+    assert page["executions"] == [{"execution_id": "exec-2"}, {"execution_id": "exec-1"}]
+    assert page["total_count"] == 3
+    failed = client.list_executions(status="failed")["data"]["executions"]
+    assert [e["execution_id"] for e in failed] == ["exec-other", "exec-1"]
+
+    step = client.create_step("exec-2", "build")["data"]
+    client.patch_step("exec-2", step["step_id"], status="completed")
+    logs = client.get_logs(lines=1)["data"]
+    assert logs["lines"] == 1 and logs["total_lines"] == 2
+    assert logs["logs"][0].endswith(f"patch_step exec-2 {step['step_id']} status=completed")
+    assert client.get_logs(lines=0)["status_code"] == 400
+    health = client.dashboard_health()
+    assert health["success"] and health["status"] == "healthy" and health["avg_latency_ms"] == 0.0
+    print("✓ read endpoints")
+
+
+if __name__ == "__main__":
+    test_concurrent_steps()
+    test_steps_belong_to_execution()
+    test_eviction()
+    test_read_endpoints()
+    print("✅ All passed!")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for the composite task overview and its cache
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastmcp import Client
+
+from benchmarks.standin_server import StandinServer
+from src.clients.http_client import HttpTaskManagerClient
+from src.clients.mock_client import MockTaskManagerClient
+from src.server import mcp_tools
+from src.server.overview import TaskOverviews
+
+
+def seed(backend: MockTaskManagerClient) -> None:
+    backend.put_task({
+        "task_id": "1",
+        "status": "running",
+        "retry_count": 1,
+        "jira_ticket_id": "NOVA-7",
+        "jira_info": {"key": "NOVA-7", "summary": "Fix login", "description": "x" * 5000, "status": "open"}
+    })
+    for i in range(8):
+        backend.put_execution({
+            "execution_id": f"e{i}",
+            "task_id": "1",
+            "status": "running" if i == 7 else "failed",
+            "started_at": f"2026-10-0{i + 1}T00:00:00Z",
+            "raw_output": "y" * 10_000
+        })
+
+
+def test_concurrent_fan_out_and_merge():
+    with StandinServer(latency=0.2) as server:
+        seed(server.app.backend)
+        overviews = TaskOverviews(HttpTaskManagerClient(base_url=server.base_url))
+        started = time.monotonic()
+        result = overviews.get("1", recent=3)
+        elapsed = time.monotonic() - started
+    # Three requests in about one round trip
+    assert elapsed < 0.5, elapsed
+    assert result["success"] and not result["cached"]
+    overview = result["data"]
+    assert overview["task"] == {"task_id": "1", "status": "running", "jira_ticket_id": "NOVA-7", "retry_count": 1}
+    assert overview["jira"] == {"key": "NOVA-7", "summary": "Fix login", "status": "open"}
+    assert overview["active_execution"]["execution_id"] == "e7"
+    assert [e["execution_id"] for e in overview["recent_executions"]] == ["e7", "e6", "e5"]
+    assert overview["execution_count"] == 8
+    assert all("raw_output" not in e for e in overview["recent_executions"])
+    print("✓ concurrent fan-out merged into one compact overview")
+
+
+def test_dependency_aware_cache():
+    backend = MockTaskManagerClient()
+    seed(backend)
+    overviews = TaskOverviews(backend, ttl=60)
+    assert not overviews.get("1")["cached"]
+    assert overviews.get("1")["cached"]
+
+    # Executions the overview does not show leave it cached
+    overviews.invalidate_execution("e0")
+    overviews.invalidate("task://2")
+    assert overviews.get("1")["cached"]
+    # A shown execution or the task itself drops it
+    overviews.invalidate_execution("e5")
+    assert not overviews.get("1")["cached"]
+    overviews.invalidate_execution("new", task_id="1")
+    assert not overviews.get("1")["cached"]
+    assert overviews.stats() == {"cached": 1, "hits": 2, "misses": 3, "invalidations": 2}
+
+    short = TaskOverviews(backend, ttl=0.05)
+    short.get("1")
+    time.sleep(0.1)
+    assert not short.get("1")["cached"]
+    print("✓ cache dropped by its dependencies and TTL")
+
+
+def test_partial_and_failed_overviews():
+    backend = MockTaskManagerClient()
+    seed(backend)
+    backend.list_executions = lambda **kwargs: {"success": False, "error": "boom", "status_code": 500}
+    overviews = TaskOverviews(backend, ttl=60)
+    result = overviews.get("1")
+    assert result["partial"] and result["errors"] == {"recent_executions": "boom"}
+    assert result["data"]["active_execution"]["execution_id"] == "e7"
+    assert not overviews.get("1")["cached"]
+    assert overviews.get("2")["status_code"] == 404
+    print("✓ partial overviews are returned but not cached")
+
+
+def test_tool_writes_invalidate():
+    backend = MockTaskManagerClient()
+    seed(backend)
+    originals = mcp_tools.task_client, mcp_tools.overviews
+    mcp_tools.task_client = backend
+    mcp_tools.overviews = TaskOverviews(backend, ttl=60)
+
+    async def main():
+        async with Client(mcp_tools.mcp) as session:
+            first = await session.call_tool("get_task_overview", {"task_id": "1"})
+            cached = await session.call_tool("get_task_overview", {"task_id": "1"})
+            await session.call_tool("update_execution_session", {"execution_id": "e7", "session_id": "s-1"})
+            fresh = await session.call_tool("get_task_overview", {"task_id": "1"})
+            invalid = await session.call_tool("get_task_overview", {"task_id": "1", "recent_executions": 50})
+            return first.data, cached.data, fresh.data, invalid.data
+
+    try:
+        first, cached, fresh, invalid = asyncio.run(main())
+    finally:
+        mcp_tools.task_client, mcp_tools.overviews = originals
+    assert not first["cached"] and cached["cached"]
+    assert not fresh["cached"] and fresh["data"]["active_execution"]["session_id"] == "s-1"
+    assert not invalid["success"]
+    print("✓ get_task_overview tool, invalidated by writes")
+
+
+if __name__ == "__main__":
+    test_concurrent_fan_out_and_merge()
+    test_dependency_aware_cache()
+    test_partial_and_failed_overviews()
+    test_tool_writes_invalidate()
+    print("✅ All passed!")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the record/replay transports
+"""
+
+import asyncio
+import gzip
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.clients.codec import get_codec
+from src.clients.http_client import HttpTaskManagerClient
+from src.clients.recording import RecordingTransport, ReplayTransport, load_records, replay_session
+from src.clients.generated._client import Client
+from src.clients.generated._client.api.health import get_api_health
+
+
+def backend(request: httpx.Request) -> httpx.Response:
+    """In-process stand-in for the Task Manager API, 20ms per request"""
+    time.sleep(0.02)
+    if request.url.path == "/api/health":
+        data = {"status": "healthy", "version": "1.0.0"}
+    else:
+        content = request.content
+        if request.headers.get("content-encoding") == "gzip":
+            content = gzip.decompress(content)
+        data = {"success": True, "data": {"step_id": "s-1", "step_name": get_codec().loads(content)["step_name"]}}
+    return httpx.Response(200, content=get_codec().dumps(data), headers={"Content-Type": "application/json"})
+
+
+def record_session(path: str) -> None:
+    recorder = RecordingTransport(path, httpx.MockTransport(backend))
+
+    client = HttpTaskManagerClient()
+    client.transport = recorder
+    assert client.create_step("exec-1", "build")["data"]["step_name"] == "build"
+    assert client.health_check()["success"]
+
+    async def generated_health():
+        generated = Client(base_url="http://task-manager", httpx_args={"transport": recorder})
+        async with generated:
+            return await get_api_health.asyncio(client=generated)
+
+    assert asyncio.run(generated_health()).status == "healthy"
+
+
+def test_record_and_replay():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.jsonl")
+        record_session(path)
+        record_session(path)
+
+        records = load_records(path)
+        assert [r["m"] for r in records] == ["POST", "GET", "GET"] * 2
+        assert records[0]["u"] == "/api/executions/exec-1/steps"
+        assert all(r["d"] >= 0.02 for r in records)
+        assert records[3]["t"] >= records[2]["t"] + records[2]["d"]  # second session follows the first
+
+        client = HttpTaskManagerClient()
+        client.transport = ReplayTransport(records, speed=None)
+        start = time.monotonic()
+        for _ in range(5):  # more than recorded; the last response repeats
+            assert client.health_check()["version"] == "1.0.0"
+        assert time.monotonic() - start < 0.05
+        assert client.create_step("exec-1", "build")["data"]["step_id"] == "s-1"
+        assert client.create_step("exec-2", "build")["error"].startswith("API endpoint not found")
+
+        client.transport = ReplayTransport(records, speed=1.0)
+        start = time.monotonic()
+        client.health_check()
+        assert time.monotonic() - start >= 0.02
+    print("✓ record and replay")
+
+
+def test_replay_from_env():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.jsonl")
+        record_session(path)
+        os.environ["TASK_MANAGER_REPLAY"] = path
+        os.environ["TASK_MANAGER_REPLAY_SPEED"] = "max"
+        try:
+            client = HttpTaskManagerClient()
+            assert isinstance(client.transport, ReplayTransport)
+            assert client.health_check()["success"]
+        finally:
+            os.environ.pop("TASK_MANAGER_REPLAY")
+            os.environ.pop("TASK_MANAGER_REPLAY_SPEED")
+    print("✓ replay configured from env")
+
+
+def test_replay_session():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.jsonl")
+        record_session(path)
+        records = load_records(path)
+
+        with httpx.Client(base_url="http://task-manager", transport=httpx.MockTransport(backend)) as client:
+            results = replay_session(records, client, speed=None)
+        assert [r["status"] for r in results] == [r["recorded_status"] for r in results] == [200, 200, 200]
+        assert all(r["latency"] >= 0.02 for r in results)
+
+        # Compressed request bodies are replayed with their Content-Encoding
+        compressed = os.path.join(tmp, "compressed.jsonl")
+        os.environ["TASK_MANAGER_COMPRESS_REQUESTS"] = "all"
+        try:
+            client = HttpTaskManagerClient()
+        finally:
+            os.environ.pop("TASK_MANAGER_COMPRESS_REQUESTS")
+        client.transport = RecordingTransport(compressed, httpx.MockTransport(backend))
+        assert client.create_step("exec-1", "build", message="compiling " * 200)["success"]
+        records = load_records(compressed)
+        assert records[0]["e"] == "gzip" and "q64" in records[0]
+        with httpx.Client(base_url="http://task-manager", transport=httpx.MockTransport(backend)) as client:
+            results = replay_session(records, client, speed=None)
+        assert [r["status"] for r in results] == [200]
+    print("✓ replay session")
+
+
+if __name__ == "__main__":
+    test_record_and_replay()
+    test_replay_from_env()
+    test_replay_session()
+    print("✅ All passed!")
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Tests for the task:// and execution:// resources, their shared watcher, and
+waiting for an execution status
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import fastmcp
+from fastmcp import Client
+from mcp import types
+from mcp.client.subscriptions import listen
+
+from src.clients.mock_client import MockTaskManagerClient
+from src.server import mcp_tools
+from src.server.resources import register_resources
+from src.server.watcher import ResourceWatcher, _ExecutionWatch, diff, parse_uri
+
+
+class CountingClient(MockTaskManagerClient):
+    """Mock client counting upstream reads"""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get_task(self, task_id, fields=None):
+        self.reads += 1
+        return super().get_task(task_id, fields)
+
+
+def seeded() -> CountingClient:
+    client = CountingClient()
+    client.put_task({"task_id": "1", "status": "running"})
+    client.put_execution({"execution_id": "e1", "task_id": "1", "status": "running", "raw_output": "x" * 1000})
+    return client
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_uris_and_diff():
+    assert parse_uri("task://42") == ("task", "42")
+    assert parse_uri("execution://e-1") == ("execution", "e-1")
+    for uri in ("task://", "job://1", "task://1/steps", "task:1"):
+        try:
+            parse_uri(uri)
+            assert False, uri
+        except ValueError:
+            pass
+    assert diff({"status": "running", "a": 1}, {"status": "completed", "a": 1}) == {
+        "status": {"old": "running", "new": "completed"}
+    }
+    assert diff(None, {"a": 1}) == {"a": {"old": None, "new": 1}}
+    print("✓ resource URIs and diffs")
+
+
+def test_one_poll_stream_for_many_subscribers():
+    client = seeded()
+    watcher = ResourceWatcher(client, min_interval=0.02, max_interval=0.1)
+    notified = []
+    subscribers = [lambda uri, i=i: notified.append((i, uri)) for i in range(10)]
+    for subscriber in subscribers:
+        watcher.subscribe("task://1", subscriber)
+        watcher.subscribe("execution://e1", subscriber)
+    wait_for(lambda: watcher.read("task://1").get("version") == 1)
+    reads, polls = client.reads, watcher.polls
+    time.sleep(0.5)
+    # Ten subscribers, one task polled; quiet tasks back off to the max interval
+    assert client.reads - reads == watcher.polls - polls < 20
+    assert watcher.watched()["tasks"]["1"] == 0.1
+
+    client.put_execution({"execution_id": "e1", "task_id": "1", "status": "completed"})
+    wait_for(lambda: len(notified) == 20)
+    assert sorted(set(uri for _, uri in notified)) == ["execution://e1", "task://1"]
+
+    task = watcher.read("task://1")
+    assert task["active_execution"] is None
+    assert task["changes"]["active_execution"]["status"] == {"old": "running", "new": None}
+    execution = watcher.read("execution://e1")
+    assert execution["execution"]["status"] == "completed"
+    assert execution["changes"] == {"status": {"old": "running", "new": "completed"}}
+    assert "raw_output" not in execution["execution"]
+    # A change resets the interval
+    assert watcher.watched()["tasks"]["1"] < 0.1
+
+    reads = client.reads
+    for _ in range(50):
+        watcher.read("task://1")
+    assert client.reads - reads <= 2
+
+    for subscriber in subscribers:
+        watcher.unsubscribe("task://1", subscriber)
+        watcher.unsubscribe("execution://e1", subscriber)
+    assert watcher.watched()["tasks"] == {} and watcher.watched()["executions"] == {}
+    print("✓ one poll stream shared by all subscribers")
+
+
+def test_poll_and_listener_errors_do_not_stop_the_watcher():
+    client = seeded()
+    failures = [RuntimeError("backend bug")] * 2
+    get_task = client.get_task
+    client.get_task = lambda task_id, fields=None: (_ for _ in ()).throw(failures.pop()) if failures \
+        else get_task(task_id, fields)
+    watcher = ResourceWatcher(client, min_interval=0.02, max_interval=0.1)
+
+    def broken_listener(uri):
+        raise RuntimeError("listener bug")
+
+    notified = []
+    watcher.add_listener(broken_listener)
+    watcher.subscribe("task://1", notified.append)
+    # The first two polls raise
+    wait_for(lambda: not failures and watcher._tasks["1"].polled)
+    client.put_task({"task_id": "1", "status": "completed"})
+    wait_for(lambda: notified == ["task://1"])
+    assert watcher._thread.is_alive()
+    print("✓ poll and listener errors are logged, polling goes on")
+
+
+def test_unwatched_reads():
+    watcher = ResourceWatcher(seeded())
+    task = watcher.read("task://1")
+    assert task["success"] and task["active_execution"]["execution_id"] == "e1"
+    assert watcher.read("execution://e1")["execution"]["status"] == "running"
+    assert watcher.read("task://2") == {"success": False, "error": "Task 2 not found"}
+    assert not watcher.read("execution://nope")["success"]
+    assert watcher.watched()["tasks"] == {}
+    print("✓ reads of unwatched resources")
+
+
+def test_listen_over_mcp():
+    client = seeded()
+    watcher = ResourceWatcher(client, min_interval=0.02, max_interval=0.1)
+    mcp = fastmcp.FastMCP("test")
+    register_resources(mcp, watcher)
+
+    async def main():
+        async with Client(mcp) as first, Client(mcp) as second:
+            contents = await first.read_resource("task://1")
+            assert '"execution_id": "e1"' in contents[0].text
+            async with listen(first.session, resource_subscriptions=["execution://e1"]) as one, \
+                    listen(second.session, resource_subscriptions=["execution://e1", "task://1"]) as two:
+                await asyncio.to_thread(wait_for, lambda: watcher.read("execution://e1").get("version") == 1)
+                assert watcher.watched()["subscriptions"] == {"execution://e1": 2, "task://1": 1}
+                client.put_execution({"execution_id": "e1", "task_id": "1", "status": "failed"})
+
+                async def events(subscription, count):
+                    received = []
+                    async for event in subscription:
+                        received.append(event.uri)
+                        if len(received) == count:
+                            return received
+
+                assert await asyncio.wait_for(events(one, 1), 5) == ["execution://e1"]
+                assert sorted(await asyncio.wait_for(events(two, 2), 5)) == ["execution://e1", "task://1"]
+            contents = await second.read_resource("execution://e1")
+            assert '"status": "failed"' in contents[0].text
+        await asyncio.to_thread(wait_for, lambda: watcher.watched()["subscriptions"] == {})
+
+    asyncio.run(main())
+    print("✓ subscriptions/listen streams share the watcher")
+
+
+def test_resources_subscribe():
+    client = seeded()
+    watcher = ResourceWatcher(client, min_interval=0.02, max_interval=0.1)
+    mcp = fastmcp.FastMCP("test")
+    register_resources(mcp, watcher)
+    handlers = mcp._mcp_server._request_handlers
+    updated = []
+
+    class Session:
+        async def send_resource_updated(self, uri):
+            updated.append(uri)
+
+    async def main():
+        ctx = SimpleNamespace(session=Session())
+        params = types.SubscribeRequestParams(uri="task://1")
+        for _ in range(2):
+            await handlers["resources/subscribe"].handler(ctx, params)
+        assert watcher.watched()["subscriptions"] == {"task://1": 1}
+        await asyncio.to_thread(wait_for, lambda: watcher.read("task://1").get("version") == 1)
+        client.put_task({"task_id": "1", "status": "success"})
+        await asyncio.to_thread(wait_for, lambda: updated == ["task://1"])
+        await handlers["resources/unsubscribe"].handler(ctx, types.UnsubscribeRequestParams(uri="task://1"))
+        assert watcher.watched()["subscriptions"] == {}
+
+    asyncio.run(main())
+    print("✓ resources/subscribe notifies the session")
+
+
+def test_concurrent_waiters_share_polls():
+    client = seeded()
+    watcher = ResourceWatcher(client, min_interval=0.02, max_interval=0.1)
+
+    async def main():
+        async def finish():
+            await asyncio.sleep(0.3)
+            client.put_execution({"execution_id": "e1", "task_id": "1", "status": "completed"})
+
+        waiters = [watcher.wait_for_execution_status("e1", ["completed", "failed"], 5) for _ in range(50)]
+        results = await asyncio.gather(finish(), *waiters)
+        return results[1:]
+
+    started = time.monotonic()
+    results = asyncio.run(main())
+    assert time.monotonic() - started < 2
+    assert all(result["success"] and result["status"] == "completed" for result in results)
+    assert results[0]["waited_seconds"] >= 0.3
+    # 50 waiters, one poll stream
+    assert client.reads < 30
+    assert watcher.watched()["subscriptions"] == {}
+    print("✓ concurrent waiters share one poll stream")
+
+
+def test_wait_outcomes():
+    client = seeded()
+    client.put_execution({"execution_id": "e2", "task_id": "1", "status": "rejected"})
+    watcher = ResourceWatcher(client, min_interval=0.02, max_interval=0.1)
+
+    timed_out = asyncio.run(watcher.wait_for_execution_status("e1", ["completed"], 0.2))
+    assert not timed_out["success"] and timed_out["timed_out"] and timed_out["status"] == "running"
+    assert 0.2 <= timed_out["waited_seconds"] < 1
+    assert asyncio.run(watcher.wait_for_execution_status("e1", ["running"], 1))["success"]
+
+    finished = asyncio.run(watcher.wait_for_execution_status("e2", ["completed"], 5))
+    assert finished["status"] == "rejected" and "finished with status 'rejected'" in finished["error"]
+    assert finished["waited_seconds"] < 1
+
+    missing = asyncio.run(watcher.wait_for_execution_status("nope", ["completed"], 5))
+    assert missing["status_code"] == 404
+    print("✓ timeout, other final status and unknown execution")
+
+
+def test_lookup_beyond_recent_pages():
+    client = seeded()
+    for i in range(700):
+        client.put_execution({"execution_id": f"old-{i}", "task_id": "2", "status": "completed",
+                              "started_at": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}Z"})
+    pages = []
+    list_executions = client.list_executions
+    client.list_executions = lambda **args: pages.append(args["page"]) or list_executions(**args)
+    watcher = ResourceWatcher(client, min_interval=0.02, max_interval=0.1)
+
+    oldest = asyncio.run(watcher.wait_for_execution_status("old-0", ["completed"], 5))
+    assert oldest["success"] and oldest["data"]["execution_id"] == "old-0"
+
+    # An unknown execution is searched for in full once, then only among newer ones
+    watch = _ExecutionWatch("nope")
+    pages.clear()
+    watcher._resolve(watch, [])
+    assert watch.missing and pages == list(range(1, 9))
+    pages.clear()
+    watcher._resolve(watch, [])
+    assert watch.missing and pages == [1]
+    print("✓ executions older than the recent pages are found")
+
+
+def test_wait_tool():
+    client = seeded()
+    original = mcp_tools.watcher
+    mcp_tools.watcher = ResourceWatcher(client, min_interval=0.02, max_interval=0.1)
+
+    async def main():
+        async with Client(mcp_tools.mcp) as session:
+            invalid = await session.call_tool(
+                "wait_for_execution_status", {"execution_id": "e1", "target_statuses": ["done"]}
+            )
+            assert "Invalid target_statuses" in invalid.data["error"]
+
+            async def finish():
+                await asyncio.sleep(0.1)
+                client.put_execution({"execution_id": "e1", "task_id": "1", "status": "failed"})
+
+            _, result = await asyncio.gather(finish(), session.call_tool(
+                "wait_for_execution_status",
+                {"execution_id": "e1", "target_statuses": ["completed", "failed"], "timeout": 10}
+            ))
+            return result.data
+
+    try:
+        result = asyncio.run(main())
+    finally:
+        mcp_tools.watcher = original
+    assert result["success"] and result["data"]["status"] == "failed"
+    print("✓ wait_for_execution_status tool")
+
+
+if __name__ == "__main__":
+    test_uris_and_diff()
+    test_one_poll_stream_for_many_subscribers()
+    test_poll_and_listener_errors_do_not_stop_the_watcher()
+    test_unwatched_reads()
+    test_listen_over_mcp()
+    test_resources_subscribe()
+    test_concurrent_waiters_share_polls()
+    test_wait_outcomes()
+    test_lookup_beyond_recent_pages()
+    test_wait_tool()
+    print("✅ All passed!")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for the consistent-hash sharding client, against several stand-in servers
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.standin_server import StandinServer
+from src.clients.http_client import HttpTaskManagerClient
+from src.clients.mock_client import MockTaskManagerClient
+from src.clients.sharded_client import HashRing, ShardedTaskManagerClient
+
+
+def test_hash_ring():
+    ring = HashRing(["a", "b", "c"])
+    shares = ring.ownership()
+    assert abs(sum(shares.values()) - 1.0) < 1e-9
+    assert all(0.2 < share < 0.47 for share in shares.values()), shares
+
+    keys = [f"exec-{i}" for i in range(3000)]
+    grown = ring.with_node("d")
+    moved = [key for key in keys if ring.owner(key) != grown.owner(key)]
+    # Only keys taken over by the new node move
+    assert all(grown.owner(key) == "d" for key in moved)
+    assert abs(ring.moved_fraction(grown) - grown.ownership()["d"]) < 1e-9
+    assert abs(len(moved) / len(keys) - ring.moved_fraction(grown)) < 0.05
+    assert ring.moved_fraction(HashRing(["c", "b", "a"])) == 0.0
+    print("✓ hash ring balance and minimal movement")
+
+
+def test_routing_against_standin_servers():
+    servers = {name: StandinServer(MockTaskManagerClient()).start() for name in ("s1", "s2", "s3")}
+    try:
+        client = ShardedTaskManagerClient({
+            name: HttpTaskManagerClient(base_url=server.base_url) for name, server in servers.items()
+        })
+        backends = {name: server.app.backend for name, server in servers.items()}
+
+        # Seed each shard with the tasks and executions it owns
+        for i in range(12):
+            task_id = f"task-{i}"
+            backends[client.shard_for(task_id)].put_task({"task_id": task_id, "status": "running"})
+        for i in range(30):
+            execution_id = f"exec-{i}"
+            backends[client.shard_for(execution_id)].put_execution({
+                "execution_id": execution_id,
+                "task_id": "task-0",
+                "status": "running" if i == 7 else "completed",
+                "started_at": f"2024-01-01T00:00:{i:02d}Z"
+            })
+
+        # Writes land on the owning shard only
+        for i in range(30):
+            assert client.create_step(f"exec-{i}", "build")["success"]
+            assert client.patch_execution(f"exec-{i}", "session")["success"]
+        for i in range(30):
+            owner = client.shard_for(f"exec-{i}")
+            for name, store in backends.items():
+                assert bool(store._steps_by_execution.get(f"exec-{i}")) == (name == owner)
+
+        assert client.get_task("task-5")["data"]["task_id"] == "task-5"
+        tasks = client.list_tasks(fields=["task_id"])["data"]
+        assert sorted(t["task_id"] for t in tasks["tasks"]) == sorted(f"task-{i}" for i in range(12))
+
+        # Fan-out pagination: newest first across shards
+        page = client.list_executions(task_id="task-0", page=2, limit=5, fields=["execution_id"])["data"]
+        assert [e["execution_id"] for e in page["executions"]] == [f"exec-{i}" for i in range(24, 19, -1)]
+        assert page["total_count"] == 30
+        assert client.get_active_execution("task-0")["data"]["execution_id"] == "exec-7"
+
+        stats = client.shard_stats()
+        assert sum(s["requests"] for s in stats["shards"].values()) >= 60 + 1 + 3 * 3
+
+        # Adding a shard reports the keyspace it took over
+        extra = StandinServer(MockTaskManagerClient()).start()
+        servers["s4"] = extra
+        report = client.add_shard("s4", HttpTaskManagerClient(base_url=extra.base_url))
+        assert 0.1 < report["moved_fraction"] < 0.45
+        assert abs(report["ownership_delta"]["s4"] - report["moved_fraction"]) < 1e-6
+        assert client.shard_stats()["rebalances"] == [report]
+
+        # A shard going down makes fan-out results partial, not failed
+        servers["s2"].stop()
+        result = client.list_tasks()
+        assert result["success"] and result["partial"]
+        assert list(result["shard_errors"]) == ["s2"]
+        assert not client.health_check()["success"]
+        servers.pop("s2")
+    finally:
+        for server in servers.values():
+            server.stop()
+    print("✓ writes routed to owning shard, list queries merged")
+
+
+class CountingShard(MockTaskManagerClient):
+    """Mock shard recording the (page, limit) of each list_executions call"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def list_executions(self, task_id=None, status=None, page=None, limit=None, fields=None):
+        self.calls.append((page, limit))
+        return super().list_executions(task_id=task_id, status=status, page=page, limit=limit, fields=fields)
+
+
+def test_merged_pages_read_shards_with_cursors():
+    shards = {name: CountingShard() for name in ("s1", "s2", "s3")}
+    client = ShardedTaskManagerClient(shards)
+    for i in range(600):
+        execution_id = f"exec-{i}"
+        shards[client.shard_for(execution_id)].put_execution({
+            "execution_id": execution_id, "task_id": "task-0", "status": "completed",
+            "started_at": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}Z"
+        })
+    newest_first = [f"exec-{i}" for i in range(599, -1, -1)]
+
+    # A deep page: every shard read in pages of at most 100
+    page = client.list_executions(page=9, limit=50, fields=["execution_id"])["data"]
+    assert [e["execution_id"] for e in page["executions"]] == newest_first[400:450]
+    assert page["total_count"] == 600
+    assert all(limit <= 100 for shard in shards.values() for _, limit in shard.calls)
+
+    # Walking every page continues the merge: each shard page is read once
+    for shard in shards.values():
+        shard.calls.clear()
+    seen = []
+    for number in range(1, 13):
+        seen += [e["execution_id"] for e in client.list_executions(page=number, limit=50)["data"]["executions"]]
+    assert seen == newest_first
+    for shard in shards.values():
+        pages = [page for page, _ in shard.calls]
+        assert pages == sorted(set(pages)) and set(limit for _, limit in shard.calls) == {50}
+    print("✓ merged pages read each shard through a cursor, 100 at most per call")
+
+
+if __name__ == "__main__":
+    test_hash_ring()
+    test_routing_against_standin_servers()
+    test_merged_pages_read_shards_with_cursors()
+    print("✅ All passed!")
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Tests for the sidecar daemon and its forwarding client
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.clients.deadline import current_deadline, deadline
+from src.clients.mock_client import MockTaskManagerClient
+from src.clients.sidecar import SidecarDaemon, WriteBatcher
+from src.clients.sidecar_client import SidecarTaskManagerClient
+
+
+def socket_path() -> str:
+    return os.path.join(tempfile.mkdtemp(), "sidecar.sock")
+
+
+def start_daemon(backend, **kwargs) -> SidecarDaemon:
+    daemon = SidecarDaemon(backend, path=socket_path(), **kwargs)
+    threading.Thread(target=daemon.serve, daemon=True).start()
+    deadline = time.monotonic() + 5
+    while not os.path.exists(daemon.path):
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    return daemon
+
+
+def test_forwarding_and_read_cache():
+    backend = MockTaskManagerClient()
+    backend.put_task({"task_id": "1", "name": "build", "status": "active"})
+    daemon = start_daemon(backend, idle_timeout=60, cache_ttl=60)
+    try:
+        client = SidecarTaskManagerClient(path=daemon.path, autostart=False)
+        assert client.get_task("1")["data"]["name"] == "build"
+        assert client.get_task("1")["data"]["name"] == "build"
+        assert daemon.cache_hits == 1
+        assert client.get_task("2")["status_code"] == 404
+
+        step = client.create_step("exec-1", "build", message="start")
+        assert step["success"] and step["data"]["execution_id"] == "exec-1"
+        patched = client.patch_step("exec-1", step["data"]["step_id"], status="completed")
+        assert patched["data"]["status"] == "completed"
+        assert client.patch_execution("exec-1", "session-1")["data"]["session_id"] == "session-1"
+        # A write drops cached reads
+        backend.put_task({"task_id": "1", "name": "renamed", "status": "active"})
+        client.create_step("exec-1", "test")
+        assert client.get_task("1")["data"]["name"] == "renamed"
+
+        assert client.health_check()["status"] == "healthy"
+        # The caller's remaining deadline applies to the daemon's call
+        budgets = []
+        health_check = backend.health_check
+        backend.health_check = lambda: budgets.append(current_deadline().remaining()) or health_check()
+        with deadline(2):
+            assert client.health_check()["success"]
+        assert 0 < budgets[0] <= 2
+        # A backend error is answered, on the same connection
+        get_task = backend.get_task
+        backend.get_task = lambda task_id, fields=None: 1 / 0
+        failed = client.get_task("3")
+        assert not failed["success"] and failed["error"] == "Sidecar get_task failed: division by zero"
+        backend.get_task = get_task
+        stats = client.sidecar_stats()["data"]
+        assert stats["writes"] == 4 and stats["pid"] == os.getpid()
+        # One connection reused by every sequential call
+        assert stats["connections"] == 1
+        client.close()
+    finally:
+        daemon.shutdown()
+    print("✓ reads, writes and cache through the sidecar")
+
+
+def test_write_batching():
+    backend = MockTaskManagerClient()
+    step_id = backend.create_step("exec-1", "build")["data"]["step_id"]
+    calls = []
+    original = backend.patch_step
+
+    def patch_step(**args):
+        calls.append(args)
+        return original(**args)
+
+    backend.patch_step = patch_step
+    batcher = WriteBatcher(backend, window=0.2)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = []
+        for status in ["running", "running", "completed"]:
+            args = {"execution_id": "exec-1", "step_id": step_id, "status": status}
+            futures.append(pool.submit(batcher.submit, "patch_step", args))
+            time.sleep(0.01)  # keep arrival order
+        results = [future.result() for future in futures]
+        sessions = list(pool.map(
+            lambda i: batcher.submit("patch_execution", {"execution_id": f"exec-{i}", "session_id": f"s-{i}"}),
+            range(8)
+        ))
+    # Updates of one step within a window become one request with the last values
+    assert len(calls) == 1 and calls[0]["status"] == "completed"
+    assert all(result["data"]["status"] == "completed" for result in results)
+    assert batcher.coalesced == 2
+    assert [session["data"]["session_id"] for session in sessions] == [f"s-{i}" for i in range(8)]
+    print("✓ writes coalesced per execution within a window")
+
+
+def test_slow_execution_and_expired_writes():
+    backend = MockTaskManagerClient()
+    release = threading.Event()
+    order = []
+    original = backend.patch_execution
+
+    def patch_execution(execution_id, session_id):
+        if session_id == "slow":
+            release.wait(5)
+        order.append((execution_id, session_id))
+        return original(execution_id, session_id)
+
+    backend.patch_execution = patch_execution
+    batcher = WriteBatcher(backend, window=0.01)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        slow = pool.submit(batcher.submit, "patch_execution", {"execution_id": "exec-1", "session_id": "slow"})
+        time.sleep(0.05)
+        # A later batch is not held up by the slow execution...
+        assert batcher.submit("patch_execution", {"execution_id": "exec-2", "session_id": "fast"})["success"]
+        # ...whose own later writes wait for it, and are dropped once their caller stops waiting
+        expired = pool.submit(batcher.submit, "patch_execution", {"execution_id": "exec-1", "session_id": "late"},
+                              time.monotonic() + 0.05)
+        time.sleep(0.05)
+        after = pool.submit(batcher.submit, "patch_execution", {"execution_id": "exec-1", "session_id": "after"})
+        time.sleep(0.1)
+        release.set()
+        assert slow.result()["success"] and after.result()["success"]
+        result = expired.result()
+    assert not result["success"] and "deadline" in result["error"] and batcher.expired == 1
+    assert order == [("exec-2", "fast"), ("exec-1", "slow"), ("exec-1", "after")]
+    print("✓ executions written independently, expired writes dropped")
+
+
+def test_idle_shutdown_and_single_daemon():
+    daemon = start_daemon(MockTaskManagerClient(), idle_timeout=0.3)
+    # A second daemon on the same socket stands down
+    assert SidecarDaemon(MockTaskManagerClient(), path=daemon.path).serve() is False
+    deadline = time.monotonic() + 5
+    while os.path.exists(daemon.path):
+        assert time.monotonic() < deadline, "daemon did not exit when idle"
+        time.sleep(0.05)
+    client = SidecarTaskManagerClient(path=daemon.path, autostart=False)
+    result = client.health_check()
+    assert not result["success"] and "sidecar" in result["error"]
+    print("✓ idle daemon exits and removes its socket")
+
+
+def test_autostart():
+    os.environ["TASK_MANAGER_SIDECAR_BACKEND"] = "mock"
+    os.environ["TASK_MANAGER_SIDECAR_IDLE"] = "2"
+    try:
+        path = socket_path()
+        first = SidecarTaskManagerClient(path=path)
+        second = SidecarTaskManagerClient(path=path)
+        step = first.create_step("exec-1", "build")
+        assert step["success"] and first.started_daemon
+        # Another MCP process shares the daemon and its state
+        assert second.get_active_execution("missing")["success"] is False
+        assert second.patch_step("exec-1", step["data"]["step_id"], status="completed")["success"]
+        assert not second.started_daemon
+        pid = second.sidecar_stats()["data"]["pid"]
+        assert pid != os.getpid()
+        first.close()
+        second.close()
+    finally:
+        os.environ.pop("TASK_MANAGER_SIDECAR_BACKEND")
+        os.environ.pop("TASK_MANAGER_SIDECAR_IDLE")
+    print("✓ first client starts the daemon, others reuse it")
+
+
+if __name__ == "__main__":
+    test_forwarding_and_read_cache()
+    test_write_batching()
+    test_slow_execution_and_expired_writes()
+    test_idle_shutdown_and_single_daemon()
+    test_autostart()
+    print("✅ All passed!")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for SqliteTaskManagerClient
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.clients import SqliteTaskManagerClient, create_task_manager_client
+
+
+def test_persistence_and_batching():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tm.db")
+        client = SqliteTaskManagerClient(path, batch_size=1000, commit_interval=60)
+        assert client._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        client.patch_execution("exec-1", "session-1")
+        step_id = client.create_step("exec-1", "build", message="compiling")["data"]["step_id"]
+        result = client.patch_step("exec-1", step_id, status="completed")
+        assert result["data"]["status"] == "completed" and "completed_at" in result["data"]
+        assert not client.patch_step("exec-2", step_id, status="failed")["success"]
+
+        # Batched: nothing is committed yet, but this client reads its own writes
+        assert client._pending == 3
+        other = SqliteTaskManagerClient(path)
+        assert other.list_executions()["data"]["total_count"] == 0
+        other.close()
+
+        client.close()
+        reopened = SqliteTaskManagerClient(path)
+        execution = reopened.list_executions()["data"]["executions"][0]
+        assert execution["session_id"] == "session-1" and execution["status"] == "running"
+        step_count = reopened._conn.execute("SELECT COUNT(*) FROM steps").fetchone()[0]
+        assert step_count == 1
+        reopened.close()
+    print("✓ persistence and batched commits")
+
+
+def test_concurrent_writers():
+    with tempfile.TemporaryDirectory() as tmp:
+        client = SqliteTaskManagerClient(os.path.join(tmp, "tm.db"))
+
+        def agent(n: int):
+            for i in range(100):
+                client.create_step(f"exec-{n}", f"step-{i}")
+
+        threads = [threading.Thread(target=agent, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert client._conn.execute("SELECT COUNT(DISTINCT step_id) FROM steps").fetchone()[0] == 400
+        client.close()
+    print("✓ concurrent writers")
+
+
+def test_idle_client_commits_on_a_timer():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tm.db")
+        client = SqliteTaskManagerClient(path, batch_size=1000, commit_interval=0.2)
+        other = SqliteTaskManagerClient(path)
+        other._conn.execute("PRAGMA busy_timeout = 50")
+
+        client.create_step("exec-1", "build")
+        # The open batch holds the write lock: the other client's write fails, as a result
+        locked = other.create_step("exec-2", "build")
+        assert not locked["success"] and "locked" in locked["error"]
+
+        # No further write on the first client, its timer commits the batch
+        time.sleep(0.5)
+        assert client._pending == 0
+        assert other.create_step("exec-2", "build")["success"]
+        other.flush()
+        assert other._conn.execute("SELECT COUNT(*) FROM steps").fetchone()[0] == 2
+        other.close()
+        client.close()
+    print("✓ idle batches committed by a timer, write errors returned")
+
+
+def test_read_endpoints():
+    with tempfile.TemporaryDirectory() as tmp:
+        client = SqliteTaskManagerClient(os.path.join(tmp, "tm.db"))
+        client.put_task({"task_id": "task-1", "status": "running", "jira_info": {"key": "NOVA-1"}})
+        for n, status in enumerate(["completed", "failed", "running"]):
+            client.put_execution({
+                "execution_id": f"exec-{n}",
+                "task_id": "task-1",
+                "status": status,
+                "raw_output": "x" * 1000,
+                "started_at": f"2026-01-0{n + 1}T00:00:00Z"
+            })
+
+        assert client.get_task("task-1")["data"]["jira_info"] == {"key": "NOVA-1"}
+        assert client.get_task("task-1", fields=["status", "unknown"])["data"] == {"status": "running"}
+        assert client.get_task("missing")["status_code"] == 404
+        assert client.list_tasks(status="running")["data"]["total_count"] == 1
+
+        active = client.get_active_execution("task-1", fields=["execution_id"])
+        assert active["data"] == {"execution_id": "exec-2"}
+
+        page = client.list_executions(task_id="task-1", limit=2, fields=["execution_id", "status"])["data"]
+        assert page["executions"] == [
+            {"execution_id": "exec-2", "status": "running"},
+            {"execution_id": "exec-1", "status": "failed"}
+        ]
+        assert page["total_count"] == 3
+
+        plan = client._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM executions WHERE task_id = ? AND status = ?", ("t", "s")
+        ).fetchall()
+        assert "idx_executions_task_status" in str([tuple(row) for row in plan])
+        client.close()
+    print("✓ read endpoints")
+
+
+def test_factory_selection():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["TASK_MANAGER_CLIENT"] = "sqlite"
+        os.environ["TASK_MANAGER_SQLITE_PATH"] = os.path.join(tmp, "factory.db")
+        try:
+            client = create_task_manager_client()
+            assert isinstance(client, SqliteTaskManagerClient)
+            client.close()
+        finally:
+            os.environ.pop("TASK_MANAGER_CLIENT")
+            os.environ.pop("TASK_MANAGER_SQLITE_PATH")
+    print("✓ factory selects sqlite")
+
+
+if __name__ == "__main__":
+    test_persistence_and_batching()
+    test_concurrent_writers()
+    test_idle_client_commits_on_a_timer()
+    test_read_endpoints()
+    test_factory_selection()
+    print("✅ All passed!")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for the step duration profiler
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastmcp import Client
+
+from src.analytics.steps import MAX_PHASES, OTHER, StepProfiler, TDigest
+from src.clients.mock_client import MockTaskManagerClient
+from src.clients.sqlite_client import SqliteTaskManagerClient
+from src.server import mcp_tools
+
+
+def test_tdigest_accuracy_and_size():
+    rng = random.Random(3)
+    centroids = []
+    for count in (10_000, 200_000):
+        values = [rng.lognormvariate(3, 1.2) for _ in range(count)]
+        digest = TDigest(100)
+        for value in values:
+            digest.add(value)
+        values.sort()
+        for q in (0.01, 0.5, 0.95, 0.99):
+            estimate = digest.quantile(q)
+            rank = sum(1 for value in values if value <= estimate) / count
+            assert abs(rank - q) < 0.005, (count, q, rank)
+        assert digest.quantile(0) == values[0] and digest.quantile(1) == values[-1]
+        centroids.append(digest.centroids())
+    # Twenty times the values, about the same number of centroids
+    assert centroids[1] <= 100 and centroids[1] < centroids[0] * 1.5, centroids
+
+    small = TDigest()
+    assert small.quantile(0.5) is None
+    for value in (1.0, 2.0, 3.0):
+        small.add(value)
+    assert small.quantile(0) == 1.0 and small.quantile(0.5) == 2.0 and small.quantile(1) == 3.0
+    print(f"✓ t-digest quantiles within 0.5% rank, {centroids[1]} centroids for 200k values")
+
+
+def test_step_lifecycles():
+    profiler = StepProfiler(backfill_path=None)
+    assert profiler.record({"step_id": "a", "step_name": "coding", "status": "running",
+                            "started_at": "2026-10-01T00:00:00Z"}, created=True) is None
+    # Updates may carry only the id and status; the name and start come from creation
+    assert profiler.record({"step_id": "a", "status": "completed", "completed_at": "2026-10-01T00:01:30Z"}) == 90
+    assert profiler.record({"step_id": "a", "status": "completed", "message": "late note",
+                            "completed_at": "2026-10-01T00:05:00Z"}) is None
+    for i in range(1, 101):
+        profiler.record({"step_id": f"t{i}", "step_name": "testing", "status": "failed" if i % 10 == 0 else "completed",
+                         "started_at": "2026-10-01T00:00:00Z", "completed_at": f"2026-10-01T00:00:{i % 60:02d}Z"},
+                        created=True)
+    # Created finished, without timestamps from the backend: counted with no elapsed time
+    assert profiler.record({"step_id": "s", "step_name": "analyzing", "status": "skipped"}, created=True) == 0
+    # Finishing steps whose start was never seen: without a started_at, or
+    # finished before the profiler started (the backfill counts those)
+    assert profiler.record({"step_id": "u", "step_name": "coding", "status": "completed"}) is None
+    assert profiler.record({"step_id": "v", "step_name": "coding", "status": "completed",
+                            "started_at": "2026-10-01T00:00:00Z", "completed_at": "2026-10-01T00:01:00Z"}) is None
+    profiler.record({"step_id": "r", "step_name": "reviewing", "status": "running"}, created=True)
+    assert profiler.record({"step_id": "r", "status": "completed"}) >= 0
+
+    result = profiler.profile(percentiles=[50, 95, 99.9])
+    assert result["success"] and result["data"]["steps"] == 103 and result["data"]["running"] == 0
+    testing, coding = result["data"]["phases"][:2]
+    assert testing["step_name"] == "testing" and testing["count"] == 100
+    assert testing["statuses"] == {"completed": 90, "failed": 10}
+    assert testing["p50"] == 25.0 and testing["max_seconds"] == 59 and "p99_9" in testing
+    assert coding == {**coding, "count": 1, "total_seconds": 90.0, "p50": 90.0, "p95": 90.0}
+    assert round(sum(phase["share"] for phase in result["data"]["phases"]), 3) == 1.0
+    assert profiler.profile(step_name="coding")["data"]["phase_count"] == 1
+    assert not profiler.profile(percentiles=[120])["success"]
+    print("✓ step lifecycles recorded once, per step name")
+
+
+def test_bounded_phases():
+    profiler = StepProfiler(backfill_path=None)
+    for i in range(MAX_PHASES + 50):
+        profiler.record({"step_id": f"s{i}", "step_name": f"phase {i}", "status": "completed",
+                         "started_at": "2026-10-01T00:00:00Z", "completed_at": "2026-10-01T00:00:01Z"}, created=True)
+    data = profiler.profile(limit=1000)["data"]
+    assert data["phase_count"] == MAX_PHASES + 1 and data["steps"] == MAX_PHASES + 50
+    assert profiler.profile(step_name=OTHER)["data"]["phases"][0]["count"] == 50
+    print("✓ step names beyond the limit are counted together")
+
+
+def test_backfill_from_sqlite_database():
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "tasks.db")
+        client = SqliteTaskManagerClient(path=database)
+        for i in range(30):
+            step = client.create_step(f"e{i % 3}", "coding" if i % 2 else "testing")
+            if i % 3:
+                client.patch_step(f"e{i % 3}", step["data"]["step_id"], status="completed")
+        client.flush()
+
+        profiler = StepProfiler(client)
+        assert profiler.backfill_path == database
+        data = profiler.profile()["data"]
+        assert data["backfilled"] == 20 and data["steps"] == 20
+        # Once only
+        assert profiler.profile()["data"]["steps"] == 20
+        client.close()
+
+        missing = StepProfiler(backfill_path=os.path.join(directory, "nope.db")).profile()
+        assert missing["success"] and "does not exist" in missing["backfill_error"]
+    print("✓ history backfilled once from a sqlite backend database")
+
+
+def test_step_duration_profile_tool():
+    originals = mcp_tools.task_client, mcp_tools.step_profiler
+    mcp_tools.task_client = MockTaskManagerClient()
+    mcp_tools.step_profiler = StepProfiler(backfill_path=None)
+
+    async def main():
+        async with Client(mcp_tools.mcp) as session:
+            for name in ("analyzing", "coding", "coding"):
+                created = await session.call_tool("create_step", {"execution_id": "e1", "step_name": name})
+                await session.call_tool("update_step", {
+                    "execution_id": "e1", "step_id": created.data["step_id"], "status": "completed"
+                })
+            await session.call_tool("create_step", {"execution_id": "e1", "step_name": "testing"})
+            # As after a restart: the backfill already counted this finished step
+            mcp_tools.step_profiler._steps.pop(created.data["step_id"])
+            await session.call_tool("update_step", {
+                "execution_id": "e1", "step_id": created.data["step_id"], "message": "late note"
+            })
+            profile = await session.call_tool("step_duration_profile", {})
+            invalid = await session.call_tool("step_duration_profile", {"percentiles": [-1]})
+            return profile.data, invalid.data
+
+    try:
+        profile, invalid = asyncio.run(main())
+    finally:
+        mcp_tools.task_client, mcp_tools.step_profiler = originals
+    assert profile["success"] and profile["data"]["steps"] == 3 and profile["data"]["running"] == 1
+    counts = {phase["step_name"]: phase["count"] for phase in profile["data"]["phases"]}
+    assert counts == {"analyzing": 1, "coding": 2}
+    assert {"p50", "p95"} <= set(profile["data"]["phases"][0])
+    assert not invalid["success"]
+    print("✓ step_duration_profile tool")
+
+
+if __name__ == "__main__":
+    test_tdigest_accuracy_and_size()
+    test_step_lifecycles()
+    test_bounded_phases()
+    test_backfill_from_sqlite_database()
+    test_step_duration_profile_tool()
+    print("✅ All passed!")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared httpx transports against the local stand-in server
+"""
+
+import importlib.util
+import os
+import socket
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+
+from benchmarks.standin_server import StandinServer
+from src.clients.http_client import HttpTaskManagerClient
+from src.clients.transport import DualTransport, Http2Transport, create_transport, http2_available
+
+
+def make_client(server: StandinServer, transport) -> HttpTaskManagerClient:
+    client = HttpTaskManagerClient()
+    client.base_url = server.base_url
+    client.transport = transport
+    return client
+
+
+def test_shared_transport_concurrency():
+    with StandinServer() as server:
+        client = make_client(server, DualTransport(shared=True))
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda n: client.create_step(f"exec-{n % 4}", "step"), range(200)))
+        assert all(result["success"] for result in results)
+        assert server.app.requests == 200
+    print("✓ shared transport under concurrency")
+
+
+def test_http2_fallback():
+    if not http2_available():
+        print("- HTTP/2 fallback skipped (h2 not installed)")
+        return
+    with StandinServer() as server:  # uvicorn: HTTP/1.1 only
+        transport = Http2Transport(shared=True)
+        client = make_client(server, transport)
+        assert client.create_step("exec-1", "build")["success"]
+        assert transport.negotiated == "HTTP/1.1"
+        # Found by a probe: the POST itself was sent once
+        assert len(server.app.backend._steps_by_execution["exec-1"]) == 1
+        assert client.health_check()["success"]
+    print("✓ HTTP/2 falls back to HTTP/1.1")
+
+
+def test_http2_errors_are_not_downgraded():
+    # A server answering the HTTP/2 preface with a SETTINGS frame
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def serve():
+        while True:
+            try:
+                connection, _ = listener.accept()
+            except OSError:
+                return
+            with connection:
+                connection.recv(1024)
+                connection.sendall(b"\x00\x00\x00\x04\x00\x00\x00\x00\x00")
+
+    threading.Thread(target=serve, daemon=True).start()
+    transport = Http2Transport()
+    sent = []
+
+    class Broken(httpx.BaseTransport):
+        def handle_request(self, request):
+            sent.append(request.method)
+            raise httpx.ReadError("connection reset")
+
+    transport._prior_knowledge = Broken()
+    transport._http1 = Broken()
+    try:
+        with httpx.Client(transport=transport) as client:
+            client.post(f"http://127.0.0.1:{listener.getsockname()[1]}/api/executions/e1/steps", json={})
+        assert False, "the error must propagate"
+    except httpx.ReadError:
+        pass
+    finally:
+        listener.close()
+    # A reset after HTTP/2 was found neither downgrades nor re-sends the POST
+    assert transport.negotiated == "HTTP/2" and sent == ["POST"]
+    print("✓ HTTP/2 request errors are not taken for a failed negotiation")
+
+
+def test_http2():
+    if not http2_available() or importlib.util.find_spec("hypercorn") is None:
+        print("- HTTP/2 skipped (h2 or hypercorn not installed)")
+        return
+    with StandinServer(http2=True) as server:
+        transport = Http2Transport(shared=True)
+        client = make_client(server, transport)
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda n: client.create_step("exec-1", f"step-{n}"), range(100)))
+        assert all(result["success"] for result in results)
+        assert transport.negotiated == "HTTP/2"
+        assert len(transport._prior_knowledge._sync._pool.connections) == 1
+    print("✓ HTTP/2 multiplexes over one connection")
+
+
+def test_unix_socket():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "task-manager.sock")
+        os.environ["TASK_MANAGER_UDS"] = path
+        try:
+            with StandinServer(uds=path) as server:
+                client = HttpTaskManagerClient()
+                assert client.transport is create_transport()
+                assert client.transport.kwargs["uds"] == path
+                assert client.create_step("exec-1", "build")["success"]
+                assert client.list_executions(fields=["execution_id"])["data"]["executions"] == [
+                    {"execution_id": "exec-1"}
+                ]
+                assert server.app.requests == 2
+        finally:
+            os.environ.pop("TASK_MANAGER_UDS")
+    print("✓ Unix domain socket")
+
+
+if __name__ == "__main__":
+    test_shared_transport_concurrency()
+    test_http2_fallback()
+    test_http2_errors_are_not_downgraded()
+    test_http2()
+    test_unix_socket()
+    print("✅ All passed!")
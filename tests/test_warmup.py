@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the DNS cache and connection warm-up
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.standin_server import StandinServer
+from src.clients.dns import DnsCache
+from src.clients.http_client import HttpTaskManagerClient
+from src.clients.transport import DualTransport
+from src.clients.warmup import start_warm_up
+
+
+def pooled(transport: DualTransport) -> int:
+    return len(transport._sync._pool.connections) if transport._sync else 0
+
+
+def test_dns_cache():
+    cache = DnsCache(ttl=0.1)
+    addresses = cache.resolve("localhost", 80)
+    assert addresses and cache.resolve("localhost", 80) == addresses
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 1
+    assert cache.resolve("127.0.0.1", 80) == ["127.0.0.1"]
+    time.sleep(0.15)
+    cache.resolve("localhost", 80)
+    assert cache.stats()["misses"] == 2
+    cache.invalidate("localhost", 80)
+    assert cache.cached("localhost", 80) is None
+    print("✓ DNS cache with TTL")
+
+
+def test_connections_use_dns_cache():
+    with StandinServer() as server:
+        cache = DnsCache(ttl=60)
+        client = HttpTaskManagerClient(base_url=f"http://localhost:{server.port}")
+        client.transport = DualTransport(shared=True, dns_cache=cache)
+        for _ in range(3):
+            assert client.create_step("exec-1", "build")["success"]
+        # The pool reuses its connection; only a new connection resolves, once
+        assert cache.stats()["misses"] == 1
+        client.transport._sync.close()
+        assert client.create_step("exec-1", "test")["success"]
+        assert cache.stats() == {"ttl": 60, "hosts": 1, "hits": 1, "misses": 1}
+    print("✓ new connections resolve through the DNS cache")
+
+
+def test_warm_up_opens_pooled_connections():
+    with StandinServer(latency=0.05) as server:
+        client = HttpTaskManagerClient(base_url=server.base_url)
+        client.transport = DualTransport(shared=True)
+        result = client.warm_up(connections=3, probe=True)
+        assert result["success"] and result["healthy"]
+        assert pooled(client.transport) == 3
+
+        # The first real call reuses a warm connection
+        assert client.create_step("exec-1", "build")["success"]
+        assert pooled(client.transport) == 3
+    print("✓ warm-up opens pooled connections")
+
+
+def test_warm_up_runs_in_background():
+    with StandinServer(latency=0.3) as server:
+        client = HttpTaskManagerClient(base_url=server.base_url)
+        client.transport = DualTransport(shared=True)
+        os.environ["TASK_MANAGER_WARMUP_PROBE"] = "true"
+        try:
+            start = time.monotonic()
+            thread = start_warm_up(client)
+            assert time.monotonic() - start < 0.1
+        finally:
+            os.environ.pop("TASK_MANAGER_WARMUP_PROBE")
+        thread.join(timeout=5)
+        assert client.warm_up_result["healthy"] and client.warm_up_result["connections"] == 2
+
+    os.environ["TASK_MANAGER_WARMUP_CONNECTIONS"] = "0"
+    try:
+        assert start_warm_up(client) is None
+    finally:
+        os.environ.pop("TASK_MANAGER_WARMUP_CONNECTIONS")
+    print("✓ warm-up runs in the background")
+
+
+if __name__ == "__main__":
+    test_dns_cache()
+    test_connections_use_dns_cache()
+    test_warm_up_opens_pooled_connections()
+    test_warm_up_runs_in_background()
+    print("✅ All passed!")